@@ -254,13 +254,14 @@ async def generate_assets(assets_spec_path: Path, output_dir: Optional[Path] = N
                             name=name,
                             style=track_spec.get("style", "electronic"),
                             duration=track_spec.get("duration", 120),
-                            save_path=str(audio_dir / f"{name}.mp3")
+                            save_path=str(audio_dir / f"{name}.ogg")
                         )
                         
-                        # Register in asset registry
+                        # Register the rendered file (OGG or WAV) in asset registry
+                        filename = Path(result.path).name if result.path else f"{name}.ogg"
                         registry.register_asset(
                             name=name,
-                            path=f"/public/static/assets/generated/audio/{category}/{name}.mp3",
+                            path=f"/public/static/assets/generated/audio/{category}/{filename}",
                             asset_type="audio",
                             category=category,
                             generated=True
@@ -281,10 +282,11 @@ async def generate_assets(assets_spec_path: Path, output_dir: Optional[Path] = N
                             save_path=str(audio_dir / f"{name}.wav")
                         )
                         
-                        # Register in asset registry
+                        # Register the file actually written (library sounds keep their format)
+                        filename = Path(result.path).name if result.path else f"{name}.wav"
                         registry.register_asset(
                             name=name,
-                            path=f"/public/static/assets/generated/audio/{category}/{name}.wav",
+                            path=f"/public/static/assets/generated/audio/{category}/{filename}",
                             asset_type="audio",
                             category=category,
                             generated=True
@@ -29,6 +29,8 @@ from ai_game_dev.text import (
     create_lesson_plan,
     identify_teachable_moment,
     create_educational_dialogue,
+    create_coding_challenge,
+    run_coding_challenge,
 )
 
 
@@ -101,6 +103,8 @@ Always be encouraging and explain concepts clearly.""",
         create_lesson_plan,
         identify_teachable_moment,
         create_educational_dialogue,
+        create_coding_challenge,
+        run_coding_challenge,
         generate_sprite,
         generate_voice_acting,
         generate_mechanic_variants,  # For educational variants
@@ -4,9 +4,12 @@ Provides OpenAI function tools for TTS, music, and sound effects.
 """
 
 from ai_game_dev.audio.audio_tools import AudioTools
+from ai_game_dev.audio.audio_processor import AudioProcessor, ProcessingOptions
 from ai_game_dev.audio.tts_generator import TTSGenerator
 from ai_game_dev.audio.music_generator import MusicGenerator
-from ai_game_dev.audio.freesound_client import FreesoundClient
+from ai_game_dev.audio.freesound_client import FreesoundClient, SoundLibrary
+from ai_game_dev.audio.midi_renderer import MidiRenderer
+from ai_game_dev.audio.sfx_synth import SoundEffectSynthesizer, SynthParams
 from ai_game_dev.audio.tool import (
     generate_voice_acting,
     generate_sound_effect,
@@ -16,9 +19,15 @@ from ai_game_dev.audio.tool import (
 
 __all__ = [
     "AudioTools",
+    "AudioProcessor",
+    "ProcessingOptions",
     "TTSGenerator", 
     "MusicGenerator",
     "FreesoundClient",
+    "SoundLibrary",
+    "MidiRenderer",
+    "SoundEffectSynthesizer",
+    "SynthParams",
     # OpenAI function tools
     "generate_voice_acting",
     "generate_sound_effect",
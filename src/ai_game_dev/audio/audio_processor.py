@@ -0,0 +1,327 @@
+"""
+Vectorized batch post-processing for generated and downloaded audio.
+
+Clips are trimmed of leading/trailing silence, normalized to a peak,
+RMS or approximate LUFS target, given short fades, and music can be cut
+to a seamless loop found by correlating its opening against its tail.
+WAV input is memory-mapped and streamed in chunks, so long music files
+are never fully loaded; directories are processed in a process pool.
+"""
+
+import os
+import struct
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+from ai_game_dev.audio.audio_sprite import read_audio
+from ai_game_dev.audio.sfx_synth import pcm16
+
+
+CHUNK_FRAMES = 1 << 18
+BLOCK_FRAMES = 256
+LUFS_BLOCK_SECONDS = 0.4
+LUFS_ABSOLUTE_GATE = -70.0
+LUFS_RELATIVE_GATE = -10.0
+
+# (format tag, bits per sample) -> (dtype, full-scale divisor) for memory mapping
+_MEMMAP_FORMATS = {
+    (1, 16): ("<i2", 32768.0),
+    (1, 32): ("<i4", 2147483648.0),
+    (3, 32): ("<f4", 1.0),
+    (3, 64): ("<f8", 1.0),
+}
+
+
+@dataclass
+class ProcessingOptions:
+    """Settings for AudioProcessor.
+
+    Levels are in dBFS, except ``lufs`` normalization where ``target_db``
+    is the integrated loudness target.
+    """
+    trim: bool = True
+    silence_threshold_db: float = -50.0
+    normalize: Literal["peak", "rms", "lufs"] | None = "peak"
+    target_db: float = -1.0
+    max_peak_db: float = -0.5
+    fade_ms: float = 5.0
+    loop: bool = False
+    loop_search_seconds: float = 2.0
+    loop_window_seconds: float = 0.1
+    crossfade_ms: float = 50.0
+
+
+@dataclass
+class ProcessingResult:
+    """What was done to one file; frame positions refer to the input."""
+    input_path: str
+    output_path: str
+    sample_rate: int
+    start_frame: int
+    end_frame: int
+    gain_db: float
+    duration_seconds: float
+    loop_score: float | None = None
+
+
+class WavSource:
+    """Frame access to an audio file, memory-mapped for plain PCM/float WAV."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        mapped = _memmap_wav(self.path)
+        if mapped:
+            self._data, self.sample_rate, self._scale = mapped
+        else:
+            self._data, self.sample_rate = read_audio(self.path)
+            self._scale = 1.0
+        self.frames, self.channels = self._data.shape
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """Return frames ``[start, stop)`` as float32 ``(n, channels)``."""
+        return np.asarray(self._data[start:stop], dtype=np.float32) / np.float32(self._scale)
+
+    def chunks(self, start: int = 0, stop: int | None = None):
+        """Yield ``(offset, frames)`` over a range in CHUNK_FRAMES pieces."""
+        stop = self.frames if stop is None else stop
+        for offset in range(start, stop, CHUNK_FRAMES):
+            yield offset, self.read(offset, min(offset + CHUNK_FRAMES, stop))
+
+
+def _memmap_wav(path: Path) -> tuple[np.memmap, int, float] | None:
+    """Memory-map the data chunk of a WAV file if its sample format allows it."""
+    if path.suffix.lower() != ".wav":
+        return None
+
+    with open(path, "rb") as f:
+        if f.read(12)[8:] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            chunk_id, size = struct.unpack("<4sI", header)
+            if chunk_id == b"fmt ":
+                data = f.read(size + size % 2)
+                tag, channels, sample_rate, _, _, bits = struct.unpack("<HHIIHH", data[:16])
+                if tag == 0xFFFE:  # WAVE_FORMAT_EXTENSIBLE: real tag starts the subformat GUID
+                    tag = struct.unpack("<H", data[24:26])[0]
+                fmt = (tag, channels, sample_rate, bits)
+            elif chunk_id == b"data":
+                offset = f.tell()
+                break
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)
+
+    if fmt is None or (fmt[0], fmt[3]) not in _MEMMAP_FORMATS:
+        return None
+
+    tag, channels, sample_rate, bits = fmt
+    dtype, scale = _MEMMAP_FORMATS[(tag, bits)]
+    frames = min(size, path.stat().st_size - offset) // (bits // 8 * channels)
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(frames, channels))
+    return data, sample_rate, scale
+
+
+def block_stats(source: WavSource, block: int = BLOCK_FRAMES) -> tuple[np.ndarray, np.ndarray]:
+    """Per-block peak and mean-square levels, computed chunk by chunk."""
+    peaks, mean_squares = [], []
+    for _, chunk in source.chunks():
+        usable = len(chunk) - len(chunk) % block
+        blocks = [chunk[:usable].reshape(-1, block, source.channels)]
+        if usable < len(chunk):
+            tail = np.zeros((1, block, source.channels), dtype=np.float32)
+            tail[0, :len(chunk) - usable] = chunk[usable:]
+            blocks.append(tail)
+        for b in blocks:
+            peaks.append(np.abs(b).max(axis=(1, 2)))
+            mean_squares.append(np.square(b).mean(axis=(1, 2)))
+    if not peaks:
+        return np.zeros(0), np.zeros(0)
+    return np.concatenate(peaks), np.concatenate(mean_squares)
+
+
+def _db(value: float) -> float:
+    return 20.0 * np.log10(max(value, 1e-12))
+
+
+def approximate_lufs(mean_squares: np.ndarray, sample_rate: int, channels: int, block: int = BLOCK_FRAMES) -> float:
+    """Gated integrated loudness over 400 ms blocks (no K-weighting filter)."""
+    group = max(int(LUFS_BLOCK_SECONDS * sample_rate / block), 1)
+    usable = len(mean_squares) - len(mean_squares) % group
+    if usable == 0:
+        power = mean_squares
+    else:
+        power = mean_squares[:usable].reshape(-1, group).mean(axis=1)
+    power = power * channels  # Loudness sums channel power
+    loudness = -0.691 + 10.0 * np.log10(np.maximum(power, 1e-12))
+
+    gated = power[loudness > LUFS_ABSOLUTE_GATE]
+    if not len(gated):
+        return LUFS_ABSOLUTE_GATE
+    relative = -0.691 + 10.0 * np.log10(gated.mean()) + LUFS_RELATIVE_GATE
+    gated = power[loudness > max(relative, LUFS_ABSOLUTE_GATE)]
+    return float(-0.691 + 10.0 * np.log10(gated.mean()))
+
+
+def find_loop_end(
+    source: WavSource,
+    loop_start: int,
+    end: int,
+    window: int,
+    search: int
+) -> tuple[int, float]:
+    """Find where the tail best matches the audio at ``loop_start``.
+
+    Uses FFT cross-correlation of a short window from the loop start
+    against the last ``search`` frames, normalized by local energy.
+    Returns the loop end frame and its correlation score.
+    """
+    template = source.read(loop_start, loop_start + window).mean(axis=1)
+    region_start = max(end - search, loop_start + 2 * window)
+    region = source.read(region_start, end).mean(axis=1)
+    if len(region) < window or not np.any(template):
+        return end, 0.0
+
+    size = 1 << int(np.ceil(np.log2(len(region) + window)))
+    correlation = np.fft.irfft(
+        np.fft.rfft(region, size) * np.conj(np.fft.rfft(template, size)), size
+    )[:len(region) - window + 1]
+
+    energy = np.concatenate(([0.0], np.cumsum(region.astype(np.float64) ** 2)))
+    window_energy = energy[window:] - energy[:-window]
+    score = correlation / np.sqrt(window_energy * np.sum(template.astype(np.float64) ** 2) + 1e-12)
+
+    best = int(np.argmax(score))
+    return region_start + best, float(score[best])
+
+
+class AudioProcessor:
+    """Batch audio post-processor for clips and music loops."""
+
+    def __init__(self, options: ProcessingOptions | None = None):
+        self.options = options or ProcessingOptions()
+
+    def process_file(self, input_path: Path, output_path: Path | None = None) -> ProcessingResult:
+        """Process one file into a 16-bit WAV (in place when no output is given)."""
+        opts = self.options
+        source = WavSource(input_path)
+        output_path = Path(output_path or input_path).with_suffix(".wav")
+        rate = source.sample_rate
+
+        peaks, mean_squares = block_stats(source)
+        start, end = 0, source.frames
+        if opts.trim and len(peaks):
+            active = np.flatnonzero(peaks > 10 ** (opts.silence_threshold_db / 20))
+            if len(active):
+                start = int(active[0] * BLOCK_FRAMES)
+                end = int(min((active[-1] + 1) * BLOCK_FRAMES, source.frames))
+
+        first_block, last_block = start // BLOCK_FRAMES, -(-end // BLOCK_FRAMES)
+        gain_db = self._gain_db(
+            peaks[first_block:last_block], mean_squares[first_block:last_block], rate, source.channels
+        )
+
+        crossfade = int(opts.crossfade_ms * rate / 1000)
+        loop_score = None
+        tail = None
+        if opts.loop and end - start > 4 * crossfade:
+            loop_end, loop_score = find_loop_end(
+                source,
+                start + crossfade,
+                end,
+                window=int(opts.loop_window_seconds * rate),
+                search=int(opts.loop_search_seconds * rate),
+            )
+            # Blend the tail into the pre-roll so playback wraps seamlessly
+            fade_in = np.linspace(0.0, 1.0, crossfade, dtype=np.float32)[:, None]
+            tail = (source.read(loop_end - crossfade, loop_end) * (1 - fade_in)
+                    + source.read(start, start + crossfade) * fade_in)
+            start, end = start + crossfade, loop_end
+
+        gain = np.float32(10 ** (gain_db / 20))
+        fade = 0 if opts.loop else min(int(opts.fade_ms * rate / 1000), (end - start) // 2)
+        body_end = end - len(tail) if tail is not None else end
+
+        tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with wave.open(str(tmp_path), "wb") as wav:
+            wav.setnchannels(source.channels)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            for offset, chunk in source.chunks(start, body_end):
+                chunk *= gain
+                if fade:
+                    _apply_fades(chunk, offset - start, end - start, fade)
+                wav.writeframes(pcm16(chunk).tobytes())
+            if tail is not None:
+                wav.writeframes(pcm16(tail * gain).tobytes())
+        tmp_path.replace(output_path)
+
+        return ProcessingResult(
+            input_path=str(input_path),
+            output_path=str(output_path),
+            sample_rate=rate,
+            start_frame=start,
+            end_frame=end,
+            gain_db=float(gain_db),
+            duration_seconds=(end - start) / rate,
+            loop_score=loop_score,
+        )
+
+    def process_directory(
+        self,
+        input_dir: Path,
+        output_dir: Path | None = None,
+        pattern: str = "*.wav",
+        max_workers: int | None = None
+    ) -> list[ProcessingResult]:
+        """Process every matching file in a directory across a process pool."""
+        input_dir = Path(input_dir)
+        output_dir = Path(output_dir or input_dir)
+        paths = sorted(input_dir.glob(pattern))
+        if not paths:
+            return []
+
+        jobs = [(self.options, path, output_dir / path.relative_to(input_dir)) for path in paths]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_process_job, jobs))
+
+    def _gain_db(self, peaks: np.ndarray, mean_squares: np.ndarray, sample_rate: int, channels: int) -> float:
+        """Gain that reaches the normalization target without exceeding the peak ceiling."""
+        opts = self.options
+        if opts.normalize is None or not len(peaks) or peaks.max() == 0:
+            return 0.0
+
+        peak_db = _db(float(peaks.max()))
+        if opts.normalize == "peak":
+            return opts.target_db - peak_db
+        if opts.normalize == "rms":
+            level = 10.0 * np.log10(max(float(mean_squares.mean()), 1e-24))
+        else:
+            level = approximate_lufs(mean_squares, sample_rate, channels)
+        return min(opts.target_db - level, opts.max_peak_db - peak_db)
+
+
+def _apply_fades(chunk: np.ndarray, position: int, length: int, fade: int) -> None:
+    """Apply linear fade in/out in place to a chunk at ``position`` of ``length``."""
+    frames = np.arange(position, position + len(chunk))
+    ramp = np.minimum(np.minimum(frames, length - 1 - frames) / fade, 1.0)
+    chunk *= ramp.astype(np.float32)[:, None]
+
+
+def _process_job(job: tuple[ProcessingOptions, Path, Path]) -> ProcessingResult:
+    """Process-pool entry point."""
+    options, input_path, output_path = job
+    return AudioProcessor(options).process_file(input_path, output_path)
+
+
+def results_manifest(results: list[ProcessingResult]) -> list[dict]:
+    """Plain-dict form of processing results for JSON manifests."""
+    return [asdict(result) for result in results]
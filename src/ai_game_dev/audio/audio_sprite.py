@@ -0,0 +1,293 @@
+"""
+Audio sprites for web builds.
+
+Short clips are normalized to one sample rate and channel count, joined
+with silence guards into a single compressed file, and described by an
+offset/duration map. Browsers then fetch and decode one file instead of
+one per sound; the pygame helper slices it back into Sound objects.
+"""
+
+import json
+import wave
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from ai_game_dev.audio.sfx_synth import pcm16
+
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+
+SPRITE_SAMPLE_RATE = 44100
+SPRITE_GAP_SECONDS = 0.1
+MAX_SPRITE_CLIP_SECONDS = 10.0
+SPRITE_CLIP_EXTENSIONS = (".wav", ".ogg", ".flac")
+
+PYGAME_SPRITE_PLAYER = '''"""
+Audio sprite playback for pygame and pygbag builds.
+
+Usage:
+    sounds = AudioSprite("assets/audio/sfx.json")
+    sounds.play("jump")
+"""
+import json
+import os
+
+import pygame
+
+
+class AudioSprite:
+    """Slices one audio sprite file into named pygame Sounds."""
+
+    def __init__(self, map_path):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+        with open(map_path) as f:
+            sprite_map = json.load(f)
+
+        base_dir = os.path.dirname(map_path)
+        sheet = pygame.mixer.Sound(os.path.join(base_dir, sprite_map["src"][0]))
+        raw = sheet.get_raw()
+
+        frequency, size, channels = pygame.mixer.get_init()
+        frame_bytes = abs(size) // 8 * channels
+
+        self.sounds = {}
+        for name, (start_ms, duration_ms) in sprite_map["sprite"].items():
+            start = int(start_ms * frequency / 1000) * frame_bytes
+            end = start + int(duration_ms * frequency / 1000) * frame_bytes
+            self.sounds[name] = pygame.mixer.Sound(buffer=raw[start:end])
+
+    def get(self, name):
+        return self.sounds[name]
+
+    def play(self, name, loops=0, volume=None):
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        if volume is not None:
+            sound.set_volume(volume)
+        return sound.play(loops=loops)
+
+    def names(self):
+        return list(self.sounds)
+'''
+
+
+@dataclass
+class AudioSprite:
+    """A packed audio sprite and its clip map (seconds)."""
+    path: Path
+    sample_rate: int
+    channels: int
+    sprites: dict[str, dict[str, float]] = field(default_factory=dict)
+    sources: dict[str, Path] = field(default_factory=dict)
+
+    def to_map(self) -> dict:
+        """Howler.js-compatible sprite map with millisecond offsets."""
+        return {
+            "src": [self.path.name],
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "sprite": {
+                name: [round(clip["start"] * 1000, 3), round(clip["duration"] * 1000, 3)]
+                for name, clip in self.sprites.items()
+            },
+        }
+
+    def save_map(self, map_path: Path | None = None) -> Path:
+        """Write the sprite map JSON next to the audio file."""
+        map_path = map_path or self.path.with_suffix(".json")
+        map_path.write_text(json.dumps(self.to_map(), indent=2))
+        return map_path
+
+
+def read_audio(path: Path) -> tuple[np.ndarray, int]:
+    """Read an audio file as float32 ``(frames, channels)`` and its sample rate."""
+    path = Path(path)
+    if path.suffix.lower() != ".wav":
+        if not SOUNDFILE_AVAILABLE:
+            raise ValueError(f"Reading {path.suffix} files requires soundfile: {path}")
+        samples, sample_rate = soundfile.read(str(path), dtype="float32", always_2d=True)
+        return samples, sample_rate
+
+    with wave.open(str(path), "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        sample_rate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, np.uint8).astype(np.float32) - 128) / 128
+    elif width == 3:
+        bytes_ = np.frombuffer(raw, np.uint8).reshape(-1, 3)
+        ints = (bytes_[:, 0].astype(np.int32) | (bytes_[:, 1].astype(np.int32) << 8)
+                | (bytes_[:, 2].astype(np.int32) << 16))
+        samples = (np.where(ints >= 1 << 23, ints - (1 << 24), ints) / float(1 << 23)).astype(np.float32)
+    else:
+        dtype = {2: "<i2", 4: "<i4"}[width]
+        samples = np.frombuffer(raw, dtype).astype(np.float32) / float(2 ** (8 * width - 1))
+
+    return samples.reshape(-1, channels), sample_rate
+
+
+def normalize_format(
+    samples: np.ndarray,
+    sample_rate: int,
+    target_rate: int,
+    target_channels: int
+) -> np.ndarray:
+    """Resample (linear) and up/down-mix to the target format."""
+    if samples.shape[1] != target_channels:
+        mono = samples.mean(axis=1, keepdims=True)
+        samples = np.repeat(mono, target_channels, axis=1)
+
+    if sample_rate != target_rate and len(samples):
+        length = max(int(round(len(samples) * target_rate / sample_rate)), 1)
+        source_times = np.arange(len(samples)) / sample_rate
+        target_times = np.arange(length) / target_rate
+        samples = np.column_stack([
+            np.interp(target_times, source_times, samples[:, ch]) for ch in range(target_channels)
+        ]).astype(np.float32)
+
+    return samples
+
+
+def build_audio_sprite(
+    clips: dict[str, Path],
+    output_path: Path,
+    sample_rate: int = SPRITE_SAMPLE_RATE,
+    channels: int = 1,
+    gap_seconds: float = SPRITE_GAP_SECONDS
+) -> AudioSprite:
+    """Pack named clips into one audio file and write its sprite map.
+
+    The file is OGG Vorbis when soundfile is installed, otherwise WAV.
+    """
+    output_path = Path(output_path)
+    if not SOUNDFILE_AVAILABLE:
+        output_path = output_path.with_suffix(".wav")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    gap = np.zeros((int(gap_seconds * sample_rate), channels), dtype=np.float32)
+    sprite = AudioSprite(path=output_path, sample_rate=sample_rate, channels=channels)
+    parts = []
+    cursor = 0
+
+    for name, clip_path in clips.items():
+        samples, clip_rate = read_audio(clip_path)
+        samples = normalize_format(samples, clip_rate, sample_rate, channels)
+        sprite.sprites[name] = {"start": cursor / sample_rate, "duration": len(samples) / sample_rate}
+        sprite.sources[name] = Path(clip_path)
+        parts.extend([samples, gap])
+        cursor += len(samples) + len(gap)
+
+    data = np.concatenate(parts) if parts else np.zeros((0, channels), dtype=np.float32)
+
+    if output_path.suffix == ".wav":
+        with wave.open(str(output_path), "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm16(data).tobytes())
+    else:
+        soundfile.write(str(output_path), data, sample_rate)
+
+    sprite.save_map()
+    return sprite
+
+
+def collect_sprite_clips(
+    audio_dir: Path,
+    max_duration: float = MAX_SPRITE_CLIP_SECONDS
+) -> dict[str, Path]:
+    """Find short clips in a directory that are worth packing.
+
+    Longer files (music, ambience) are left alone so they can stream, and
+    so are clips sharing a name (``jump.wav`` and ``jump.ogg``), since the
+    sprite map addresses clips by name alone.
+    """
+    candidates = [
+        path for path in sorted(Path(audio_dir).iterdir())
+        if path.suffix.lower() in SPRITE_CLIP_EXTENSIONS and path.is_file()
+    ]
+    stems = Counter(path.stem for path in candidates)
+    clips = {}
+    for path in candidates:
+        if stems[path.stem] > 1:
+            continue
+        try:
+            samples, sample_rate = read_audio(path)
+        except (ValueError, wave.Error, EOFError):
+            continue
+        if len(samples) / sample_rate <= max_duration:
+            clips[path.stem] = path
+    return clips
+
+
+def pack_audio_directory(
+    audio_dir: Path,
+    output_dir: Path | None = None,
+    name: str = "sfx",
+    **kwargs
+) -> AudioSprite | None:
+    """Pack the short clips of a directory into ``<name>.ogg``/``<name>.json``.
+
+    Returns None when fewer than two clips are found.
+    """
+    audio_dir = Path(audio_dir)
+    clips = collect_sprite_clips(audio_dir)
+    clips.pop(name, None)  # A previous sprite of the same name is not a clip
+    if len(clips) < 2:
+        return None
+    return build_audio_sprite(clips, Path(output_dir or audio_dir) / f"{name}.ogg", **kwargs)
+
+
+def pack_web_audio(
+    project_dir: Path,
+    name: str = "audio_sprite",
+    strip_packed: bool = False
+) -> list[AudioSprite]:
+    """Pack every audio directory of a web build into sprites.
+
+    Each directory with two or more short clips gets ``<name>.ogg`` and
+    ``<name>.json``, and the pygame helper is written to the project root.
+    Packed clips are kept unless ``strip_packed`` is true; only strip them
+    for games that load every sound through ``audio_sprites``. This
+    rewrites the directory, so point it at a build copy, never the source
+    project.
+    """
+    project_dir = Path(project_dir)
+    audio_dirs = sorted({
+        path.parent for ext in SPRITE_CLIP_EXTENSIONS for path in project_dir.rglob(f"*{ext}")
+    })
+
+    sprites = [
+        sprite for sprite in (pack_audio_directory(d, name=name) for d in audio_dirs) if sprite
+    ]
+    if not sprites:
+        return []
+
+    write_pygame_player(project_dir)
+    if strip_packed:
+        for sprite in sprites:
+            for packed in sprite.sources.values():
+                if packed != sprite.path:
+                    packed.unlink(missing_ok=True)
+
+    return sprites
+
+
+def write_pygame_player(output_dir: Path) -> Path:
+    """Write the pygame ``audio_sprites.py`` playback helper."""
+    output_path = Path(output_dir) / "audio_sprites.py"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(PYGAME_SPRITE_PLAYER)
+    return output_path
@@ -2,16 +2,77 @@
 Unified audio tools integrating TTS, music generation, and sound effects.
 Provides LangGraph structured tools for complete audio workflow.
 """
+import asyncio
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
 from typing import Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
+from ai_game_dev.keywords import find_keywords, register_keywords
 from ai_game_dev.audio.tts_generator import TTSGenerator
 from ai_game_dev.audio.music_generator import MusicGenerator
 from ai_game_dev.audio.freesound_client import FreesoundClient
 
+logger = logging.getLogger(__name__)
+
+# Soundtrack theme used for each detected game context
+CONTEXT_THEMES = {
+    "gameplay": "gameplay",
+    "exploration": "gameplay",
+    "battle": "combat",
+    "menu": "menu",
+}
+DIALOGUE_VOICES = ["onyx", "fable", "nova", "echo", "shimmer"]
+NARRATOR_VOICE = "alloy"
+
+# Description keywords per detected value; the first matching entry wins
+GENRE_KEYWORDS = {
+    "fantasy": ["fantasy", "magic", "medieval", "dragon"],
+    "sci-fi": ["sci-fi", "space", "robot", "cyber", "future"],
+    "horror": ["horror", "scary", "dark", "zombie"],
+    "retro": ["retro", "pixel", "8bit", "arcade"],
+}
+MOOD_KEYWORDS = {
+    "intense": ["action", "battle", "fight", "combat"],
+    "heroic": ["adventure", "hero", "quest"],
+    "mysterious": ["mystery", "puzzle", "hidden"],
+    "victorious": ["victory", "win", "success"],
+}
+CONTEXT_KEYWORDS = {
+    "menu": ["menu", "ui", "interface"],
+    "battle": ["battle", "combat", "fight"],
+    "exploration": ["explore", "world", "environment"],
+}
+# Extra sound effects for keywords in the description
+SFX_KEYWORDS = {
+    ("explosion", "hurt"): ["battle", "fight", "combat"],
+    ("footstep", "ambient"): ["explore", "adventure"],
+    ("door",): ["door", "open", "enter"],
+}
+register_keywords(GENRE_KEYWORDS, MOOD_KEYWORDS, CONTEXT_KEYWORDS, SFX_KEYWORDS)
+
+
+_music_pool: ProcessPoolExecutor | None = None
+
+
+def get_music_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool that renders soundtrack themes."""
+    global _music_pool
+    if _music_pool is None:
+        _music_pool = ProcessPoolExecutor(max_workers=2)
+    return _music_pool
+
+
+def _first_match(hits: frozenset[str], groups: dict[str, list[str]], default: str) -> str:
+    """First label in ``groups`` with a keyword among ``hits``."""
+    return next((label for label, keywords in groups.items() if not hits.isdisjoint(keywords)), default)
+
 
 class AudioWorkflowRequest(BaseModel):
     """Request for complete audio workflow."""
@@ -28,6 +89,7 @@ class AudioWorkflowResult:
     background_music: dict[str, Any]
     sound_effects: list[dict[str, Any]]
     audio_pack_summary: str
+    manifest: dict[str, Any] = field(default_factory=dict)
 
 
 class AudioTools:
@@ -43,114 +105,133 @@ class AudioTools:
         game_description: str,
         audio_needs: list[str],
         style_preferences: str = "",
-        target_duration: int = 120
+        target_duration: int = 120,
+        output_dir: Path | None = None,
+        parallel: bool = True
     ) -> AudioWorkflowResult:
-        """Generate a complete audio pack for a game."""
+        """Generate a complete audio pack for a game.
+        
+        With ``parallel`` the dialogue, music and sound-effect packs run
+        concurrently: TTS and Freesound requests share the event loop while
+        music composition and rendering run in a process pool. The result
+        manifest records how long each pack and music track took.
+        """
+        
+        if output_dir is None:
+            output_dir = Path("audio_pack")
+        started = time.perf_counter()
         
         # Analyze game description for audio context
         audio_context = self._analyze_audio_context(game_description, style_preferences)
         
-        # Generate dialogue if needed
-        dialogue_audio = {}
+        packs = {}
         if "dialogue" in audio_needs or "narration" in audio_needs:
-            dialogue_audio = await self._generate_dialogue_pack(game_description, audio_context)
-        
-        # Generate background music
-        background_music = {}
+            packs["dialogue"] = self._generate_dialogue_pack(
+                game_description, audio_context, output_dir / "voices"
+            )
         if "music" in audio_needs or "background" in audio_needs:
-            background_music = await self._generate_music_pack(
-                game_description, audio_context, target_duration
+            packs["music"] = self._generate_music_pack(
+                game_description, audio_context, target_duration, output_dir / "music"
             )
-        
-        # Generate sound effects
-        sound_effects = []
         if "sfx" in audio_needs or "effects" in audio_needs:
-            sound_effects = await self._generate_sfx_pack(game_description, audio_context)
+            packs["sfx"] = self._generate_sfx_pack(game_description, audio_context)
+        
+        if parallel:
+            timed = await asyncio.gather(*(self._timed(pack) for pack in packs.values()))
+        else:
+            timed = [await self._timed(pack) for pack in packs.values()]
+        results = dict(zip(packs, timed))
+        
+        dialogue_audio = results["dialogue"][0] if "dialogue" in results else {}
+        background_music = results["music"][0] if "music" in results else {}
+        sound_effects = results["sfx"][0] if "sfx" in results else []
         
         # Create summary
         summary = self._create_audio_summary(dialogue_audio, background_music, sound_effects)
         
+        manifest = {
+            "parallel": parallel,
+            "total_seconds": time.perf_counter() - started,
+            "packs": {name: elapsed for name, (_, elapsed) in results.items()},
+            "tracks": {
+                name: {
+                    "path": track.get("audio_path") or track.get("midi_path"),
+                    "elapsed_seconds": track.get("elapsed_seconds"),
+                }
+                for name, track in background_music.items()
+            },
+        }
+        
         return AudioWorkflowResult(
             dialogue_audio=dialogue_audio,
             background_music=background_music,
             sound_effects=sound_effects,
-            audio_pack_summary=summary
+            audio_pack_summary=summary,
+            manifest=manifest
         )
     
+    @staticmethod
+    async def _timed(coroutine) -> tuple[Any, float]:
+        """Await a coroutine and return its result with elapsed seconds."""
+        started = time.perf_counter()
+        result = await coroutine
+        return result, time.perf_counter() - started
+    
     def _analyze_audio_context(self, game_description: str, style_preferences: str) -> dict[str, Any]:
         """Analyze game description to determine audio context."""
         
-        desc_lower = game_description.lower()
-        style_lower = style_preferences.lower()
-        
-        # Determine game genre
-        genre = "modern"
-        if any(word in desc_lower for word in ["fantasy", "magic", "medieval", "dragon"]):
-            genre = "fantasy"
-        elif any(word in desc_lower for word in ["sci-fi", "space", "robot", "cyber", "future"]):
-            genre = "sci-fi"
-        elif any(word in desc_lower for word in ["horror", "scary", "dark", "zombie"]):
-            genre = "horror"
-        elif any(word in desc_lower for word in ["retro", "pixel", "8bit", "arcade"]):
-            genre = "retro"
-        
-        # Determine mood
-        mood = "peaceful"
-        if any(word in desc_lower for word in ["action", "battle", "fight", "combat"]):
-            mood = "intense"
-        elif any(word in desc_lower for word in ["adventure", "hero", "quest"]):
-            mood = "heroic"
-        elif any(word in desc_lower for word in ["mystery", "puzzle", "hidden"]):
-            mood = "mysterious"
-        elif any(word in desc_lower for word in ["victory", "win", "success"]):
-            mood = "victorious"
-        
-        # Determine game context
-        context = "gameplay"
-        if any(word in desc_lower for word in ["menu", "ui", "interface"]):
-            context = "menu"
-        elif any(word in desc_lower for word in ["battle", "combat", "fight"]):
-            context = "battle"
-        elif any(word in desc_lower for word in ["explore", "world", "environment"]):
-            context = "exploration"
+        hits = find_keywords(game_description)
         
         return {
-            "genre": genre,
-            "mood": mood,
-            "context": context,
+            "genre": _first_match(hits, GENRE_KEYWORDS, "modern"),
+            "mood": _first_match(hits, MOOD_KEYWORDS, "peaceful"),
+            "context": _first_match(hits, CONTEXT_KEYWORDS, "gameplay"),
             "style_preferences": style_preferences
         }
     
     async def _generate_dialogue_pack(
         self,
         game_description: str,
-        audio_context: dict[str, Any]
+        audio_context: dict[str, Any],
+        output_dir: Path
     ) -> dict[str, Any]:
         """Generate dialogue and narration audio."""
         
         # Generate sample dialogue based on game type
         dialogue_lines = self._create_sample_dialogue(game_description, audio_context)
+        characters = list(dict.fromkeys(line["character"] for line in dialogue_lines))
+        voices = {
+            character: DIALOGUE_VOICES[i % len(DIALOGUE_VOICES)]
+            for i, character in enumerate(characters)
+        }
         
-        # Generate TTS for dialogue
-        tts_results = await self.tts_generator.generate_dialogue_set(dialogue_lines)
-        
-        # Generate narration
+        # Dialogue lines and narration are synthesized concurrently
         narration_text = f"Welcome to {game_description.split('.')[0]}. Your adventure begins now."
-        narration_result = await self.tts_generator.generate_narration(narration_text)
+        dialogue_paths, narration_path = await asyncio.gather(
+            self.tts_generator.generate_speech_batch(
+                [(line["text"], voices[line["character"]]) for line in dialogue_lines],
+                output_dir=output_dir / "dialogue"
+            ),
+            self.tts_generator.generate_speech(
+                narration_text,
+                voice=NARRATOR_VOICE,
+                output_path=output_dir / "narration.mp3"
+            )
+        )
         
         return {
             "dialogue": [
                 {
-                    "character": result.character_context,
-                    "text": result.text,
-                    "audio_path": result.audio_path,
-                    "voice": result.voice
-                } for result in tts_results
+                    "character": line["character"],
+                    "text": line["text"],
+                    "audio_path": str(path),
+                    "voice": voices[line["character"]]
+                } for line, path in zip(dialogue_lines, dialogue_paths)
             ],
             "narration": {
-                "text": narration_result.text,
-                "audio_path": narration_result.audio_path,
-                "voice": narration_result.voice
+                "text": narration_text,
+                "audio_path": str(narration_path),
+                "voice": NARRATOR_VOICE
             }
         }
     
@@ -193,44 +274,43 @@ class AudioTools:
         self,
         game_description: str,
         audio_context: dict[str, Any],
-        target_duration: int
+        target_duration: int,
+        output_dir: Path
     ) -> dict[str, Any]:
-        """Generate background music pack."""
+        """Generate background music pack in the shared process pool.
+        
+        The pool outlives the call, so the event loop never blocks on
+        shutting workers down.
+        """
+        global _music_pool
         
         mood = audio_context["mood"]
         context = audio_context["context"]
-        
-        # Generate main theme
-        main_theme = await self.music_generator.generate_music(
-            mood=mood,
-            context=context,
-            duration_seconds=target_duration,
-            loop_compatible=True
-        )
-        
-        # Generate additional tracks for different contexts
-        menu_music = await self.music_generator.generate_music(
-            mood="peaceful",
-            context="menu",
-            duration_seconds=60,
-            loop_compatible=True
-        )
+        main_theme = CONTEXT_THEMES.get(context, "gameplay")
+        executor = get_music_pool()
+        
+        # Main theme follows the target duration; the menu loop stays short
+        try:
+            main, menu = await asyncio.gather(
+                self.music_generator.generate_game_soundtrack_parallel(
+                    [main_theme],
+                    output_dir=output_dir,
+                    duration_minutes=max(1, round(target_duration / 60)),
+                    executor=executor
+                ),
+                self.music_generator.generate_game_soundtrack_parallel(
+                    ["menu"], output_dir=output_dir / "menu", executor=executor
+                )
+            )
+        except BrokenProcessPool:
+            # A dead worker poisons the pool; start a fresh one next time
+            if _music_pool is executor:
+                _music_pool = None
+            raise
         
         return {
-            "main_theme": {
-                "midi_path": main_theme.midi_path,
-                "mood": main_theme.mood,
-                "context": main_theme.context,
-                "duration_seconds": main_theme.duration_seconds,
-                "tempo_bpm": main_theme.tempo_bpm
-            },
-            "menu_music": {
-                "midi_path": menu_music.midi_path,
-                "mood": menu_music.mood,
-                "context": menu_music.context,
-                "duration_seconds": menu_music.duration_seconds,
-                "tempo_bpm": menu_music.tempo_bpm
-            }
+            "main_theme": {**main[main_theme], "mood": mood, "context": context},
+            "menu_music": {**menu["menu"], "mood": "peaceful", "context": "menu"},
         }
     
     async def _generate_sfx_pack(
@@ -247,28 +327,32 @@ class AudioTools:
         
         sound_effects = []
         
-        # If Freesound client is available, search for effects
+        # If Freesound client is available, search for all effects concurrently
         if self.freesound_client:
-            for sfx_type in sfx_needs:
-                try:
-                    sounds = await self.freesound_client.search_game_sounds(
-                        sound_type=sfx_type,
-                        game_genre=genre,
-                        max_results=3
-                    )
-                    
-                    for sound in sounds:
-                        sound_effects.append({
-                            "type": sfx_type,
-                            "name": sound.name,
-                            "description": sound.description,
-                            "download_url": sound.download_url,
-                            "preview_url": sound.preview_url,
-                            "license": sound.license,
-                            "duration": sound.duration
-                        })
-                except Exception as e:
-                    print(f"Error searching for {sfx_type}: {e}")
+            searches = await asyncio.gather(*(
+                self.freesound_client.search_game_sounds(
+                    sound_type=sfx_type,
+                    game_genre=genre,
+                    max_results=3
+                )
+                for sfx_type in sfx_needs
+            ), return_exceptions=True)
+            
+            for sfx_type, sounds in zip(sfx_needs, searches):
+                if isinstance(sounds, Exception):
+                    logger.warning("Error searching for %s: %s", sfx_type, sounds)
+                    continue
+                
+                for sound in sounds:
+                    sound_effects.append({
+                        "type": sfx_type,
+                        "name": sound.name,
+                        "description": sound.description,
+                        "download_url": sound.download_url,
+                        "preview_url": sound.preview_url,
+                        "license": sound.license,
+                        "duration": sound.duration
+                    })
         
         # If no Freesound client or no results, provide placeholders
         if not sound_effects:
@@ -288,7 +372,7 @@ class AudioTools:
     def _analyze_sfx_needs(self, game_description: str, genre: str) -> list[str]:
         """Analyze game description to determine needed sound effects."""
         
-        desc_lower = game_description.lower()
+        hits = find_keywords(game_description)
         base_sfx = ["button", "coin", "jump"]
         
         # Add genre-specific effects
@@ -300,14 +384,9 @@ class AudioTools:
             base_sfx.extend(["powerup", "explosion", "victory"])
         
         # Add context-specific effects based on description
-        if any(word in desc_lower for word in ["battle", "fight", "combat"]):
-            base_sfx.extend(["explosion", "hurt"])
-        
-        if any(word in desc_lower for word in ["explore", "adventure"]):
-            base_sfx.extend(["footstep", "ambient"])
-        
-        if any(word in desc_lower for word in ["door", "open", "enter"]):
-            base_sfx.append("door")
+        for effects, keywords in SFX_KEYWORDS.items():
+            if not hits.isdisjoint(keywords):
+                base_sfx.extend(effects)
         
         return list(set(base_sfx))  # Remove duplicates
     
@@ -1,29 +1,231 @@
 """
 Freesound API client for downloading CC-licensed audio assets.
+
+Searches are cached on disk keyed by query, filter and license, downloads
+stream to disk through one pooled session, and downloaded sounds are kept
+in a local sound library that is consulted before the API.
 """
 
 import asyncio
 import aiohttp
-from pathlib import Path
+import hashlib
+import json
+import re
+import shutil
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
 from typing import Any
+from urllib.parse import urlparse
+
+from xdg_base_dirs import xdg_cache_home
+
+
+FREESOUND_CACHE_DIR = xdg_cache_home() / "ai-game-dev" / "freesound"
+SEARCH_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+MAX_CONCURRENT_DOWNLOADS = 4
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+SEARCH_FIELDS = "id,name,url,description,license,duration,download,previews,tags,type"
+SOUND_FILE_TYPES = frozenset({"wav", "aiff", "aif", "flac", "mp3", "ogg", "m4a"})
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+def _sound_suffix(sound: dict[str, Any]) -> str:
+    """File extension of a sound's original upload, from its ``type`` field."""
+    file_type = str(sound.get("type", "")).lower()
+    return f".{file_type}" if file_type in SOUND_FILE_TYPES else ""
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON next to the target and swap it in."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data))
+    tmp_path.replace(path)
+
+
+@dataclass
+class FreesoundSound:
+    """A Freesound search result."""
+    id: int
+    name: str
+    description: str
+    download_url: str | None
+    preview_url: str | None
+    license: str
+    duration: float
+
+    @classmethod
+    def from_result(cls, result: dict[str, Any]) -> "FreesoundSound":
+        previews = result.get("previews") or {}
+        return cls(
+            id=result["id"],
+            name=result.get("name", str(result["id"])),
+            description=result.get("description", ""),
+            download_url=result.get("download"),
+            preview_url=previews.get("preview-hq-mp3") or previews.get("preview-lq-mp3"),
+            license=result.get("license", ""),
+            duration=float(result.get("duration", 0.0)),
+        )
+
+
+_shared_clients: dict[str | None, "FreesoundClient"] = {}
+
+
+def shared_freesound_client(api_key: str | None = None) -> "FreesoundClient":
+    """Return a process-wide client per API key so tools share one session."""
+    if api_key not in _shared_clients:
+        _shared_clients[api_key] = FreesoundClient(api_key=api_key)
+    return _shared_clients[api_key]
+
+
+class SoundLibrary:
+    """Local index of downloaded sounds, searched before the API.
+
+    The index is a JSON file mapping sound ids to metadata and the local
+    file path; lookups match query words against names, tags and the
+    queries that originally found each sound.
+    """
+
+    def __init__(self, root: Path | None = None):
+        self.root = root or FREESOUND_CACHE_DIR / "library"
+        self.index_path = self.root / "index.json"
+        self._entries: dict[str, dict[str, Any]] | None = None
+
+    @property
+    def entries(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.index_path.read_text())
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def path_for(self, sound_id: int, suffix: str = "") -> Path:
+        """Library file location for a sound id (``suffix`` is the file's real extension)."""
+        return self.root / "sounds" / f"{sound_id}{suffix}"
+
+    def get(self, sound_id: int) -> dict[str, Any] | None:
+        """Return the entry for a sound if its file is still present."""
+        entry = self.entries.get(str(sound_id))
+        if entry and Path(entry["path"]).exists():
+            return entry
+        return None
+
+    def find(self, query: str, duration_max: float | None = None) -> dict[str, Any] | None:
+        """Return the best local match for a query, if any."""
+        wanted = _words(query)
+        best, best_score = None, 0
+        for entry in self.entries.values():
+            if duration_max is not None and entry.get("duration", 0.0) > duration_max:
+                continue
+            if not Path(entry["path"]).exists():
+                continue
+            known = _words(" ".join([entry.get("name", ""), *entry.get("tags", []), *entry.get("queries", [])]))
+            score = len(wanted & known)
+            if score > best_score:
+                best, best_score = entry, score
+        # Require every query word for multi-word queries, or the single word
+        return best if best_score >= len(wanted) else None
+
+    def add(self, sound: dict[str, Any], path: Path, query: str | None = None) -> dict[str, Any]:
+        """Record a downloaded sound and persist the index."""
+        key = str(sound["id"])
+        entry = self.entries.get(key, {
+            "id": sound["id"],
+            "name": sound.get("name", key),
+            "tags": sound.get("tags", []),
+            "license": sound.get("license", ""),
+            "duration": float(sound.get("duration", 0.0)),
+            "queries": [],
+        })
+        entry["path"] = str(path)
+        if query and query not in entry["queries"]:
+            entry["queries"].append(query)
+        self.entries[key] = entry
+        _write_json_atomic(self.index_path, self.entries)
+        return entry
 
 
 class FreesoundClient:
-    """Client for accessing Freesound.org API."""
-    
-    def __init__(self, api_key: str | None = None):
+    """Client for accessing Freesound.org API.
+
+    One aiohttp session (with a bounded connection pool) per event loop is
+    reused for all requests until ``close``; the client can be used with or
+    without ``async with``.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache_dir: Path | None = None,
+        cache_ttl: float = SEARCH_CACHE_TTL_SECONDS,
+        max_concurrent_downloads: int = MAX_CONCURRENT_DOWNLOADS
+    ):
         self.api_key = api_key
         self.base_url = "https://freesound.org/apiv2"
         self.session = None
-    
+        self.cache_dir = cache_dir or FREESOUND_CACHE_DIR
+        self.cache_ttl = cache_ttl
+        self.library = SoundLibrary(self.cache_dir / "library")
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self._download_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Sessions this client created, one per event loop. Not weak: a
+        # session references its loop, so the key would never be collected.
+        self._sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self._get_session()
         return self
-    
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    
+        await self.close()
+
+    async def close(self):
+        """Close the session this client created for the running loop.
+
+        Sessions left on loops that have since closed are detached.
+        Sessions on loops still running elsewhere are left for those loops
+        to close.
+        """
+        self._drop_dead_sessions()
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return a session given to the client, or the pooled session for the running loop."""
+        if self.session is not None and not self.session.closed:
+            return self.session
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            self._drop_dead_sessions()
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_DOWNLOADS * 2)
+            )
+        return session
+
+    def _drop_dead_sessions(self) -> None:
+        """Forget sessions whose loop has closed; nothing can run their close, so detach the connector."""
+        for loop, session in list(self._sessions.items()):
+            if loop.is_closed():
+                if self._sessions.pop(loop, None) is session:
+                    session.detach()
+
+    def _slots(self) -> asyncio.Semaphore:
+        """Download slots for the running loop (a Semaphore is bound to one loop)."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._download_slots:
+            self._download_slots[loop] = asyncio.Semaphore(self.max_concurrent_downloads)
+        return self._download_slots[loop]
+
     async def search_sounds(
         self,
         query: str,
@@ -31,114 +233,194 @@ class FreesoundClient:
         duration_max: float = 10.0,
         limit: int = 10
     ) -> list[dict[str, Any]]:
-        """Search for sounds with specified criteria."""
-        
-        if not self.session:
-            raise RuntimeError("Client not initialized. Use 'async with' context manager.")
-        
+        """Search for sounds with specified criteria.
+
+        Results are cached on disk per (query, filter, license, limit).
+        """
+
+        search_filter = f'duration:[0 TO {duration_max}] license:"{license}"'
+        cache_path = self._search_cache_path(query, search_filter, license, limit)
+        cached = self._read_search_cache(cache_path)
+        if cached is not None:
+            return cached
+
         params = {
             "query": query,
-            "license": license,
-            "duration": f"[0 TO {duration_max}]",
-            "fields": "id,name,url,description,license,duration,download",
+            "filter": search_filter,
+            "fields": SEARCH_FIELDS,
             "page_size": limit
         }
-        
+
         if self.api_key:
             params["token"] = self.api_key
-        
-        async with self.session.get(f"{self.base_url}/search/text/", params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                return data.get("results", [])
-            else:
+
+        async with self._get_session().get(f"{self.base_url}/search/text/", params=params) as response:
+            if response.status != 200:
                 return []
-    
+            data = await response.json()
+
+        results = data.get("results", [])
+        _write_json_atomic(cache_path, {"fetched_at": time.time(), "results": results})
+        return results
+
+    async def search_game_sounds(
+        self,
+        sound_type: str,
+        game_genre: str = "",
+        max_results: int = 5
+    ) -> list[FreesoundSound]:
+        """Search for a game sound effect, adding the genre as context."""
+        query = f"{sound_type} {game_genre}".strip() if game_genre else sound_type
+        results = await self.search_sounds(query, limit=max_results)
+        if not results and game_genre:
+            results = await self.search_sounds(sound_type, limit=max_results)
+        return [FreesoundSound.from_result(result) for result in results]
+
     async def download_sound(
         self,
         sound_id: int,
-        output_path: Path,
-        quality: str = "mp3-hq"
+        output_path: Path
     ) -> Path | None:
-        """Download a sound file."""
-        
+        """Download a sound's original file, streaming it to disk in chunks.
+
+        If ``output_path`` has no extension, the one in the download URL is
+        used. Returns the path written.
+        """
+
         if not self.api_key:
             raise ValueError("API key required for downloading sounds")
-        
-        if not self.session:
-            raise RuntimeError("Client not initialized. Use 'async with' context manager.")
-        
+
+        session = self._get_session()
+
         # Get download URL
         params = {"token": self.api_key}
-        
-        async with self.session.get(
-            f"{self.base_url}/sounds/{sound_id}/download/",
-            params=params,
-            allow_redirects=False
-        ) as response:
-            if response.status == 302:
-                download_url = response.headers.get("Location")
-            else:
+
+        async with self._slots():
+            async with session.get(
+                f"{self.base_url}/sounds/{sound_id}/download/",
+                params=params,
+                allow_redirects=False
+            ) as response:
+                download_url = response.headers.get("Location") if response.status == 302 else None
+            if not download_url:
                 return None
-        
-        # Download the file
-        async with self.session.get(download_url) as response:
-            if response.status == 200:
+
+            if not output_path.suffix:
+                output_path = output_path.with_suffix(PurePosixPath(urlparse(download_url).path).suffix)
+
+            # Download the file
+            async with session.get(download_url) as response:
+                if response.status != 200:
+                    return None
+
                 output_path.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(output_path, 'wb') as f:
-                    async for chunk in response.content.iter_chunked(8192):
+                tmp_path = output_path.with_name(f"{output_path.name}.part")
+                with open(tmp_path, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
                         f.write(chunk)
-                
-                return output_path
-        
+                tmp_path.replace(output_path)
+
+        return output_path
+
+    async def find_sound(
+        self,
+        query: str,
+        duration_max: float = 10.0
+    ) -> dict[str, Any] | None:
+        """Return a library entry for a query, downloading it if needed.
+
+        The local library is checked first; without an API key only the
+        library is searched.
+        """
+
+        entry = self.library.find(query, duration_max)
+        if entry or not self.api_key:
+            return entry
+
+        for sound in await self.search_sounds(query, duration_max=duration_max, limit=3):
+            existing = self.library.get(sound["id"])
+            if existing:
+                return self.library.add(sound, Path(existing["path"]), query)
+
+            path = await self.download_sound(sound["id"], self.library.path_for(sound["id"], _sound_suffix(sound)))
+            if path:
+                return self.library.add(sound, path, query)
+
         return None
-    
+
+    async def fetch_sounds(
+        self,
+        queries: list[str],
+        duration_max: float = 10.0
+    ) -> dict[str, dict[str, Any] | None]:
+        """Resolve several queries concurrently; downloads share the pool."""
+
+        results = await asyncio.gather(
+            *(self.find_sound(query, duration_max) for query in queries),
+            return_exceptions=True
+        )
+        return {
+            query: None if isinstance(result, Exception) else result
+            for query, result in zip(queries, results)
+        }
+
     async def get_game_audio_pack(
         self,
         categories: list[str],
         output_dir: Path | None = None
     ) -> dict[str, list[Path]]:
         """Download a curated pack of game audio assets."""
-        
+
         if output_dir is None:
             output_dir = Path("game_audio_pack")
         output_dir.mkdir(exist_ok=True)
-        
-        audio_pack = {}
-        
+
         category_queries = {
             "ui": ["button click", "menu beep", "notification", "error sound"],
             "ambient": ["forest ambient", "wind", "water", "cave ambient"],
             "effects": ["explosion", "laser", "magic spell", "footstep"],
             "music": ["8bit music", "chiptune", "game music loop"]
         }
-        
+
+        categories = [category for category in categories if category in category_queries]
+        queries = [query for category in categories for query in category_queries[category]]
+        entries = await self.fetch_sounds(queries)
+
+        audio_pack = {}
+
         for category in categories:
-            if category not in category_queries:
-                continue
-            
             category_dir = output_dir / category
             category_dir.mkdir(exist_ok=True)
-            
+
             category_files = []
-            
+
             for query in category_queries[category]:
-                sounds = await self.search_sounds(query, limit=2)
-                
-                for sound in sounds:
-                    sound_id = sound.get("id")
-                    if sound_id:
-                        filename = f"{sound.get('name', sound_id)}.mp3"
-                        # Clean filename
-                        filename = "".join(c for c in filename if c.isalnum() or c in "._- ")
-                        
-                        output_path = category_dir / filename
-                        downloaded_path = await self.download_sound(sound_id, output_path)
-                        
-                        if downloaded_path:
-                            category_files.append(downloaded_path)
-            
+                entry = entries.get(query)
+                if not entry:
+                    continue
+
+                source = Path(entry["path"])
+                filename = f"{entry['name']}{source.suffix}"
+                # Clean filename
+                filename = "".join(c for c in filename if c.isalnum() or c in "._- ")
+
+                output_path = category_dir / filename
+                await asyncio.to_thread(shutil.copyfile, source, output_path)
+                category_files.append(output_path)
+
             audio_pack[category] = category_files
-        
-        return audio_pack
\ No newline at end of file
+
+        return audio_pack
+
+    def _search_cache_path(self, query: str, search_filter: str, license: str, limit: int) -> Path:
+        key = hashlib.sha256(f"{query}\0{search_filter}\0{license}\0{limit}".encode("utf-8")).hexdigest()
+        return self.cache_dir / "search" / f"{key}.json"
+
+    def _read_search_cache(self, cache_path: Path) -> list[dict[str, Any]] | None:
+        try:
+            cached = json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if time.time() - cached.get("fetched_at", 0) > self.cache_ttl:
+            return None
+        return cached["results"]
@@ -1,112 +1,307 @@
 """
-Procedural music generation using music21 library.
+Procedural music generation on compact note-event arrays.
 """
 
+import asyncio
+import os
+import time
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
 from typing import Literal
-import random
-from music21 import stream, note, chord, meter, tempo, key, duration, scale
+
+import numpy as np
+
+from ai_game_dev.audio.midi_renderer import MidiRenderer
+from ai_game_dev.audio.note_events import NoteSequence, scale_pitches
+
+
+# General MIDI programs for instrument names used by the music tools
+INSTRUMENT_PROGRAMS = {
+    "piano": 0,
+    "organ": 16,
+    "guitar": 24,
+    "bass": 33,
+    "strings": 48,
+    "brass": 61,
+    "synth": 80,
+    "lead": 80,
+    "pad": 88,
+}
+DEFAULT_INSTRUMENT_PROGRAM = 27  # Electric guitar
+
+# Soundtrack themes: (generator, default minutes, generator arguments)
+THEME_SPECS = {
+    "menu": ("ambient", 1, {"key_signature": "F major", "tempo_bpm": 60}),
+    "gameplay": ("ambient", 3, {"key_signature": "C major", "tempo_bpm": 100}),
+    "combat": ("action", 2, {"intensity": "high"}),
+    "victory": ("ambient", 1, {"key_signature": "G major", "tempo_bpm": 90}),
+    "defeat": ("ambient", 1, {"key_signature": "D minor", "tempo_bpm": 70}),
+}
+
+
+def theme_seed(seed: int, theme: str) -> int:
+    """Derive a stable per-theme seed from a soundtrack seed."""
+    return zlib.crc32(f"{seed}:{theme}".encode("utf-8"))
 
 
 class MusicGenerator:
-    """Procedural music generator using music21."""
-    
+    """Procedural music generator producing NoteSequence arrays.
+
+    Generators take an optional ``seed``; the same seed always yields the
+    same sequence, so results can be cached and regenerated exactly.
+    """
+
     def __init__(self):
         pass
-    
+
     def generate_ambient_track(
         self,
         duration_minutes: int = 2,
         key_signature: str = "C major",
-        tempo_bpm: int = 80
-    ) -> stream.Stream:
+        tempo_bpm: int = 80,
+        seed: int | None = None
+    ) -> NoteSequence:
         """Generate ambient background music."""
-        
-        score = stream.Stream()
-        score.append(tempo.TempoIndication(number=tempo_bpm))
-        score.append(key.KeySignature(key_signature))
-        score.append(meter.TimeSignature('4/4'))
-        
-        # Generate chord progression
-        root_scale = scale.MajorScale(key_signature.split()[0])
-        chord_notes = [root_scale.pitches[i] for i in [0, 2, 4, 5]]  # I, iii, V, vi
-        
-        measures = duration_minutes * tempo_bpm // 60 * 4  # Approximate measures
-        
-        for measure in range(measures):
-            # Add ambient chord
-            chord_root = random.choice(chord_notes)
-            ambient_chord = chord.Chord([
-                chord_root,
-                chord_root.transpose(4),  # Major third
-                chord_root.transpose(7)   # Perfect fifth
-            ])
-            ambient_chord.duration = duration.Duration(4.0)  # Whole note
-            score.append(ambient_chord)
-        
-        return score
-    
+
+        rng = np.random.default_rng(seed)
+        seconds_per_beat = 60.0 / tempo_bpm
+
+        # Chord roots on I, iii, V, vi with a major third and perfect fifth
+        roots = scale_pitches(key_signature)[[0, 2, 4, 5]]
+        chord_count = max(duration_minutes * tempo_bpm // 4, 1)  # One whole note per chord
+        chord_roots = rng.choice(roots, chord_count)
+
+        pitches = (chord_roots[:, None] + np.array([0, 4, 7])).ravel()
+        onsets = np.repeat(np.arange(chord_count) * 4 * seconds_per_beat, 3)
+
+        return NoteSequence.from_arrays(
+            onset=onsets,
+            duration=4 * seconds_per_beat,
+            pitch=pitches,
+            velocity=70,
+            program=INSTRUMENT_PROGRAMS["pad"],
+            tempo_bpm=tempo_bpm
+        )
+
     def generate_action_music(
         self,
         duration_minutes: int = 1,
-        intensity: Literal["low", "medium", "high"] = "medium"
-    ) -> stream.Stream:
+        intensity: Literal["low", "medium", "high"] = "medium",
+        seed: int | None = None
+    ) -> NoteSequence:
         """Generate action/combat music."""
-        
+
         tempo_map = {"low": 100, "medium": 120, "high": 140}
         tempo_bpm = tempo_map[intensity]
-        
-        score = stream.Stream()
-        score.append(tempo.TempoIndication(number=tempo_bpm))
-        score.append(key.KeySignature("D minor"))  # Dramatic key
-        score.append(meter.TimeSignature('4/4'))
-        
-        root_scale = scale.MinorScale("D")
-        notes_pool = root_scale.pitches[:8]
-        
-        measures = duration_minutes * tempo_bpm // 60 * 4
-        
-        for measure in range(measures):
-            # Create rhythmic pattern
-            for beat in range(4):
-                selected_note = random.choice(notes_pool)
-                n = note.Note(selected_note)
-                n.duration = duration.Duration(0.5 if intensity == "high" else 1.0)
-                score.append(n)
-        
-        return score
-    
-    def export_midi(self, music_stream: stream.Stream, output_path: Path) -> Path:
-        """Export music stream to MIDI file."""
-        music_stream.write('midi', fp=str(output_path))
-        return output_path
-    
+        rng = np.random.default_rng(seed)
+
+        notes_pool = scale_pitches("D minor")  # Dramatic key
+        step_beats = 0.5 if intensity == "high" else 1.0
+        step_count = int(duration_minutes * tempo_bpm / step_beats)
+        step_seconds = step_beats * 60.0 / tempo_bpm
+
+        return NoteSequence.from_arrays(
+            onset=np.arange(step_count) * step_seconds,
+            duration=step_seconds,
+            pitch=rng.choice(notes_pool, step_count),
+            velocity=rng.integers(90, 118, step_count),
+            program=INSTRUMENT_PROGRAMS["brass"],
+            tempo_bpm=tempo_bpm
+        )
+
+    def compose_background_music(
+        self,
+        mood: str,
+        genre: str = "electronic",
+        tempo_bpm: int = 120,
+        duration_seconds: int = 120,
+        instruments: list[str] | None = None
+    ) -> NoteSequence:
+        """Compose a looping background pattern for a mood and genre."""
+
+        seconds_per_beat = 60.0 / tempo_bpm
+        total_beats = max(int(duration_seconds / seconds_per_beat), 4)
+
+        program = 0
+        if instruments:
+            name = instruments[0].lower()
+            program = next(
+                (p for key, p in INSTRUMENT_PROGRAMS.items() if key in name),
+                DEFAULT_INSTRUMENT_PROGRAM
+            )
+
+        if genre == "chiptune":
+            # Simple 8-bit style arpeggio in eighth notes
+            if mood in ["happy", "epic"]:
+                pattern = np.array([0, 4, 7, 12, 7, 4])  # Major arpeggio
+            else:
+                pattern = np.array([0, 3, 7, 12, 7, 3])  # Minor arpeggio
+            steps = np.arange(total_beats * 2)
+            return NoteSequence.from_arrays(
+                onset=steps * 0.5 * seconds_per_beat,
+                duration=0.5 * seconds_per_beat,
+                pitch=60 + pattern[steps % len(pattern)],
+                program=program,
+                tempo_bpm=tempo_bpm
+            )
+
+        if genre == "ambient":
+            # Long sustained chords
+            if mood in ["mysterious", "tense"]:
+                progression = np.array([
+                    [60, 63, 67],  # Cm
+                    [58, 62, 65],  # Bb
+                    [57, 60, 64],  # Am
+                    [55, 58, 62],  # Gm
+                ])
+            else:
+                progression = np.array([
+                    [60, 64, 67],  # C
+                    [62, 65, 69],  # Dm
+                    [64, 67, 71],  # Em
+                    [65, 69, 72],  # F
+                ])
+            chord_beats = 4
+        else:
+            # Generic pattern for other genres: C major then three D minor beats
+            progression = np.array([
+                [60, 64, 67],  # C major
+                [62, 65, 69],  # D minor
+                [62, 65, 69],
+                [62, 65, 69],
+            ])
+            chord_beats = 1
+
+        chord_count = total_beats // chord_beats
+        chords = progression[np.arange(chord_count) % len(progression)]
+        return NoteSequence.from_arrays(
+            onset=np.repeat(np.arange(chord_count) * chord_beats * seconds_per_beat, 3),
+            duration=chord_beats * seconds_per_beat,
+            pitch=chords.ravel(),
+            velocity=80,
+            program=program,
+            tempo_bpm=tempo_bpm
+        )
+
+    def export_midi(self, sequence: NoteSequence, output_path: Path) -> Path:
+        """Export a note sequence to a MIDI file."""
+        return sequence.write_midi(output_path)
+
+    def export_audio(self, sequence: NoteSequence, output_path: Path) -> Path:
+        """Export a note sequence to MIDI and render it to OGG or WAV."""
+        self.export_midi(sequence, output_path.with_suffix('.mid'))
+        return MidiRenderer().write_sequence(sequence, output_path)
+
     def generate_game_soundtrack(
         self,
         themes: list[str],
-        output_dir: Path | None = None
+        output_dir: Path | None = None,
+        seed: int = 0
     ) -> dict[str, Path]:
-        """Generate a complete game soundtrack."""
-        
+        """Generate a complete game soundtrack.
+
+        Each theme gets its own seed derived from ``seed``, so a soundtrack
+        is reproducible as a whole and per theme.
+        """
+
         if output_dir is None:
             output_dir = Path("soundtrack")
         output_dir.mkdir(exist_ok=True)
-        
+
         soundtrack = {}
-        
-        theme_generators = {
-            "menu": lambda: self.generate_ambient_track(1, "F major", 60),
-            "gameplay": lambda: self.generate_ambient_track(3, "C major", 100),
-            "combat": lambda: self.generate_action_music(2, "high"),
-            "victory": lambda: self.generate_ambient_track(1, "G major", 90),
-            "defeat": lambda: self.generate_ambient_track(1, "D minor", 70)
-        }
-        
+
         for theme in themes:
-            if theme in theme_generators:
-                music = theme_generators[theme]()
+            if theme in THEME_SPECS:
+                music = self.compose_theme(theme, theme_seed(seed, theme))
                 output_path = output_dir / f"{theme}.mid"
                 self.export_midi(music, output_path)
                 soundtrack[theme] = output_path
-        
-        return soundtrack
\ No newline at end of file
+
+        return soundtrack
+
+    async def generate_game_soundtrack_parallel(
+        self,
+        themes: list[str],
+        output_dir: Path | None = None,
+        seed: int = 0,
+        render_audio: bool = True,
+        duration_minutes: int | None = None,
+        executor: Executor | None = None
+    ) -> dict[str, dict]:
+        """Compose and render soundtrack themes concurrently in a process pool.
+
+        Returns a manifest keyed by theme with output paths and per-track
+        timing. Output is identical to the sequential soundtrack for the
+        same seed. Pass ``executor`` to share a pool across calls.
+        """
+
+        if output_dir is None:
+            output_dir = Path("soundtrack")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        themes = [theme for theme in dict.fromkeys(themes) if theme in THEME_SPECS]
+        if not themes:
+            return {}
+
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=min(len(themes), os.cpu_count() or 1))
+
+        loop = asyncio.get_running_loop()
+        try:
+            results = await asyncio.gather(*(
+                loop.run_in_executor(
+                    executor, build_theme, theme, seed, output_dir, render_audio, duration_minutes
+                )
+                for theme in themes
+            ))
+        finally:
+            if owns_executor:
+                executor.shutdown(wait=False)
+
+        return dict(zip(themes, results))
+
+    def compose_theme(
+        self,
+        theme: str,
+        seed: int | None = None,
+        duration_minutes: int | None = None
+    ) -> NoteSequence:
+        """Compose one named soundtrack theme."""
+        kind, default_minutes, kwargs = THEME_SPECS[theme]
+        minutes = duration_minutes or default_minutes
+        if kind == "action":
+            return self.generate_action_music(minutes, seed=seed, **kwargs)
+        return self.generate_ambient_track(minutes, seed=seed, **kwargs)
+
+
+def build_theme(
+    theme: str,
+    seed: int,
+    output_dir: Path,
+    render_audio: bool = True,
+    duration_minutes: int | None = None
+) -> dict:
+    """Compose, export and optionally render one theme; runs in worker processes."""
+    started = time.perf_counter()
+    sequence = MusicGenerator().compose_theme(theme, theme_seed(seed, theme), duration_minutes)
+    midi_path = sequence.write_midi(output_dir / f"{theme}.mid")
+    composed = time.perf_counter()
+
+    audio_path = None
+    if render_audio:
+        audio_path = MidiRenderer().write_sequence(sequence, output_dir / f"{theme}.ogg")
+    finished = time.perf_counter()
+
+    return {
+        "midi_path": str(midi_path),
+        "audio_path": str(audio_path) if audio_path else None,
+        "notes": len(sequence),
+        "tempo_bpm": sequence.tempo_bpm,
+        "duration_seconds": sequence.duration,
+        "compose_seconds": composed - started,
+        "render_seconds": finished - composed,
+        "elapsed_seconds": finished - started,
+        "worker_pid": os.getpid(),
+    }
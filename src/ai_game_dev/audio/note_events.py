@@ -0,0 +1,162 @@
+"""
+Compact array-backed note events with a direct Standard MIDI File writer.
+
+A NoteSequence stores every note as one row of a NumPy structured array
+(onset and duration in seconds, pitch, velocity, channel, program), so
+multi-minute soundtracks are built with a few vectorized operations and
+written to MIDI without an intermediate object graph. music21 is only
+needed for the optional ``to_music21`` export.
+"""
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+MIDI_DIVISION = 480  # Ticks per quarter note
+
+NOTE_DTYPE = np.dtype([
+    ("onset", np.float64),
+    ("duration", np.float64),
+    ("pitch", np.int16),
+    ("velocity", np.int16),
+    ("channel", np.int16),
+    ("program", np.int16),
+])
+
+PITCH_CLASSES = {
+    "C": 0, "C#": 1, "Db": 1, "D": 2, "D#": 3, "Eb": 3, "E": 4, "F": 5,
+    "F#": 6, "Gb": 6, "G": 7, "G#": 8, "Ab": 8, "A": 9, "A#": 10, "Bb": 10, "B": 11,
+}
+
+SCALE_INTERVALS = {
+    "major": (0, 2, 4, 5, 7, 9, 11),
+    "minor": (0, 2, 3, 5, 7, 8, 10),
+}
+
+
+def scale_pitches(key_signature: str, octave: int = 4, count: int = 8) -> np.ndarray:
+    """Return ``count`` ascending MIDI pitches of a key such as "D minor"."""
+    tonic, _, mode = key_signature.partition(" ")
+    intervals = SCALE_INTERVALS[mode.strip().lower() or "major"]
+    base = 12 * (octave + 1) + PITCH_CLASSES[tonic]
+    steps = np.arange(count)
+    return base + 12 * (steps // len(intervals)) + np.take(intervals, steps % len(intervals))
+
+
+def _varlen(value: int) -> bytes:
+    """Encode a MIDI variable-length quantity."""
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(out))
+
+
+@dataclass
+class NoteSequence:
+    """A tempo-tagged array of note events."""
+    events: np.ndarray
+    tempo_bpm: float = 120.0
+
+    @classmethod
+    def from_arrays(
+        cls,
+        onset: np.ndarray,
+        duration: np.ndarray,
+        pitch: np.ndarray,
+        velocity: np.ndarray | int = 90,
+        channel: np.ndarray | int = 0,
+        program: np.ndarray | int = 0,
+        tempo_bpm: float = 120.0
+    ) -> "NoteSequence":
+        """Build a sequence from parallel (or broadcastable) arrays."""
+        onset = np.asarray(onset, dtype=np.float64)
+        events = np.zeros(onset.shape[0], dtype=NOTE_DTYPE)
+        events["onset"] = onset
+        events["duration"] = duration
+        events["pitch"] = pitch
+        events["velocity"] = velocity
+        events["channel"] = channel
+        events["program"] = program
+        return cls(np.sort(events, order="onset", kind="stable"), tempo_bpm)
+
+    @classmethod
+    def merge(cls, sequences: list["NoteSequence"]) -> "NoteSequence":
+        """Combine sequences that share a tempo into one."""
+        events = np.concatenate([seq.events for seq in sequences])
+        return cls(np.sort(events, order="onset", kind="stable"), sequences[0].tempo_bpm)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds from time zero to the last note-off."""
+        if not len(self.events):
+            return 0.0
+        return float(np.max(self.events["onset"] + self.events["duration"]))
+
+    def to_midi_bytes(self, division: int = MIDI_DIVISION) -> bytes:
+        """Encode the sequence as a format 0 Standard MIDI File."""
+        ticks_per_second = self.tempo_bpm / 60.0 * division
+        on_ticks = np.round(self.events["onset"] * ticks_per_second).astype(np.int64)
+        off_ticks = np.maximum(
+            np.round((self.events["onset"] + self.events["duration"]) * ticks_per_second).astype(np.int64),
+            on_ticks + 1,
+        )
+
+        # Offs sort before ons at the same tick so repeated pitches retrigger
+        ticks = np.concatenate((off_ticks, on_ticks))
+        is_on = np.concatenate((np.zeros(len(off_ticks), bool), np.ones(len(on_ticks), bool)))
+        rows = np.concatenate((np.arange(len(off_ticks)), np.arange(len(on_ticks))))
+        order = np.lexsort((is_on, ticks))
+
+        track = bytearray()
+        track += b"\x00\xff\x51\x03" + round(60_000_000 / self.tempo_bpm).to_bytes(3, "big")
+        channels, first = np.unique(self.events["channel"], return_index=True)
+        for channel, row in zip(channels, first):
+            track += bytes([0, 0xC0 | int(channel), int(self.events["program"][row])])
+
+        channel_col = self.events["channel"]
+        pitch_col = self.events["pitch"]
+        velocity_col = self.events["velocity"]
+        previous = 0
+        for tick, on, row in zip(ticks[order].tolist(), is_on[order].tolist(), rows[order].tolist()):
+            track += _varlen(tick - previous)
+            previous = tick
+            status = (0x90 if on else 0x80) | int(channel_col[row])
+            track += bytes([status, int(pitch_col[row]), int(velocity_col[row]) if on else 0])
+
+        track += b"\x00\xff\x2f\x00"
+        header = b"MThd" + struct.pack(">IHHH", 6, 0, 1, division)
+        return header + b"MTrk" + struct.pack(">I", len(track)) + bytes(track)
+
+    def write_midi(self, output_path: Path) -> Path:
+        """Write the sequence to a ``.mid`` file."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(self.to_midi_bytes())
+        return output_path
+
+    def to_music21(self):
+        """Convert to a music21 Score for notation export (requires music21)."""
+        from music21 import note, stream, tempo
+
+        seconds_per_beat = 60.0 / self.tempo_bpm
+        score = stream.Score()
+        score.insert(0, tempo.MetronomeMark(number=self.tempo_bpm))
+        parts: dict[int, stream.Part] = {}
+        for event in self.events:
+            channel = int(event["channel"])
+            if channel not in parts:
+                parts[channel] = stream.Part()
+                score.insert(0, parts[channel])
+            n = note.Note(int(event["pitch"]))
+            n.volume.velocity = int(event["velocity"])
+            n.quarterLength = float(event["duration"]) / seconds_per_beat
+            parts[channel].insert(float(event["onset"]) / seconds_per_beat, n)
+        return score
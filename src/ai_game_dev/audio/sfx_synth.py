@@ -0,0 +1,352 @@
+"""
+Offline procedural sound-effect synthesis in NumPy.
+
+An sfxr-style synthesizer: an oscillator with frequency slides, vibrato
+and arpeggio, shaped by an attack/sustain/decay envelope, then filtered
+and optionally bitcrushed. Rendering is vectorized, deterministic for a
+given seed and memoized, so whole effect packs render without network.
+"""
+
+import io
+import wave
+import zlib
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+
+SAMPLE_RATE = 44100
+MIN_FREQUENCY = 20.0
+
+Waveform = Literal["square", "sawtooth", "sine", "triangle", "noise"]
+
+
+@dataclass(frozen=True)
+class SynthParams:
+    """Parameters for a single synthesized sound.
+
+    Frequencies are in Hz, times in seconds and slides in octaves per
+    second. Filter cutoffs of 0 disable the filter.
+    """
+    waveform: Waveform = "square"
+    base_freq: float = 440.0
+    freq_slide: float = 0.0
+    freq_delta_slide: float = 0.0
+    duty: float = 0.5
+    vibrato_depth: float = 0.0
+    vibrato_speed: float = 0.0
+    arp_mult: float = 1.0
+    arp_time: float = 0.0
+    attack: float = 0.0
+    sustain: float = 0.1
+    punch: float = 0.0
+    decay: float = 0.2
+    lowpass_cutoff: float = 0.0
+    highpass_cutoff: float = 0.0
+    bitcrush_bits: int = 0
+    downsample: int = 1
+    volume: float = 0.8
+
+    @property
+    def duration(self) -> float:
+        return self.attack + self.sustain + self.decay
+
+
+PRESETS: dict[str, SynthParams] = {
+    "jump": SynthParams(
+        waveform="square", base_freq=330.0, freq_slide=2.0,
+        sustain=0.05, decay=0.2,
+    ),
+    "collect": SynthParams(
+        waveform="square", base_freq=880.0, arp_mult=1.5, arp_time=0.06,
+        sustain=0.06, punch=0.5, decay=0.25,
+    ),
+    "hit": SynthParams(
+        waveform="noise", base_freq=1200.0, freq_slide=-3.0,
+        sustain=0.02, punch=0.4, decay=0.15, lowpass_cutoff=6000.0,
+    ),
+    "explosion": SynthParams(
+        waveform="noise", base_freq=400.0, freq_slide=-1.0,
+        sustain=0.15, punch=0.6, decay=0.65, lowpass_cutoff=3000.0,
+    ),
+    "laser": SynthParams(
+        waveform="sawtooth", base_freq=1500.0, freq_slide=-4.0, duty=0.3,
+        sustain=0.05, decay=0.15,
+    ),
+    "powerup": SynthParams(
+        waveform="square", base_freq=300.0, freq_slide=1.5,
+        vibrato_depth=0.05, vibrato_speed=10.0, sustain=0.1, decay=0.3,
+    ),
+    "blip": SynthParams(
+        waveform="square", base_freq=660.0, sustain=0.05, decay=0.05,
+    ),
+}
+
+# Common effect names mapped onto the closest preset
+EFFECT_ALIASES = {
+    "coin": "collect",
+    "pickup": "collect",
+    "item": "collect",
+    "shoot": "laser",
+    "shot": "laser",
+    "zap": "laser",
+    "damage": "hit",
+    "hurt": "hit",
+    "punch": "hit",
+    "boom": "explosion",
+    "blast": "explosion",
+    "bounce": "jump",
+    "power": "powerup",
+    "level": "powerup",
+    "select": "blip",
+    "click": "blip",
+    "menu": "blip",
+}
+
+
+def resolve_preset(effect_name: str) -> str:
+    """Map a free-form effect name onto a preset name."""
+    name = effect_name.lower()
+    for preset in PRESETS:
+        if preset in name:
+            return preset
+    for alias, preset in EFFECT_ALIASES.items():
+        if alias in name:
+            return preset
+    return "blip"
+
+
+def apply_style(params: SynthParams, style: str) -> SynthParams:
+    """Adjust preset parameters for a game audio style."""
+    tonal = params.waveform != "noise"
+
+    if style == "retro":
+        return replace(
+            params,
+            waveform="square" if tonal else "noise",
+            bitcrush_bits=5,
+            downsample=4,
+        )
+    if style == "cartoon":
+        return replace(
+            params,
+            waveform="triangle" if tonal else "noise",
+            freq_slide=params.freq_slide * 1.5,
+            vibrato_depth=max(params.vibrato_depth, 0.08),
+            vibrato_speed=max(params.vibrato_speed, 8.0),
+        )
+    if style == "electronic":
+        return replace(
+            params,
+            waveform="sawtooth" if tonal else "noise",
+            lowpass_cutoff=params.lowpass_cutoff or 4000.0,
+            highpass_cutoff=80.0,
+        )
+    return params
+
+
+def effect_seed(effect_name: str, style: str) -> int:
+    """Stable default seed for an effect, independent of PYTHONHASHSEED."""
+    return zlib.crc32(f"{effect_name}:{style}".encode("utf-8"))
+
+
+class SoundEffectSynthesizer:
+    """Procedural sfxr-style sound-effect synthesizer."""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    def params_for(
+        self,
+        effect_name: str,
+        style: str = "retro",
+        duration: float | None = None,
+        seed: int | None = None
+    ) -> SynthParams:
+        """Build seeded, styled parameters for a named effect."""
+        if seed is None:
+            seed = effect_seed(effect_name, style)
+        rng = np.random.default_rng(seed)
+
+        params = apply_style(PRESETS[resolve_preset(effect_name)], style)
+        params = replace(
+            params,
+            base_freq=params.base_freq * rng.uniform(0.9, 1.1),
+            freq_slide=params.freq_slide * rng.uniform(0.85, 1.15),
+        )
+
+        if duration and duration > params.attack:
+            scale = (duration - params.attack) / (params.sustain + params.decay)
+            params = replace(
+                params,
+                sustain=params.sustain * scale,
+                decay=params.decay * scale,
+                arp_time=params.arp_time * scale,
+            )
+        return params
+
+    def render(self, params: SynthParams, seed: int = 0) -> np.ndarray:
+        """Render parameters to float32 samples in [-1, 1].
+
+        The returned array is cached and read-only; copy it before editing.
+        """
+        return _render(params, seed, self.sample_rate)
+
+    def render_wav(
+        self,
+        effect_name: str,
+        style: str = "retro",
+        duration: float | None = None,
+        seed: int | None = None
+    ) -> bytes:
+        """Render a named effect to 16-bit mono WAV bytes."""
+        if seed is None:
+            seed = effect_seed(effect_name, style)
+        params = self.params_for(effect_name, style, duration, seed)
+        return _render_wav(params, seed, self.sample_rate)
+
+    def save(
+        self,
+        effect_name: str,
+        output_path: Path,
+        style: str = "retro",
+        duration: float | None = None,
+        seed: int | None = None
+    ) -> Path:
+        """Render a named effect and write it as a WAV file."""
+        output_path = Path(output_path).with_suffix(".wav")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(self.render_wav(effect_name, style, duration, seed))
+        return output_path
+
+    def generate_batch(
+        self,
+        effect_names: list[str],
+        output_dir: Path,
+        style: str = "retro",
+        seed: int | None = None
+    ) -> dict[str, Path]:
+        """Render several named effects into ``output_dir``."""
+        return {
+            name: self.save(name, Path(output_dir) / f"{name}.wav", style, seed=seed)
+            for name in effect_names
+        }
+
+
+def _oscillator(
+    waveform: Waveform,
+    phase: np.ndarray,
+    duty: float,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """Evaluate a waveform for an array of phases measured in cycles."""
+    frac = phase % 1.0
+    if waveform == "square":
+        return np.where(frac < duty, 1.0, -1.0)
+    if waveform == "sawtooth":
+        return 2.0 * frac - 1.0
+    if waveform == "triangle":
+        return 4.0 * np.abs(frac - 0.5) - 1.0
+    if waveform == "noise":
+        # Sample-and-hold noise, refreshed twice per cycle like sfxr
+        steps = np.floor(phase * 2.0).astype(np.int64)
+        return rng.uniform(-1.0, 1.0, steps[-1] + 1)[steps]
+    return np.sin(2.0 * np.pi * phase)
+
+
+def _envelope(params: SynthParams, t: np.ndarray) -> np.ndarray:
+    """Attack/sustain/decay envelope with an optional punch on sustain."""
+    env = np.zeros_like(t)
+    attack_end = params.attack
+    sustain_end = attack_end + params.sustain
+
+    if params.attack > 0:
+        in_attack = t < attack_end
+        env[in_attack] = t[in_attack] / params.attack
+
+    in_sustain = (t >= attack_end) & (t < sustain_end)
+    progress = (t[in_sustain] - attack_end) / max(params.sustain, 1e-9)
+    env[in_sustain] = 1.0 + params.punch * (1.0 - progress)
+
+    in_decay = t >= sustain_end
+    env[in_decay] = 1.0 - (t[in_decay] - sustain_end) / max(params.decay, 1e-9)
+
+    return np.clip(env, 0.0, None)
+
+
+def _filter(samples: np.ndarray, params: SynthParams, sample_rate: int) -> np.ndarray:
+    """Apply zero-phase one-pole low/high-pass responses in the frequency domain."""
+    if not params.lowpass_cutoff and not params.highpass_cutoff:
+        return samples
+
+    spectrum = np.fft.rfft(samples)
+    freqs = np.fft.rfftfreq(len(samples), 1.0 / sample_rate)
+    if params.lowpass_cutoff:
+        spectrum /= np.sqrt(1.0 + (freqs / params.lowpass_cutoff) ** 2)
+    if params.highpass_cutoff:
+        ratio = freqs / params.highpass_cutoff
+        spectrum *= ratio / np.sqrt(1.0 + ratio ** 2)
+    return np.fft.irfft(spectrum, len(samples))
+
+
+@lru_cache(maxsize=256)
+def _render(params: SynthParams, seed: int, sample_rate: int) -> np.ndarray:
+    """Render samples; cached because parameters and seed fully determine them."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(max(int(params.duration * sample_rate), 1)) / sample_rate
+
+    octaves = params.freq_slide * t + 0.5 * params.freq_delta_slide * t ** 2
+    freq = params.base_freq * np.exp2(octaves)
+    if params.vibrato_depth:
+        freq *= 1.0 + params.vibrato_depth * np.sin(2.0 * np.pi * params.vibrato_speed * t)
+    if params.arp_time and params.arp_mult != 1.0:
+        freq = np.where(t >= params.arp_time, freq * params.arp_mult, freq)
+    freq = np.clip(freq, MIN_FREQUENCY, sample_rate / 2)
+
+    phase = np.cumsum(freq) / sample_rate
+    samples = _oscillator(params.waveform, phase, params.duty, rng)
+    samples = _filter(samples * _envelope(params, t), params, sample_rate)
+
+    if params.downsample > 1:
+        held = samples[::params.downsample]
+        samples = np.repeat(held, params.downsample)[:len(samples)]
+    if params.bitcrush_bits:
+        levels = 2 ** (params.bitcrush_bits - 1)
+        samples = np.round(samples * levels) / levels
+
+    peak = np.max(np.abs(samples))
+    if peak > 0:
+        samples = samples / peak * params.volume
+
+    samples = samples.astype(np.float32)
+    samples.flags.writeable = False
+    return samples
+
+
+@lru_cache(maxsize=256)
+def _render_wav(params: SynthParams, seed: int, sample_rate: int) -> bytes:
+    """Encode rendered samples as 16-bit mono WAV bytes."""
+    return encode_wav(_render(params, seed, sample_rate), sample_rate)
+
+
+def pcm16(samples: np.ndarray) -> np.ndarray:
+    """Convert float samples in [-1, 1] to little-endian 16-bit PCM."""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Encode float samples in [-1, 1] as 16-bit PCM WAV bytes.
+
+    Mono arrays have shape ``(n,)``; multi-channel arrays ``(n, channels)``.
+    """
+    pcm = pcm16(samples)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1 if pcm.ndim == 1 else pcm.shape[1])
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
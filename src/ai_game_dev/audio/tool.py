@@ -2,11 +2,13 @@
 OpenAI function tools for audio generation.
 Integrates TTS, music generation, and Freesound API.
 """
+import asyncio
+import os
+import shutil
 from pathlib import Path
 from typing import Literal, Any
 
 import aiofiles
-import httpx
 from openai import AsyncOpenAI
 from pydantic import BaseModel
 
@@ -15,7 +17,9 @@ from agents import function_tool
 from ai_game_dev.constants import OPENAI_MODELS
 from ai_game_dev.audio.tts_generator import TTSGenerator
 from ai_game_dev.audio.music_generator import MusicGenerator
-from ai_game_dev.audio.freesound_client import FreesoundClient
+from ai_game_dev.audio.freesound_client import FreesoundClient, shared_freesound_client
+from ai_game_dev.audio.midi_renderer import MidiRenderer
+from ai_game_dev.audio.sfx_synth import SoundEffectSynthesizer, resolve_preset
 
 
 class GeneratedAudio(BaseModel):
@@ -84,82 +88,58 @@ async def generate_sound_effect(
     style: Literal["realistic", "cartoon", "retro", "electronic"] = "realistic",
     duration: float = 1.0,
     save_path: str | None = None,
+    seed: int | None = None,
 ) -> GeneratedAudio:
     """Generate or fetch a sound effect for games.
     
-    This integrates with Freesound API when available, otherwise generates
-    a procedural sound effect description.
+    Sounds already in the local library are reused; otherwise Freesound is
+    searched when FREESOUND_API_KEY is set, and as a last resort the effect
+    is synthesized offline as a WAV file.
     
     Args:
         effect_name: Name of the sound effect (explosion, jump, collect, etc.)
         style: Style of the sound effect
         duration: Approximate duration in seconds
         save_path: Optional path to save the sound
+        seed: Optional seed for synthesis variation (stable per effect by default)
         
     Returns:
         GeneratedAudio with file path or description
     """
-    # Try Freesound API if available
-    import os
-    freesound_key = os.getenv("FREESOUND_API_KEY")
+    # Check the local sound library, then Freesound when a key is configured
+    client = shared_freesound_client(os.getenv("FREESOUND_API_KEY"))
+    try:
+        entry = await client.find_sound(f"{effect_name} {style}", duration_max=duration + 2)
+    except Exception:
+        entry = None  # Fall back to procedural generation
     
-    if freesound_key:
-        # Search Freesound for the effect
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    "https://freesound.org/apiv2/search/text/",
-                    params={
-                        "query": f"{effect_name} {style}",
-                        "filter": f"duration:[0 TO {duration + 2}]",
-                        "fields": "id,name,url,duration,download",
-                        "token": freesound_key
-                    }
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if data["results"]:
-                        # Use the first result
-                        sound = data["results"][0]
-                        
-                        if save_path:
-                            # Download the sound
-                            download_url = sound["download"]
-                            audio_response = await client.get(
-                                download_url,
-                                params={"token": freesound_key}
-                            )
-                            
-                            path = Path(save_path)
-                            path.parent.mkdir(parents=True, exist_ok=True)
-                            
-                            async with aiofiles.open(path, 'wb') as f:
-                                await f.write(audio_response.content)
-                            
-                            return GeneratedAudio(
-                                type="sound_effect",
-                                description=f"{style} {effect_name} from Freesound",
-                                path=str(path),
-                                duration=sound["duration"]
-                            )
-            except Exception:
-                pass  # Fall back to procedural generation
+    if entry:
+        path = Path(entry["path"])
+        if save_path:
+            source, path = path, Path(save_path).with_suffix(path.suffix)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(shutil.copyfile, source, path)
+        
+        return GeneratedAudio(
+            type="sound_effect",
+            description=f"{style} {effect_name} from Freesound ({entry['license'] or 'license unknown'})",
+            path=str(path),
+            duration=entry["duration"]
+        )
     
-    # Procedural sound generation fallback
-    description = f"{style} {effect_name} sound effect, {duration}s"
+    # Procedural synthesis fallback, fully offline
+    synth = SoundEffectSynthesizer()
+    preset = resolve_preset(effect_name)
+    description = f"{style} {effect_name} sound effect, synthesized from '{preset}' preset"
     
     if save_path:
-        # For now, save a description file
-        path = Path(save_path).with_suffix('.txt')
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(description)
+        path = synth.save(effect_name, Path(save_path), style=style, duration=duration, seed=seed)
         
         return GeneratedAudio(
             type="sound_effect",
             description=description,
             path=str(path),
-            duration=duration
+            duration=synth.params_for(effect_name, style, duration, seed).duration
         )
     
     return GeneratedAudio(
@@ -181,7 +161,8 @@ async def generate_background_music(
 ) -> GeneratedAudio:
     """Generate background music for games using algorithmic composition.
     
-    Uses music21 for music generation based on mood and style parameters.
+    Composes a note-event sequence from mood and style parameters, writes
+    it as MIDI and renders it offline to OGG (with soundfile) or WAV.
     
     Args:
         mood: Musical mood (happy, sad, tense, relaxed, epic, mysterious)
@@ -194,111 +175,33 @@ async def generate_background_music(
     Returns:
         GeneratedAudio with file path or description
     """
-    try:
-        from music21 import stream, tempo as m21tempo, note, chord, instrument
-        
-        # Create a stream
-        s = stream.Score()
-        part = stream.Part()
-        
-        # Set tempo
-        part.append(m21tempo.MetronomeMark(number=tempo))
-        
-        # Add instrument
-        if instruments:
-            if "piano" in instruments[0].lower():
-                part.append(instrument.Piano())
-            elif "guitar" in instruments[0].lower():
-                part.append(instrument.Guitar())
-            else:
-                part.append(instrument.ElectricGuitar())
-        
-        # Generate notes based on mood and genre
-        if genre == "chiptune":
-            # Simple 8-bit style patterns
-            base_note = 60  # C4
-            if mood in ["happy", "epic"]:
-                pattern = [0, 4, 7, 12, 7, 4]  # Major arpeggio
-            else:
-                pattern = [0, 3, 7, 12, 7, 3]  # Minor arpeggio
-            
-            for i in range(duration * 2):  # 2 notes per second
-                n = note.Note(base_note + pattern[i % len(pattern)])
-                n.duration.quarterLength = 0.5
-                part.append(n)
-                
-        elif genre == "ambient":
-            # Long sustained chords
-            chord_progression = []
-            if mood in ["mysterious", "tense"]:
-                chord_progression = [
-                    [60, 63, 67],  # Cm
-                    [58, 62, 65],  # Bb
-                    [57, 60, 64],  # Am
-                    [55, 58, 62],  # Gm
-                ]
-            else:
-                chord_progression = [
-                    [60, 64, 67],  # C
-                    [62, 65, 69],  # Dm
-                    [64, 67, 71],  # Em
-                    [65, 69, 72],  # F
-                ]
-            
-            for i in range(duration // 4):  # One chord every 4 seconds
-                c = chord.Chord(chord_progression[i % len(chord_progression)])
-                c.duration.quarterLength = 4
-                part.append(c)
-        
-        else:
-            # Generic pattern for other genres
-            for i in range(duration):
-                if i % 4 == 0:
-                    c = chord.Chord([60, 64, 67])  # C major
-                else:
-                    c = chord.Chord([62, 65, 69])  # D minor
-                c.duration.quarterLength = 1
-                part.append(c)
-        
-        s.append(part)
-        
-        # Save the music
-        if save_path:
-            path = Path(save_path)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Export as MIDI
-            midi_path = path.with_suffix('.mid')
-            s.write('midi', fp=str(midi_path))
-            
-            return GeneratedAudio(
-                type="music",
-                description=f"{mood} {genre} music at {tempo} BPM",
-                path=str(midi_path),
-                duration=float(duration)
-            )
-        
-    except ImportError:
-        # Fallback if music21 not available
-        pass
-    
-    # Fallback description
-    description = f"{mood} {genre} music, {tempo} BPM, {duration}s"
-    if instruments:
-        description += f" with {', '.join(instruments)}"
+    sequence = MusicGenerator().compose_background_music(
+        mood, genre, tempo_bpm=tempo, duration_seconds=duration, instruments=instruments
+    )
     
+    # Save the music
     if save_path:
-        path = Path(save_path).with_suffix('.txt')
+        path = Path(save_path)
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(description)
+        
+        # Export as MIDI, then render playable audio next to it
+        midi_path = sequence.write_midi(path.with_suffix('.mid'))
+        audio_path = await asyncio.to_thread(
+            MidiRenderer().write_sequence, sequence, path.with_suffix(".ogg")
+        )
         
         return GeneratedAudio(
             type="music",
-            description=description,
-            path=str(path),
-            duration=float(duration)
+            description=f"{mood} {genre} music at {tempo} BPM (MIDI: {midi_path.name})",
+            path=str(audio_path),
+            duration=sequence.duration
         )
     
+    # Without a save path, describe the composition
+    description = f"{mood} {genre} music, {tempo} BPM, {duration}s"
+    if instruments:
+        description += f" with {', '.join(instruments)}"
+    
     return GeneratedAudio(
         type="music",
         description=description,
@@ -3,18 +3,58 @@ Text-to-speech generation using OpenAI TTS API.
 """
 
 import asyncio
+import hashlib
+import os
+import shutil
+import weakref
 from pathlib import Path
 from typing import Literal
 import aiofiles
 from openai import AsyncOpenAI
+from xdg_base_dirs import xdg_cache_home
+
+
+TTS_CACHE_DIR = xdg_cache_home() / "ai-game-dev" / "tts"
+MAX_CONCURRENT_REQUESTS = 4
+
+
+def clip_key(text: str, voice: str, model: str) -> str:
+    """Return a stable content hash for a rendered voice line."""
+    return hashlib.sha256(f"{model}\0{voice}\0{text}".encode("utf-8")).hexdigest()
 
 
 class TTSGenerator:
-    """Text-to-speech generator using OpenAI's TTS API."""
-    
-    def __init__(self, api_key: str):
+    """Text-to-speech generator using OpenAI's TTS API.
+
+    Rendered clips are stored in a content-addressed cache keyed by
+    (text, voice, model), so repeated lines are only synthesized once
+    across batches and processes.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        cache_dir: Path | None = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS
+    ):
         self.client = AsyncOpenAI(api_key=api_key)
-    
+        self.cache_dir = Path(cache_dir) if cache_dir else TTS_CACHE_DIR
+        self.max_concurrency = max_concurrency
+        # Semaphores and tasks belong to one event loop, so both are kept per loop
+        self._request_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._in_flight: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _slots(self) -> asyncio.Semaphore:
+        """Request slots for the running loop (a Semaphore is bound to one loop)."""
+        loop = asyncio.get_running_loop()
+        if loop not in self._request_slots:
+            self._request_slots[loop] = asyncio.Semaphore(self.max_concurrency)
+        return self._request_slots[loop]
+
+    def _tasks(self) -> dict[str, asyncio.Task]:
+        """Clips being synthesized on the running loop, by cache key."""
+        return self._in_flight.setdefault(asyncio.get_running_loop(), {})
+
     async def generate_speech(
         self,
         text: str,
@@ -23,53 +63,96 @@ class TTSGenerator:
         output_path: Path | None = None
     ) -> Path:
         """Generate speech from text."""
-        
+
+        key = clip_key(text, voice, model)
         if output_path is None:
-            output_path = Path(f"tts_output_{hash(text)}.mp3")
-        
-        response = await self.client.audio.speech.create(
-            model=model,
-            voice=voice,
-            input=text
-        )
-        
-        async with aiofiles.open(output_path, 'wb') as f:
-            async for chunk in response.iter_bytes():
-                await f.write(chunk)
-        
+            output_path = Path(f"tts_output_{key[:16]}.mp3")
+
+        clip_path = await self._get_clip(key, text, voice, model)
+        await asyncio.to_thread(shutil.copyfile, clip_path, output_path)
+
         return output_path
-    
+
+    async def generate_speech_batch(
+        self,
+        lines: list[tuple[str, str]],
+        model: Literal["tts-1", "tts-1-hd"] = "tts-1",
+        output_dir: Path | None = None
+    ) -> list[Path]:
+        """Generate speech for (text, voice) pairs concurrently.
+
+        Identical lines are synthesized once and results keep input order,
+        written as ``line_000.mp3``, ``line_001.mp3``, ...
+        """
+
+        if output_dir is None:
+            output_dir = Path("narration")
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        return list(await asyncio.gather(*(
+            self.generate_speech(
+                text,
+                voice=voice,
+                model=model,
+                output_path=output_dir / f"line_{i:03d}.mp3"
+            )
+            for i, (text, voice) in enumerate(lines)
+        )))
+
     async def generate_narration(
         self,
         script: str,
         character_voices: dict[str, str] | None = None,
-        output_dir: Path | None = None
+        output_dir: Path | None = None,
+        model: Literal["tts-1", "tts-1-hd"] = "tts-1"
     ) -> list[Path]:
         """Generate narration with different character voices."""
-        
-        if output_dir is None:
-            output_dir = Path("narration")
-        output_dir.mkdir(exist_ok=True)
-        
+
         # Split script by character (simple implementation)
-        lines = script.split('\n')
-        audio_files = []
-        
-        for i, line in enumerate(lines):
+        lines = []
+        for line in script.split('\n'):
             if ':' in line:
                 character, dialogue = line.split(':', 1)
                 voice = character_voices.get(character.strip(), "alloy") if character_voices else "alloy"
             else:
                 dialogue = line
                 voice = "alloy"
-            
+
             if dialogue.strip():
-                output_path = output_dir / f"line_{i:03d}.mp3"
-                await self.generate_speech(
-                    dialogue.strip(),
-                    voice=voice,
-                    output_path=output_path
-                )
-                audio_files.append(output_path)
-        
-        return audio_files
\ No newline at end of file
+                lines.append((dialogue.strip(), voice))
+
+        return await self.generate_speech_batch(lines, model=model, output_dir=output_dir)
+
+    async def _get_clip(self, key: str, text: str, voice: str, model: str) -> Path:
+        """Return the cached clip for a key, synthesizing it at most once."""
+
+        clip_path = self.cache_dir / f"{key}.mp3"
+        if clip_path.exists():
+            return clip_path
+
+        in_flight = self._tasks()
+        task = in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._synthesize(clip_path, text, voice, model))
+            in_flight[key] = task
+            task.add_done_callback(lambda _: in_flight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    async def _synthesize(self, clip_path: Path, text: str, voice: str, model: str) -> Path:
+        """Render a clip through the API and store it atomically in the cache."""
+
+        async with self._slots():
+            response = await self.client.audio.speech.create(
+                model=model,
+                voice=voice,
+                input=text
+            )
+
+        clip_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = clip_path.with_name(f"{clip_path.name}.{os.getpid()}.tmp")
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(response.content)
+        tmp_path.replace(clip_path)
+
+        return clip_path
@@ -24,6 +24,7 @@ from ai_game_dev.constants import CHAINLIT_CONFIG
 # Startup generation now handled via Justfile
 from ai_game_dev.specs.game_spec_loader import GameSpecLoader, GameSpec
 from ai_game_dev.assets.asset_registry import get_asset_registry
+from ai_game_dev.text.challenge_runner import GradeReport, get_challenge_runner
 
 # Initialize components
 initialize_sqlite_cache_and_memory()
@@ -567,7 +568,11 @@ lives = 3
 # We can change what's in the box
 score = score + 10
 print(f"{player_name} has {score} points!")""",
-            "challenge": "Create variables for a player's health (starting at 100) and gold (starting at 50)"
+            "challenge": "Create variables for a player's health (starting at 100) and gold (starting at 50)",
+            "tests": [
+                {"description": "health starts at 100", "expression": "health", "expected": 100},
+                {"description": "gold starts at 50", "expression": "gold", "expected": 50},
+            ]
         },
         "intermediate": {
             "id": "game_loops",
@@ -590,7 +595,10 @@ while running:
     screen.clear()
     player.draw()
     enemies.draw()""",
-            "challenge": "Add a frame counter to the game loop that increases each frame"
+            "challenge": "Write a loop that runs for 60 frames and counts them in a variable called frame_count",
+            "tests": [
+                {"description": "frame_count reaches 60", "expression": "frame_count", "expected": 60},
+            ]
         }
     }
     
@@ -667,21 +675,54 @@ async def handle_workshop_customization(request: str, state: Dict[str, Any]):
         ).send()
 
 
+def award_xp(state: Dict[str, Any], amount: int) -> bool:
+    """Add XP to the academy progress; returns True on level up."""
+    progress = state.setdefault("progress", {"level": 1, "xp": 0, "lessons": []})
+    progress["xp"] += amount
+    if progress["xp"] >= 100:
+        progress["level"] += 1
+        progress["xp"] = 0
+        return True
+    return False
+
+
+def format_grade_report(report: GradeReport) -> str:
+    """Render test results as a markdown checklist."""
+    if report.error:
+        return f"❌ {report.error}"
+    lines = []
+    for result in report.results:
+        if result.passed:
+            lines.append(f"✅ {result.description}")
+        elif result.error:
+            lines.append(f"❌ {result.description}: {result.error}")
+        else:
+            lines.append(f"❌ {result.description}: expected `{result.expected}`, got `{result.actual}`")
+    return "\n".join(lines)
+
+
 async def handle_lesson_interaction(code: str, state: Dict[str, Any]):
     """Handle code submission during lessons."""
-    # Check if the code meets the challenge requirements
+    # Run the submission against the lesson's tests in the sandboxed runner
     lesson = state["lesson"]
+    tests = lesson.get("tests", [])
+    if not tests:
+        # Nothing to grade against, so nothing is earned
+        await cl.Message(
+            content=f"""
+Professor Pixel: "This lesson doesn't have automatic checks yet, so I can't grade that one.
+
+Remember the challenge: {lesson.get('challenge', 'check the lesson goal')}"
+"""
+        ).send()
+        return
+    report = await get_challenge_runner().grade(code, tests)
     
-    # Simple validation (in real implementation, would be more sophisticated)
-    if "health" in code and "gold" in code and "=" in code:
+    if report.passed:
         # Success!
-        state["progress"]["xp"] += 50
+        leveled_up = award_xp(state, 50)
         state["progress"]["lessons"].append(lesson["id"])
         
-        if state["progress"]["xp"] >= 100:
-            state["progress"]["level"] += 1
-            state["progress"]["xp"] = 0
-        
         cl.user_session.set("academy_state", state)
         
         await cl.Message(
@@ -690,8 +731,10 @@ async def handle_lesson_interaction(code: str, state: Dict[str, Any]):
 
 Professor Pixel: "That's exactly right! You've mastered {lesson['title']}!"
 
+{format_grade_report(report)}
+
 **+50 XP earned!**
-{f"**LEVEL UP! You're now level {state['progress']['level']}!**" if state["progress"]["xp"] == 0 else ""}
+{f"**LEVEL UP! You're now level {state['progress']['level']}!**" if leveled_up else ""}
 
 Ready for the next lesson? Type 'continue' or 'next'!
 """,
@@ -701,7 +744,8 @@ Ready for the next lesson? Type 'continue' or 'next'!
                     content=json.dumps({
                         "type": "academy_progress",
                         "stage": "lesson_complete",
-                        "progress": state["progress"]
+                        "progress": state["progress"],
+                        "results": report.to_dict()
                     }),
                     display="none"
                 )
@@ -710,24 +754,64 @@ Ready for the next lesson? Type 'continue' or 'next'!
     else:
         # Provide helpful feedback
         await cl.Message(
-            content="""
+            content=f"""
 🤔 **Not quite right...**
 
-Professor Pixel: "Good try! Remember, we need to create two variables:
-- `health` starting at 100
-- `gold` starting at 50
+Professor Pixel: "Good try! Here's how your code did:
 
-Here's a hint:
-```python
-variable_name = value
-```
+{format_grade_report(report)}
 
-Try again!
+Remember the challenge: {lesson.get('challenge', 'check the lesson goal')}
+
+Try again!"
 """
         ).send()
 
 
 async def handle_challenge_submission(code: str, state: Dict[str, Any]):
     """Handle challenge code submissions."""
-    # Validate and provide feedback on challenge submissions
-    pass
\ No newline at end of file
+    challenge = state.get("current_challenge") or {}
+    test_cases = challenge.get("test_cases", [])
+    if not test_cases:
+        # No challenge (or one without tests): nothing to grade, no XP, keep the challenge
+        await cl.Message(
+            content="There's no challenge with tests to grade right now. Ask for a new challenge first!"
+        ).send()
+        return
+    report = await get_challenge_runner().grade(code, test_cases)
+    
+    if report.passed:
+        leveled_up = award_xp(state, 100)
+        state["current_challenge"] = None
+        state["stage"] = "lesson_active"
+        cl.user_session.set("academy_state", state)
+        content = f"""
+🏆 **Challenge complete!**
+
+{format_grade_report(report)}
+
+**+100 XP earned!**
+{f"**LEVEL UP! You're now level {state['progress']['level']}!**" if leveled_up else ""}
+"""
+    else:
+        content = f"""
+🔧 **{report.passed_count}/{len(report.results)} tests passing**
+
+{format_grade_report(report)}
+
+Fix the failing tests and submit again!
+"""
+    
+    await cl.Message(
+        content=content,
+        elements=[
+            cl.Text(
+                name="ui_state",
+                content=json.dumps({
+                    "type": "challenge_result",
+                    "results": report.to_dict()
+                }),
+                display="none"
+            )
+        ]
+    ).send()
\ No newline at end of file
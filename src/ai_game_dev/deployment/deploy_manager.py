@@ -8,6 +8,8 @@ import subprocess
 import tempfile
 import shutil
 
+from ai_game_dev.audio.audio_sprite import pack_web_audio
+
 @dataclass
 class DeploymentConfig:
     platform: str  # "web", "desktop", "mobile"
@@ -92,6 +94,12 @@ class DeploymentManager:
             
             logs.append("Copied project files to build directory")
             
+            # One fetch per audio directory instead of one per clip
+            for sprite in pack_web_audio(web_dir):
+                logs.append(
+                    f"Packed {len(sprite.sprites)} clips into {sprite.path.relative_to(web_dir)}"
+                )
+            
             # Run pygbag
             cmd = [
                 'python', '-m', 'pygbag',
@@ -8,10 +8,13 @@ import asyncio
 import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 
+from ai_game_dev.audio.audio_sprite import pack_web_audio
+
 try:
     import typer
     from rich.console import Console
@@ -47,6 +50,8 @@ class PygbagConfig:
     stack_size: int = 32
     enable_threading: bool = False
     enable_audio: bool = True
+    audio_sprites: bool = True
+    strip_packed_audio: bool = False  # Only for games that play every sound through audio_sprites
     
     def __post_init__(self):
         self.project_path = Path(self.project_path).resolve()
@@ -113,7 +118,31 @@ class PygbagDeployer:
                 self.console.print(f"❌ Error checking dependencies: {e}", style="red")
             return False
     
-    def build_command(self) -> List[str]:
+    def stage_project(self, staging_dir: Path) -> Path:
+        """Copy the project into ``staging_dir`` so build steps never touch the source."""
+        staged = Path(staging_dir) / self.config.project_path.name
+        shutil.copytree(
+            self.config.project_path,
+            staged,
+            ignore=shutil.ignore_patterns(".*", "build", "__pycache__")
+        )
+        return staged
+    
+    def pack_audio_sprites(self, build_path: Path) -> List[Path]:
+        """Pack short sound clips of a staged build into audio sprites for faster browser loading.
+        
+        Sprites are added next to the clips; the originals are kept unless
+        ``strip_packed_audio`` is set.
+        """
+        sprites = pack_web_audio(build_path, strip_packed=self.config.strip_packed_audio)
+        if self.console:
+            for sprite in sprites:
+                self.console.print(
+                    f"🔊 Packed {len(sprite.sprites)} clips into {sprite.path.name}", style="green"
+                )
+        return [sprite.path for sprite in sprites]
+    
+    def build_command(self, project_path: Optional[Path] = None) -> List[str]:
         """Build the pygbag deployment command with all options."""
         cmd = [
             sys.executable, "-m", "pygbag",
@@ -137,7 +166,7 @@ class PygbagDeployer:
             "--optimization", self.config.optimization_level
         ])
         
-        cmd.append(str(self.config.project_path))
+        cmd.append(str(project_path or self.config.project_path))
         return cmd
     
     async def deploy_async(self) -> bool:
@@ -148,7 +177,21 @@ class PygbagDeployer:
         if not self.check_dependencies():
             return False
         
-        cmd = self.build_command()
+        if not (self.config.enable_audio and self.config.audio_sprites):
+            return await self._run_pygbag(self.config.project_path)
+        
+        # Sprites are packed into a copy; pygbag's output is copied back to
+        # <project>/build, where it would have written it anyway
+        with tempfile.TemporaryDirectory(prefix="pygbag-") as staging_dir:
+            build_path = self.stage_project(Path(staging_dir))
+            self.pack_audio_sprites(build_path)
+            success = await self._run_pygbag(build_path)
+            if (build_path / "build").is_dir():
+                shutil.copytree(build_path / "build", self.config.project_path / "build", dirs_exist_ok=True)
+            return success
+    
+    async def _run_pygbag(self, project_path: Path) -> bool:
+        cmd = self.build_command(project_path)
         
         if self.console:
             # Create deployment info table
@@ -178,7 +221,7 @@ class PygbagDeployer:
                     
                     process = await asyncio.create_subprocess_exec(
                         *cmd,
-                        cwd=self.config.project_path.parent,
+                        cwd=project_path.parent,
                         stdout=asyncio.subprocess.PIPE,
                         stderr=asyncio.subprocess.PIPE
                     )
@@ -202,7 +245,7 @@ class PygbagDeployer:
             else:
                 # Fallback without Rich
                 print("🚀 Deploying to WebAssembly...")
-                result = subprocess.run(cmd, cwd=self.config.project_path.parent)
+                result = subprocess.run(cmd, cwd=project_path.parent)
                 return result.returncode == 0
                 
         except Exception as e:
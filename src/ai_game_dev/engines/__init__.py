@@ -3,11 +3,30 @@
 Modern modular engine architecture with dedicated adapters.
 """
 
-from .base import BaseEngineAdapter, EngineGenerationResult
-from .manager import EngineManager, engine_manager, generate_for_engine, get_supported_engines
-from .pygame import PygameAdapter
-from .bevy import BevyAdapter
-from .godot import GodotAdapter
+from importlib import import_module
+
+from .base import BaseEngineAdapter, EngineGenerationResult, get_llm_client
+from .manager import (
+    EngineManager,
+    engine_manager,
+    generate_for_engine,
+    get_supported_engines,
+    register_engine,
+)
+
+# Adapter classes are imported on first access so unused engines cost nothing
+_LAZY_ADAPTERS = {
+    "PygameAdapter": ".pygame",
+    "BevyAdapter": ".bevy",
+    "GodotAdapter": ".godot",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ADAPTERS:
+        return getattr(import_module(_LAZY_ADAPTERS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "BaseEngineAdapter",
@@ -16,6 +35,8 @@ __all__ = [
     "engine_manager",
     "generate_for_engine",
     "get_supported_engines",
+    "register_engine",
+    "get_llm_client",
     "PygameAdapter",
     "BevyAdapter", 
     "GodotAdapter"
@@ -3,13 +3,19 @@ Base classes for game engine adapters.
 Provides structured interfaces for language-native game engine implementations.
 """
 from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from pathlib import Path
+import asyncio
 import os
 
 from openai import AsyncOpenAI
 from ai_game_dev.config import settings
+from ai_game_dev.engines.project_writer import FileContent, WriteManifest, write_project
+from ai_game_dev.engines.validation import GENERATION_FAILED, FileReport, strip_code_fences, validate_project
+
+
+REPAIR_ATTEMPTS = 2
 
 
 @dataclass
@@ -23,13 +29,26 @@ class EngineGenerationResult:
     deployment_notes: str
     generated_files: Dict[str, str]  # filename -> actual code content
     project_path: Optional[Path] = None
+    write_manifest: Optional[WriteManifest] = None  # changed/unchanged/removed files
+    validation_issues: Dict[str, List[str]] = field(default_factory=dict)  # problems left after re-prompting
+
+
+_llm_client: Optional[AsyncOpenAI] = None
+
+
+def get_llm_client() -> AsyncOpenAI:
+    """Get the OpenAI client (and its connection pool) shared by every adapter."""
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _llm_client
 
 
 class BaseEngineAdapter(ABC):
     """Abstract base class for game engine adapters."""
     
     def __init__(self):
-        self.llm_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.llm_client = get_llm_client()
         self.output_dir = settings.cache_dir / "generated_projects"
         # Don't create directories on init - defer until needed
     
@@ -84,18 +103,61 @@ class BaseEngineAdapter(ABC):
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            return f"// Error generating code: {e}\n// Fallback placeholder code"
+            return f"{GENERATION_FAILED}: {e}\n// Fallback placeholder code"
     
-    async def save_project_files(self, project_name: str, files: Dict[str, str]) -> Path:
-        """Save generated files to disk."""
-        project_path = self.output_dir / f"{self.engine_name}_{project_name}"
-        project_path.mkdir(exist_ok=True)
+    async def generate_files_with_llm(
+        self,
+        prompts: Dict[str, str],
+        project_files: Optional[Dict[str, str]] = None
+    ) -> tuple[Dict[str, str], Dict[str, List[str]]]:
+        """Generate files concurrently, validate them and re-prompt only the broken ones.
         
-        for filename, content in files.items():
-            file_path = project_path / filename
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+        ``project_files`` are the rest of the project (checked alongside, e.g.
+        for imports, but never regenerated). Returns the files and the issues
+        still left after ``REPAIR_ATTEMPTS`` rounds; files whose generation
+        never succeeded are reported but left out, so the error placeholder
+        is never written as source.
+        """
+        project_files = project_files or {}
+        codes = await asyncio.gather(*(self.generate_code_with_llm(prompt) for prompt in prompts.values()))
+        files = {path: strip_code_fences(code) for path, code in zip(prompts, codes)}
         
-        return project_path
\ No newline at end of file
+        for attempt in range(REPAIR_ATTEMPTS + 1):
+            reports = await validate_project({**project_files, **files})
+            failing = {path: report for path, report in reports.items() if path in files and not report.ok}
+            if not failing or attempt == REPAIR_ATTEMPTS:
+                break
+            repaired = await asyncio.gather(*(
+                self.generate_code_with_llm(self._repair_prompt(prompts[path], files[path], report))
+                for path, report in failing.items()
+            ))
+            files.update({path: strip_code_fences(code) for path, code in zip(failing, repaired)})
+        
+        issues = {path: report.messages() for path, report in reports.items() if not report.ok}
+        files = {path: code for path, code in files.items() if not code.lstrip().startswith(GENERATION_FAILED)}
+        return files, issues
+    
+    def _repair_prompt(self, prompt: str, code: str, report: FileReport) -> str:
+        """Prompt for regenerating one file that failed validation."""
+        if code.lstrip().startswith(GENERATION_FAILED):
+            return prompt
+        problems = "\n".join(f"- {message}" for message in report.messages())
+        return f"""{prompt}
+
+A previous attempt at {report.path} had these problems:
+{problems}
+
+Previous attempt:
+{code}
+
+Return the complete corrected {report.path} as plain {self.native_language} code, without markdown fences."""
+    
+    async def save_project_files(self, project_name: str, files: Dict[str, FileContent]) -> Path:
+        """Save generated files to disk."""
+        manifest = await self.write_project_files(project_name, files)
+        return manifest.project_path
+    
+    async def write_project_files(self, project_name: str, files: Dict[str, FileContent]) -> WriteManifest:
+        """Save generated files, skipping unchanged ones, and report what changed."""
+        project_path = self.output_dir / f"{self.engine_name}_{project_name}"
+        return await write_project(project_path, files)
\ No newline at end of file
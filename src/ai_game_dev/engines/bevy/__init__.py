@@ -1,5 +1,6 @@
 """Bevy engine package for Rust game development."""
 
 from .adapter import BevyAdapter
+from .composer import BevyProjectComposer
 
-__all__ = ["BevyAdapter"]
\ No newline at end of file
+__all__ = ["BevyAdapter", "BevyProjectComposer"]
\ No newline at end of file
@@ -6,11 +6,16 @@ from typing import Dict, List
 from pathlib import Path
 
 from ai_game_dev.engines.base import BaseEngineAdapter, EngineGenerationResult
+from ai_game_dev.engines.bevy.composer import BevyProjectComposer
 
 
 class BevyAdapter(BaseEngineAdapter):
     """Adapter for Rust Bevy engine projects."""
     
+    def __init__(self):
+        super().__init__()
+        self.composer = BevyProjectComposer()
+    
     @property
     def engine_name(self) -> str:
         return "bevy"
@@ -31,87 +36,10 @@ class BevyAdapter(BaseEngineAdapter):
         features = features or []
         project_name = description.replace(" ", "_").lower()[:20]
         
-        # Generate Cargo.toml
-        cargo_prompt = f"""
-        Create a complete Cargo.toml file for a Bevy game: {description}
-        
-        Requirements:
-        - Latest stable Bevy version (0.14)
-        - Proper optimization settings
-        - Include dependencies for features: {', '.join(features)}
-        - Fast compile settings for development
-        - Production optimization settings
-        
-        Include relevant Bevy plugins for the features needed.
-        """
-        
-        # Generate main.rs
-        main_prompt = f"""
-        Create a complete main.rs file for a Bevy game: {description}
-        Complexity: {complexity}
-        Features: {', '.join(features)}
-        Art style: {art_style}
-        
-        Requirements:
-        - Modern Bevy ECS architecture
-        - Proper plugin system usage
-        - Component-based design
-        - System organization
-        - Resource management
-        - Event handling
-        - Startup and update systems
-        
-        Make it production-ready with proper Rust patterns.
-        """
-        
-        # Generate components.rs
-        components_prompt = f"""
-        Create a complete components.rs file for a Bevy game: {description}
-        
-        Requirements:
-        - Component definitions using Bevy's derive macros
-        - Player, enemy, and interactive object components
-        - Health, movement, and state components
-        - Resource definitions for game state
-        - Proper Rust documentation
-        
-        Features: {', '.join(features)}
-        Complexity: {complexity}
-        
-        Use idiomatic Rust and Bevy patterns.
-        """
-        
-        # Generate systems.rs
-        systems_prompt = f"""
-        Create a complete systems.rs file for a Bevy game: {description}
-        
-        Requirements:
-        - Movement systems
-        - Collision detection systems
-        - Game logic systems
-        - UI systems
-        - Audio systems
-        - Proper query patterns and system ordering
-        
-        Features: {', '.join(features)}
-        Art style: {art_style}
-        
-        Use Bevy's system parameter patterns and change detection.
-        """
-        
-        # Generate lib.rs
-        lib_prompt = f"""
-        Create a complete lib.rs file for a Bevy game: {description}
-        
-        Requirements:
-        - Module declarations
-        - Public API exports
-        - Plugin definition for the game
-        - Configuration structs
-        - Re-exports for external use
-        
-        Make it clean and well-organized.
-        """
+        # Compose everything the ECS library covers; the LLM only writes
+        # a gameplay plugin for features outside the library
+        composition = self.composer.compose(project_name, description, features)
+        glue_prompt = self.composer.glue_prompt(composition, description, complexity, art_style)
         
         # Static files
         readme_content = f"""# {description.title()}
@@ -146,10 +74,12 @@ A {complexity} complexity Bevy game built with Rust, featuring:
 
 ## Architecture
 
-- `main.rs`: Application entry point and plugin setup
+- `main.rs`: Application entry point
 - `lib.rs`: Module organization and public API
+- `plugins.rs`: `GamePlugin` wiring events, resources and system order
 - `components.rs`: ECS component definitions
 - `systems.rs`: Game logic systems
+- `gameplay.rs`: Extra gameplay for features beyond the component library (when present)
 - `assets/`: Game assets (textures, sounds, models)
 """
         
@@ -161,20 +91,21 @@ A {complexity} complexity Bevy game built with Rust, featuring:
 *~
 """
         
-        # Generate all code files
         generated_files = {
-            "Cargo.toml": await self.generate_code_with_llm(cargo_prompt),
-            "src/main.rs": await self.generate_code_with_llm(main_prompt),
-            "src/lib.rs": await self.generate_code_with_llm(lib_prompt),
-            "src/components.rs": await self.generate_code_with_llm(components_prompt),
-            "src/systems.rs": await self.generate_code_with_llm(systems_prompt),
+            **composition.files,
             "README.md": readme_content,
             ".gitignore": gitignore_content,
             "assets/.gitkeep": ""
         }
+        validation_issues = {}
+        if glue_prompt:
+            gameplay, validation_issues = await self.generate_files_with_llm(
+                {"src/gameplay.rs": glue_prompt}, composition.files
+            )
+            generated_files.update(gameplay)
         
         # Save files to disk
-        project_path = await self.save_project_files(project_name, generated_files)
+        manifest = await self.write_project_files(project_name, generated_files)
         
         return EngineGenerationResult(
             engine_type="bevy",
@@ -184,7 +115,9 @@ A {complexity} complexity Bevy game built with Rust, featuring:
             build_instructions=self.get_build_instructions(),
             deployment_notes="Compile with 'cargo build --release' for production builds",
             generated_files=generated_files,
-            project_path=project_path
+            project_path=manifest.project_path,
+            write_manifest=manifest,
+            validation_issues=validation_issues
         )
     
     def get_project_template(self) -> Dict[str, str]:
@@ -193,6 +126,7 @@ A {complexity} complexity Bevy game built with Rust, featuring:
             "Cargo.toml": "Rust project manifest",
             "src/main.rs": "Application entry point",
             "src/lib.rs": "Library organization",
+            "src/plugins.rs": "Game plugin and system ordering",
             "src/components.rs": "ECS component definitions",
             "src/systems.rs": "Game logic systems",
             "assets/": "Asset files directory",
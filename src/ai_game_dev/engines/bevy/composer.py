@@ -0,0 +1,368 @@
+"""
+Deterministic Bevy project composition from the ECS library.
+
+Spec features are matched to blueprints (components plus systems), and
+Cargo.toml, main.rs, lib.rs, plugins.rs, components.rs and systems.rs are
+assembled straight from ``ECSlibrary`` templates. The same spec always
+produces the same files. Features no blueprint covers are reported so the
+adapter can ask the LLM for a small gameplay plugin instead of the whole
+project.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from ai_game_dev.engines.bevy.ecs_components import ECSlibrary
+from ai_game_dev.keywords import find_keywords, matching_labels, register_keywords
+
+
+BEVY_VERSION = "0.14"
+ENEMY_COUNT = 6
+CROWD_ENEMY_COUNT = 200
+
+
+@dataclass(frozen=True)
+class FeatureBlueprint:
+    """Library components and systems that implement a spec feature."""
+    keywords: tuple[str, ...]
+    components: tuple[str, ...]
+    systems: tuple[str, ...]
+
+
+# Every project gets a controllable player
+BASE_BLUEPRINT = FeatureBlueprint((), ("player", "velocity"), ("player_input", "movement"))
+
+FEATURE_BLUEPRINTS: Dict[str, FeatureBlueprint] = {
+    "movement": FeatureBlueprint(
+        ("movement", "move", "controls", "platformer", "top-down", "walking", "running"),
+        ("player", "velocity"), ("player_input", "movement"),
+    ),
+    "physics": FeatureBlueprint(
+        ("physics", "velocity", "momentum"),
+        ("velocity",), ("movement",),
+    ),
+    "collision": FeatureBlueprint(
+        ("collision", "collide", "hitbox", "obstacle"),
+        ("collider", "collision_event"), ("collision",),
+    ),
+    "health": FeatureBlueprint(
+        ("health", "combat", "damage", "lives", "hp"),
+        ("health", "death_event"), ("health",),
+    ),
+    "enemies": FeatureBlueprint(
+        ("enemy", "enemies", "monster", "ai", "hostile"),
+        ("enemy", "ai_behavior", "velocity", "collider", "contact_damage", "health",
+         "collision_event", "death_event"),
+        ("ai", "movement", "collision", "contact_damage", "player_attack", "health"),
+    ),
+    # Many simultaneous colliders: swap the pairwise collision check for a grid broad-phase
+    "crowds": FeatureBlueprint(
+        ("bullet hell", "projectile", "swarm", "horde", "many enemies", "hundreds", "shmup",
+         "shoot 'em up", "waves of enemies"),
+        ("collider", "collision_event", "spatial_hash"), ("collision_grid",),
+    ),
+    "animation": FeatureBlueprint(
+        ("animation", "animated", "sprite animation"),
+        ("animation",), ("animation",),
+    ),
+    "inventory": FeatureBlueprint(
+        ("inventory", "items", "loot", "pickup"),
+        ("inventory",), (),
+    ),
+    # Points are scored for defeating enemies, so scoring brings them along
+    "scoring": FeatureBlueprint(
+        ("score", "scoring", "points", "high score"),
+        ("score", "enemy", "ai_behavior", "velocity", "collider", "contact_damage", "health",
+         "collision_event", "death_event"),
+        ("ai", "movement", "collision", "contact_damage", "player_attack", "scoring", "health"),
+    ),
+}
+
+FEATURE_KEYWORDS = {label: blueprint.keywords for label, blueprint in FEATURE_BLUEPRINTS.items()}
+register_keywords(FEATURE_KEYWORDS)
+
+# Update systems run chained in this order; events are read the frame they're sent
+# and scoring sees dead enemies before health_system despawns them
+SYSTEM_ORDER = (
+    "player_input", "ai", "movement", "collision", "collision_grid", "contact_damage", "player_attack",
+    "scoring", "health", "animation"
+)
+# Library system patterns are named after their key
+SYSTEM_FUNCTIONS = {name: f"{name}_system" for name in SYSTEM_ORDER}
+EVENTS = ("collision_event", "death_event")
+RESOURCES = ("spatial_hash", "score")
+BUILT_IN_COMPONENTS = ("transform",)
+
+
+@dataclass
+class BevyComposition:
+    """Files and bookkeeping for a composed Bevy project."""
+    crate_name: str
+    covered: Dict[str, List[str]] = field(default_factory=dict)
+    uncovered: List[str] = field(default_factory=list)
+    components: List[str] = field(default_factory=list)
+    systems: List[str] = field(default_factory=list)
+    files: Dict[str, str] = field(default_factory=dict)
+
+
+def crate_name(name: str) -> str:
+    """A valid Rust crate name derived from a project name."""
+    crate = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+    if not crate or not crate[0].isalpha():
+        crate = f"game_{crate}".rstrip("_")
+    return crate
+
+
+def rust_string(text: str) -> str:
+    """A double-quoted Rust string literal."""
+    escaped = text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "")
+    return f'"{escaped}"'
+
+
+class BevyProjectComposer:
+    """Assembles Bevy projects from ``ECSlibrary`` templates."""
+
+    def __init__(self, library: ECSlibrary | None = None):
+        self.library = library or ECSlibrary()
+
+    def plan(self, features: List[str]) -> tuple[Dict[str, List[str]], List[str]]:
+        """Map features to blueprint labels; returns (label -> features, uncovered features)."""
+        covered: Dict[str, List[str]] = {}
+        uncovered = []
+        for feature in features:
+            labels = matching_labels(find_keywords(feature.replace("_", " ")), FEATURE_KEYWORDS)
+            if not labels:
+                uncovered.append(feature)
+            for label in labels:
+                covered.setdefault(label, []).append(feature)
+        return covered, uncovered
+
+    def compose(self, name: str, description: str, features: List[str]) -> BevyComposition:
+        """Build every project file that the library can produce."""
+        covered, uncovered = self.plan(features)
+        if "crowds" not in covered and not find_keywords(description).isdisjoint(FEATURE_KEYWORDS["crowds"]):
+            covered["crowds"] = []
+        blueprints = [BASE_BLUEPRINT, *(FEATURE_BLUEPRINTS[label] for label in FEATURE_BLUEPRINTS if label in covered)]
+
+        selected_components = {component for blueprint in blueprints for component in blueprint.components}
+        selected_systems = {system for blueprint in blueprints for system in blueprint.systems}
+        if "collision_grid" in selected_systems:
+            selected_systems.discard("collision")
+        components = [key for key in self.library.components if key in selected_components]
+        systems = [system for system in SYSTEM_ORDER if system in selected_systems]
+
+        composition = BevyComposition(
+            crate_name=crate_name(name),
+            covered=covered,
+            uncovered=uncovered,
+            components=components,
+            systems=systems,
+        )
+        composition.files = {
+            "Cargo.toml": self._cargo_toml(composition),
+            "src/main.rs": self._main_rs(composition, description),
+            "src/lib.rs": self._lib_rs(composition, description),
+            "src/plugins.rs": self._plugins_rs(composition),
+            "src/components.rs": self._components_rs(composition),
+            "src/systems.rs": self._systems_rs(composition),
+        }
+        return composition
+
+    def glue_prompt(self, composition: BevyComposition, description: str, complexity: str, art_style: str) -> str | None:
+        """Prompt for a gameplay plugin covering features the library can't, or None."""
+        if not composition.uncovered:
+            return None
+        component_names = [self.library.components[key].name for key in composition.components]
+        system_names = [SYSTEM_FUNCTIONS[system] for system in composition.systems]
+        return f"""
+        Write src/gameplay.rs for a Bevy {BEVY_VERSION} game: {description}
+        Complexity: {complexity}
+        Art style: {art_style}
+
+        The project already has these components (in crate::components): {', '.join(component_names)}
+        and these systems (in crate::systems): {', '.join(system_names)}.
+
+        Implement only these features: {', '.join(composition.uncovered)}
+
+        Requirements:
+        - `use bevy::prelude::*;` and `use crate::components::*;`
+        - Define `pub struct GameplayPlugin;` implementing `Plugin`
+        - Add any new components, resources and systems in this file
+        - Don't redefine existing components or systems
+
+        Return only the Rust source for the file.
+        """
+
+    def _cargo_toml(self, composition: BevyComposition) -> str:
+        return f"""[package]
+name = "{composition.crate_name}"
+version = "0.1.0"
+edition = "2021"
+
+[dependencies]
+bevy = "{BEVY_VERSION}"
+
+# Fast iteration: optimize dependencies, keep our code quick to build
+[profile.dev]
+opt-level = 1
+
+[profile.dev.package."*"]
+opt-level = 3
+
+[profile.release]
+lto = "thin"
+codegen-units = 1
+"""
+
+    def _main_rs(self, composition: BevyComposition, description: str) -> str:
+        return f"""use bevy::prelude::*;
+use {composition.crate_name}::GamePlugin;
+
+fn main() {{
+    App::new()
+        .add_plugins(DefaultPlugins.set(WindowPlugin {{
+            primary_window: Some(Window {{
+                title: {rust_string(description.title())}.into(),
+                ..default()
+            }}),
+            ..default()
+        }}))
+        .add_plugins(GamePlugin)
+        .run();
+}}
+"""
+
+    def _lib_rs(self, composition: BevyComposition, description: str) -> str:
+        modules = ["components", "systems", "plugins"]
+        if composition.uncovered:
+            modules.append("gameplay")
+        declarations = "\n".join(f"pub mod {module};" for module in modules)
+        summary = " ".join(description.split())
+        return f"""//! {summary}
+
+{declarations}
+
+pub use plugins::GamePlugin;
+"""
+
+    def _plugins_rs(self, composition: BevyComposition) -> str:
+        setup = []
+        for key in composition.components:
+            name = self.library.components[key].name
+            if key in EVENTS:
+                setup.append(f".add_event::<{name}>()")
+            elif key in RESOURCES:
+                setup.append(f".init_resource::<{name}>()")
+        setup.append(".add_systems(Startup, setup)")
+
+        functions = [SYSTEM_FUNCTIONS[system] for system in composition.systems]
+        if len(functions) == 1:
+            setup.append(f".add_systems(Update, {functions[0]})")
+        elif functions:
+            chained = ",\n".join(f"                    {function}" for function in functions)
+            setup.append(f".add_systems(\n                Update,\n                (\n{chained},\n                )\n                    .chain(),\n            )")
+        if composition.uncovered:
+            setup.append(".add_plugins(crate::gameplay::GameplayPlugin)")
+
+        builder = "        app" + "".join(f"\n            {line}" for line in setup)
+        return f"""use bevy::prelude::*;
+
+#[allow(unused_imports)]
+use crate::components::*;
+use crate::systems::*;
+
+pub struct GamePlugin;
+
+impl Plugin for GamePlugin {{
+    fn build(&self, app: &mut App) {{
+{builder};
+    }}
+}}
+"""
+
+    def _components_rs(self, composition: BevyComposition) -> str:
+        blocks = [
+            self.library.components[key].rust_code
+            for key in composition.components
+            if key not in BUILT_IN_COMPONENTS
+        ]
+        return "use bevy::prelude::*;\n\n" + "\n\n".join(blocks) + "\n"
+
+    def _systems_rs(self, composition: BevyComposition) -> str:
+        blocks = [self._setup_system(composition)]
+        blocks.extend(self.library.get_system_pattern(system) for system in composition.systems)
+        return f"""use bevy::prelude::*;
+
+use crate::components::*;
+
+pub const PLAYER_SPEED: f32 = 240.0;
+pub const ENEMY_SPEED: f32 = 120.0;
+pub const PLAYER_ATTACK_RANGE: f32 = 48.0;
+pub const PLAYER_ATTACK_DAMAGE: f32 = 10.0;
+pub const ENEMY_COUNT: usize = {CROWD_ENEMY_COUNT if "crowds" in composition.covered else ENEMY_COUNT};
+
+""" + "\n\n".join(blocks) + "\n"
+
+    def _setup_system(self, composition: BevyComposition) -> str:
+        has = set(composition.components).__contains__
+        player = [
+            "sprite_bundle(Color::srgb(0.3, 0.7, 1.0), Vec3::ZERO)",
+            'Player { player_id: 1, name: "Player1".to_string() }',
+            "Velocity::default()",
+        ]
+        if has("health"):
+            player.append("Health::new(100.0)")
+        if has("collider"):
+            player.append("Collider::square(32.0)")
+        if has("inventory"):
+            player.append("Inventory::new(10)")
+        if has("animation"):
+            player.append("AnimationState::default()")
+
+        lines = [
+            "pub fn setup(mut commands: Commands) {",
+            "    commands.spawn(Camera2dBundle::default());",
+            "",
+            "    let player = commands",
+            "        .spawn((",
+            *(f"            {part}," for part in player),
+            "        ))",
+            "        .id();",
+        ]
+        if has("enemy"):
+            enemy = [
+                "sprite_bundle(Color::srgb(0.9, 0.3, 0.3), position)",
+                "Enemy",
+                "AIBehavior::Chase { target: player }",
+                "Velocity::default()",
+                "Health::new(30.0)",
+                "Collider::square(32.0)",
+                "ContactDamage(10.0)",
+            ]
+            lines += [
+                "",
+                "    for i in 0..ENEMY_COUNT {",
+                "        let angle = i as f32 / ENEMY_COUNT as f32 * std::f32::consts::TAU;",
+                "        let position = Vec3::new(angle.cos(), angle.sin(), 0.0) * 300.0;",
+                "        commands.spawn((",
+                *(f"            {part}," for part in enemy),
+                "        ));",
+                "    }",
+            ]
+        else:
+            lines.append("    let _ = player;")
+        lines.append("}")
+        return "\n".join(lines) + """
+
+fn sprite_bundle(color: Color, position: Vec3) -> SpriteBundle {
+    SpriteBundle {
+        sprite: Sprite {
+            color,
+            custom_size: Some(Vec2::splat(32.0)),
+            ..default()
+        },
+        transform: Transform::from_translation(position),
+        ..default()
+    }
+}"""
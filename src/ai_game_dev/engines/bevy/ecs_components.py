@@ -109,6 +109,7 @@ pub struct AnimationState {
     pub timer: Timer,
     pub looping: bool,
     pub frame_index: usize,
+    pub frame_count: usize,
 }
 
 impl Default for AnimationState {
@@ -118,6 +119,7 @@ impl Default for AnimationState {
             timer: Timer::from_seconds(0.1, TimerMode::Repeating),
             looping: true,
             frame_index: 0,
+            frame_count: 4,
         }
     }
 }""",
@@ -188,6 +190,123 @@ impl Default for AIBehavior {
                 description="AI behavior state machine",
                 usage_example="AIBehavior::Patrol { waypoints: vec![Vec3::ZERO], current_target: 0 }"
             ),
+            
+            "enemy": ComponentTemplate(
+                name="Enemy",
+                category="identity",
+                rust_code="""#[derive(Component, Default, Debug)]
+pub struct Enemy;""",
+                description="Marks an entity as an enemy",
+                usage_example="Enemy"
+            ),
+            
+            "collider": ComponentTemplate(
+                name="Collider",
+                category="physics",
+                rust_code="""#[derive(Component, Debug, Clone, Copy)]
+pub struct Collider {
+    pub half_extents: Vec2,
+}
+
+impl Collider {
+    pub fn square(size: f32) -> Self {
+        Self { half_extents: Vec2::splat(size / 2.0) }
+    }
+}""",
+                description="Axis-aligned box collider",
+                usage_example="Collider::square(32.0)"
+            ),
+            
+            "contact_damage": ComponentTemplate(
+                name="ContactDamage",
+                category="gameplay",
+                rust_code="""#[derive(Component, Debug)]
+pub struct ContactDamage(pub f32);""",
+                description="Damage dealt to the player on contact",
+                usage_example="ContactDamage(10.0)"
+            ),
+            
+            "collision_event": ComponentTemplate(
+                name="CollisionEvent",
+                category="event",
+                rust_code="""#[derive(Event, Debug, Clone, Copy)]
+pub struct CollisionEvent {
+    pub entity_a: Entity,
+    pub entity_b: Entity,
+}""",
+                description="Sent when two colliders overlap",
+                usage_example="EventReader<CollisionEvent>"
+            ),
+            
+            "death_event": ComponentTemplate(
+                name="DeathEvent",
+                category="event",
+                rust_code="""#[derive(Event, Debug, Clone, Copy)]
+pub struct DeathEvent {
+    pub entity: Entity,
+}""",
+                description="Sent when an entity's health reaches zero",
+                usage_example="EventReader<DeathEvent>"
+            ),
+            
+            "spatial_hash": ComponentTemplate(
+                name="SpatialHash",
+                category="resource",
+                rust_code="""#[derive(Resource, Debug)]
+pub struct SpatialHash {
+    pub cell_size: f32,
+    pub cells: bevy::utils::HashMap<IVec2, Vec<(Entity, Vec2, Vec2)>>,
+}
+
+impl Default for SpatialHash {
+    fn default() -> Self {
+        Self {
+            cell_size: 64.0,
+            cells: bevy::utils::HashMap::default(),
+        }
+    }
+}
+
+impl SpatialHash {
+    pub fn cell(&self, position: Vec2) -> IVec2 {
+        (position / self.cell_size).floor().as_ivec2()
+    }
+    
+    /// Empty every bucket, keeping allocations for cells still in use and
+    /// dropping cells that stayed empty for a whole frame.
+    pub fn clear(&mut self) {
+        self.cells.retain(|_, bucket| {
+            let occupied = !bucket.is_empty();
+            bucket.clear();
+            occupied
+        });
+    }
+    
+    pub fn insert(&mut self, entity: Entity, center: Vec2, half_extents: Vec2) {
+        let min = self.cell(center - half_extents);
+        let max = self.cell(center + half_extents);
+        for x in min.x..=max.x {
+            for y in min.y..=max.y {
+                self.cells
+                    .entry(IVec2::new(x, y))
+                    .or_default()
+                    .push((entity, center, half_extents));
+            }
+        }
+    }
+}""",
+                description="Uniform grid broad-phase for collision detection",
+                usage_example="ResMut<SpatialHash>"
+            ),
+            
+            "score": ComponentTemplate(
+                name="Score",
+                category="resource",
+                rust_code="""#[derive(Resource, Default, Debug)]
+pub struct Score(pub u32);""",
+                description="Running score for the session",
+                usage_example="ResMut<Score>"
+            ),
         }
     
     def _initialize_system_patterns(self) -> Dict[str, str]:
@@ -220,6 +339,51 @@ impl Default for AIBehavior {
             }
         }
     }
+}
+
+pub fn check_collision(
+    transform_a: &Transform,
+    collider_a: &Collider,
+    transform_b: &Transform,
+    collider_b: &Collider,
+) -> bool {
+    let delta = (transform_a.translation - transform_b.translation).truncate().abs();
+    let reach = collider_a.half_extents + collider_b.half_extents;
+    delta.x < reach.x && delta.y < reach.y
+}""",
+            
+            "collision_grid": """pub fn collision_grid_system(
+    mut grid: ResMut<SpatialHash>,
+    query: Query<(Entity, &Transform, &Collider)>,
+    mut collision_events: EventWriter<CollisionEvent>,
+    mut reported: Local<bevy::utils::HashSet<(Entity, Entity)>>,
+) {
+    // Broad phase: bucket colliders by grid cell, rebuilt every frame
+    grid.clear();
+    for (entity, transform, collider) in query.iter() {
+        grid.insert(entity, transform.translation.truncate(), collider.half_extents);
+    }
+    
+    // Narrow phase: only entities sharing a cell are tested; colliders
+    // spanning several cells are reported once
+    reported.clear();
+    for bucket in grid.cells.values() {
+        for (i, &(entity_a, center_a, extents_a)) in bucket.iter().enumerate() {
+            for &(entity_b, center_b, extents_b) in &bucket[i + 1..] {
+                let delta = (center_a - center_b).abs();
+                let reach = extents_a + extents_b;
+                if delta.x < reach.x && delta.y < reach.y {
+                    let pair = (entity_a.min(entity_b), entity_a.max(entity_b));
+                    if reported.insert(pair) {
+                        collision_events.send(CollisionEvent {
+                            entity_a: pair.0,
+                            entity_b: pair.1,
+                        });
+                    }
+                }
+            }
+        }
+    }
 }""",
             
             "health": """pub fn health_system(
@@ -236,18 +400,120 @@ impl Default for AIBehavior {
 }""",
             
             "animation": """pub fn animation_system(
-    mut query: Query<(&mut AnimationState, &mut TextureAtlasSprite)>,
+    mut query: Query<(&mut AnimationState, &mut TextureAtlas)>,
     time: Res<Time>,
 ) {
-    for (mut animation, mut sprite) in query.iter_mut() {
+    for (mut animation, mut atlas) in query.iter_mut() {
         animation.timer.tick(time.delta());
         
         if animation.timer.just_finished() {
-            animation.frame_index += 1;
-            if animation.looping && animation.frame_index >= sprite.index {
-                animation.frame_index = 0;
+            let last = animation.frame_count.saturating_sub(1);
+            animation.frame_index = if animation.frame_index < last {
+                animation.frame_index + 1
+            } else if animation.looping {
+                0
+            } else {
+                last
+            };
+            atlas.index = animation.frame_index;
+        }
+    }
+}""",
+            
+            "player_input": """pub fn player_input_system(
+    keyboard: Res<ButtonInput<KeyCode>>,
+    mut query: Query<&mut Velocity, With<Player>>,
+) {
+    let mut direction = Vec3::ZERO;
+    if keyboard.any_pressed([KeyCode::KeyW, KeyCode::ArrowUp]) {
+        direction.y += 1.0;
+    }
+    if keyboard.any_pressed([KeyCode::KeyS, KeyCode::ArrowDown]) {
+        direction.y -= 1.0;
+    }
+    if keyboard.any_pressed([KeyCode::KeyA, KeyCode::ArrowLeft]) {
+        direction.x -= 1.0;
+    }
+    if keyboard.any_pressed([KeyCode::KeyD, KeyCode::ArrowRight]) {
+        direction.x += 1.0;
+    }
+    
+    for mut velocity in query.iter_mut() {
+        velocity.linear = direction.normalize_or_zero() * PLAYER_SPEED;
+    }
+}""",
+            
+            "ai": """pub fn ai_system(
+    mut enemies: Query<(&mut AIBehavior, &Transform, &mut Velocity), Without<Player>>,
+    targets: Query<&Transform, With<Player>>,
+) {
+    for (mut behavior, transform, mut velocity) in enemies.iter_mut() {
+        let position = transform.translation;
+        let goal = match &mut *behavior {
+            AIBehavior::Chase { target } | AIBehavior::Attack { target, .. } => {
+                targets.get(*target).ok().map(|target| target.translation)
+            }
+            AIBehavior::Patrol { waypoints, current_target } => {
+                let waypoint = waypoints.get(*current_target).copied();
+                if waypoint.map_or(false, |point| point.distance(position) < 4.0) {
+                    *current_target = (*current_target + 1) % waypoints.len();
+                }
+                waypoint
             }
-            sprite.index = animation.frame_index;
+            AIBehavior::Flee { from } => targets
+                .get(*from)
+                .ok()
+                .map(|threat| position * 2.0 - threat.translation),
+            AIBehavior::Idle => None,
+        };
+        velocity.linear = goal
+            .map(|goal| (goal - position).normalize_or_zero() * ENEMY_SPEED)
+            .unwrap_or(Vec3::ZERO);
+    }
+}""",
+            
+            "contact_damage": """pub fn contact_damage_system(
+    mut collisions: EventReader<CollisionEvent>,
+    damage: Query<&ContactDamage>,
+    mut players: Query<&mut Health, With<Player>>,
+) {
+    for collision in collisions.read() {
+        for (source, target) in [
+            (collision.entity_a, collision.entity_b),
+            (collision.entity_b, collision.entity_a),
+        ] {
+            if let (Ok(damage), Ok(mut health)) = (damage.get(source), players.get_mut(target)) {
+                health.take_damage(damage.0);
+            }
+        }
+    }
+}""",
+            
+            "player_attack": """pub fn player_attack_system(
+    keyboard: Res<ButtonInput<KeyCode>>,
+    players: Query<&Transform, With<Player>>,
+    mut enemies: Query<(&Transform, &mut Health), With<Enemy>>,
+) {
+    if !keyboard.just_pressed(KeyCode::Space) {
+        return;
+    }
+    for player in players.iter() {
+        for (transform, mut health) in enemies.iter_mut() {
+            if transform.translation.distance(player.translation) <= PLAYER_ATTACK_RANGE {
+                health.take_damage(PLAYER_ATTACK_DAMAGE);
+            }
+        }
+    }
+}""",
+            
+            "scoring": """pub fn scoring_system(
+    enemies: Query<&Health, (With<Enemy>, Changed<Health>)>,
+    mut score: ResMut<Score>,
+) {
+    // Runs before health_system despawns the dead, so each defeat counts once
+    for health in enemies.iter() {
+        if health.is_dead() {
+            score.0 += 10;
         }
     }
 }""",
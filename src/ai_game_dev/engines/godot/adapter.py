@@ -2,15 +2,23 @@
 Godot engine adapter for GDScript game development.
 Generates complete scene-based Godot projects with professional structure.
 """
+import asyncio
 from typing import Dict, List
 from pathlib import Path
 
 from ai_game_dev.engines.base import BaseEngineAdapter, EngineGenerationResult
+from ai_game_dev.engines.godot.emitter import INPUT_ACTIONS, GodotProjectEmitter, is_pixel_art
+from ai_game_dev.engines.godot.imports import bake_imports
+from ai_game_dev.specs.game_spec_loader import GameSpec
 
 
 class GodotAdapter(BaseEngineAdapter):
     """Adapter for Godot engine projects."""
     
+    def __init__(self):
+        super().__init__()
+        self.emitter = GodotProjectEmitter()
+    
     @property
     def engine_name(self) -> str:
         return "godot"
@@ -31,20 +39,25 @@ class GodotAdapter(BaseEngineAdapter):
         features = features or []
         project_name = description.replace(" ", "_").lower()[:20]
         
-        # Generate project.godot
-        project_prompt = f"""
-        Create a complete project.godot configuration file for: {description}
-        
-        Requirements:
-        - Proper Godot 4.x configuration
-        - Input map for game controls
-        - Display settings for {art_style} style
-        - Audio settings
-        - Physics configuration
-        - Export settings preparation
-        
-        Features: {', '.join(features)}
-        Complexity: {complexity}
+        # project.godot, scenes and resources are emitted without the LLM;
+        # the scripts are written against their node layout
+        spec = GameSpec(
+            title=description.title(),
+            engine="godot",
+            type=self._game_type(description, features),
+            description_short=description,
+            features={feature: True for feature in features},
+        )
+        emitted = self.emitter.emit(spec, art_style)
+        scene_context = f"""
+        The project already contains these scenes (don't rewrite them):
+        - scenes/Main.tscn: Node2D "Main" (Main.gd) with children "Player" (instance of Player.tscn),
+          "HUD" (instance of ui/HUD.tscn) and optionally "Level" (TileMapLayer) and "Background" (Sprite2D)
+        - scenes/Player.tscn: CharacterBody2D "Player" (Player.gd) with "AnimatedSprite2D"
+          (animation "idle"), "CollisionShape2D" and "Camera2D"
+        - scenes/ui/HUD.tscn: CanvasLayer "HUD" (UI.gd) with Label "ScoreLabel" and Control "PauseMenu"
+        GameManager.gd is registered as the "GameManager" autoload.
+        Input actions: {', '.join(INPUT_ACTIONS)}
         """
         
         # Generate Main.gd
@@ -64,6 +77,7 @@ class GodotAdapter(BaseEngineAdapter):
         - Audio management
         
         Make it production-ready with proper GDScript patterns.
+        {scene_context}
         """
         
         # Generate Player.gd
@@ -84,6 +98,7 @@ class GodotAdapter(BaseEngineAdapter):
         Complexity: {complexity}
         
         Use Godot's best practices and node system.
+        {scene_context}
         """
         
         # Generate GameManager.gd
@@ -103,6 +118,7 @@ class GodotAdapter(BaseEngineAdapter):
         Complexity: {complexity}
         
         Make it a robust game management system.
+        {scene_context}
         """
         
         # Generate UI.gd
@@ -122,6 +138,7 @@ class GodotAdapter(BaseEngineAdapter):
         Features: {', '.join(features)}
         
         Use Godot's UI system effectively.
+        {scene_context}
         """
         
         # Static files
@@ -188,34 +205,57 @@ mono_crash.*.json
 Thumbs.db
 """
         
-        # Generate all code files
+        # Only the scripts need the LLM; request (and validate) them concurrently
+        # while the texture imports are baked so the project opens without reimporting
+        (scripts, validation_issues), imports = await asyncio.gather(
+            self.generate_files_with_llm({
+                "scripts/Main.gd": main_prompt,
+                "scripts/Player.gd": player_prompt,
+                "scripts/GameManager.gd": gamemanager_prompt,
+                "scripts/UI.gd": ui_prompt,
+            }, emitted.files),
+            asyncio.to_thread(bake_imports, emitted.assets, is_pixel_art(art_style)),
+        )
         generated_files = {
-            "project.godot": await self.generate_code_with_llm(project_prompt),
-            "scripts/Main.gd": await self.generate_code_with_llm(main_prompt),
-            "scripts/Player.gd": await self.generate_code_with_llm(player_prompt),
-            "scripts/GameManager.gd": await self.generate_code_with_llm(gamemanager_prompt),
-            "scripts/UI.gd": await self.generate_code_with_llm(ui_prompt),
+            **emitted.files,
+            **scripts,
             "README.md": readme_content,
             ".gitignore": gitignore_content,
-            "assets/.gitkeep": "",
-            "scenes/.gitkeep": "",
-            "scenes/ui/.gitkeep": ""
+            "assets/.gitkeep": ""
         }
         
-        # Save files to disk
-        project_path = await self.save_project_files(project_name, generated_files)
+        # Save files to disk along with the registry assets the scenes
+        # reference and their baked imports; unchanged files keep their mtimes
+        assets = await asyncio.to_thread(
+            lambda: {path.removeprefix("res://"): source.read_bytes() for path, source in emitted.assets.items()}
+        )
+        manifest = await self.write_project_files(project_name, {**generated_files, **assets, **imports})
         
         return EngineGenerationResult(
             engine_type="godot",
             project_structure=self.get_project_template(),
             main_files=list(generated_files.keys()),
-            asset_requirements=["player.png", "background.png", "sounds.ogg", "music.ogg"],
+            asset_requirements=sorted(emitted.assets) or ["player.png", "background.png", "sounds.ogg", "music.ogg"],
             build_instructions=self.get_build_instructions(),
             deployment_notes="Export project using Godot editor export templates",
             generated_files=generated_files,
-            project_path=project_path
+            project_path=manifest.project_path,
+            write_manifest=manifest,
+            validation_issues=validation_issues
         )
     
+    @staticmethod
+    def _game_type(description: str, features: List[str]) -> str:
+        """Asset registry game type implied by the description."""
+        text = " ".join([description, *features]).lower()
+        if "platformer" in text or "platform" in text:
+            return "platformer"
+        if "space" in text or "shooter" in text:
+            return "space_shooter"
+        if "educational" in text or "academy" in text:
+            return "educational_rpg"
+        return "general"
+    
     def get_project_template(self) -> Dict[str, str]:
         """Get Godot project template structure."""
         return {
@@ -224,9 +264,13 @@ Thumbs.db
             "scripts/Player.gd": "Player controller script", 
             "scripts/GameManager.gd": "Game management script",
             "scripts/UI.gd": "User interface script",
-            "scenes/": "Scene files directory",
-            "scenes/ui/": "UI scene files",
+            "scenes/Main.tscn": "Main scene",
+            "scenes/Player.tscn": "Player scene",
+            "scenes/ui/HUD.tscn": "HUD and pause menu",
+            "resources/player_frames.tres": "Player SpriteFrames",
+            "resources/tileset.tres": "Level TileSet (when tile assets exist)",
             "assets/": "Asset files directory",
+            ".godot/imported/": "Pre-baked texture imports (with .import sidecars in assets/)",
             "assets/sprites/": "2D sprites",
             "assets/models/": "3D models",
             "assets/sounds/": "Audio files"
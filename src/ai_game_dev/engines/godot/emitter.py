@@ -0,0 +1,288 @@
+"""
+Deterministic Godot project boilerplate.
+
+Builds project.godot (with the input map), the Main/Player/HUD scenes, a
+SpriteFrames resource for the player and a TileSet for level tiles from a
+``GameSpec`` and the asset registry. No model call is involved; only the
+gameplay scripts are left to the LLM.
+"""
+
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ai_game_dev.constants import PROJECT_ROOT
+from ai_game_dev.engines.godot.resources import (
+    InlineObject,
+    PackedStringArray,
+    ProjectSettings,
+    StringName,
+    TextResource,
+    Vector2,
+    Vector2i,
+    resource_uid,
+)
+from ai_game_dev.specs.game_spec_loader import GameSpec
+
+
+GODOT_VERSION = "4.3"
+WINDOW_SIZE = (1280, 720)
+PIXEL_ART_VIEWPORT = (640, 360)
+TILE_SIZE = 16
+PLAYER_SIZE = 32
+
+# Godot Key enum values (letters are their ASCII code)
+KEY_CODES = {
+    "SPACE": 32,
+    "ESCAPE": 4194305,
+    "ENTER": 4194309,
+    "LEFT": 4194319,
+    "UP": 4194320,
+    "RIGHT": 4194321,
+    "DOWN": 4194322,
+}
+
+INPUT_ACTIONS: Dict[str, tuple[str, ...]] = {
+    "move_left": ("A", "LEFT"),
+    "move_right": ("D", "RIGHT"),
+    "move_up": ("W", "UP"),
+    "move_down": ("S", "DOWN"),
+    "jump": ("SPACE",),
+    "action": ("J", "ENTER"),
+    "pause": ("ESCAPE",),
+}
+
+SCRIPTS = {
+    "main": "res://scripts/Main.gd",
+    "player": "res://scripts/Player.gd",
+    "game_manager": "res://scripts/GameManager.gd",
+    "ui": "res://scripts/UI.gd",
+}
+SCENES = {
+    "main": "res://scenes/Main.tscn",
+    "player": "res://scenes/Player.tscn",
+    "hud": "res://scenes/ui/HUD.tscn",
+}
+PLAYER_FRAMES = "res://resources/player_frames.tres"
+TILESET = "res://resources/tileset.tres"
+
+
+@dataclass
+class GodotProject:
+    """Emitted project files plus the registry assets they reference."""
+    files: Dict[str, str] = field(default_factory=dict)
+    assets: Dict[str, Path] = field(default_factory=dict)  # res:// path -> source file
+
+
+def key_event(key: str) -> InlineObject:
+    """An InputEventKey as Godot writes it in project.godot."""
+    code = KEY_CODES.get(key, ord(key[0]))
+    unicode = 32 if key == "SPACE" else (ord(key.lower()) if len(key) == 1 else 0)
+    return InlineObject("InputEventKey", (
+        ("resource_local_to_scene", False), ("resource_name", ""), ("device", -1), ("window_id", 0),
+        ("alt_pressed", False), ("shift_pressed", False), ("ctrl_pressed", False), ("meta_pressed", False),
+        ("pressed", False), ("keycode", 0), ("physical_keycode", code), ("key_label", 0),
+        ("unicode", unicode), ("location", 0), ("echo", False), ("script", None),
+    ))
+
+
+def png_size(path: Path) -> Optional[tuple[int, int]]:
+    """Width and height from a PNG header, or None if it isn't a PNG."""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if len(header) < 24 or header[:8] != b"\x89PNG\r\n\x1a\n":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def res_path(web_path: str) -> str:
+    """Registry web path to its location in the Godot project."""
+    return f"res://assets/{web_path.rsplit('/', 1)[-1]}"
+
+
+def is_pixel_art(art_style: str) -> bool:
+    return "pixel" in art_style.lower() or "retro" in art_style.lower()
+
+
+class GodotProjectEmitter:
+    """Emits Godot text resources for a game spec."""
+
+    def __init__(self, registry=None, assets_root: Path = PROJECT_ROOT):
+        self._registry = registry
+        self.assets_root = assets_root
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            from ai_game_dev.assets.asset_registry import get_asset_registry
+            self._registry = get_asset_registry()
+        return self._registry
+
+    def emit(self, spec: GameSpec, art_style: str = "modern") -> GodotProject:
+        """Build every boilerplate file for the spec."""
+        project = GodotProject()
+        assets = self._collect_assets(spec, project)
+        pixel_art = is_pixel_art(art_style)
+
+        project.files["project.godot"] = self._project_settings(spec, pixel_art)
+        project.files["resources/player_frames.tres"] = self._sprite_frames(PLAYER_FRAMES, assets.get("player"))
+        if assets.get("tiles"):
+            project.files["resources/tileset.tres"] = self._tileset(assets["tiles"], project)
+        project.files["scenes/Player.tscn"] = self._player_scene()
+        project.files["scenes/ui/HUD.tscn"] = self._hud_scene(spec)
+        project.files["scenes/Main.tscn"] = self._main_scene(assets, "resources/tileset.tres" in project.files)
+        return project
+
+    def _collect_assets(self, spec: GameSpec, project: GodotProject) -> Dict[str, Any]:
+        """Registry assets for the game type that exist on disk, by role."""
+        # No engine formatting: keep web paths so the source files can be found
+        config = self.registry.get_assets_for_game(spec.type, engine="")
+        sprites = config.get("sprites", {})
+
+        def resolve(web_path: Optional[str]) -> Optional[str]:
+            if not web_path or not web_path.lower().endswith(".png"):
+                return None
+            source = self.assets_root / web_path.lstrip("/")
+            if not source.is_file():
+                return None
+            path = res_path(web_path)
+            project.assets[path] = source
+            return path
+
+        return {
+            "player": resolve(sprites.get("player")),
+            "tiles": [path for path in map(resolve, sprites.get("tiles", [])) if path],
+            "background": next(filter(None, map(resolve, config.get("backgrounds", []))), None),
+        }
+
+    def _project_settings(self, spec: GameSpec, pixel_art: bool) -> str:
+        settings = ProjectSettings()
+        settings.set("application", "config/name", spec.title)
+        if spec.description_short:
+            settings.set("application", "config/description", spec.description_short)
+        settings.set("application", "run/main_scene", SCENES["main"])
+        settings.set("application", "config/features", PackedStringArray(GODOT_VERSION, "GL Compatibility"))
+
+        settings.set("autoload", "GameManager", f"*{SCRIPTS['game_manager']}")
+
+        if pixel_art:
+            settings.set("display", "window/size/viewport_width", PIXEL_ART_VIEWPORT[0])
+            settings.set("display", "window/size/viewport_height", PIXEL_ART_VIEWPORT[1])
+            settings.set("display", "window/size/window_width_override", WINDOW_SIZE[0])
+            settings.set("display", "window/size/window_height_override", WINDOW_SIZE[1])
+            settings.set("display", "window/stretch/mode", "viewport")
+            settings.set("display", "window/stretch/scale_mode", "integer")
+        else:
+            settings.set("display", "window/size/viewport_width", WINDOW_SIZE[0])
+            settings.set("display", "window/size/viewport_height", WINDOW_SIZE[1])
+            settings.set("display", "window/stretch/mode", "canvas_items")
+
+        for action, keys in INPUT_ACTIONS.items():
+            settings.set("input", action, {"deadzone": 0.5, "events": [key_event(key) for key in keys]})
+
+        settings.set("rendering", "renderer/rendering_method", "gl_compatibility")
+        settings.set("rendering", "renderer/rendering_method.mobile", "gl_compatibility")
+        # Matches the baked imports: pixel art has no mipmaps (Nearest), other art does (Linear Mipmap)
+        settings.set("rendering", "textures/canvas_textures/default_texture_filter", 0 if pixel_art else 2)
+        return settings.render()
+
+    def _sprite_frames(self, path: str, texture: Optional[str]) -> str:
+        resource = TextResource(path, "SpriteFrames")
+        frames = []
+        if texture:
+            frames.append({"duration": 1.0, "texture": resource.ext("Texture2D", texture, resource_uid(texture))})
+        resource.properties["animations"] = [{
+            "frames": frames,
+            "loop": True,
+            "name": StringName("idle"),
+            "speed": 5.0,
+        }]
+        return resource.render()
+
+    def _tileset(self, tiles: List[str], project: GodotProject) -> str:
+        resource = TextResource(TILESET, "TileSet")
+        resource.properties["tile_size"] = Vector2i(TILE_SIZE, TILE_SIZE)
+        for index, texture in enumerate(tiles):
+            width, height = png_size(project.assets[texture]) or (TILE_SIZE, TILE_SIZE)
+            if width % TILE_SIZE or height % TILE_SIZE:
+                region, columns, rows = (width, height), 1, 1
+            else:
+                region, columns, rows = (TILE_SIZE, TILE_SIZE), width // TILE_SIZE, height // TILE_SIZE
+            properties: Dict[str, Any] = {
+                "texture": resource.ext("Texture2D", texture, resource_uid(texture)),
+                "texture_region_size": Vector2i(*region),
+            }
+            properties.update({f"{x}:{y}/0": 0 for y in range(rows) for x in range(columns)})
+            resource.properties[f"sources/{index}"] = resource.sub("TileSetAtlasSource", properties)
+        return resource.render()
+
+    def _player_scene(self) -> str:
+        scene = TextResource(SCENES["player"])
+        script = scene.ext("Script", SCRIPTS["player"])
+        frames = scene.ext("SpriteFrames", PLAYER_FRAMES, resource_uid(PLAYER_FRAMES))
+        shape = scene.sub("RectangleShape2D", {"size": Vector2(PLAYER_SIZE, PLAYER_SIZE)})
+
+        scene.node("Player", "CharacterBody2D", properties={"script": script})
+        scene.node("AnimatedSprite2D", "AnimatedSprite2D", ".", properties={
+            "sprite_frames": frames,
+            "animation": StringName("idle"),
+            "autoplay": "idle",
+        })
+        scene.node("CollisionShape2D", "CollisionShape2D", ".", properties={"shape": shape})
+        scene.node("Camera2D", "Camera2D", ".", properties={"position_smoothing_enabled": True})
+        return scene.render()
+
+    def _hud_scene(self, spec: GameSpec) -> str:
+        scene = TextResource(SCENES["hud"])
+        script = scene.ext("Script", SCRIPTS["ui"])
+
+        scene.node("HUD", "CanvasLayer", properties={"script": script})
+        scene.node("ScoreLabel", "Label", ".", properties={
+            "offset_left": 16.0,
+            "offset_top": 16.0,
+            "offset_right": 216.0,
+            "offset_bottom": 42.0,
+            "text": "Score: 0",
+        })
+        scene.node("PauseMenu", "Control", ".", properties={
+            "visible": False,
+            "layout_mode": 3,
+            "anchors_preset": 15,
+            "anchor_right": 1.0,
+            "anchor_bottom": 1.0,
+        })
+        scene.node("Title", "Label", "PauseMenu", properties={
+            "layout_mode": 1,
+            "anchors_preset": 8,
+            "anchor_left": 0.5,
+            "anchor_top": 0.5,
+            "anchor_right": 0.5,
+            "anchor_bottom": 0.5,
+            "text": f"{spec.title} - Paused",
+            "horizontal_alignment": 1,
+        })
+        return scene.render()
+
+    def _main_scene(self, assets: Dict[str, Any], has_tileset: bool) -> str:
+        scene = TextResource(SCENES["main"])
+        script = scene.ext("Script", SCRIPTS["main"])
+        player = scene.ext("PackedScene", SCENES["player"], resource_uid(SCENES["player"]))
+        hud = scene.ext("PackedScene", SCENES["hud"], resource_uid(SCENES["hud"]))
+
+        scene.node("Main", "Node2D", properties={"script": script})
+        if assets.get("background"):
+            texture = scene.ext("Texture2D", assets["background"], resource_uid(assets["background"]))
+            scene.node("Background", "Sprite2D", ".", properties={
+                "z_index": -10,
+                "texture": texture,
+                "centered": False,
+            })
+        if has_tileset:
+            tileset = scene.ext("TileSet", TILESET, resource_uid(TILESET))
+            scene.node("Level", "TileMapLayer", ".", properties={"tile_set": tileset})
+        scene.node("Player", parent=".", instance=player, properties={
+            "position": Vector2(WINDOW_SIZE[0] / 2, WINDOW_SIZE[1] / 2),
+        })
+        scene.node("HUD", parent=".", instance=hud)
+        return scene.render()
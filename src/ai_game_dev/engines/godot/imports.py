@@ -0,0 +1,194 @@
+"""
+Pre-baked Godot import data for registry textures.
+
+Godot imports every PNG the first time a project is opened, which for a
+freshly generated project means waiting on the importer before a headless
+export can even start. This stage writes what the importer would: the
+``.import`` sidecar next to each texture, the compressed ``.ctex`` under
+``.godot/imported`` and the ``.md5`` file Godot checks to decide that the
+import is current.
+
+Textures are stored lossless (Godot's 2D default). Pixel art is stored
+without mipmaps or alpha-border fixing, since it is drawn with nearest
+filtering; other art gets a mipmap chain and bleeds edge colors into
+transparent pixels so linear filtering doesn't show dark fringes.
+"""
+
+import hashlib
+import io
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+from ai_game_dev.engines.godot.resources import ConfigFile, resource_uid
+
+
+IMPORTED_DIR = "res://.godot/imported"
+CTEX_FORMAT_VERSION = 1
+CTEX_DATA_FORMAT_PNG = 1
+CTEX_FLAG_HAS_MIPMAPS = 1 << 23
+ALPHA_BORDER_RADIUS = 4
+ALPHA_BORDER_THRESHOLD = 20
+
+# Godot Image::Format values for the PIL modes we store
+IMAGE_FORMATS = {"L": 0, "LA": 1, "RGB": 4, "RGBA": 5}
+
+
+def import_base_path(res_path: str) -> str:
+    """Where Godot keeps imported data for a source file."""
+    file_name = res_path.rsplit("/", 1)[-1]
+    return f"{IMPORTED_DIR}/{file_name}-{hashlib.md5(res_path.encode('utf-8')).hexdigest()}"
+
+
+def project_relative(res_path: str) -> str:
+    return res_path.removeprefix("res://")
+
+
+def fix_alpha_border(image: Image.Image) -> Image.Image:
+    """Copy the color of the nearest visible pixel into transparent ones (alpha stays 0)."""
+    pixels = np.array(image)
+    alpha = pixels[..., -1]
+    visible = alpha > ALPHA_BORDER_THRESHOLD
+    if visible.all() or not visible.any():
+        return image
+
+    height, width = alpha.shape
+    fixed = pixels.copy()
+    pending = ~visible
+    offsets = sorted(
+        ((dx, dy) for dy in range(-ALPHA_BORDER_RADIUS, ALPHA_BORDER_RADIUS + 1)
+         for dx in range(-ALPHA_BORDER_RADIUS, ALPHA_BORDER_RADIUS + 1)
+         if (dx or dy) and dx * dx + dy * dy <= ALPHA_BORDER_RADIUS ** 2),
+        key=lambda offset: (offset[0] ** 2 + offset[1] ** 2, offset[1], offset[0]),
+    )
+    for dx, dy in offsets:
+        # Pixels at (y, x) take their color from (y + dy, x + dx)
+        target = (slice(max(0, -dy), height - max(0, dy)), slice(max(0, -dx), width - max(0, dx)))
+        source = (slice(max(0, dy), height - max(0, -dy)), slice(max(0, dx), width - max(0, -dx)))
+        fill = pending[target] & visible[source]
+        if fill.any():
+            fixed[target][fill, :-1] = pixels[source][fill, :-1]
+            pending[target] &= ~fill
+        if not pending.any():
+            break
+    return Image.fromarray(fixed, image.mode)
+
+
+def mipmap_chain(image: Image.Image) -> list[Image.Image]:
+    """The image and every halved level down to 1x1."""
+    levels = [image]
+    width, height = image.size
+    while width > 1 or height > 1:
+        width, height = max(1, width >> 1), max(1, height >> 1)
+        levels.append(levels[-1].resize((width, height), Image.Resampling.BOX))
+    return levels
+
+
+def _png_bytes(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=False)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=256)
+def compressed_texture(source: bytes, pixel_art: bool) -> bytes:
+    """A lossless CompressedTexture2D (``.ctex``) for PNG data.
+
+    Cached on the source bytes, since the same registry textures are baked
+    into every generated project.
+    """
+    with Image.open(io.BytesIO(source)) as opened:
+        opened.load()
+        image = opened if opened.mode in IMAGE_FORMATS else opened.convert("RGBA")
+
+    if not pixel_art and image.mode in ("LA", "RGBA"):
+        image = fix_alpha_border(image)
+    levels = [image] if pixel_art else mipmap_chain(image)
+
+    width, height = image.size
+    header = b"GST2" + struct.pack(
+        "<IIIIiIII",
+        CTEX_FORMAT_VERSION,
+        width,
+        height,
+        0 if pixel_art else CTEX_FLAG_HAS_MIPMAPS,
+        -1,  # mipmap limit
+        0, 0, 0,  # reserved
+    )
+    body = [struct.pack("<IHHII", CTEX_DATA_FORMAT_PNG, width, height, len(levels) - 1, IMAGE_FORMATS[image.mode])]
+    for level in levels:
+        # Each lossless level is tagged "PNG " and the tag counts in its length
+        data = b"PNG " + _png_bytes(level)
+        body.append(struct.pack("<I", len(data)) + data)
+    return header + b"".join(body)
+
+
+def texture_import(res_path: str, pixel_art: bool) -> str:
+    """The ``.import`` sidecar for a texture baked by ``compressed_texture``."""
+    ctex_path = f"{import_base_path(res_path)}.ctex"
+    sidecar = ConfigFile()
+    sidecar.set("remap", "importer", "texture")
+    sidecar.set("remap", "type", "CompressedTexture2D")
+    sidecar.set("remap", "uid", resource_uid(res_path))
+    sidecar.set("remap", "path", ctex_path)
+    sidecar.set("remap", "metadata", {"vram_texture": False})
+    sidecar.set("deps", "source_file", res_path)
+    sidecar.set("deps", "dest_files", [ctex_path])
+    params = {
+        "compress/mode": 0,  # lossless
+        "compress/high_quality": False,
+        "compress/lossy_quality": 0.7,
+        "compress/hdr_compression": 1,
+        "compress/normal_map": 0,
+        "compress/channel_pack": 0,
+        "mipmaps/generate": not pixel_art,
+        "mipmaps/limit": -1,
+        "roughness/mode": 0,
+        "roughness/src_normal": "",
+        "process/fix_alpha_border": not pixel_art,
+        "process/premult_alpha": False,
+        "process/normal_map_invert_y": False,
+        "process/hdr_as_srgb": False,
+        "process/hdr_clamp_exposure": False,
+        "process/size_limit": 0,
+        "detect_3d/compress_to": 0,  # 2D only; never switch to VRAM compression
+    }
+    for key, value in params.items():
+        sidecar.set("params", key, value)
+    return sidecar.render()
+
+
+def bake_texture(res_path: str, source: Path, pixel_art: bool) -> Dict[str, bytes]:
+    """Sidecar, ``.ctex`` and ``.md5`` for one texture, keyed by project-relative path."""
+    data = source.read_bytes()
+    ctex = compressed_texture(data, pixel_art)
+    base = project_relative(import_base_path(res_path))
+    md5s = (
+        f'source_md5="{hashlib.md5(data).hexdigest()}"\n'
+        f'dest_md5="{hashlib.md5(ctex).hexdigest()}"\n'
+    )
+    return {
+        f"{project_relative(res_path)}.import": texture_import(res_path, pixel_art).encode("utf-8"),
+        f"{base}.ctex": ctex,
+        f"{base}.md5": md5s.encode("utf-8"),
+    }
+
+
+def bake_imports(assets: Dict[str, Path], pixel_art: bool, workers: Optional[int] = None) -> Dict[str, bytes]:
+    """Import data for every PNG in ``res:// path -> source file``.
+
+    Textures are encoded on a thread pool (Pillow and zlib release the GIL).
+    """
+    textures = sorted((path, source) for path, source in assets.items() if path.lower().endswith(".png"))
+    if not textures:
+        return {}
+    baked: Dict[str, bytes] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for files in pool.map(lambda item: bake_texture(item[0], item[1], pixel_art), textures):
+            baked.update(files)
+    return baked
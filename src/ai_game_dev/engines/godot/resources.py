@@ -0,0 +1,237 @@
+"""
+Writer for Godot 4 text resources (.tscn, .tres, project.godot and .import).
+
+Values are converted from Python with ``to_godot``; engine types such as
+``Vector2`` or ``ExtResource`` are small helper objects. Resource ids and
+UIDs are derived from content keys, so the same project always serializes
+to the same bytes.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+RESOURCE_FORMAT = 3
+UID_CHARACTERS = "abcdefghijklmnopqrstuvwxy012345678"  # Godot's base-34 UID alphabet
+
+
+def stable_hash(key: str) -> int:
+    """A 63-bit integer derived from a key (Godot UIDs are positive int64)."""
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+def resource_uid(key: str) -> str:
+    """A deterministic ``uid://`` string in Godot's text encoding."""
+    value = stable_hash(key)
+    digits = []
+    while True:
+        value, remainder = divmod(value, len(UID_CHARACTERS))
+        digits.append(UID_CHARACTERS[remainder])
+        if not value:
+            break
+    return "uid://" + "".join(reversed(digits))
+
+
+def short_id(key: str, length: int = 5) -> str:
+    """Short lowercase suffix for resource ids (``1_ab3cd``)."""
+    value = stable_hash(key)
+    alphabet = "abcdefghijklmnopqrstuvwxyz0123456789"
+    chars = []
+    for _ in range(length):
+        value, remainder = divmod(value, len(alphabet))
+        chars.append(alphabet[remainder])
+    return "".join(chars)
+
+
+@dataclass(frozen=True)
+class GodotCall:
+    """A constructor-style value: ``Vector2(1, 2)``, ``ExtResource("1_x")``."""
+    type_name: str
+    args: tuple = ()
+
+    def __str__(self) -> str:
+        # Godot writes whole-number constructor arguments without a decimal point
+        args = (
+            str(int(arg)) if isinstance(arg, float) and arg.is_integer() else to_godot(arg)
+            for arg in self.args
+        )
+        return f"{self.type_name}({', '.join(args)})"
+
+
+@dataclass(frozen=True)
+class StringName:
+    """A ``&"name"`` literal."""
+    name: str
+
+    def __str__(self) -> str:
+        return "&" + to_godot(self.name)
+
+
+@dataclass(frozen=True)
+class InlineObject:
+    """An ``Object(Type, "prop": value, ...)`` literal, as used in input maps."""
+    type_name: str
+    properties: tuple
+
+    def __str__(self) -> str:
+        props = ",".join(f"{to_godot(key)}:{to_godot(value)}" for key, value in self.properties)
+        return f"Object({self.type_name},{props})"
+
+
+def Vector2(x: float, y: float) -> GodotCall:
+    return GodotCall("Vector2", (float(x), float(y)))
+
+
+def Vector2i(x: int, y: int) -> GodotCall:
+    return GodotCall("Vector2i", (int(x), int(y)))
+
+
+def Color(r: float, g: float, b: float, a: float = 1.0) -> GodotCall:
+    return GodotCall("Color", (float(r), float(g), float(b), float(a)))
+
+
+def PackedStringArray(*items: str) -> GodotCall:
+    return GodotCall("PackedStringArray", items)
+
+
+def to_godot(value: Any) -> str:
+    """Serialize a Python value in Godot's text resource syntax."""
+    if isinstance(value, (GodotCall, StringName, InlineObject)):
+        return str(value)
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return repr(value) if not value.is_integer() else f"{value:.1f}"
+    if isinstance(value, str):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return f'"{escaped}"'
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(to_godot(item) for item in value) + "]"
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        return "{\n" + ",\n".join(f"{to_godot(key)}: {to_godot(item)}" for key, item in value.items()) + "\n}"
+    raise TypeError(f"Can't serialize {type(value).__name__} as a Godot value")
+
+
+@dataclass
+class _Section:
+    header: str
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+    def render(self) -> str:
+        lines = [f"[{self.header}]"]
+        lines.extend(f"{key} = {to_godot(value)}" for key, value in self.properties.items())
+        return "\n".join(lines)
+
+
+def _attributes(**attributes: Any) -> str:
+    return " ".join(f"{key}={to_godot(value)}" for key, value in attributes.items() if value is not None)
+
+
+class TextResource:
+    """Builder for a ``.tscn`` scene (``resource_type=None``) or ``.tres`` resource."""
+
+    def __init__(self, path: str, resource_type: Optional[str] = None):
+        self.path = path
+        self.resource_type = resource_type
+        self.uid = resource_uid(path)
+        self.properties: Dict[str, Any] = {}
+        self._ext: Dict[str, tuple[str, GodotCall, Optional[str]]] = {}
+        self._sub: List[_Section] = []
+        self._nodes: List[_Section] = []
+        self._connections: List[str] = []
+
+    def ext(self, type_name: str, path: str, uid: Optional[str] = None) -> GodotCall:
+        """Reference an external resource, returning its ``ExtResource``."""
+        if path not in self._ext:
+            resource_id = f"{len(self._ext) + 1}_{short_id(path)}"
+            self._ext[path] = (type_name, GodotCall("ExtResource", (resource_id,)), uid)
+        return self._ext[path][1]
+
+    def sub(self, type_name: str, properties: Optional[Dict[str, Any]] = None) -> GodotCall:
+        """Add an embedded sub-resource, returning its ``SubResource``."""
+        resource_id = f"{type_name}_{short_id(f'{self.path}:{len(self._sub)}')}"
+        self._sub.append(_Section(
+            f'sub_resource {_attributes(type=type_name, id=resource_id)}',
+            dict(properties or {}),
+        ))
+        return GodotCall("SubResource", (resource_id,))
+
+    def node(
+        self,
+        name: str,
+        type_name: Optional[str] = None,
+        parent: Optional[str] = None,
+        instance: Optional[GodotCall] = None,
+        properties: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Add a node; the first node added is the scene root."""
+        header = f"node {_attributes(name=name, type=type_name, parent=parent)}"
+        if instance is not None:
+            header += f" instance={instance}"
+        self._nodes.append(_Section(header, dict(properties or {})))
+
+    def connect(self, signal: str, source: str, target: str, method: str) -> None:
+        self._connections.append(f"[connection {_attributes(signal=signal, **{'from': source}, to=target, method=method)}]")
+
+    def render(self) -> str:
+        load_steps = len(self._ext) + len(self._sub) + 1
+        if self.resource_type is None:
+            header = f"gd_scene {_attributes(load_steps=load_steps, format=RESOURCE_FORMAT, uid=self.uid)}"
+        else:
+            header = f"gd_resource {_attributes(type=self.resource_type, load_steps=load_steps, format=RESOURCE_FORMAT, uid=self.uid)}"
+        if load_steps == 1:
+            header = header.replace(" load_steps=1", "")
+
+        blocks = [f"[{header}]"]
+        if self._ext:
+            blocks.append("\n".join(
+                f"[ext_resource {_attributes(type=type_name, uid=uid, path=path, id=reference.args[0])}]"
+                for path, (type_name, reference, uid) in self._ext.items()
+            ))
+        blocks.extend(section.render() for section in self._sub)
+        if self.resource_type is not None:
+            blocks.append(_Section("resource", self.properties).render())
+        blocks.extend(section.render() for section in self._nodes)
+        blocks.extend(self._connections)
+        return "\n\n".join(blocks) + "\n"
+
+
+class ConfigFile:
+    """Builder for Godot's ``[section]`` / ``key=value`` files (``.import`` sidecars)."""
+
+    HEADER = ""
+
+    def __init__(self):
+        self.sections: Dict[str, Dict[str, Any]] = {}
+
+    def set(self, section: str, key: str, value: Any) -> None:
+        self.sections.setdefault(section, {})[key] = value
+
+    def render(self) -> str:
+        blocks = [self.HEADER] if self.HEADER else []
+        for section, values in self.sections.items():
+            lines = [f"[{section}]", ""]
+            lines.extend(f"{key}={to_godot(value)}" for key, value in values.items())
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks) + "\n"
+
+
+class ProjectSettings(ConfigFile):
+    """Builder for ``project.godot``."""
+
+    HEADER = """; Engine configuration file.
+; It's best edited using the editor UI and not directly,
+; since the parameters that go here are not all obvious.
+;
+; Format:
+;   [section] ; section goes between []
+;   param=value ; assign values to parameters
+
+config_version=5"""
@@ -1,14 +1,50 @@
 """
 Modern engine management system with proper adapter architecture.
 Replaces the old monolithic engine_adapters.py with clean, modular design.
+
+Adapters are registered as factories and only imported and built the
+first time an engine is used. Third-party engines register either with
+``register_engine`` or through the ``ai_game_dev.engines`` entry point
+group, pointing at an adapter class::
+
+    [project.entry-points."ai_game_dev.engines"]
+    defold = "defold_ai.adapter:DefoldAdapter"
 """
-from typing import Dict, Optional, List
-from pathlib import Path
+from importlib import import_module
+from importlib.metadata import EntryPoint, entry_points
+from typing import Callable, Dict, Optional, List, Union
 
 from ai_game_dev.engines.base import BaseEngineAdapter, EngineGenerationResult
-from ai_game_dev.engines.pygame import PygameAdapter
-from ai_game_dev.engines.bevy import BevyAdapter  
-from ai_game_dev.engines.godot import GodotAdapter
+
+
+ENTRY_POINT_GROUP = "ai_game_dev.engines"
+
+# An adapter class/callable, or a "module:attribute" path to one
+AdapterFactory = Union[Callable[[], BaseEngineAdapter], str]
+
+_registered_engines: Dict[str, AdapterFactory] = {
+    "pygame": "ai_game_dev.engines.pygame:PygameAdapter",
+    "bevy": "ai_game_dev.engines.bevy:BevyAdapter",
+    "godot": "ai_game_dev.engines.godot:GodotAdapter",
+}
+
+
+def register_engine(name: str, factory: AdapterFactory) -> None:
+    """Register an adapter factory for an engine name.
+
+    Managers created afterwards pick it up; existing managers see it for
+    engines they haven't built yet.
+    """
+    _registered_engines[name.lower()] = factory
+
+
+def _load_factory(factory: Union[AdapterFactory, EntryPoint]) -> Callable[[], BaseEngineAdapter]:
+    if isinstance(factory, EntryPoint):
+        return factory.load()
+    if isinstance(factory, str):
+        module_name, _, attribute = factory.partition(":")
+        return getattr(import_module(module_name), attribute)
+    return factory
 
 
 class EngineManager:
@@ -18,19 +54,35 @@ class EngineManager:
     """
     
     def __init__(self):
-        self._adapters: Dict[str, BaseEngineAdapter] = {
-            "pygame": PygameAdapter(),
-            "bevy": BevyAdapter(),
-            "godot": GodotAdapter()
-        }
+        self._adapters: Dict[str, BaseEngineAdapter] = {}
+        self._plugins: Optional[Dict[str, EntryPoint]] = None
+    
+    def _discover_plugins(self) -> Dict[str, EntryPoint]:
+        """Entry-point engines, read once (nothing is imported until used)."""
+        if self._plugins is None:
+            self._plugins = {ep.name.lower(): ep for ep in entry_points(group=ENTRY_POINT_GROUP)}
+        return self._plugins
+    
+    def _factory(self, engine_name: str) -> Optional[Union[AdapterFactory, EntryPoint]]:
+        if engine_name in _registered_engines:
+            return _registered_engines[engine_name]
+        return self._discover_plugins().get(engine_name)
     
     def get_supported_engines(self) -> List[str]:
         """Get list of supported game engines."""
-        return list(self._adapters.keys())
+        engines = list(_registered_engines)
+        engines.extend(name for name in self._discover_plugins() if name not in _registered_engines)
+        return engines
     
     def get_adapter(self, engine_name: str) -> Optional[BaseEngineAdapter]:
-        """Get adapter for specific engine."""
-        return self._adapters.get(engine_name.lower())
+        """Get adapter for specific engine, building it on first use."""
+        engine_name = engine_name.lower()
+        if engine_name not in self._adapters:
+            factory = self._factory(engine_name)
+            if factory is None:
+                return None
+            self._adapters[engine_name] = _load_factory(factory)()
+        return self._adapters[engine_name]
     
     async def generate_for_engine(
         self,
@@ -85,7 +137,7 @@ class EngineManager:
         }
 
 
-# Create global instance for backward compatibility
+# Create global instance for backward compatibility (builds no adapters)
 engine_manager = EngineManager()
 
 
@@ -0,0 +1,169 @@
+"""
+Incremental, atomic writer for generated project trees.
+
+Every file is written to a temporary file next to its destination and
+renamed into place, so an interrupted write never leaves a truncated file.
+Files whose content hasn't changed are left untouched (keeping their
+mtimes, which cargo and Godot's import cache rely on), and files written
+by a previous generation that are no longer produced are removed. A
+manifest of content hashes in the project directory makes the unchanged
+check a ``stat`` for files nobody has edited since.
+
+File I/O runs on worker threads, so writing a project doesn't block the
+event loop.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import secrets
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Union
+
+
+MANIFEST_NAME = ".ai_game_dev_manifest.json"
+DEFAULT_CONCURRENCY = 16
+
+FileContent = Union[str, bytes]
+
+
+@dataclass
+class WriteManifest:
+    """What a project write did, by project-relative path."""
+    project_path: Path
+    changed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "project_path": str(self.project_path),
+            "changed": self.changed,
+            "unchanged": self.unchanged,
+            "removed": self.removed,
+        }
+
+
+def _relative_path(name: str) -> str:
+    """Normalize a project-relative path, refusing ones that leave the project."""
+    path = PurePosixPath(name.replace("\\", "/"))
+    if path.is_absolute() or ".." in path.parts or not path.parts or path.as_posix() == MANIFEST_NAME:
+        raise ValueError(f"Invalid project file path: {name!r}")
+    return path.as_posix()
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write via a temporary file in the same directory and rename it over ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    try:
+        with open(tmp_path, "xb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _read_manifest(project_path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(project_path / MANIFEST_NAME, encoding="utf-8") as f:
+            files = json.load(f).get("files", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    if not isinstance(files, dict):
+        return {}
+    valid = {}
+    for name, entry in files.items():
+        try:
+            if _relative_path(name) == name and isinstance(entry, dict) and "sha256" in entry:
+                valid[name] = entry
+        except ValueError:
+            pass
+    return valid
+
+
+def _entry(path: Path, sha256: str) -> Dict[str, Any]:
+    stat = path.stat()
+    return {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _sync_file(path: Path, data: bytes, previous: Optional[Dict[str, Any]]) -> tuple[bool, Dict[str, Any]]:
+    """Write one file unless it already holds ``data``; returns (changed, manifest entry)."""
+    sha256 = hashlib.sha256(data).hexdigest()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        stat = None
+
+    if stat is not None and stat.st_size == len(data):
+        untouched = (
+            previous is not None
+            and previous.get("size") == stat.st_size
+            and previous.get("mtime_ns") == stat.st_mtime_ns
+        )
+        # Trust the manifest for files that haven't been touched since we wrote them
+        current = previous["sha256"] if untouched else _file_sha256(path)
+        if current == sha256:
+            return False, _entry(path, sha256)
+
+    atomic_write(path, data)
+    return True, _entry(path, sha256)
+
+
+def _remove(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+async def write_project(
+    project_path: Path,
+    files: Dict[str, FileContent],
+    concurrency: int = DEFAULT_CONCURRENCY
+) -> WriteManifest:
+    """Bring ``project_path`` in line with ``files`` (relative path -> text or bytes).
+
+    Only files recorded in the previous manifest are ever removed; anything
+    else in the directory is left alone.
+    """
+    project_path = Path(project_path)
+    encoded = {
+        _relative_path(name): content.encode("utf-8") if isinstance(content, str) else bytes(content)
+        for name, content in files.items()
+    }
+    await asyncio.to_thread(project_path.mkdir, parents=True, exist_ok=True)
+    previous = await asyncio.to_thread(_read_manifest, project_path)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write_one(name: str, data: bytes) -> tuple[bool, Dict[str, Any]]:
+        async with semaphore:
+            return await asyncio.to_thread(_sync_file, project_path / name, data, previous.get(name))
+
+    async def remove_one(name: str) -> None:
+        async with semaphore:
+            await asyncio.to_thread(_remove, project_path / name)
+
+    names = sorted(encoded)
+    results = await asyncio.gather(*(write_one(name, encoded[name]) for name in names))
+    removed = sorted(name for name in previous if name not in encoded)
+    await asyncio.gather(*(remove_one(name) for name in removed))
+
+    manifest = WriteManifest(project_path=project_path, removed=removed)
+    entries: Dict[str, Dict[str, Any]] = {}
+    for name, (changed, entry) in zip(names, results):
+        (manifest.changed if changed else manifest.unchanged).append(name)
+        entries[name] = entry
+
+    # Written last: after a crash the next write re-checks files against disk
+    manifest_data = json.dumps({"files": entries}, indent=2, sort_keys=True).encode("utf-8")
+    await asyncio.to_thread(atomic_write, project_path / MANIFEST_NAME, manifest_data)
+    return manifest
@@ -5,6 +5,7 @@ Generates complete, working Pygame projects with professional structure.
 from typing import Dict, List
 from pathlib import Path
 
+from ai_game_dev.audio.audio_sprite import PYGAME_SPRITE_PLAYER
 from ai_game_dev.engines.base import BaseEngineAdapter, EngineGenerationResult
 
 
@@ -138,20 +139,26 @@ A {complexity} complexity Pygame game featuring:
 - `game.py`: Core game logic and state management
 - `player.py`: Player character implementation
 - `utils.py`: Utility functions and constants
+- `audio_sprites.py`: Plays packed audio sprites (one file for all sound effects on the web)
 """
         
-        # Generate all code files
-        generated_files = {
-            "main.py": await self.generate_code_with_llm(main_prompt),
-            "game.py": await self.generate_code_with_llm(game_prompt),
-            "player.py": await self.generate_code_with_llm(player_prompt),
-            "utils.py": await self.generate_code_with_llm(utils_prompt),
+        # Generate all code files; modules that don't compile or import names
+        # their siblings don't define are re-prompted on their own
+        static_files = {
+            "audio_sprites.py": PYGAME_SPRITE_PLAYER,
             "requirements.txt": requirements_content,
             "README.md": readme_content
         }
+        code_files, validation_issues = await self.generate_files_with_llm({
+            "main.py": main_prompt,
+            "game.py": game_prompt,
+            "player.py": player_prompt,
+            "utils.py": utils_prompt,
+        }, static_files)
+        generated_files = {**code_files, **static_files}
         
         # Save files to disk
-        project_path = await self.save_project_files(project_name, generated_files)
+        manifest = await self.write_project_files(project_name, generated_files)
         
         return EngineGenerationResult(
             engine_type="pygame",
@@ -161,7 +168,9 @@ A {complexity} complexity Pygame game featuring:
             build_instructions=self.get_build_instructions(),
             deployment_notes="Use PyInstaller or cx_Freeze for standalone executables",
             generated_files=generated_files,
-            project_path=project_path
+            project_path=manifest.project_path,
+            write_manifest=manifest,
+            validation_issues=validation_issues
         )
     
     def get_project_template(self) -> Dict[str, str]:
@@ -171,6 +180,7 @@ A {complexity} complexity Pygame game featuring:
             "game.py": "Core game logic and state management", 
             "player.py": "Player character implementation",
             "utils.py": "Utility functions and constants",
+            "audio_sprites.py": "Audio sprite playback helper",
             "assets/": "Asset files directory",
             "assets/images/": "Image assets",
             "assets/sounds/": "Audio assets",
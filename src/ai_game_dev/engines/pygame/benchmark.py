@@ -0,0 +1,191 @@
+"""
+Headless smoke-run and frame-time benchmark for generated pygame projects.
+
+The project runs in a child process with SDL's dummy video and audio
+drivers (see ``smoke_harness.py``), receives a scripted sequence of key
+and mouse input, and is stopped after a fixed number of frames. The run
+fails if the game raises, exits early, hangs, or can't hold the FPS
+budget; either way the report carries frame/update/draw times, allocation
+counts and peak RSS so generator changes show up as numbers.
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PYGAME_AVAILABLE = find_spec("pygame") is not None
+
+HARNESS = Path(__file__).with_name("smoke_harness.py")
+DEFAULT_FRAMES = 600
+DEFAULT_FPS_BUDGET = 60.0
+DEFAULT_TIMEOUT = 60.0
+WARMUP_FRAMES = 10
+
+# Get past a title screen, then move, jump and click
+DEFAULT_INPUT_SCRIPT: List[Dict[str, Any]] = [
+    {"frame": 5, "type": "KEYDOWN", "key": "K_RETURN"},
+    {"frame": 7, "type": "KEYUP", "key": "K_RETURN"},
+    {"frame": 20, "type": "KEYDOWN", "key": "K_RIGHT"},
+    {"frame": 80, "type": "KEYUP", "key": "K_RIGHT"},
+    {"frame": 90, "type": "KEYDOWN", "key": "K_SPACE"},
+    {"frame": 95, "type": "KEYUP", "key": "K_SPACE"},
+    {"frame": 110, "type": "KEYDOWN", "key": "K_LEFT"},
+    {"frame": 170, "type": "KEYUP", "key": "K_LEFT"},
+    {"frame": 180, "type": "KEYDOWN", "key": "K_UP"},
+    {"frame": 200, "type": "KEYUP", "key": "K_UP"},
+    {"frame": 210, "type": "MOUSEMOTION", "pos": [320, 240], "rel": [0, 0], "buttons": [0, 0, 0]},
+    {"frame": 212, "type": "MOUSEBUTTONDOWN", "pos": [320, 240], "button": 1},
+    {"frame": 214, "type": "MOUSEBUTTONUP", "pos": [320, 240], "button": 1},
+]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Mean and percentiles of a timing series, in the series' units."""
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def percentile(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(percentile(0.50), 3),
+        "p95": round(percentile(0.95), 3),
+        "p99": round(percentile(0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+@dataclass
+class SmokeRunReport:
+    """Outcome and measurements of one headless run."""
+    passed: bool
+    frames: int
+    frames_requested: int
+    fps: float = 0.0
+    fps_budget: float = DEFAULT_FPS_BUDGET
+    frame_ms: Dict[str, float] = field(default_factory=dict)
+    update_ms: Dict[str, float] = field(default_factory=dict)
+    draw_ms: Dict[str, float] = field(default_factory=dict)
+    frames_over_budget: int = 0
+    allocated_blocks_per_frame: float = 0.0  # mean net change in live allocations
+    allocated_blocks_growth: int = 0
+    gc_collections: int = 0
+    peak_rss_mb: Optional[float] = None
+    failures: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    stderr: str = ""
+    duration_s: float = 0.0
+    recorded_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def build_report(result: Dict[str, Any], frames: int, fps_budget: float) -> SmokeRunReport:
+    """Turn the harness's raw per-frame samples into a report with pass/fail."""
+    measured = slice(WARMUP_FRAMES, None) if len(result.get("frame_ms", [])) > WARMUP_FRAMES * 2 else slice(None)
+    frame_ms = result.get("frame_ms", [])[measured]
+    blocks = result.get("allocated_blocks", [])[measured]
+    budget_ms = 1000 / fps_budget
+    mean_ms = statistics.fmean(frame_ms) if frame_ms else 0.0
+
+    report = SmokeRunReport(
+        passed=True,
+        frames=result.get("frames", 0),
+        frames_requested=frames,
+        fps=round(1000 / mean_ms, 1) if mean_ms > 0 else 0.0,
+        fps_budget=fps_budget,
+        frame_ms=summarize(frame_ms),
+        update_ms=summarize(result.get("update_ms", [])[measured]),
+        draw_ms=summarize(result.get("draw_ms", [])[measured]),
+        frames_over_budget=sum(ms > budget_ms for ms in frame_ms),
+        allocated_blocks_per_frame=round((blocks[-1] - blocks[0]) / (len(blocks) - 1), 2) if len(blocks) > 1 else 0.0,
+        allocated_blocks_growth=blocks[-1] - blocks[0] if blocks else 0,
+        gc_collections=result.get("gc_collections", 0),
+        peak_rss_mb=round(result["peak_rss_kb"] / 1024, 1) if result.get("peak_rss_kb") else None,
+        error=result.get("error"),
+    )
+
+    if report.error:
+        report.failures.append("Game raised an exception")
+    elif not result.get("completed"):
+        report.failures.append(f"Game exited after {report.frames} of {frames} frames")
+    if frame_ms and report.fps < fps_budget:
+        report.failures.append(f"Ran at {report.fps} FPS, below the {fps_budget:g} FPS budget")
+    report.passed = not report.failures
+    return report
+
+
+async def smoke_run(
+    project_path: Path,
+    frames: int = DEFAULT_FRAMES,
+    fps_budget: float = DEFAULT_FPS_BUDGET,
+    input_script: Optional[List[Dict[str, Any]]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    entry: str = "main.py"
+) -> SmokeRunReport:
+    """Run a generated pygame project headlessly for ``frames`` frames and measure it."""
+    project_path = Path(project_path)
+    if not PYGAME_AVAILABLE:
+        return SmokeRunReport(False, 0, frames, fps_budget=fps_budget,
+                              failures=["pygame is not installed; install the 'pygame' extra"])
+    if not (project_path / entry).is_file():
+        return SmokeRunReport(False, 0, frames, fps_budget=fps_budget, failures=[f"{entry} not found"])
+
+    config = {
+        "frames": frames,
+        "entry": entry,
+        "input": DEFAULT_INPUT_SCRIPT if input_script is None else input_script,
+    }
+    env = {
+        **os.environ,
+        "SDL_VIDEODRIVER": "dummy",
+        "SDL_AUDIODRIVER": "dummy",
+        "PYGAME_HIDE_SUPPORT_PROMPT": "1",
+    }
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="pygame-smoke-") as scratch:
+        config_path = Path(scratch) / "config.json"
+        result_path = Path(scratch) / "result.json"
+        config_path.write_text(json.dumps(config), encoding="utf-8")
+
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, str(HARNESS), str(project_path), str(config_path), str(result_path),
+            cwd=project_path,
+            env=env,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return SmokeRunReport(False, 0, frames, fps_budget=fps_budget,
+                                  failures=[f"Timed out after {timeout:g}s (the game never reached {frames} frames)"],
+                                  duration_s=round(time.perf_counter() - start, 2))
+        stderr_text = stderr.decode("utf-8", "replace")[-4000:]
+
+        try:
+            result = json.loads(result_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return SmokeRunReport(False, 0, frames, fps_budget=fps_budget,
+                                  failures=[f"Harness crashed (exit code {process.returncode})"],
+                                  stderr=stderr_text, duration_s=round(time.perf_counter() - start, 2))
+
+    report = build_report(result, frames, fps_budget)
+    report.stderr = stderr_text
+    report.duration_s = round(time.perf_counter() - start, 2)
+    return report
@@ -0,0 +1,242 @@
+"""
+Child-process harness for smoke-running a generated pygame project.
+
+Run as a script (not imported through ``ai_game_dev``, so the game's
+process only pays for pygame)::
+
+    python smoke_harness.py <project_dir> <config.json> <result.json>
+
+Frames are counted at ``pygame.display.flip``/``update``. ``Clock.tick``
+returns a fixed step without sleeping, so frame times measure the game's
+own work. Scripted input is posted as events and mirrored in
+``pygame.key.get_pressed``/``pygame.mouse``. ``update``/``draw``/``render``
+methods of classes defined in the project are timed from the first frame
+on. The run stops with ``SmokeRunComplete`` after the requested number of
+frames.
+"""
+
+import gc
+import json
+import os
+import runpy
+import sys
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+PHASES = {"update": "update", "draw": "draw", "render": "draw"}
+
+
+class SmokeRunComplete(BaseException):
+    """Stops the game loop; a BaseException so ``except Exception`` in the game can't catch it."""
+
+
+class PressedKeys:
+    """Stands in for ``pygame.key.get_pressed()``'s ScancodeWrapper."""
+
+    def __init__(self, held):
+        self._held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self._held
+
+    def __len__(self):
+        return 512
+
+    def __iter__(self):
+        return (index in self._held for index in range(512))
+
+
+class Recorder:
+    """Per-frame timings and allocation counters."""
+
+    def __init__(self, frames):
+        self.target = frames
+        self.frame_ms = []
+        self.update_ms = []
+        self.draw_ms = []
+        self.allocated_blocks = []
+        self._phase_ms = {"update": 0.0, "draw": 0.0}
+        self._depth = {"update": 0, "draw": 0}
+        self._started = {"update": 0.0, "draw": 0.0}
+        self._frame_start = None
+
+    def start_frame(self):
+        self._frame_start = time.perf_counter()
+        self._phase_ms = {"update": 0.0, "draw": 0.0}
+        # A draw() that presents the frame itself keeps running into the next one
+        for phase, depth in self._depth.items():
+            if depth:
+                self._started[phase] = self._frame_start
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        now = time.perf_counter()
+        for phase, depth in self._depth.items():
+            if depth:
+                self._phase_ms[phase] += (now - self._started[phase]) * 1000
+        self.frame_ms.append((now - self._frame_start) * 1000)
+        self.update_ms.append(self._phase_ms["update"])
+        self.draw_ms.append(self._phase_ms["draw"])
+        self.allocated_blocks.append(sys.getallocatedblocks())
+
+    def timed(self, phase, method):
+        def wrapper(*args, **kwargs):
+            # Only the outermost call counts (Game.update calling Player.update)
+            if self._depth[phase]:
+                return method(*args, **kwargs)
+            self._depth[phase] += 1
+            self._started[phase] = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._phase_ms[phase] += (time.perf_counter() - self._started[phase]) * 1000
+                self._depth[phase] -= 1
+        wrapper.__wrapped__ = method
+        return wrapper
+
+
+def instrument_project_classes(project_dir, recorder):
+    """Wrap update/draw/render on classes defined in the project's modules."""
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if not path or not os.path.abspath(path).startswith(project_dir + os.sep):
+            continue
+        for value in list(vars(module).values()):
+            if not isinstance(value, type) or value.__module__ != module.__name__:
+                continue
+            for name, phase in PHASES.items():
+                method = value.__dict__.get(name)
+                if callable(method) and not hasattr(method, "__wrapped__"):
+                    setattr(value, name, recorder.timed(phase, method))
+
+
+def install(pygame, project_dir, config, recorder):
+    """Patch pygame for frame counting, uncapped clocks and scripted input."""
+    script = {}
+    for event in config.get("input", []):
+        script.setdefault(int(event["frame"]), []).append(event)
+    held = set()
+    mouse = {"pos": (0, 0), "buttons": [False, False, False]}
+    frame = {"index": 0}
+
+    def post_scripted(index):
+        for event in script.get(index, []):
+            attributes = {key: value for key, value in event.items() if key not in ("frame", "type")}
+            if isinstance(attributes.get("key"), str):
+                attributes["key"] = getattr(pygame, attributes["key"])
+            event_type = getattr(pygame, event["type"])
+            if event_type == pygame.KEYDOWN:
+                held.add(attributes["key"])
+            elif event_type == pygame.KEYUP:
+                held.discard(attributes["key"])
+            if "pos" in attributes:
+                attributes["pos"] = tuple(attributes["pos"])
+                mouse["pos"] = attributes["pos"]
+            if event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                mouse["buttons"][attributes.get("button", 1) - 1] = event_type == pygame.MOUSEBUTTONDOWN
+            pygame.event.post(pygame.event.Event(event_type, attributes))
+
+    def frame_boundary(original):
+        def present(*args, **kwargs):
+            result = original(*args, **kwargs)
+            recorder.end_frame()
+            frame["index"] += 1
+            if frame["index"] == 1:
+                instrument_project_classes(project_dir, recorder)
+            if frame["index"] >= recorder.target:
+                raise SmokeRunComplete()
+            post_scripted(frame["index"])
+            recorder.start_frame()
+            return result
+        return present
+
+    class SteppedClock:
+        """Clock whose tick returns a fixed step instead of sleeping."""
+
+        def __init__(self):
+            self._fps = 0.0
+            self._last = time.perf_counter()
+            self._step = 0
+
+        def tick(self, framerate=0):
+            now = time.perf_counter()
+            elapsed = (now - self._last) * 1000
+            self._last = now
+            self._step = round(1000 / framerate) if framerate else max(1, round(elapsed))
+            self._fps = 1000 / self._step
+            return self._step
+
+        tick_busy_loop = tick
+
+        def get_time(self):
+            return self._step
+
+        def get_rawtime(self):
+            return self._step
+
+        def get_fps(self):
+            return self._fps
+
+    pygame.display.flip = frame_boundary(pygame.display.flip)
+    pygame.display.update = frame_boundary(pygame.display.update)
+    pygame.time.Clock = SteppedClock
+    pygame.key.get_pressed = lambda: PressedKeys(held)
+    pygame.mouse.get_pos = lambda: mouse["pos"]
+    pygame.mouse.get_pressed = lambda num_buttons=3: tuple((mouse["buttons"] + [False, False])[:num_buttons])
+    post_scripted(0)
+
+
+def main(argv):
+    project_dir, config_path, result_path = (os.path.abspath(arg) for arg in argv[1:4])
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    os.chdir(project_dir)
+    sys.path.insert(0, project_dir)
+    sys.argv = [config.get("entry", "main.py")]
+
+    recorder = Recorder(int(config.get("frames", 600)))
+    result = {"error": None, "completed": False}
+    gc_before = sum(stat["collections"] for stat in gc.get_stats())
+    try:
+        import pygame
+        install(pygame, project_dir, config, recorder)
+        recorder.start_frame()
+        runpy.run_path(os.path.join(project_dir, config.get("entry", "main.py")), run_name="__main__")
+    except SmokeRunComplete:
+        result["completed"] = True
+    except SystemExit as exit_:
+        if exit_.code not in (None, 0):
+            result["error"] = f"SystemExit({exit_.code!r})"
+    except BaseException:
+        result["error"] = traceback.format_exc(limit=20)
+
+    result.update(
+        frames=len(recorder.frame_ms),
+        frame_ms=recorder.frame_ms,
+        update_ms=recorder.update_ms,
+        draw_ms=recorder.draw_ms,
+        allocated_blocks=recorder.allocated_blocks,
+        gc_collections=sum(stat["collections"] for stat in gc.get_stats()) - gc_before,
+        # ru_maxrss is KiB on Linux and bytes on macOS
+        peak_rss_kb=(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == "darwin" else 1)
+            if resource else None
+        ),
+    )
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
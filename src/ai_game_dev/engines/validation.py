@@ -0,0 +1,430 @@
+"""
+Static checks for generated source files.
+
+Every checkable file in a project is checked on a shared thread pool:
+
+- Python is byte-compiled, and ``from module import name`` between project
+  modules is resolved against what each module defines at top level
+- GDScript goes through a small line/indent/bracket parser that also
+  catches Godot 3 syntax the Godot 4 parser rejects
+- Rust is tokenized (strings, chars, lifetimes, nested comments) to check
+  that delimiters balance
+
+Nothing is executed or compiled with a toolchain; the aim is to catch
+truncated, fenced or wrong-language model output before it is saved, so
+only the broken file needs to be regenerated.
+"""
+
+import ast
+import asyncio
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Callable, Dict, List, Optional
+
+
+GENERATION_FAILED = "// Error generating code"
+BRACKETS = {")": "(", "]": "[", "}": "{"}
+
+
+@dataclass
+class ValidationIssue:
+    """A problem found in one file."""
+    message: str
+    line: Optional[int] = None
+
+    def __str__(self) -> str:
+        return f"line {self.line}: {self.message}" if self.line else self.message
+
+
+@dataclass
+class FileReport:
+    """Check results for one file; Python reports also carry what the module defines and imports."""
+    path: str
+    language: str
+    issues: List[ValidationIssue] = field(default_factory=list)
+    exports: Optional[List[str]] = None  # None: any name may exist (star import, __getattr__)
+    imports: List[tuple] = field(default_factory=list)  # (module, names, line)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def messages(self) -> List[str]:
+        return [str(issue) for issue in self.issues]
+
+
+def strip_code_fences(code: str) -> str:
+    """Drop a surrounding markdown code fence from LLM output."""
+    match = re.search(r"```[\w+-]*\n(.*?)```", code, re.DOTALL)
+    return match.group(1).strip() + "\n" if match else code
+
+
+def _placeholder_issues(code: str) -> List[ValidationIssue]:
+    if not code.strip():
+        return [ValidationIssue("File is empty")]
+    if code.lstrip().startswith(GENERATION_FAILED):
+        return [ValidationIssue("Code generation failed; the file only contains the error placeholder")]
+    if code.lstrip().startswith("```"):
+        return [ValidationIssue("File is wrapped in a markdown code fence")]
+    return []
+
+
+# --- Python ---------------------------------------------------------------
+
+def _module_names(node: ast.Module) -> Optional[List[str]]:
+    """Top-level names a module defines, or None if it can't be known statically."""
+    names: List[str] = []
+
+    def visit(statements):
+        for statement in statements:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.append(statement.name)
+            elif isinstance(statement, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+                for target in targets:
+                    names.extend(n.id for n in ast.walk(target) if isinstance(n, ast.Name))
+            elif isinstance(statement, (ast.Import, ast.ImportFrom)):
+                for alias in statement.names:
+                    if alias.name == "*":
+                        return False
+                    names.append(alias.asname or alias.name.partition(".")[0])
+            elif isinstance(statement, (ast.If, ast.Try, ast.With, ast.For, ast.While)):
+                bodies = [statement.body, getattr(statement, "orelse", []), getattr(statement, "finalbody", [])]
+                bodies.extend(handler.body for handler in getattr(statement, "handlers", []))
+                if any(visit(body) is False for body in bodies):
+                    return False
+        return True
+
+    if visit(node.body) is False or "__getattr__" in names:
+        return None
+    return names
+
+
+def check_python(path: str, code: str) -> FileReport:
+    report = FileReport(path, "python", _placeholder_issues(code))
+    if report.issues:
+        return report
+    try:
+        tree = ast.parse(code, filename=path)
+        compile(tree, path, "exec", dont_inherit=True)
+    except SyntaxError as error:
+        report.issues.append(ValidationIssue(f"SyntaxError: {error.msg}", error.lineno))
+        return report
+
+    report.exports = _module_names(tree)
+    package = list(PurePosixPath(path).parent.parts)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            if node.level:
+                base = package[:max(0, len(package) - node.level + 1)]
+                module = ".".join([*base, module] if module else base)
+            report.imports.append((module, [alias.name for alias in node.names], node.lineno))
+        elif isinstance(node, ast.Import):
+            report.imports.extend((alias.name, [], node.lineno) for alias in node.names)
+    return report
+
+
+def python_module_name(path: str) -> str:
+    parts = list(PurePosixPath(path).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def check_python_imports(reports: Dict[str, FileReport]) -> None:
+    """Resolve ``from module import name`` between the project's own modules."""
+    modules = {python_module_name(path): report for path, report in reports.items() if report.language == "python"}
+    for report in modules.values():
+        for module, names, line in report.imports:
+            target = modules.get(module)
+            # A broken module is reported (and regenerated) on its own
+            if target is None or target.issues or target.exports is None:
+                continue
+            for name in names:
+                if name != "*" and name not in target.exports and f"{module}.{name}" not in modules:
+                    report.issues.append(ValidationIssue(f"'{name}' is not defined in '{module}'", line))
+
+
+# --- GDScript -------------------------------------------------------------
+
+GDSCRIPT_FUNC = re.compile(r"^(static\s+)?func\s+[A-Za-z_]\w*\s*\(.*\)\s*(->\s*[^:]+)?:")
+GODOT3_SYNTAX = [
+    (re.compile(r"^onready\s+var\b"), "'onready var' is Godot 3 syntax; use '@onready var'"),
+    (re.compile(r"^export(\s*\(.*\))?\s+var\b"), "'export var' is Godot 3 syntax; use '@export var'"),
+    (re.compile(r"\byield\s*\("), "'yield' was removed in Godot 4; use 'await'"),
+    (re.compile(r"\bsetget\b"), "'setget' was removed in Godot 4; use set/get property blocks"),
+    (re.compile(r"^(remote|master|puppet|remotesync|mastersync|puppetsync)\s+func\b"),
+     "RPC keywords were removed in Godot 4; use '@rpc'"),
+    (re.compile(r"^def\s+\w+\s*\("), "GDScript functions are declared with 'func', not 'def'"),
+]
+
+
+def _gdscript_lines(code: str, issues: List[ValidationIssue]) -> List[tuple[int, str, str]]:
+    """Split into logical lines (line number, indentation, code without comments)."""
+    lines = []
+    brackets: List[tuple[str, int]] = []
+    current: List[str] = []
+    start, indent = 1, None
+    quote, i, line = None, 0, 1
+    at_line_start = True
+
+    while i < len(code):
+        char = code[i]
+        if quote:
+            if char == "\\":
+                current.append(code[i:i + 2])
+                line += code[i:i + 2].count("\n")
+                i += 2
+                continue
+            if code.startswith(quote, i):
+                current.append(quote)
+                i += len(quote)
+                quote = None
+                continue
+            if char == "\n":
+                if len(quote) == 1:
+                    issues.append(ValidationIssue("Unterminated string", line))
+                    quote = None
+                else:
+                    line += 1
+            current.append(char)
+            i += 1
+            continue
+
+        if at_line_start:
+            match = re.match(r"[ \t]*", code[i:])
+            whitespace = match.group(0)
+            i += len(whitespace)
+            at_line_start = False
+            if indent is None:
+                indent, start = whitespace, line
+            continue
+
+        if char in "\"'":
+            quote = code[i:i + 3] if code.startswith(char * 3, i) else char
+            current.append(quote)
+            i += len(quote)
+            continue
+        if char == "#":
+            while i < len(code) and code[i] != "\n":
+                i += 1
+            continue
+        if char in "([{":
+            brackets.append((char, line))
+        elif char in ")]}":
+            if not brackets or brackets[-1][0] != BRACKETS[char]:
+                issues.append(ValidationIssue(f"Unmatched '{char}'", line))
+            else:
+                brackets.pop()
+        if char == "\\" and code[i + 1:i + 2] == "\n":
+            i += 2
+            line += 1
+            continue
+        if char == "\n":
+            line += 1
+            if brackets:
+                current.append(" ")
+                i += 1
+                continue
+            text = "".join(current).strip()
+            if text:
+                lines.append((start, indent or "", text))
+            current, indent = [], None
+            at_line_start = True
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+
+    if quote:
+        issues.append(ValidationIssue("Unterminated string", line))
+    for char, opened in brackets:
+        issues.append(ValidationIssue(f"'{char}' is never closed", opened))
+    text = "".join(current).strip()
+    if text:
+        lines.append((start, indent or "", text))
+    return lines
+
+
+def check_gdscript(path: str, code: str) -> FileReport:
+    report = FileReport(path, "gdscript", _placeholder_issues(code))
+    if report.issues:
+        return report
+    issues = report.issues
+    lines = _gdscript_lines(code, issues)
+
+    indent_char = None
+    levels = [0]
+    expect_block = None
+    for number, indent, text in lines:
+        if " " in indent and "\t" in indent:
+            issues.append(ValidationIssue("Mixed tabs and spaces in indentation", number))
+        elif indent:
+            if indent_char is None:
+                indent_char = indent[0]
+            elif indent[0] != indent_char:
+                issues.append(ValidationIssue("Indentation uses a different character than earlier lines", number))
+
+        width = len(indent)
+        if expect_block is not None:
+            if width <= levels[-1]:
+                issues.append(ValidationIssue(f"Expected an indented block after line {expect_block}", number))
+            else:
+                levels.append(width)
+        elif width > levels[-1]:
+            issues.append(ValidationIssue("Unexpected indentation", number))
+            levels.append(width)
+        while width < levels[-1]:
+            levels.pop()
+        if width != levels[-1]:
+            issues.append(ValidationIssue("Unindent doesn't match any outer indentation level", number))
+            levels.append(width)
+
+        if text.startswith(("func ", "static func ")) and not GDSCRIPT_FUNC.match(text):
+            issues.append(ValidationIssue("Invalid function declaration (expected 'func name(args):')", number))
+        for pattern, message in GODOT3_SYNTAX:
+            if pattern.search(text):
+                issues.append(ValidationIssue(message, number))
+        expect_block = number if text.endswith(":") else None
+
+    if expect_block is not None:
+        issues.append(ValidationIssue(f"Expected an indented block after line {expect_block}", expect_block))
+    issues.sort(key=lambda issue: issue.line or 0)
+    return report
+
+
+# --- Rust -----------------------------------------------------------------
+
+RUST_RAW_STRING = re.compile(r'b?r(#*)"')
+RUST_WORD = re.compile(r"[A-Za-z_]\w*")
+RUST_CHAR = re.compile(r"'(\\(x[0-9a-fA-F]{2}|u\{[0-9a-fA-F]{1,6}\}|.)|[^\\'\n])'", re.DOTALL)
+
+
+def check_rust(path: str, code: str) -> FileReport:
+    report = FileReport(path, "rust", _placeholder_issues(code))
+    if report.issues:
+        return report
+    issues = report.issues
+    brackets: List[tuple[str, int]] = []
+    i, line = 0, 1
+    words = []
+
+    while i < len(code):
+        char = code[i]
+        if char == "\n":
+            line += 1
+            i += 1
+        elif code.startswith("//", i):
+            end = code.find("\n", i)
+            i = len(code) if end == -1 else end
+        elif code.startswith("/*", i):
+            depth, opened = 0, line
+            while i < len(code):
+                if code.startswith("/*", i):
+                    depth, i = depth + 1, i + 2
+                elif code.startswith("*/", i):
+                    depth, i = depth - 1, i + 2
+                    if not depth:
+                        break
+                else:
+                    line += code[i] == "\n"
+                    i += 1
+            if depth:
+                issues.append(ValidationIssue("Unterminated block comment", opened))
+        elif raw := RUST_RAW_STRING.match(code, i):
+            terminator = '"' + raw.group(1)
+            end = code.find(terminator, raw.end())
+            if end == -1:
+                issues.append(ValidationIssue("Unterminated raw string", line))
+                break
+            line += code.count("\n", i, end)
+            i = end + len(terminator)
+        elif char == '"' or (char == "b" and code.startswith('b"', i)):
+            opened = line
+            i = code.index('"', i) + 1
+            while i < len(code) and code[i] != '"':
+                step = 2 if code[i] == "\\" else 1
+                line += code.count("\n", i, i + step)
+                i += step
+            if i >= len(code):
+                issues.append(ValidationIssue("Unterminated string", opened))
+                break
+            i += 1
+        elif char == "'":
+            literal = RUST_CHAR.match(code, i)
+            # Anything else is a lifetime or loop label ('a, 'static)
+            i = literal.end() if literal else i + 1
+        elif char in "([{":
+            brackets.append((char, line))
+            i += 1
+        elif char in ")]}":
+            if not brackets or brackets[-1][0] != BRACKETS[char]:
+                expected = f", expected closing for '{brackets[-1][0]}' from line {brackets[-1][1]}" if brackets else ""
+                issues.append(ValidationIssue(f"Unmatched '{char}'{expected}", line))
+                break
+            brackets.pop()
+            i += 1
+        else:
+            word = RUST_WORD.match(code, i)
+            if word:
+                words.append(word.group(0))
+                i = word.end()
+            else:
+                i += 1
+
+    if not issues:
+        for char, opened in brackets:
+            issues.append(ValidationIssue(f"'{char}' is never closed", opened))
+    if PurePosixPath(path).name == "main.rs" and not issues and not any(
+        a == "fn" and b == "main" for a, b in zip(words, words[1:])
+    ):
+        issues.append(ValidationIssue("main.rs has no 'fn main'"))
+    return report
+
+
+CHECKERS: Dict[str, Callable[[str, str], FileReport]] = {
+    ".py": check_python,
+    ".gd": check_gdscript,
+    ".rs": check_rust,
+}
+
+
+def check_file(path: str, code: str) -> Optional[FileReport]:
+    """Check one file by extension; None for files that aren't source code."""
+    checker = CHECKERS.get(PurePosixPath(path).suffix)
+    return checker(path, code) if checker else None
+
+
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_validation_pool() -> ThreadPoolExecutor:
+    """Get the shared thread pool used for checks.
+
+    The checks are cheap pure Python, so threads keep them off the event
+    loop without forking the running app.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="validation")
+    return _pool
+
+
+async def validate_project(files: Dict[str, str], pool: Optional[ThreadPoolExecutor] = None) -> Dict[str, FileReport]:
+    """Check every source file off the event loop; returns reports keyed by path."""
+    sources = {path: code for path, code in files.items() if PurePosixPath(path).suffix in CHECKERS}
+    if not sources:
+        return {}
+    loop = asyncio.get_running_loop()
+    executor = pool or get_validation_pool()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(executor, check_file, path, code) for path, code in sources.items()
+    ))
+
+    reports = dict(zip(sources, results))
+    check_python_imports(reports)
+    return reports
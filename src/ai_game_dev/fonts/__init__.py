@@ -3,17 +3,25 @@ Font management and typography tools.
 Provides OpenAI function tools for font selection and text rendering.
 """
 
+from ai_game_dev.fonts.bitmap_font import GlyphAtlas, build_glyph_atlas, collect_charset
 from ai_game_dev.fonts.google_fonts import GoogleFonts
 from ai_game_dev.fonts.tool import (
     find_game_font,
     render_game_text,
+    render_game_text_batch,
+    generate_bitmap_font,
     generate_text_assets,
 )
 
 __all__ = [
     "GoogleFonts",
+    "GlyphAtlas",
+    "build_glyph_atlas",
+    "collect_charset",
     # OpenAI function tools
     "find_game_font",
     "render_game_text", 
+    "render_game_text_batch",
+    "generate_bitmap_font",
     "generate_text_assets",
 ]
\ No newline at end of file
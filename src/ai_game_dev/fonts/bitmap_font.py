@@ -0,0 +1,457 @@
+"""
+Bitmap font (BMFont / AngelCode) glyph atlas generation for in-game text.
+
+Rasterizes a charset once into a packed atlas texture with a text-format
+.fnt descriptor, so generated games draw text as blits from one texture
+instead of rasterizing TrueType fonts at runtime.
+"""
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageDraw, ImageFont
+
+from ai_game_dev.fonts.text_effects import OUTLINE_WIDTH, SHADOW_OFFSET, load_font, outline_mask, shadow_mask
+
+# Printable ASCII, the default charset when no game strings are given
+ASCII_CHARSET = "".join(chr(c) for c in range(32, 127))
+
+# Glyphs always included so games have a space and a missing-glyph fallback
+REQUIRED_GLYPHS = " ?"
+
+GLYPH_SPACING = 1  # Empty pixels between packed glyphs
+
+
+@dataclass
+class Glyph:
+    """Placement and metrics of one glyph in the atlas."""
+    char: str
+    x: int
+    y: int
+    width: int
+    height: int
+    xoffset: int
+    yoffset: int
+    xadvance: int
+
+
+@dataclass
+class GlyphAtlas:
+    """A packed glyph atlas with BMFont metadata."""
+    face: str
+    size: int
+    image: Image.Image
+    line_height: int
+    base: int
+    padding: int
+    glyphs: dict[str, Glyph] = field(default_factory=dict)
+
+    def to_fnt(self, page_file: str) -> str:
+        """Serialize to the AngelCode BMFont text format."""
+        pad = self.padding
+        lines = [
+            f'info face="{self.face}" size={self.size} bold=0 italic=0 charset="" unicode=1 '
+            f'stretchH=100 smooth=1 aa=1 padding={pad},{pad},{pad},{pad} '
+            f'spacing={GLYPH_SPACING},{GLYPH_SPACING} outline=0',
+            f'common lineHeight={self.line_height} base={self.base} '
+            f'scaleW={self.image.width} scaleH={self.image.height} pages=1 packed=0',
+            f'page id=0 file="{page_file}"',
+            f'chars count={len(self.glyphs)}',
+        ]
+        for glyph in sorted(self.glyphs.values(), key=lambda g: ord(g.char)):
+            lines.append(
+                f"char id={ord(glyph.char)} x={glyph.x} y={glyph.y} "
+                f"width={glyph.width} height={glyph.height} "
+                f"xoffset={glyph.xoffset} yoffset={glyph.yoffset} "
+                f"xadvance={glyph.xadvance} page=0 chnl=15"
+            )
+        return "\n".join(lines) + "\n"
+
+    def save(self, output_dir: Path, name: str) -> dict[str, Path]:
+        """Write the atlas PNG and .fnt descriptor side by side."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        png_path = output_dir / f"{name}.png"
+        fnt_path = output_dir / f"{name}.fnt"
+
+        self.image.save(png_path, "PNG", optimize=True)
+        fnt_path.write_text(self.to_fnt(png_path.name), encoding="utf-8")
+
+        return {"texture": png_path, "descriptor": fnt_path}
+
+
+def collect_charset(texts: Iterable[str]) -> str:
+    """Collect the unique glyphs used by a game's dialogue and UI strings."""
+    chars = set(REQUIRED_GLYPHS)
+    for text in texts:
+        chars.update(ch for ch in text if ch.isprintable())
+    return "".join(sorted(chars))
+
+
+def _font_metrics(font: ImageFont.ImageFont) -> tuple[int, int]:
+    """Return (ascent, descent) for a font."""
+    if hasattr(font, "getmetrics"):
+        return font.getmetrics()
+    _, _, _, bottom = font.getbbox("Ag")
+    return bottom, 0
+
+
+def _render_glyph(
+    font: ImageFont.ImageFont,
+    char: str,
+    padding: int,
+    effects: tuple[str, ...],
+) -> tuple[Image.Image, tuple[int, int, int, int]]:
+    """Rasterize one glyph with effects baked in.
+
+    Returns the glyph image and its (left, top, right, bottom) bbox
+    relative to the pen position.
+    """
+    left, top, right, bottom = font.getbbox(char)
+    width = max(right - left, 0) + padding * 2
+    height = max(bottom - top, 0) + padding * 2
+
+    mask = Image.new("L", (width, height), 0)
+    ImageDraw.Draw(mask).text((padding - left, padding - top), char, font=font, fill=255)
+
+    glyph = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+
+    # Glyph fill is white so games can tint text at draw time
+    if "shadow" in effects:
+        glyph.paste((0, 0, 0, 255), mask=shadow_mask(mask))
+
+    if "outline" in effects:
+        glyph.paste((0, 0, 0, 255), mask=outline_mask(mask))
+
+    fill = Image.new("RGBA", (width, height), (255, 255, 255, 0))
+    fill.putalpha(mask)
+    glyph = Image.alpha_composite(glyph, fill)
+
+    return glyph, (left, top, right, bottom)
+
+
+def _next_power_of_two(value: int) -> int:
+    """Smallest power of two >= value (minimum 64)."""
+    size = 64
+    while size < value:
+        size *= 2
+    return size
+
+
+def build_glyph_atlas(
+    charset: str = ASCII_CHARSET,
+    font_path: str | None = None,
+    size: int = 32,
+    effects: Iterable[str] = (),
+    face: str | None = None,
+) -> GlyphAtlas:
+    """Rasterize a charset and shelf-pack it into a power-of-two atlas.
+
+    Args:
+        charset: Characters to include (duplicates are ignored)
+        font_path: TrueType/OpenType file; Pillow's default font if None
+        size: Font size in pixels
+        effects: Baked effects ("outline", "shadow")
+        face: Face name written into the .fnt info line
+
+    Returns:
+        GlyphAtlas with the packed texture and per-glyph metrics
+    """
+    effects = tuple(sorted(set(effects)))
+    padding = 0
+    if "outline" in effects:
+        padding = OUTLINE_WIDTH
+    if "shadow" in effects:
+        padding = max(padding, SHADOW_OFFSET)
+
+    font = load_font(font_path, size)
+    ascent, descent = _font_metrics(font)
+
+    rendered = []
+    for char in dict.fromkeys(charset + REQUIRED_GLYPHS):
+        image, bbox = _render_glyph(font, char, padding, effects)
+        rendered.append((char, image, bbox, round(font.getlength(char))))
+
+    # Shelf packing: tallest glyphs first, rows filled left to right
+    rendered.sort(key=lambda item: (-item[1].height, -item[1].width))
+    total_area = sum(
+        (img.width + GLYPH_SPACING) * (img.height + GLYPH_SPACING) for _, img, _, _ in rendered
+    )
+    widest = max(img.width for _, img, _, _ in rendered) + GLYPH_SPACING
+    atlas_width = _next_power_of_two(max(int(total_area ** 0.5), widest))
+
+    placements = []
+    x = y = shelf_height = 0
+    for char, image, bbox, advance in rendered:
+        if x + image.width > atlas_width:
+            x = 0
+            y += shelf_height + GLYPH_SPACING
+            shelf_height = 0
+        placements.append((char, image, bbox, advance, x, y))
+        x += image.width + GLYPH_SPACING
+        shelf_height = max(shelf_height, image.height)
+
+    atlas = Image.new("RGBA", (atlas_width, _next_power_of_two(y + shelf_height)), (0, 0, 0, 0))
+    glyphs = {}
+    for char, image, (left, top, _, _), advance, gx, gy in placements:
+        atlas.paste(image, (gx, gy))
+        glyphs[char] = Glyph(
+            char=char,
+            x=gx,
+            y=gy,
+            width=image.width,
+            height=image.height,
+            xoffset=left - padding,
+            yoffset=top - padding,
+            xadvance=advance
+        )
+
+    return GlyphAtlas(
+        face=face or (Path(font_path).stem if font_path else "default"),
+        size=size,
+        image=atlas,
+        line_height=ascent + descent,
+        base=ascent,
+        padding=padding,
+        glyphs=glyphs
+    )
+
+
+PYGAME_LOADER = '''"""Bitmap font loader: draws text as blits from one BMFont atlas."""
+import os
+
+import pygame
+
+
+class BitmapFont:
+    """Loads an AngelCode BMFont (.fnt text format) and its atlas page."""
+
+    def __init__(self, fnt_path):
+        self.glyphs = {}
+        self.line_height = 0
+        page_file = None
+        with open(fnt_path, encoding="utf-8") as f:
+            for line in f:
+                tag, _, rest = line.partition(" ")
+                fields = dict(
+                    part.split("=", 1) for part in rest.split() if "=" in part
+                )
+                if tag == "common":
+                    self.line_height = int(fields["lineHeight"])
+                elif tag == "page":
+                    page_file = fields["file"].strip('"')
+                elif tag == "char":
+                    self.glyphs[chr(int(fields["id"]))] = tuple(
+                        int(fields[key]) for key in
+                        ("x", "y", "width", "height", "xoffset", "yoffset", "xadvance")
+                    )
+        page_path = os.path.join(os.path.dirname(fnt_path), page_file)
+        self.texture = pygame.image.load(page_path).convert_alpha()
+        self._surfaces = {
+            char: self.texture.subsurface((x, y, w, h))
+            for char, (x, y, w, h, _, _, _) in self.glyphs.items()
+        }
+
+    def size(self, text):
+        """Return (width, height) of a single line of text."""
+        fallback = self.glyphs.get("?")
+        width = sum(self.glyphs.get(ch, fallback)[6] for ch in text)
+        return width, self.line_height
+
+    def draw(self, surface, text, pos, color=None):
+        """Blit text onto surface; color tints the white glyphs."""
+        pen_x, pen_y = pos
+        fallback = self.glyphs.get("?")
+        for ch in text:
+            if ch == "\\n":
+                pen_x, pen_y = pos[0], pen_y + self.line_height
+                continue
+            glyph = self.glyphs.get(ch, fallback)
+            image = self._surfaces.get(ch, self._surfaces["?"])
+            if color is not None:
+                image = image.copy()
+                image.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+            surface.blit(image, (pen_x + glyph[4], pen_y + glyph[5]))
+            pen_x += glyph[6]
+
+    def render(self, text, color=None):
+        """Render text to a new transparent surface."""
+        image = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        self.draw(image, text, (0, 0), color)
+        return image
+'''
+
+GODOT_LOADER = '''extends Node
+## Bitmap font loader: Godot 4 reads AngelCode .fnt files into a FontFile.
+
+static func load_bitmap_font(fnt_path: String) -> FontFile:
+\tvar font := FontFile.new()
+\tvar err := font.load_bitmap_font(fnt_path)
+\tif err != OK:
+\t\tpush_error("Failed to load bitmap font %s: %s" % [fnt_path, err])
+\t\treturn null
+\treturn font
+
+
+static func apply_to(control: Control, fnt_path: String, font_size: int = 0) -> void:
+\tvar font := load_bitmap_font(fnt_path)
+\tif font:
+\t\tcontrol.add_theme_font_override("font", font)
+\t\tif font_size > 0:
+\t\t\tcontrol.add_theme_font_size_override("font_size", font_size)
+'''
+
+BEVY_LOADER = '''//! Bitmap font loader: draws text as sprites cut from one BMFont atlas.
+//!
+//! Add `BitmapFontPlugin`, then `asset_server.load::<BitmapFont>("fonts/game.fnt")`.
+//! Descriptors go through the AssetServer, so they load on wasm and hot-reload.
+use bevy::asset::io::Reader;
+use bevy::asset::{AssetLoader, AsyncReadExt, LoadContext};
+use bevy::prelude::*;
+use std::collections::HashMap;
+
+#[derive(Clone, Copy, Debug)]
+pub struct BitmapGlyph {
+    pub rect: Rect,
+    pub offset: Vec2,
+    pub advance: f32,
+}
+
+#[derive(Asset, TypePath, Clone, Debug)]
+pub struct BitmapFont {
+    #[dependency]
+    pub texture: Handle<Image>,
+    pub line_height: f32,
+    pub glyphs: HashMap<char, BitmapGlyph>,
+}
+
+/// Registers the `BitmapFont` asset and its `.fnt` loader.
+pub struct BitmapFontPlugin;
+
+impl Plugin for BitmapFontPlugin {
+    fn build(&self, app: &mut App) {
+        app.init_asset::<BitmapFont>()
+            .init_asset_loader::<BitmapFontLoader>();
+    }
+}
+
+/// Parses AngelCode .fnt (text format) descriptors.
+#[derive(Default)]
+pub struct BitmapFontLoader;
+
+impl AssetLoader for BitmapFontLoader {
+    type Asset = BitmapFont;
+    type Settings = ();
+    type Error = std::io::Error;
+
+    async fn load<'a>(
+        &'a self,
+        reader: &'a mut Reader<'_>,
+        _settings: &'a (),
+        load_context: &'a mut LoadContext<'_>,
+    ) -> Result<BitmapFont, Self::Error> {
+        let mut bytes = Vec::new();
+        reader.read_to_end(&mut bytes).await?;
+        let source = String::from_utf8_lossy(&bytes);
+        let mut glyphs = HashMap::new();
+        let mut line_height = 0.0;
+        let mut page = String::new();
+
+        for line in source.lines() {
+            let mut parts = line.split_whitespace();
+            let tag = parts.next().unwrap_or("");
+            let fields: HashMap<&str, &str> = parts.filter_map(|p| p.split_once('=')).collect();
+            let num = |key: &str| fields.get(key).and_then(|v| v.parse::<f32>().ok()).unwrap_or(0.0);
+            match tag {
+                "common" => line_height = num("lineHeight"),
+                "page" => page = fields.get("file").unwrap_or(&"").trim_matches('"').to_string(),
+                "char" => {
+                    if let Some(ch) = char::from_u32(num("id") as u32) {
+                        let (x, y) = (num("x"), num("y"));
+                        glyphs.insert(ch, BitmapGlyph {
+                            rect: Rect::new(x, y, x + num("width"), y + num("height")),
+                            offset: Vec2::new(num("xoffset"), num("yoffset")),
+                            advance: num("xadvance"),
+                        });
+                    }
+                }
+                _ => {}
+            }
+        }
+
+        // The atlas page is relative to the descriptor
+        let texture_path = match load_context.path().parent() {
+            Some(dir) => dir.join(&page),
+            None => page.into(),
+        };
+        let texture = load_context.load(texture_path);
+        Ok(BitmapFont { texture, line_height, glyphs })
+    }
+
+    fn extensions(&self) -> &[&str] {
+        &["fnt"]
+    }
+}
+
+impl BitmapFont {
+    /// Spawn one sprite per glyph, left-aligned at `origin` (top-left, y up).
+    pub fn spawn_text(&self, commands: &mut Commands, text: &str, origin: Vec3, color: Color) -> Entity {
+        let fallback = self.glyphs.get(&'?').copied();
+        commands
+            .spawn(SpatialBundle::from_transform(Transform::from_translation(origin)))
+            .with_children(|parent| {
+                let mut pen = Vec2::ZERO;
+                for ch in text.chars() {
+                    if ch == '\\n' {
+                        pen = Vec2::new(0.0, pen.y - self.line_height);
+                        continue;
+                    }
+                    let Some(glyph) = self.glyphs.get(&ch).copied().or(fallback) else { continue };
+                    let size = glyph.rect.size();
+                    let center = Vec2::new(
+                        pen.x + glyph.offset.x + size.x / 2.0,
+                        pen.y - glyph.offset.y - size.y / 2.0,
+                    );
+                    parent.spawn(SpriteBundle {
+                        texture: self.texture.clone(),
+                        sprite: Sprite { rect: Some(glyph.rect), color, ..default() },
+                        transform: Transform::from_translation(center.extend(0.0)),
+                        ..default()
+                    });
+                    pen.x += glyph.advance;
+                }
+            })
+            .id()
+    }
+}
+'''
+
+# Engine -> (loader file name, loader source)
+ENGINE_LOADERS: dict[str, tuple[str, str]] = {
+    "pygame": ("bitmap_font.py", PYGAME_LOADER),
+    "godot": ("bitmap_font.gd", GODOT_LOADER),
+    "bevy": ("bitmap_font.rs", BEVY_LOADER),
+}
+
+
+def write_engine_loader(engine: str, output_dir: Path) -> Path:
+    """Write the runtime bitmap-font loader for an engine."""
+    if engine not in ENGINE_LOADERS:
+        raise ValueError(f"No bitmap font loader for engine: {engine}")
+
+    filename, source = ENGINE_LOADERS[engine]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    loader_path = output_dir / filename
+    loader_path.write_text(source, encoding="utf-8")
+    return loader_path
+
+
+def atlas_summary(atlas: GlyphAtlas) -> dict[str, Any]:
+    """Describe an atlas for tool results."""
+    return {
+        "face": atlas.face,
+        "size": atlas.size,
+        "glyph_count": len(atlas.glyphs),
+        "texture_size": (atlas.image.width, atlas.image.height),
+        "line_height": atlas.line_height,
+    }
@@ -4,62 +4,215 @@ Google Fonts integration for game typography.
 
 import asyncio
 import aiohttp
+import hashlib
+import re
+import time
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 import json
+import logging
+import os
+
+from xdg_base_dirs import xdg_cache_home
+
+try:
+    from fontTools import subset as ft_subset
+    FONTTOOLS_AVAILABLE = True
+except ImportError:
+    FONTTOOLS_AVAILABLE = False
+    ft_subset = None
+
+# Shared on-disk font cache (catalog + downloaded font files)
+FONTS_CACHE_DIR = xdg_cache_home() / "ai-game-dev" / "fonts"
+CATALOG_CACHE_PATH = FONTS_CACHE_DIR / "catalog.json"
+CATALOG_TTL_SECONDS = 24 * 60 * 60
+
+# Network requests give up after this long so callers can fall back offline
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+# Font file URLs inside a css2 stylesheet
+_CSS_FONT_URL = re.compile(r"url\((https://[^)]+)\)\s*format\('(\w+)'\)")
+_FONT_EXTENSIONS = {"truetype": "ttf", "opentype": "otf", "woff": "woff", "woff2": "woff2"}
+
+logger = logging.getLogger(__name__)
+
+
+def subset_font(
+    font_path: Path,
+    text: str,
+    output_path: Path | None = None,
+    flavor: str | None = None
+) -> Path | None:
+    """Strip a font down to the glyphs needed for the given text.
+    
+    Args:
+        font_path: Source TTF/OTF file
+        text: Characters that must remain renderable
+        output_path: Where to write the subset (defaults to *_subset next to the source)
+        flavor: Optional web flavor ("woff" or "woff2")
+        
+    Returns:
+        Path to the subset font, or None when fontTools is unavailable
+    """
+    if not FONTTOOLS_AVAILABLE:
+        return None
+    
+    if output_path is None:
+        suffix = f".{flavor}" if flavor else font_path.suffix
+        output_path = font_path.with_name(f"{font_path.stem}_subset{suffix}")
+    
+    options = ft_subset.Options()
+    options.flavor = flavor
+    options.layout_features = ["kern", "liga"]
+    options.name_IDs = ["*"]
+    
+    font = ft_subset.load_font(str(font_path), options)
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(text="".join(sorted(set(text + " "))))
+    subsetter.subset(font)
+    ft_subset.save_font(font, str(output_path), options)
+    
+    return output_path
 
 
 class GoogleFonts:
     """Google Fonts API integration for game typography."""
     
-    def __init__(self, api_key: str | None = None):
+    # Catalogs shared by every instance in the process: cache path -> (fetched_at, items)
+    _shared_catalogs: dict[Path, tuple[float, list[dict[str, Any]]]] = {}
+    
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache_path: Path | None = None,
+        cache_ttl: float = CATALOG_TTL_SECONDS
+    ):
         self.api_key = api_key
         self.base_url = "https://www.googleapis.com/webfonts/v1/webfonts"
         self.download_base = "https://fonts.googleapis.com/css2"
         self.session = None
+        self.cache_path = cache_path or CATALOG_CACHE_PATH
+        self.cache_ttl = cache_ttl
         self._font_cache = None
+        self._by_family: dict[str, dict[str, Any]] = {}
+        self._by_category: dict[str, list[dict[str, Any]]] = {}
+        self._by_variant: dict[str, list[dict[str, Any]]] = {}
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = aiohttp.ClientSession(timeout=HTTP_TIMEOUT)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
     
-    async def get_available_fonts(self, category: str | None = None) -> list[dict[str, Any]]:
-        """Get list of available Google Fonts."""
+    async def get_available_fonts(
+        self,
+        category: str | None = None,
+        style: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Get list of available Google Fonts, optionally by category and style."""
         
         if self._font_cache is None:
             await self._load_font_cache()
         
-        fonts = self._font_cache
+        fonts = self._by_category.get(category, []) if category else self._font_cache
         
-        if category:
-            fonts = [font for font in fonts if font.get("category") == category]
+        if style:
+            with_style = {id(font) for font in self._by_variant.get(style, [])}
+            fonts = [font for font in fonts if id(font) in with_style]
         
         return fonts
     
     async def _load_font_cache(self):
-        """Load font information from Google Fonts API or cache."""
+        """Load font information from the shared/on-disk cache or Google Fonts API.
+        
+        The on-disk catalog is used as-is while younger than the TTL; after
+        that it is revalidated with the stored ETag so an unchanged catalog
+        costs a 304 instead of a full download. The in-process copy expires
+        with the same TTL, so long-running processes pick up new fonts too.
+        """
+        
+        shared = GoogleFonts._shared_catalogs.get(self.cache_path)
+        if shared and time.time() - shared[0] < self.cache_ttl:
+            self._set_catalog(shared[1])
+            return
+        
+        cached = self._read_catalog_cache()
+        if cached and time.time() - cached.get("fetched_at", 0) < self.cache_ttl:
+            self._set_catalog(cached["items"], fetched_at=cached["fetched_at"])
+            return
         
         if not self.session:
+            if cached:
+                # Stale but usable without a network session
+                self._set_catalog(cached["items"])
+                return
             raise RuntimeError("Client not initialized. Use 'async with' context manager.")
         
         params = {}
         if self.api_key:
             params["key"] = self.api_key
         
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        
         try:
-            async with self.session.get(self.base_url, params=params) as response:
-                if response.status == 200:
+            async with self.session.get(self.base_url, params=params, headers=headers) as response:
+                if response.status == 304 and cached:
+                    self._write_catalog_cache(cached["items"], cached.get("etag"))
+                    self._set_catalog(cached["items"], fetched_at=time.time())
+                elif response.status == 200:
                     data = await response.json()
-                    self._font_cache = data.get("items", [])
+                    items = data.get("items", [])
+                    self._write_catalog_cache(items, response.headers.get("ETag"))
+                    self._set_catalog(items, fetched_at=time.time())
+                elif cached:
+                    self._set_catalog(cached["items"])
                 else:
                     # Fallback to popular game fonts
-                    self._font_cache = self._get_fallback_fonts()
+                    self._set_catalog(self._get_fallback_fonts())
         except Exception:
-            self._font_cache = self._get_fallback_fonts()
+            self._set_catalog(cached["items"] if cached else self._get_fallback_fonts())
+    
+    def _read_catalog_cache(self) -> dict[str, Any] | None:
+        """Read the on-disk catalog, ignoring missing or corrupt files."""
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data.get("items"), list) else None
+    
+    def _write_catalog_cache(self, items: list[dict[str, Any]], etag: str | None) -> None:
+        """Persist the catalog atomically so concurrent processes never read a partial file."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"etag": etag, "fetched_at": time.time(), "items": items}, f)
+        tmp_path.replace(self.cache_path)
+    
+    def _set_catalog(self, fonts: list[dict[str, Any]], fetched_at: float | None = None) -> None:
+        """Install the catalog and build the family/category/variant index.
+        
+        Passing ``fetched_at`` shares a fresh catalog with other instances
+        using the same cache path.
+        """
+        self._font_cache = fonts
+        self._by_family = {}
+        self._by_category = {}
+        self._by_variant = {}
+        
+        for font in fonts:
+            self._by_family[font.get("family", "")] = font
+            self._by_category.setdefault(font.get("category", ""), []).append(font)
+            for variant in font.get("variants", []):
+                self._by_variant.setdefault(variant, []).append(font)
+        
+        if fetched_at is not None:
+            GoogleFonts._shared_catalogs[self.cache_path] = (fetched_at, fonts)
     
     def _get_fallback_fonts(self) -> list[dict[str, Any]]:
         """Get fallback list of popular game fonts."""
@@ -119,11 +272,12 @@ class GoogleFonts:
         self,
         query: str,
         category: str | None = None,
-        sort: str = "popularity"
+        sort: str = "popularity",
+        style: str | None = None
     ) -> list[dict[str, Any]]:
         """Search for fonts matching criteria."""
         
-        all_fonts = await self.get_available_fonts(category)
+        all_fonts = await self.get_available_fonts(category, style)
         
         # Filter by query
         matching_fonts = []
@@ -156,22 +310,137 @@ class GoogleFonts:
         }
         
         font_families = style_recommendations.get(game_style, ["Roboto"])
-        all_fonts = await self.get_available_fonts()
+        await self.get_available_fonts()
         
-        recommended_fonts = []
-        for font in all_fonts:
-            if font.get("family") in font_families:
-                recommended_fonts.append(font)
+        return [self._by_family[family] for family in font_families if family in self._by_family]
+    
+    async def download_font_files(
+        self,
+        font_family: str,
+        output_dir: Path | None = None,
+        variants: list[str] | None = None,
+        text: str | None = None
+    ) -> list[Path]:
+        """Download the font binaries for a family.
         
-        return recommended_fonts
+        When ``text`` is given only those glyphs are requested from Google
+        Fonts, and local copies are subset again with fontTools when
+        available, so web builds ship kilobytes instead of whole fonts.
+        Downloads are reused from disk on later calls.
+        """
+        
+        if output_dir is None:
+            output_dir = FONTS_CACHE_DIR / "files"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        css_content = await self._fetch_css(font_family, variants or ["regular"], text)
+        if css_content is None:
+            return []
+        
+        downloaded = await self._download_css_fonts(css_content, font_family, output_dir, variants, text)
+        return list(downloaded.values())
+    
+    async def _download_css_fonts(
+        self,
+        css_content: str,
+        font_family: str,
+        output_dir: Path,
+        variants: list[str] | None,
+        text: str | None
+    ) -> dict[str, Path]:
+        """Concurrently download every font file referenced by a stylesheet.
+        
+        Returns a mapping of remote URL to local path for successful downloads.
+        """
+        
+        stem = "_".join([font_family.replace(" ", "_"), *sorted(variants or ["regular"])])
+        if text:
+            # Distinct subsets must not overwrite each other
+            stem += "_" + hashlib.sha1("".join(sorted(set(text))).encode()).hexdigest()[:8]
+        
+        downloads = {}
+        for index, (url, fmt) in enumerate(_CSS_FONT_URL.findall(css_content)):
+            ext = _FONT_EXTENSIONS.get(fmt, "ttf")
+            downloads[url] = output_dir / f"{stem}_{index}.{ext}"
+        
+        async def fetch(url: str, font_path: Path) -> Path | None:
+            if font_path.exists():
+                return font_path
+            # Download beside the target and rename, so an interrupted
+            # transfer never leaves a truncated font that looks cached
+            tmp_path = font_path.with_name(f".{font_path.name}.{os.getpid()}.part")
+            try:
+                async with self.session.get(url) as response:
+                    if response.status != 200:
+                        return None
+                    tmp_path.write_bytes(await response.read())
+                if text and font_path.suffix in (".ttf", ".otf"):
+                    await self._subset_in_place(tmp_path, text)
+                tmp_path.replace(font_path)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+            finally:
+                tmp_path.unlink(missing_ok=True)
+            return font_path
+        
+        results = await asyncio.gather(*(fetch(url, path) for url, path in downloads.items()))
+        return {url: path for url, path in zip(downloads, results) if path}
+    
+    @staticmethod
+    async def _subset_in_place(font_path: Path, text: str) -> None:
+        """Subset a downloaded font off the event loop, keeping the full font if fontTools can't."""
+        subset_path = font_path.with_suffix(".subset")
+        try:
+            if await asyncio.to_thread(subset_font, font_path, text, subset_path):
+                subset_path.replace(font_path)
+        except Exception as e:
+            # TTLibError, KeyError, ... from fonts fontTools can't subset
+            logger.warning("Keeping the full font %s, subsetting failed: %s", font_path.name, e)
+        finally:
+            subset_path.unlink(missing_ok=True)
+
+    async def _fetch_css(
+        self,
+        font_family: str,
+        variants: list[str],
+        text: str | None = None
+    ) -> str | None:
+        """Fetch the css2 stylesheet for a family."""
+        
+        if not self.session:
+            raise RuntimeError("Client not initialized. Use 'async with' context manager.")
+        
+        # Build font URL ("regular" is weight 400)
+        font_query = font_family.replace(" ", "+")
+        weights = sorted({"400" if v == "regular" else v for v in variants if v == "regular" or v.isdigit()})
+        if weights and weights != ["400"]:
+            font_query += ":wght@" + ";".join(weights)
+        
+        font_url = f"{self.download_base}?family={font_query}&display=swap"
+        
+        # css2 serves fonts containing only the requested glyphs
+        params = {"text": "".join(sorted(set(text)))} if text else None
+        
+        try:
+            async with self.session.get(font_url, params=params) as response:
+                if response.status != 200:
+                    return None
+                return await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # Offline or slow: callers fall back to the default font
+            return None
     
     async def download_font(
         self,
         font_family: str,
         output_dir: Path | None = None,
-        variants: list[str] | None = None
+        variants: list[str] | None = None,
+        text: str | None = None
     ) -> Path | None:
-        """Download a Google Font."""
+        """Download a Google Font (CSS, font files and metadata).
+        
+        Pass ``text`` to subset the font to the glyphs a game actually uses.
+        """
         
         if output_dir is None:
             output_dir = Path("fonts")
@@ -180,41 +449,35 @@ class GoogleFonts:
         if variants is None:
             variants = ["regular"]
         
-        # Build font URL
-        font_query = font_family.replace(" ", "+")
-        if len(variants) > 1:
-            weight_query = ":wght@" + ";".join(variants)
-            font_query += weight_query
-        
-        font_url = f"{self.download_base}?family={font_query}&display=swap"
-        
-        if not self.session:
-            raise RuntimeError("Client not initialized. Use 'async with' context manager.")
-        
         try:
             # Get CSS with font URLs
-            async with self.session.get(font_url) as response:
-                if response.status == 200:
-                    css_content = await response.text()
-                    
-                    # Save CSS file
-                    css_path = output_dir / f"{font_family.replace(' ', '_').lower()}.css"
-                    with open(css_path, 'w') as f:
-                        f.write(css_content)
-                    
-                    # Create metadata file
-                    metadata = {
-                        "family": font_family,
-                        "variants": variants,
-                        "css_url": font_url,
-                        "download_date": "2025-01-01"
-                    }
-                    
-                    metadata_path = output_dir / f"{font_family.replace(' ', '_').lower()}_metadata.json"
-                    with open(metadata_path, 'w') as f:
-                        json.dump(metadata, f, indent=2)
-                    
-                    return css_path
+            css_content = await self._fetch_css(font_family, variants, text)
+            if css_content is not None:
+                downloaded = await self._download_css_fonts(css_content, font_family, output_dir, variants, text)
+                
+                # Point the stylesheet at the local font files
+                for remote_url, local_path in downloaded.items():
+                    css_content = css_content.replace(remote_url, local_path.name)
+                
+                # Save CSS file
+                css_path = output_dir / f"{font_family.replace(' ', '_').lower()}.css"
+                with open(css_path, 'w') as f:
+                    f.write(css_content)
+                
+                # Create metadata file
+                metadata = {
+                    "family": font_family,
+                    "variants": variants,
+                    "files": [path.name for path in downloaded.values()],
+                    "subset_text": text,
+                    "download_date": datetime.now().isoformat()
+                }
+                
+                metadata_path = output_dir / f"{font_family.replace(' ', '_').lower()}_metadata.json"
+                with open(metadata_path, 'w') as f:
+                    json.dump(metadata, f, indent=2)
+                
+                return css_path
         
         except Exception as e:
             print(f"Error downloading font {font_family}: {e}")
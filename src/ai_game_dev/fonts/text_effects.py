@@ -0,0 +1,46 @@
+"""
+Font loading and glyph-mask effects shared by rendered text and bitmap font atlases.
+
+Effects are derived from a single-channel glyph mask, so text images and
+atlas glyphs get identical shadows and outlines.
+"""
+from functools import lru_cache
+
+from PIL import Image, ImageFilter, ImageFont
+
+# Effect geometry (pixels)
+SHADOW_OFFSET = 2
+OUTLINE_WIDTH = 2
+GLOW_RADIUS = 3
+
+
+@lru_cache(maxsize=32)
+def load_font(font_path: str | None, size: int) -> ImageFont.ImageFont:
+    """Load a TrueType font once per (path, size), falling back to Pillow's built-in font."""
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            pass
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
+
+def shadow_mask(mask: Image.Image) -> Image.Image:
+    """Half-strength copy of the mask offset down and right."""
+    shadow = Image.new("L", mask.size, 0)
+    shadow.paste(mask.point(lambda v: v // 2), (SHADOW_OFFSET, SHADOW_OFFSET))
+    return shadow
+
+
+def outline_mask(mask: Image.Image) -> Image.Image:
+    """Mask dilated by the outline width."""
+    return mask.filter(ImageFilter.MaxFilter(OUTLINE_WIDTH * 2 + 1))
+
+
+def glow_mask(mask: Image.Image) -> Image.Image:
+    """Mask blurred by the glow radius."""
+    return mask.filter(ImageFilter.GaussianBlur(radius=GLOW_RADIUS))
@@ -1,34 +1,48 @@
 """
 OpenAI function tools for font and text rendering.
 """
+import hashlib
+import re
+import shutil
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal, Any
-from PIL import Image, ImageDraw, ImageFont
-import requests
+from PIL import Image, ImageColor, ImageDraw
 
 from agents import function_tool
 
-from ai_game_dev.fonts.google_fonts import GoogleFonts
+from ai_game_dev.fonts.bitmap_font import (
+    ASCII_CHARSET,
+    atlas_summary,
+    build_glyph_atlas,
+    collect_charset,
+    write_engine_loader,
+)
+from ai_game_dev.fonts.google_fonts import FONTS_CACHE_DIR, GoogleFonts
+from ai_game_dev.fonts.text_effects import glow_mask, load_font, outline_mask, shadow_mask
 
+# Style presets for rendered text
+STYLE_PRESETS = {
+    "title": {"style": "fantasy", "weight": "bold", "size_mult": 2.0},
+    "ui": {"style": "casual", "weight": "regular", "size_mult": 1.0},
+    "dialogue": {"style": "casual", "weight": "regular", "size_mult": 0.8},
+    "score": {"style": "retro", "weight": "bold", "size_mult": 1.5}
+}
 
-@function_tool(strict_mode=False)
-async def find_game_font(
-    style: Literal["pixel", "fantasy", "sci-fi", "casual", "retro", "horror"] = "casual",
-    weight: Literal["regular", "bold", "light"] = "regular",
+TEXT_PADDING = 10  # Pixels around rendered text, room for effects
+
+# (style, weight) -> resolved font info, so lookups/downloads happen once
+_resolved_fonts: dict[tuple[str, str], dict[str, Any]] = {}
+
+
+async def _find_font_info(
+    style: str = "casual",
+    weight: str = "regular",
     download: bool = True,
     save_path: str | None = None,
 ) -> dict[str, Any]:
-    """Find and download appropriate game fonts from Google Fonts.
-    
-    Args:
-        style: Game style to match
-        weight: Font weight
-        download: Whether to download the font
-        save_path: Where to save the font file
-        
-    Returns:
-        Font information and path
-    """
+    """Look up (and optionally download) a Google Font for a game style."""
     # Map game styles to font categories
     style_mapping = {
         "pixel": ["display", "monospace"],
@@ -39,49 +53,212 @@ async def find_game_font(
         "horror": ["display", "serif"]
     }
     
-    google_fonts = GoogleFonts()
     categories = style_mapping.get(style, ["sans-serif"])
     
-    # Search for appropriate fonts
-    results = []
-    for category in categories:
-        fonts = await google_fonts.search_fonts("game", category=category)
-        results.extend(fonts[:3])  # Top 3 from each category
-    
-    if not results:
-        # Fallback to popular gaming fonts
-        results = [
-            {"family": "Press Start 2P", "category": "display"},
-            {"family": "Orbitron", "category": "sans-serif"},
-            {"family": "Audiowide", "category": "display"}
-        ]
-    
-    # Select the first suitable font
-    font = results[0]
-    font_info = {
-        "name": font["family"],
-        "category": font.get("category", "sans-serif"),
-        "style": style,
-        "weight": weight
-    }
+    async with GoogleFonts() as google_fonts:
+        # Search for appropriate fonts (catalog comes from the on-disk cache when fresh)
+        results = []
+        for category in categories:
+            fonts = await google_fonts.search_fonts("game", category=category)
+            results.extend(fonts[:3])  # Top 3 from each category
+        
+        if not results:
+            # Fallback to popular gaming fonts
+            results = [
+                {"family": "Press Start 2P", "category": "display"},
+                {"family": "Orbitron", "category": "sans-serif"},
+                {"family": "Audiowide", "category": "display"}
+            ]
+        
+        # Select the first suitable font
+        font = results[0]
+        font_info = {
+            "name": font["family"],
+            "category": font.get("category", "sans-serif"),
+            "style": style,
+            "weight": weight
+        }
+        
+        if download and save_path:
+            # Download into the shared cache (reused from disk when already present)
+            variant = "700" if weight == "bold" else "300" if weight == "light" else "regular"
+            font_files = await google_fonts.download_font_files(font["family"], variants=[variant])
+            if font_files:
+                font_info["path"] = str(_copy_font(font_files[0], Path(save_path)))
+    
+    return font_info
+
+
+def _copy_font(source: Path, save_path: Path) -> Path:
+    """Copy a cached font to the requested path, keeping the file's real format."""
+    target = save_path.with_suffix(source.suffix)
+    if source.resolve() != target.resolve():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.tmp")
+        shutil.copyfile(source, tmp_path)
+        tmp_path.replace(target)
+    return target
+
+
+async def _resolve_font(style: str, weight: str) -> dict[str, Any]:
+    """Resolve the font for a style/weight pair, downloading it at most once.
     
-    if download and save_path:
-        # Download the font
-        font_data = await google_fonts.download_font(font["family"])
-        if font_data:
-            path = Path(save_path)
-            path.parent.mkdir(parents=True, exist_ok=True)
-            
-            for variant, data in font_data.items():
-                if weight in variant.lower() or (weight == "regular" and variant == "regular"):
-                    font_path = path.parent / f"{font['family'].replace(' ', '_')}_{variant}.ttf"
-                    font_path.write_bytes(data)
-                    font_info["path"] = str(font_path)
-                    break
+    Only fonts that were actually downloaded are cached, so a lookup that
+    fell back to the default font (e.g. while offline) is retried next time.
+    """
+    key = (style, weight)
+    if key in _resolved_fonts:
+        return _resolved_fonts[key]
     
+    font_info = await _find_font_info(
+        style=style,
+        weight=weight,
+        download=True,
+        save_path=str(FONTS_CACHE_DIR / "files" / f"{style}_{weight}.ttf")
+    )
+    if font_info.get("path"):
+        _resolved_fonts[key] = font_info
     return font_info
 
 
+def _colored_layer(mask: Image.Image, rgb: tuple[int, int, int]) -> Image.Image:
+    """Turn an alpha mask into a solid-color RGBA layer."""
+    layer = Image.new("RGBA", mask.size, rgb + (0,))
+    layer.putalpha(mask)
+    return layer
+
+
+@lru_cache(maxsize=512)
+def _render_text_image(
+    text: str,
+    font_path: str | None,
+    size: int,
+    color: str,
+    effects: tuple[str, ...],
+) -> Image.Image:
+    """Rasterize text once and derive every effect from the same glyph mask.
+    
+    Outline is a max-filter dilation and glow a Gaussian blur of the mask,
+    so effects cost one image filter each instead of extra text passes.
+    Results are cached; callers must not mutate the returned image.
+    """
+    font = load_font(font_path, size)
+    left, top, right, bottom = font.getbbox(text)
+    width = max(right - left, 1) + TEXT_PADDING * 2
+    height = max(bottom - top, 1) + TEXT_PADDING * 2
+    
+    mask = Image.new("L", (width, height), 0)
+    ImageDraw.Draw(mask).text((TEXT_PADDING - left, TEXT_PADDING - top), text, font=font, fill=255)
+    
+    rgb = ImageColor.getrgb(color)[:3]
+    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    
+    # Layers are composited bottom-up: glow, shadow, outline, fill
+    if "glow" in effects:
+        img = Image.alpha_composite(img, _colored_layer(glow_mask(mask), rgb))
+    
+    if "shadow" in effects:
+        img = Image.alpha_composite(img, _colored_layer(shadow_mask(mask), (0, 0, 0)))
+    
+    if "outline" in effects:
+        img = Image.alpha_composite(img, _colored_layer(outline_mask(mask), (0, 0, 0)))
+    
+    return Image.alpha_composite(img, _colored_layer(mask, rgb))
+
+
+def _render_with_font(
+    text: str,
+    font_info: dict[str, Any],
+    font_style: str,
+    size: int,
+    color: str,
+    effects: list[str] | None,
+    save_path: str | None,
+) -> dict[str, Any]:
+    """Render one string with an already-resolved font."""
+    img = _render_text_image(text, font_info.get("path"), size, color, tuple(sorted(set(effects or ()))))
+    
+    result = {
+        "text": text,
+        "font": font_info["name"],
+        "style": font_style,
+        "size": size,
+        "effects": effects or []
+    }
+    
+    if save_path:
+        path = Path(save_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        img.save(path, "PNG")
+        result["path"] = str(path)
+        result["dimensions"] = (img.width, img.height)
+    
+    return result
+
+
+async def _render_text_batch(
+    texts: list[str],
+    font_style: str = "ui",
+    color: str = "white",
+    size: int = 32,
+    effects: list[str] | None = None,
+    output_dir: str | None = None,
+) -> list[dict[str, Any]]:
+    """Render many strings in one style with a single font resolution."""
+    preset = STYLE_PRESETS.get(font_style, STYLE_PRESETS["ui"])
+    adjusted_size = int(size * preset["size_mult"])
+    font_info = await _resolve_font(preset["style"], preset["weight"])
+    
+    base_dir = Path(output_dir) if output_dir else None
+    filenames = _batch_filenames(texts)
+    return [
+        _render_with_font(
+            text,
+            font_info,
+            font_style,
+            adjusted_size,
+            color,
+            effects,
+            str(base_dir / filenames[text]) if base_dir else None
+        )
+        for text in texts
+    ]
+
+
+def _batch_filenames(texts: list[str]) -> dict[str, str]:
+    """Map each text to a safe, unique ``.png`` name ("HP: 100/100" -> ``hp_100_100.png``).
+
+    Texts whose slugs collide get a short hash of the text appended.
+    """
+    slugs = {text: re.sub(r"[^a-z0-9_-]+", "_", text.lower()).strip("_") or "text" for text in texts}
+    counts = Counter(slugs.values())
+    return {
+        text: f"{slug}_{hashlib.sha1(text.encode()).hexdigest()[:6]}.png" if counts[slug] > 1 else f"{slug}.png"
+        for text, slug in slugs.items()
+    }
+
+
+@function_tool(strict_mode=False)
+async def find_game_font(
+    style: Literal["pixel", "fantasy", "sci-fi", "casual", "retro", "horror"] = "casual",
+    weight: Literal["regular", "bold", "light"] = "regular",
+    download: bool = True,
+    save_path: str | None = None,
+) -> dict[str, Any]:
+    """Find and download appropriate game fonts from Google Fonts.
+    
+    Args:
+        style: Game style to match
+        weight: Font weight
+        download: Whether to download the font
+        save_path: Where to save the font file
+        
+    Returns:
+        Font information and path
+    """
+    return await _find_font_info(style=style, weight=weight, download=download, save_path=save_path)
+
+
 @function_tool(strict_mode=False)
 async def render_game_text(
     text: str,
@@ -104,91 +281,92 @@ async def render_game_text(
     Returns:
         Rendered text information
     """
-    # Style presets
-    style_presets = {
-        "title": {"style": "fantasy", "weight": "bold", "size_mult": 2.0},
-        "ui": {"style": "casual", "weight": "regular", "size_mult": 1.0},
-        "dialogue": {"style": "casual", "weight": "regular", "size_mult": 0.8},
-        "score": {"style": "retro", "weight": "bold", "size_mult": 1.5}
-    }
-    
-    preset = style_presets.get(font_style, style_presets["ui"])
+    preset = STYLE_PRESETS.get(font_style, STYLE_PRESETS["ui"])
     adjusted_size = int(size * preset["size_mult"])
     
-    # Find appropriate font
-    font_info = await find_game_font(
-        style=preset["style"],
-        weight=preset["weight"],
-        download=True,
-        save_path="temp_font.ttf" if not save_path else None
-    )
+    # Font lookup/download and loading are cached across calls
+    font_info = await _resolve_font(preset["style"], preset["weight"])
+    
+    return _render_with_font(text, font_info, font_style, adjusted_size, color, effects, save_path)
+
+
+@function_tool(strict_mode=False)
+async def render_game_text_batch(
+    texts: list[str],
+    font_style: Literal["title", "ui", "dialogue", "score"] = "ui",
+    color: str = "white",
+    size: int = 32,
+    effects: list[Literal["shadow", "outline", "glow"]] | None = None,
+    output_dir: str | None = None,
+) -> list[dict[str, Any]]:
+    """Render many game text labels in one style with a single font load.
+    
+    Args:
+        texts: Texts to render
+        font_style: Style preset shared by every text
+        color: Text color
+        size: Font size in pixels
+        effects: Visual effects to apply
+        output_dir: Directory to save rendered PNGs (named after each text)
+        
+    Returns:
+        Rendered text information, in input order
+    """
+    return await _render_text_batch(texts, font_style, color, size, effects, output_dir)
+
+
+@function_tool(strict_mode=False)
+async def generate_bitmap_font(
+    style: Literal["pixel", "fantasy", "sci-fi", "casual", "retro", "horror"] = "casual",
+    weight: Literal["regular", "bold", "light"] = "regular",
+    size: int = 32,
+    charset: str | None = None,
+    game_texts: list[str] | None = None,
+    effects: list[Literal["shadow", "outline"]] | None = None,
+    engine: Literal["pygame", "godot", "bevy"] | None = None,
+    output_dir: str | None = None,
+) -> dict[str, Any]:
+    """Bake a game font into a packed BMFont glyph atlas.
     
-    # Create image with text
-    # Estimate text size (rough approximation)
-    img_width = len(text) * adjusted_size
-    img_height = adjusted_size * 2
-    
-    # Create transparent image
-    img = Image.new('RGBA', (img_width, img_height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Try to load font, fallback to default
-    try:
-        if "path" in font_info:
-            font = ImageFont.truetype(font_info["path"], adjusted_size)
-        else:
-            font = ImageFont.load_default()
-    except:
-        font = ImageFont.load_default()
-    
-    # Get actual text size
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
-    text_height = bbox[3] - bbox[1]
-    
-    # Recreate image with proper size
-    img = Image.new('RGBA', (text_width + 20, text_height + 20), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Apply effects
-    if effects:
-        if "shadow" in effects:
-            # Draw shadow
-            shadow_color = (0, 0, 0, 128)
-            draw.text((12, 12), text, font=font, fill=shadow_color)
+    Args:
+        style: Game style used to pick the Google Font
+        weight: Font weight
+        size: Glyph size in pixels
+        charset: Explicit characters to include (defaults to printable ASCII)
+        game_texts: Dialogue/UI strings; only their glyphs are baked when given
+        effects: Effects baked into the glyphs
+        engine: Also write the runtime loader for this engine
+        output_dir: Directory for the atlas PNG, .fnt and loader
         
-        if "outline" in effects:
-            # Draw outline
-            outline_color = (0, 0, 0, 255)
-            for dx in [-2, 0, 2]:
-                for dy in [-2, 0, 2]:
-                    if dx != 0 or dy != 0:
-                        draw.text((10 + dx, 10 + dy), text, font=font, fill=outline_color)
-    
-    # Draw main text
-    draw.text((10, 10), text, font=font, fill=color)
-    
-    # Apply glow effect if requested
-    if effects and "glow" in effects:
-        # Simple glow simulation with blur
-        from PIL import ImageFilter
-        glow_img = img.filter(ImageFilter.GaussianBlur(radius=3))
-        img = Image.alpha_composite(glow_img, img)
+    Returns:
+        Atlas information and written file paths
+    """
+    font_info = await _resolve_font(style, weight)
     
-    result = {
-        "text": text,
-        "font": font_info["name"],
-        "style": font_style,
-        "size": adjusted_size,
-        "effects": effects or []
-    }
+    if game_texts:
+        glyphs = collect_charset(game_texts)
+    else:
+        glyphs = charset or ASCII_CHARSET
     
-    if save_path:
-        path = Path(save_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        img.save(path, "PNG")
-        result["path"] = str(path)
-        result["dimensions"] = (img.width, img.height)
+    atlas = build_glyph_atlas(
+        charset=glyphs,
+        font_path=font_info.get("path"),
+        size=size,
+        effects=effects or (),
+        face=font_info["name"]
+    )
+    
+    result = atlas_summary(atlas)
+    result["font"] = font_info["name"]
+    
+    base_dir = Path(output_dir) if output_dir else Path("text_assets") / "fonts"
+    name = f"{font_info['name'].replace(' ', '_').lower()}_{size}"
+    files = atlas.save(base_dir, name)
+    result["texture_path"] = str(files["texture"])
+    result["descriptor_path"] = str(files["descriptor"])
+    
+    if engine:
+        result["loader_path"] = str(write_engine_loader(engine, base_dir))
     
     return result
 
@@ -224,31 +402,31 @@ async def generate_text_assets(
     
     # Generate title
     title_path = str(base_dir / "title.png")
-    title_result = await render_game_text(
-        text=game_title,
-        font_style="title",
-        size=64,
-        effects=["shadow", "outline"],
-        save_path=title_path
+    title_font = await _resolve_font(STYLE_PRESETS["title"]["style"], STYLE_PRESETS["title"]["weight"])
+    title_result = _render_with_font(
+        game_title,
+        title_font,
+        "title",
+        int(64 * STYLE_PRESETS["title"]["size_mult"]),
+        "white",
+        ["shadow", "outline"],
+        title_path
     )
     results["title"].append(title_result)
     
-    # Generate UI texts
-    for ui_text in ui_texts:
-        ui_path = str(base_dir / "ui" / f"{ui_text.lower().replace(' ', '_')}.png")
-        ui_result = await render_game_text(
-            text=ui_text,
-            font_style="ui",
-            size=24,
-            effects=["shadow"],
-            save_path=ui_path
-        )
-        results["ui"].append(ui_result)
+    # Generate UI texts in one batch so the font is resolved once
+    results["ui"] = await _render_text_batch(
+        ui_texts,
+        font_style="ui",
+        size=24,
+        effects=["shadow"],
+        output_dir=str(base_dir / "ui")
+    )
     
     # Download fonts for the game
     for font_style in ["regular", "bold"]:
         font_path = str(base_dir / "fonts" / f"game_font_{font_style}.ttf")
-        font_info = await find_game_font(
+        font_info = await _find_font_info(
             style=style,
             weight=font_style,
             download=True,
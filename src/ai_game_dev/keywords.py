@@ -0,0 +1,126 @@
+"""
+Shared multi-pattern keyword matching.
+
+One Aho-Corasick automaton holds every keyword the text and audio
+analyzers look for, so a description or passage is scanned once no
+matter how many keyword lists are checked against it. Matches respect
+word boundaries: a keyword must start a word and may only be followed by
+a common inflection ("quest" matches "quests", not "request").
+"""
+
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Iterator, Mapping
+
+
+INFLECTION_SUFFIXES = frozenset({
+    "s", "es", "ed", "d", "ing", "er", "ers", "y", "ies", "ic", "al", "ment", "ly",
+})
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a set of lowercase keywords."""
+
+    def __init__(self, keywords: Iterable[str], suffixes: Iterable[str] = INFLECTION_SUFFIXES):
+        self.keywords = frozenset(keyword.lower() for keyword in keywords if keyword)
+        self.suffixes = frozenset(suffixes)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+
+        for keyword in sorted(self.keywords):
+            node = 0
+            for char in keyword:
+                node = self._goto[node].setdefault(char, len(self._goto))
+                if node == len(self._goto):
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+            self._out[node] += (keyword,)
+
+        # Breadth-first failure links; outputs inherit their fallback's matches
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] += self._out[self._fail[child]]
+                queue.append(child)
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, str]]:
+        """Yield ``(start, keyword)`` for every word-bounded match in one pass."""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for keyword in out[node]:
+                start = end - len(keyword)
+                if self._bounded(text, start, end, keyword):
+                    yield start, keyword
+
+    def _bounded(self, text: str, start: int, end: int, keyword: str) -> bool:
+        if keyword[0].isalnum() and start and text[start - 1].isalnum():
+            return False
+        if not keyword[-1].isalnum():
+            return True
+        word_end = end
+        while word_end < len(text) and text[word_end].isalnum():
+            word_end += 1
+        return word_end == end or text[end:word_end] in self.suffixes
+
+    def find(self, text: str) -> frozenset[str]:
+        """Distinct keywords present in the text."""
+        return frozenset(keyword for _, keyword in self.iter_matches(text))
+
+    def count(self, text: str) -> Counter:
+        """Occurrences of each keyword in the text."""
+        return Counter(keyword for _, keyword in self.iter_matches(text))
+
+
+_vocabulary: set[str] = set()
+_shared_matcher: KeywordMatcher | None = None
+
+
+def register_keywords(*groups: Iterable[str] | Mapping[str, Iterable[str]]) -> None:
+    """Add keywords to the shared automaton (mappings contribute their values)."""
+    global _shared_matcher
+    words = set()
+    for group in groups:
+        if isinstance(group, Mapping):
+            words.update(keyword.lower() for keywords in group.values() for keyword in keywords)
+        else:
+            words.update(keyword.lower() for keyword in group)
+    if not words <= _vocabulary:
+        _vocabulary.update(words)
+        _shared_matcher = None
+        find_keywords.cache_clear()
+
+
+def shared_matcher() -> KeywordMatcher:
+    """The automaton over every registered keyword, compiled on first use."""
+    global _shared_matcher
+    if _shared_matcher is None:
+        _shared_matcher = KeywordMatcher(_vocabulary)
+    return _shared_matcher
+
+
+@lru_cache(maxsize=256)
+def find_keywords(text: str) -> frozenset[str]:
+    """Registered keywords present in the text; repeated analyses of one text scan it once."""
+    return shared_matcher().find(text)
+
+
+def count_keywords(text: str) -> Counter:
+    """Occurrences of each registered keyword in the text."""
+    return shared_matcher().count(text)
+
+
+def matching_labels(hits: frozenset[str], groups: Mapping[str, Iterable[str]]) -> list[str]:
+    """Labels of ``groups`` (label -> keywords) with at least one hit, in order."""
+    return [label for label, keywords in groups.items() if not hits.isdisjoint(keywords)]
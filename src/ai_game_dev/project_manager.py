@@ -24,6 +24,7 @@ class ProjectInfo:
     generated_files: Dict[str, str] = None
     build_instructions: List[str] = None
     asset_requirements: Dict[str, List[str]] = None
+    benchmarks: List[Dict[str, Any]] = None
 
     def __post_init__(self):
         if self.generated_files is None:
@@ -32,6 +33,8 @@ class ProjectInfo:
             self.build_instructions = []
         if self.asset_requirements is None:
             self.asset_requirements = {}
+        if self.benchmarks is None:
+            self.benchmarks = []
 
 class ProjectManager:
     def __init__(self, db_path: Optional[Path] = None):
@@ -55,9 +58,13 @@ class ProjectManager:
                     project_path TEXT,
                     generated_files TEXT,
                     build_instructions TEXT,
-                    asset_requirements TEXT
+                    asset_requirements TEXT,
+                    benchmarks TEXT
                 )
             """)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(projects)")}
+            if "benchmarks" not in columns:
+                conn.execute("ALTER TABLE projects ADD COLUMN benchmarks TEXT")
             conn.commit()
 
     @contextmanager
@@ -136,6 +143,34 @@ class ProjectManager:
         
         return self.get_project(project_id)
 
+    def record_benchmark(self, project_id: str, report: Dict[str, Any]) -> Optional[ProjectInfo]:
+        """Append a smoke-run report to the project's benchmark history."""
+        project = self.get_project(project_id)
+        if not project:
+            return None
+
+        with self._get_connection() as conn:
+            conn.execute(
+                "UPDATE projects SET updated_at = ?, benchmarks = ? WHERE id = ?",
+                (datetime.now().isoformat(), json.dumps(project.benchmarks + [report]), project_id)
+            )
+            conn.commit()
+
+        return self.get_project(project_id)
+
+    async def benchmark_project(self, project_id: str, **options: Any) -> Optional[ProjectInfo]:
+        """Smoke-run a generated pygame project and record the report."""
+        from ai_game_dev.engines.pygame.benchmark import smoke_run
+
+        project = self.get_project(project_id)
+        if not project or not project.project_path:
+            return None
+        if project.engine != "pygame":
+            raise ValueError(f"Smoke runs are only supported for pygame projects, not {project.engine}")
+
+        report = await smoke_run(Path(project.project_path), **options)
+        return self.record_benchmark(project_id, report.to_dict())
+
     def get_project(self, project_id: str) -> Optional[ProjectInfo]:
         with self._get_connection() as conn:
             row = conn.execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone()
@@ -178,7 +213,8 @@ class ProjectManager:
             project_path=row["project_path"],
             generated_files=json.loads(row["generated_files"] or "{}"),
             build_instructions=json.loads(row["build_instructions"] or "[]"),
-            asset_requirements=json.loads(row["asset_requirements"] or "{}")
+            asset_requirements=json.loads(row["asset_requirements"] or "{}"),
+            benchmarks=json.loads(row["benchmarks"] or "[]")
         )
 
     def get_stats(self) -> Dict[str, Any]:
@@ -9,6 +9,7 @@ from .tool import (
     generate_game_narrative,
     generate_character_backstory,
     create_yarnspinner_dialogue,
+    compile_yarn_dialogue,
     generate_educational_content,
     generate_code_repository,
 )
@@ -16,6 +17,7 @@ from .tool import (
 # Literary seeding tools (moved from seeding module)
 from .seeding_tools import (
     seed_narrative_content,
+    ingest_literary_corpus,
     extract_narrative_patterns,
     find_literary_inspirations,
     generate_quest_seeds,
@@ -31,11 +33,18 @@ from .educational_tools import (
     create_educational_dialogue,
     generate_academy_characters,
     create_coding_challenge,
+    run_coding_challenge,
 )
 
 # Literary seeder class
 from .literary_seeder import LiterarySeeder, SeedingRequest
 
+# Yarn dialogue compiler
+from .yarn_compiler import YarnProgram, compile_yarn
+
+# Local teachable-moment rules
+from .teachable_moments import analyze_code
+
 __all__ = [
     # Core text generation
     "generate_dialogue_tree",
@@ -43,11 +52,13 @@ __all__ = [
     "generate_game_narrative",
     "generate_character_backstory",
     "create_yarnspinner_dialogue",
+    "compile_yarn_dialogue",
     "generate_educational_content",
     "generate_code_repository",
     
     # Literary seeding
     "seed_narrative_content",
+    "ingest_literary_corpus",
     "extract_narrative_patterns", 
     "find_literary_inspirations",
     "generate_quest_seeds",
@@ -55,12 +66,16 @@ __all__ = [
     "enhance_game_narrative",
     "LiterarySeeder",
     "SeedingRequest",
+    "YarnProgram",
+    "compile_yarn",
     
     # Educational content
+    "analyze_code",
     "create_lesson_plan",
     "identify_teachable_moment",
     "generate_educational_game_spec",
     "create_educational_dialogue",
     "generate_academy_characters",
     "create_coding_challenge",
+    "run_coding_challenge",
 ]
\ No newline at end of file
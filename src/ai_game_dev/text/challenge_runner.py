@@ -0,0 +1,472 @@
+"""
+Sandboxed grading of Arcade Academy challenge submissions.
+
+Student code runs in a pool of pre-started worker processes. Workers are
+spawned fresh rather than forked from the app, so they hold none of its
+state, and each one clears its environment and caps its own memory, file
+writes and child processes when it starts. Submissions may only use
+attributes that don't start with ``_`` and import a small set of modules,
+which they see as public-only views, and every test case runs under a
+wall-clock alarm. The event loop only awaits
+a future, so a classroom of submissions queues on the pool instead of
+blocking Chainlit. A worker that ignores its alarm (a loop stuck in C
+code) is killed and the pool restarted.
+
+Test cases are dicts with a ``description`` and one of:
+
+- ``call`` (function name) with optional ``args``/``kwargs``
+- ``expression`` evaluated in the submission's namespace
+
+plus ``expected`` (compared with ``==``) and/or ``expected_output``
+(compared with stripped stdout). A case with neither only checks that
+the submission runs.
+"""
+
+import ast
+import asyncio
+import builtins
+import contextlib
+import io
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import types
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, asdict
+from typing import Any
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+DEFAULT_TEST_TIMEOUT = 2.0
+DEFAULT_MEMORY_MB = 256
+MAX_OUTPUT_CHARS = 4000
+SUBMISSION_GRACE_SECONDS = 2.0
+
+ALLOWED_MODULES = frozenset({
+    "math", "random", "collections", "itertools", "functools", "dataclasses",
+    "typing", "enum", "string", "re", "json", "heapq", "bisect", "statistics",
+    "copy", "operator", "fractions", "decimal", "time",
+})
+# Public names that still reach code or objects outside the sandbox
+BLOCKED_MODULE_ATTRIBUTES = {
+    "operator": frozenset({"attrgetter", "methodcaller"}),
+    "string": frozenset({"Formatter"}),
+    "typing": frozenset({"get_type_hints", "ForwardRef"}),
+}
+ALLOWED_DUNDERS = frozenset({
+    "__init__", "__post_init__", "__str__", "__repr__", "__eq__", "__ne__", "__lt__", "__le__",
+    "__gt__", "__ge__", "__hash__", "__len__", "__iter__", "__next__", "__contains__",
+    "__getitem__", "__setitem__", "__delitem__", "__add__", "__sub__", "__mul__", "__name__", "__doc__",
+})
+# Public attributes of generators, frames, tracebacks and code objects that
+# walk back up the stack to the grader's globals
+BLOCKED_ATTRIBUTES = frozenset({
+    "gi_frame", "gi_code", "cr_frame", "ag_frame", "f_back", "f_globals",
+    "f_locals", "f_builtins", "tb_frame", "tb_next",
+})
+BLOCKED_BUILTINS = frozenset({
+    "open", "exec", "eval", "compile", "input", "breakpoint", "exit", "quit",
+    "help", "globals", "vars", "memoryview",
+})
+
+
+@dataclass
+class TestResult:
+    """Outcome of one test case."""
+    description: str
+    passed: bool
+    expected: str | None = None
+    actual: str | None = None
+    error: str | None = None
+    duration_ms: float = 0.0
+
+
+@dataclass
+class GradeReport:
+    """Structured result for one submission."""
+    passed: bool
+    results: list[TestResult] = field(default_factory=list)
+    error: str | None = None
+    stdout: str = ""
+    duration_ms: float = 0.0
+
+    @property
+    def passed_count(self) -> int:
+        return sum(result.passed for result in self.results)
+
+    def to_dict(self) -> dict[str, Any]:
+        report = asdict(self)
+        report["passed_count"] = self.passed_count
+        report["total"] = len(self.results)
+        return report
+
+
+class _TestTimeout(BaseException):
+    """Raised by the alarm handler; a BaseException so student ``except Exception`` can't swallow it."""
+
+
+def _on_alarm(signum, frame):
+    raise _TestTimeout()
+
+
+class _SandboxViolation(Exception):
+    """Code that reaches for the interpreter's internals."""
+
+
+def _introspection_attribute(name: str) -> bool:
+    return name in BLOCKED_ATTRIBUTES or name.startswith("co_")
+
+
+def _check_source(tree: ast.AST) -> None:
+    """Refuse ``_``-prefixed and introspection attribute access (``random._os``, ``gen.gi_frame``).
+
+    Classes may still use their own private attributes (``self._health``)
+    and the usual special methods (``super().__init__()``).
+    """
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Attribute):
+            continue
+        if _introspection_attribute(node.attr):
+            allowed = False
+        elif not node.attr.startswith("_"):
+            continue
+        elif node.attr.startswith("__") and node.attr.endswith("__"):
+            allowed = node.attr in ALLOWED_DUNDERS
+        else:
+            allowed = isinstance(node.value, ast.Name) and node.value.id in ("self", "cls")
+        if not allowed:
+            raise _SandboxViolation(f"Line {node.lineno}: '{node.attr}' isn't available in challenges")
+
+
+def _allowed_module(name: str) -> bool:
+    return name.partition(".")[0] in ALLOWED_MODULES
+
+
+_module_views: dict[str, types.ModuleType] = {}
+
+
+def _module_view(module: types.ModuleType) -> types.ModuleType:
+    """A copy of a module's public names, minus the modules it imported itself."""
+    view = _module_views.get(module.__name__)
+    if view is not None:
+        return view
+    view = _module_views[module.__name__] = types.ModuleType(module.__name__)
+    blocked = BLOCKED_MODULE_ATTRIBUTES.get(module.__name__, frozenset())
+    for name, value in vars(module).items():
+        if name.startswith("_") or name in blocked:
+            continue
+        if isinstance(value, types.ModuleType):
+            # typing.sys, enum.bltns, json.codecs... but keep collections.abc
+            if not _allowed_module(value.__name__):
+                continue
+            value = _module_view(value)
+        setattr(view, name, value)
+    return view
+
+
+def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level or not _allowed_module(name):
+        raise ImportError(f"Module '{name}' isn't available in challenges")
+    module = builtins.__import__(name, globals, locals, fromlist, level)
+    view = _module_view(module)
+    # ``import collections.abc``/``from collections import abc`` can import
+    # a submodule after its package's view was built
+    parent = module
+    for part in [] if fromlist else name.split(".")[1:]:
+        child = getattr(parent, part)
+        setattr(_module_view(parent), part, _module_view(child))
+        parent = child
+    for item in fromlist or ():
+        value = getattr(module, item, None)
+        if isinstance(value, types.ModuleType) and _allowed_module(value.__name__):
+            setattr(view, item, _module_view(value))
+    return view
+
+
+def _public_name(name: Any) -> Any:
+    if isinstance(name, str) and name.startswith("_"):
+        raise AttributeError("Attributes starting with '_' aren't available in challenges")
+    if isinstance(name, str) and _introspection_attribute(name):
+        raise AttributeError(f"'{name}' isn't available in challenges")
+    return name
+
+
+def _safe_getattr(obj, name, *default):
+    return getattr(obj, _public_name(name), *default)
+
+
+def _safe_hasattr(obj, name):
+    return hasattr(obj, _public_name(name))
+
+
+def _safe_setattr(obj, name, value):
+    setattr(obj, _public_name(name), value)
+
+
+def _safe_delattr(obj, name):
+    delattr(obj, _public_name(name))
+
+
+def _sandbox_builtins() -> dict[str, Any]:
+    safe = {name: value for name, value in vars(builtins).items() if name not in BLOCKED_BUILTINS}
+    safe.update(
+        __import__=_restricted_import,
+        getattr=_safe_getattr,
+        hasattr=_safe_hasattr,
+        setattr=_safe_setattr,
+        delattr=_safe_delattr,
+    )
+    return safe
+
+
+def _current_address_space() -> int:
+    """Virtual memory size of this process in bytes, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _init_worker(memory_mb: int) -> None:
+    """Clear the environment and apply resource limits once, when the worker starts."""
+    # API keys and the like are inherited through the spawn
+    os.environ.clear()
+    if not RESOURCE_AVAILABLE:
+        return
+    # The cap is on top of what the worker already maps (the interpreter
+    # plus this package's imports)
+    limits = [
+        (resource.RLIMIT_AS, _current_address_space() + memory_mb * 1024 * 1024),
+        (resource.RLIMIT_FSIZE, 0),
+        (resource.RLIMIT_NPROC, 0),
+    ]
+    for limit, value in limits:
+        with contextlib.suppress(ValueError, OSError):
+            resource.setrlimit(limit, (value, value))
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _format(value: Any) -> str:
+    text = repr(value)
+    return text if len(text) <= 200 else text[:197] + "..."
+
+
+@contextlib.contextmanager
+def _time_limit(seconds: float):
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _run_case(case: dict[str, Any], namespace: dict[str, Any], output: io.StringIO, timeout: float) -> TestResult:
+    description = case.get("description", "Code runs without errors")
+    start = time.perf_counter()
+    output.seek(0)
+    output.truncate()
+    try:
+        with _time_limit(timeout), contextlib.redirect_stdout(output):
+            if "call" in case:
+                target = namespace.get(case["call"])
+                if not callable(target):
+                    raise NameError(f"Function '{case['call']}' is not defined")
+                actual = target(*case.get("args", []), **case.get("kwargs", {}))
+            elif "expression" in case:
+                tree = ast.parse(case["expression"], "<test>", mode="eval")
+                _check_source(tree)
+                actual = eval(compile(tree, "<test>", "eval"), namespace)
+            else:
+                actual = None
+    except _TestTimeout:
+        return TestResult(description, False, error=f"Took longer than {timeout:g}s",
+                          duration_ms=(time.perf_counter() - start) * 1000)
+    except MemoryError:
+        return TestResult(description, False, error="Used too much memory",
+                          duration_ms=(time.perf_counter() - start) * 1000)
+    except _SandboxViolation as error:
+        return TestResult(description, False, error=str(error),
+                          duration_ms=(time.perf_counter() - start) * 1000)
+    except Exception as error:
+        return TestResult(description, False, error=f"{type(error).__name__}: {error}",
+                          duration_ms=(time.perf_counter() - start) * 1000)
+
+    duration_ms = (time.perf_counter() - start) * 1000
+    if "expected" in case and actual != case["expected"]:
+        return TestResult(description, False, _format(case["expected"]), _format(actual), duration_ms=duration_ms)
+    if "expected_output" in case:
+        printed = output.getvalue()[:MAX_OUTPUT_CHARS].strip()
+        if printed != str(case["expected_output"]).strip():
+            return TestResult(description, False, _format(case["expected_output"]), _format(printed),
+                              duration_ms=duration_ms)
+    expected = case.get("expected", case.get("expected_output"))
+    return TestResult(description, True, None if expected is None else _format(expected),
+                      duration_ms=duration_ms)
+
+
+def grade_submission(code: str, test_cases: list[dict[str, Any]], timeout: float = DEFAULT_TEST_TIMEOUT) -> GradeReport:
+    """Run a submission and its tests in the current process (the worker entry point)."""
+    start = time.perf_counter()
+    output = io.StringIO()
+    namespace: dict[str, Any] = {"__builtins__": _sandbox_builtins(), "__name__": "__challenge__"}
+    try:
+        tree = ast.parse(code, "<submission>")
+        _check_source(tree)
+        program = compile(tree, "<submission>", "exec")
+        with _time_limit(timeout), contextlib.redirect_stdout(output):
+            exec(program, namespace)
+    except SyntaxError as error:
+        return GradeReport(False, error=f"SyntaxError on line {error.lineno}: {error.msg}")
+    except _SandboxViolation as error:
+        return GradeReport(False, error=str(error))
+    except _TestTimeout:
+        return GradeReport(False, error=f"Your code took longer than {timeout:g}s to run")
+    except MemoryError:
+        return GradeReport(False, error="Your code used too much memory")
+    except Exception as error:
+        return GradeReport(False, error=f"{type(error).__name__}: {error}", stdout=output.getvalue()[:MAX_OUTPUT_CHARS])
+
+    stdout = output.getvalue()[:MAX_OUTPUT_CHARS]
+    results = [_run_case(case, namespace, output, timeout) for case in test_cases]
+    return GradeReport(
+        passed=all(result.passed for result in results),
+        results=results,
+        stdout=stdout,
+        duration_ms=(time.perf_counter() - start) * 1000,
+    )
+
+
+class ChallengeRunner:
+    """Pool of resource-limited worker processes that grade submissions."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        timeout: float = DEFAULT_TEST_TIMEOUT,
+        memory_mb: int = DEFAULT_MEMORY_MB
+    ):
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.RLock()
+        # Submissions only reach the pool when a worker is free, so the
+        # deadline measures running time rather than time spent queued
+        self._thread_slots = threading.BoundedSemaphore(self.workers)
+        self._loop_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _context(self):
+        # Never fork: a forked worker would hold the app's memory (API
+        # clients, caches) for student code to dig through
+        return multiprocessing.get_context("spawn")
+
+    def start(self) -> None:
+        """Start every worker so the first submissions don't pay for it."""
+        with self._lock:
+            if self._executor is not None:
+                return
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._context(),
+                initializer=_init_worker,
+                initargs=(self.memory_mb,),
+            )
+            for future in [executor.submit(_warm_up) for _ in range(self.workers)]:
+                future.result()
+            self._executor = executor
+
+    def restart(self, executor: ProcessPoolExecutor | None = None) -> None:
+        """Kill every worker, including ones stuck in student code, and start fresh.
+
+        With ``executor``, only restart if that pool is still the current one.
+        """
+        with self._lock:
+            if executor is not None and self._executor is not executor:
+                return
+            executor, self._executor = self._executor, None
+            if executor is not None:
+                # ProcessPoolExecutor has no public way to kill busy workers
+                for process in list((executor._processes or {}).values()):
+                    with contextlib.suppress(Exception):
+                        process.kill()
+                executor.shutdown(wait=False, cancel_futures=True)
+            self.start()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _deadline(self, test_cases: list[dict[str, Any]]) -> float:
+        return self.timeout * (len(test_cases) + 1) + SUBMISSION_GRACE_SECONDS
+
+    def grade_sync(self, code: str, test_cases: list[dict[str, Any]]) -> GradeReport:
+        """Grade a submission, blocking until it finishes."""
+        with self._thread_slots:
+            self.start()
+            executor = self._executor
+            future = executor.submit(grade_submission, code, test_cases, self.timeout)
+            try:
+                return future.result(timeout=self._deadline(test_cases))
+            except TimeoutError:
+                self.restart(executor)
+                return GradeReport(False, error="Your code stopped responding and was stopped")
+            except BrokenProcessPool:
+                self.restart(executor)
+                return GradeReport(False, error="Your code crashed the grader (often from using too much memory)")
+
+    def _slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._loop_slots:
+            self._loop_slots[loop] = asyncio.Semaphore(self.workers)
+        return self._loop_slots[loop]
+
+    async def grade(self, code: str, test_cases: list[dict[str, Any]]) -> GradeReport:
+        """Grade a submission without blocking the event loop.
+
+        A submission whose worker was killed because of someone else's
+        stuck code is retried once on the restarted pool.
+        """
+        async with self._slots():
+            for attempt in range(2):
+                # Starting workers waits on process spawns, so keep it off the loop
+                await asyncio.to_thread(self.start)
+                executor = self._executor
+                future = asyncio.wrap_future(executor.submit(grade_submission, code, test_cases, self.timeout))
+                try:
+                    return await asyncio.wait_for(future, self._deadline(test_cases))
+                except asyncio.TimeoutError:
+                    await asyncio.to_thread(self.restart, executor)
+                    return GradeReport(False, error="Your code stopped responding and was stopped")
+                except BrokenProcessPool:
+                    await asyncio.to_thread(self.restart, executor)
+                    if attempt:
+                        return GradeReport(False, error="Your code crashed the grader (often from using too much memory)")
+
+
+
+_runner: ChallengeRunner | None = None
+
+
+def get_challenge_runner() -> ChallengeRunner:
+    """Get the shared challenge runner instance."""
+    global _runner
+    if _runner is None:
+        _runner = ChallengeRunner()
+    return _runner
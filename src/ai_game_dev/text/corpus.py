@@ -0,0 +1,527 @@
+"""
+Streaming ingestion of public-domain text corpora for the literary seeder.
+
+Books are read line by line from plain-text or EPUB files in a local
+directory or over HTTP, split into passages by a generator, deduplicated
+by content hash, tagged with genre and themes, and appended to an
+on-disk passage index whose embeddings live in the seeder's vector store.
+Whole books are never held in memory.
+"""
+
+import codecs
+import io
+import itertools
+import json
+import re
+import shutil
+import tempfile
+import urllib.error
+import urllib.request
+import zipfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field, asdict
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from urllib.parse import urlparse
+
+import numpy as np
+
+from ai_game_dev.keywords import count_keywords, find_keywords, matching_labels, register_keywords
+
+from .vector_store import VectorStore, content_hash
+
+
+PASSAGE_MIN_CHARS = 400
+PASSAGE_MAX_CHARS = 1500
+INGEST_BATCH_SIZE = 256
+HEADER_SCAN_LINES = 400
+CORPUS_EXTENSIONS = (".txt", ".epub")
+
+# Public-domain libraries (and their subdomains) untrusted callers may ingest books from
+CORPUS_ALLOWED_HOSTS = frozenset({"gutenberg.org", "archive.org", "standardebooks.org"})
+
+THEME_KEYWORDS = {
+    "heroism": ["hero", "brave", "courage", "noble", "champion"],
+    "mystery": ["secret", "hidden", "unknown", "mysterious", "enigma"],
+    "adventure": ["journey", "quest", "travel", "explore", "discover"],
+    "conflict": ["battle", "war", "fight", "struggle", "conflict"],
+    "magic": ["magic", "spell", "wizard", "enchant", "mystical"],
+    "technology": ["machine", "device", "invention", "future", "advanced"]
+}
+
+GENRE_KEYWORDS = {
+    "fantasy": ["wizard", "dragon", "spell", "enchant", "sword", "elf", "dwarf", "kingdom", "sorcerer", "sorcery"],
+    "sci-fi": ["planet", "star", "space", "machine", "robot", "rocket", "galaxy", "martian", "laboratory"],
+    "adventure": ["ship", "island", "treasure", "journey", "voyage", "jungle", "expedition", "pirate"],
+    "mystery": ["detective", "murder", "clue", "inspector", "crime", "suspect", "evidence"],
+    "horror": ["ghost", "grave", "blood", "terror", "corpse", "vampire", "haunt", "dread"],
+    "romance": ["love", "heart", "marriage", "kiss", "beloved", "courtship"],
+}
+register_keywords(THEME_KEYWORDS, GENRE_KEYWORDS)
+
+_GUTENBERG_START = re.compile(r"^\*\*\*\s*START OF (THE|THIS) PROJECT GUTENBERG", re.IGNORECASE)
+_GUTENBERG_END = re.compile(r"^\*\*\*\s*END OF (THE|THIS) PROJECT GUTENBERG", re.IGNORECASE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@dataclass
+class Passage:
+    """One passage of a book with its tags."""
+    text: str
+    title: str = ""
+    author: str = ""
+    source: str = ""
+    genre: str = "general"
+    themes: list[str] = field(default_factory=list)
+
+    @property
+    def hash(self) -> str:
+        return content_hash(self.text)
+
+
+@dataclass
+class IngestStats:
+    """Counts from one ingestion run."""
+    books: int = 0
+    passages: int = 0
+    added: int = 0
+    duplicates: int = 0
+
+
+def tag_themes(text: str) -> list[str]:
+    """Themes whose keywords occur in the text."""
+    return matching_labels(find_keywords(text), THEME_KEYWORDS)
+
+
+def guess_genre(text: str) -> str:
+    """Genre with the most keyword hits, or "general"."""
+    hits = count_keywords(text)
+    counts = {genre: sum(hits[k] for k in keywords) for genre, keywords in GENRE_KEYWORDS.items()}
+    genre, hits = max(counts.items(), key=lambda item: item[1])
+    return genre if hits else "general"
+
+
+def iter_paragraphs(lines: Iterable[str]) -> Iterator[str]:
+    """Join wrapped lines into paragraphs separated by blank lines."""
+    paragraph = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            paragraph.append(line)
+        elif paragraph:
+            yield " ".join(paragraph)
+            paragraph = []
+    if paragraph:
+        yield " ".join(paragraph)
+
+
+def iter_passages(
+    lines: Iterable[str],
+    min_chars: int = PASSAGE_MIN_CHARS,
+    max_chars: int = PASSAGE_MAX_CHARS
+) -> Iterator[str]:
+    """Group paragraphs into passages of roughly ``min_chars``-``max_chars``.
+
+    Paragraphs longer than ``max_chars`` are split at sentence ends.
+    """
+    pending, size = [], 0
+    for paragraph in iter_paragraphs(lines):
+        pieces = [paragraph] if len(paragraph) <= max_chars else _split_sentences(paragraph, max_chars)
+        for piece in pieces:
+            if pending and size + len(piece) > max_chars:
+                yield "\n\n".join(pending)
+                pending, size = [], 0
+            pending.append(piece)
+            size += len(piece)
+            if size >= min_chars:
+                yield "\n\n".join(pending)
+                pending, size = [], 0
+    if pending:
+        yield "\n\n".join(pending)
+
+
+def _split_sentences(paragraph: str, max_chars: int) -> list[str]:
+    """Split a long paragraph into sentence groups of at most ``max_chars``."""
+    pieces, current = [], ""
+    for sentence in _SENTENCE_END.split(paragraph):
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+        while len(current) > max_chars:
+            pieces.append(current[:max_chars])
+            current = current[max_chars:]
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def read_plain_text(lines: Iterable[str]) -> tuple[dict[str, str], Iterator[str]]:
+    """Split a text stream into header metadata and body lines.
+
+    Project Gutenberg headers (``Title:``/``Author:`` before the START
+    marker) and licence footers are stripped; other texts pass through.
+    """
+    lines = iter(lines)
+    head = []
+    metadata = {}
+    for line in lines:
+        head.append(line)
+        if _GUTENBERG_START.match(line):
+            for header_line in head:
+                key, _, value = header_line.partition(":")
+                if key.strip().lower() in ("title", "author") and value.strip():
+                    metadata.setdefault(key.strip().lower(), value.strip())
+            head = []
+            break
+        if len(head) >= HEADER_SCAN_LINES:
+            break
+
+    def body() -> Iterator[str]:
+        for line in itertools.chain(head, lines):
+            if _GUTENBERG_END.match(line):
+                return
+            yield line
+
+    return metadata, body()
+
+
+class _TextExtractor(HTMLParser):
+    """Collects XHTML text as lines, with blank lines between blocks."""
+
+    BLOCK_TAGS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "tr"}
+    SKIP_TAGS = {"script", "style", "head"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: list[str] = []
+        self._current: list[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self.flush()
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in self.BLOCK_TAGS:
+            self.flush()
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._current.append(data)
+
+    def flush(self):
+        text = " ".join("".join(self._current).split())
+        self._current = []
+        if text:
+            self.lines.extend([text, ""])
+
+
+def read_epub(path: Path) -> tuple[dict[str, str], Iterator[str]]:
+    """Metadata and text lines of an EPUB, chapter by chapter in spine order."""
+    ns = {
+        "c": "urn:oasis:names:tc:opendocument:xmlns:container",
+        "opf": "http://www.idpf.org/2007/opf",
+        "dc": "http://purl.org/dc/elements/1.1/",
+    }
+    with zipfile.ZipFile(path) as epub:
+        container = ET.fromstring(epub.read("META-INF/container.xml"))
+        opf_path = container.find(".//c:rootfile", ns).get("full-path")
+        opf = ET.fromstring(epub.read(opf_path))
+
+    metadata = {}
+    for key, tag in (("title", "dc:title"), ("author", "dc:creator")):
+        element = opf.find(f".//{tag}", ns)
+        if element is not None and element.text:
+            metadata[key] = element.text.strip()
+
+    base = opf_path.rpartition("/")[0]
+    hrefs = {item.get("id"): item.get("href") for item in opf.iterfind(".//opf:manifest/opf:item", ns)}
+    chapters = [
+        f"{base}/{hrefs[ref.get('idref')]}" if base else hrefs[ref.get("idref")]
+        for ref in opf.iterfind(".//opf:spine/opf:itemref", ns) if ref.get("idref") in hrefs
+    ]
+
+    def lines() -> Iterator[str]:
+        with zipfile.ZipFile(path) as epub:
+            for chapter in chapters:
+                parser = _TextExtractor()
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                with epub.open(chapter) as f:
+                    while block := f.read(64 * 1024):
+                        parser.feed(decoder.decode(block))
+                        yield from parser.lines
+                        parser.lines.clear()
+                parser.feed(decoder.decode(b"", final=True))
+                parser.close()
+                parser.flush()
+                yield from parser.lines
+
+    return metadata, lines()
+
+
+def is_url(source: str | Path) -> bool:
+    """Whether a corpus source is an HTTP(S) URL rather than a local path."""
+    return str(source).startswith(("http://", "https://"))
+
+
+def _host_allowed(url: str, allowed_hosts: Iterable[str]) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == allowed or host.endswith("." + allowed) for allowed in allowed_hosts)
+
+
+def check_corpus_source(
+    source: str,
+    root: Path,
+    allowed_hosts: Iterable[str] = CORPUS_ALLOWED_HOSTS
+) -> str | Path:
+    """Validate an untrusted corpus source before ingesting it.
+
+    URLs must point at an allowed host; anything else is taken as a path
+    relative to ``root`` and must stay inside it.
+
+    Raises:
+        ValueError: If the source is outside the allowed hosts or root
+    """
+    if is_url(source):
+        if not _host_allowed(source, allowed_hosts):
+            raise ValueError(f"Host '{urlparse(source).hostname}' is not an allowed corpus source")
+        return source
+
+    root = Path(root).resolve()
+    path = (root / source).resolve()
+    if not path.is_relative_to(root):
+        raise ValueError(f"'{source}' is outside the corpus directory")
+    if not path.exists():
+        raise ValueError(f"'{source}' does not exist in the corpus directory")
+    return path
+
+
+class _AllowedHostRedirects(urllib.request.HTTPRedirectHandler):
+    """Refuse redirects that leave the allowed hosts."""
+
+    def __init__(self, allowed_hosts: Iterable[str]):
+        self.allowed_hosts = frozenset(allowed_hosts)
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        if not _host_allowed(newurl, self.allowed_hosts):
+            raise urllib.error.HTTPError(newurl, code, "Redirect leaves the allowed corpus hosts", headers, fp)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def iter_books(
+    source: str | Path,
+    allowed_hosts: Iterable[str] | None = None
+) -> Iterator[tuple[dict[str, str], Iterator[str]]]:
+    """Yield ``(metadata, lines)`` for each book in a directory, file or URL.
+
+    With ``allowed_hosts``, HTTP redirects may not leave those hosts.
+    """
+    if is_url(source):
+        yield _read_url(str(source), allowed_hosts)
+        return
+
+    source = Path(source)
+    paths = [source] if source.is_file() else sorted(
+        path for path in source.rglob("*") if path.suffix.lower() in CORPUS_EXTENSIONS
+    )
+    for path in paths:
+        if path.suffix.lower() == ".epub":
+            metadata, lines = read_epub(path)
+        else:
+            metadata, lines = read_plain_text(_iter_file_lines(path))
+        metadata.setdefault("title", path.stem)
+        metadata["source"] = str(path)
+        yield metadata, lines
+
+
+def _iter_file_lines(path: Path) -> Iterator[str]:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        yield from f
+
+
+def _read_url(url: str, allowed_hosts: Iterable[str] | None = None) -> tuple[dict[str, str], Iterator[str]]:
+    """Stream a plain-text book over HTTP; EPUBs are spooled to a temp file."""
+    if allowed_hosts is None:
+        response = urllib.request.urlopen(url)
+    else:
+        response = urllib.request.build_opener(_AllowedHostRedirects(allowed_hosts)).open(url)
+    name = url.rstrip("/").rpartition("/")[2]
+
+    if name.lower().endswith(".epub"):
+        with response, tempfile.NamedTemporaryFile(suffix=".epub", delete=False) as f:
+            shutil.copyfileobj(response, f)
+        metadata, chapters = read_epub(Path(f.name))
+        metadata.setdefault("title", name.rsplit(".", 1)[0])
+        metadata["source"] = url
+
+        def spooled() -> Iterator[str]:
+            try:
+                yield from chapters
+            finally:
+                Path(f.name).unlink(missing_ok=True)
+
+        return metadata, spooled()
+
+    def stream() -> Iterator[str]:
+        with response:
+            yield from io.TextIOWrapper(response, encoding="utf-8", errors="replace")
+
+    metadata, lines = read_plain_text(stream())
+    metadata.setdefault("title", name.rsplit(".", 1)[0] or url)
+    metadata["source"] = url
+    return metadata, lines
+
+
+class CorpusIndex:
+    """Append-only on-disk passage index.
+
+    Passage text and tags are stored as JSON lines; only byte offsets,
+    hashes, genres and themes are kept in memory, and passage text is read
+    back on demand. Embeddings are stored in ``vector_store`` under the
+    passage hash.
+    """
+
+    def __init__(self, root: Path, vector_store: VectorStore | None = None):
+        self.root = Path(root)
+        self.passages_path = self.root / "passages.jsonl"
+        self.vector_store = vector_store if vector_store is not None else VectorStore(self.root / "vectors")
+        self.hashes: list[str] = []
+        self.genres: list[str] = []
+        self.themes: list[list[str]] = []
+        self._offsets: list[int] = []
+        self._rows: dict[str, int] = {}
+
+        if self.passages_path.exists():
+            offset = 0
+            with open(self.passages_path, "rb") as f:
+                for line in f:
+                    try:
+                        self._track(json.loads(line), offset)
+                    except ValueError:
+                        break
+                    offset += len(line)
+            if offset < self.passages_path.stat().st_size:
+                # Drop a partial record left by an interrupted append
+                with open(self.passages_path, "r+b") as f:
+                    f.truncate(offset)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __contains__(self, passage_hash: str) -> bool:
+        return passage_hash in self._rows
+
+    def _track(self, record: dict, offset: int) -> None:
+        self._rows[record["hash"]] = len(self.hashes)
+        self.hashes.append(record["hash"])
+        self.genres.append(record.get("genre", "general"))
+        self.themes.append(record.get("themes", []))
+        self._offsets.append(offset)
+
+    def rows_for(self, hashes: Iterable[str]) -> list[int]:
+        """Rows of passages by hash."""
+        return [self._rows[passage_hash] for passage_hash in hashes]
+
+    def read(self, rows: Iterable[int]) -> list[dict]:
+        """Passage records for the given rows."""
+        records = []
+        with open(self.passages_path, "rb") as f:
+            for row in rows:
+                f.seek(self._offsets[row])
+                records.append(json.loads(f.readline()))
+        return records
+
+    def rows_matching(self, genres: list[str], themes: list[str] | None = None) -> np.ndarray:
+        """Rows whose genre contains a requested genre or whose themes overlap."""
+        wanted_genres = [genre.lower() for genre in genres]
+        wanted_themes = set(themes or [])
+        return np.fromiter(
+            (
+                row for row, (genre, tags) in enumerate(zip(self.genres, self.themes))
+                if any(g in genre for g in wanted_genres) or wanted_themes.intersection(tags)
+            ),
+            dtype=np.int64
+        )
+
+    def add(
+        self,
+        passages: Iterable[Passage],
+        embed: Callable[[list[str]], np.ndarray] | None = None,
+        batch_size: int = INGEST_BATCH_SIZE,
+        stats: IngestStats | None = None
+    ) -> IngestStats:
+        """Append new passages in batches, embedding each batch if ``embed`` is given."""
+        stats = stats or IngestStats()
+        batch: dict[str, Passage] = {}
+        for passage in passages:
+            stats.passages += 1
+            key = passage.hash
+            if key in self._rows or key in batch:
+                stats.duplicates += 1
+                continue
+            batch[key] = passage
+            if len(batch) >= batch_size:
+                self._append(batch, embed)
+                stats.added += len(batch)
+                batch = {}
+        if batch:
+            self._append(batch, embed)
+            stats.added += len(batch)
+        return stats
+
+    def _append(self, batch: dict[str, Passage], embed: Callable[[list[str]], np.ndarray] | None) -> None:
+        if embed:
+            texts = [passage.text for passage in batch.values()]
+            self.vector_store.add(list(batch), embed(texts))
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.passages_path, "ab") as f:
+            offset = f.tell()
+            for key, passage in batch.items():
+                record = {"hash": key, **asdict(passage)}
+                line = (json.dumps(record) + "\n").encode("utf-8")
+                f.write(line)
+                self._track(record, offset)
+                offset += len(line)
+
+    def ingest(
+        self,
+        source: str | Path,
+        genre: str | None = None,
+        embed: Callable[[list[str]], np.ndarray] | None = None,
+        allowed_hosts: Iterable[str] | None = None
+    ) -> IngestStats:
+        """Stream every book from a directory, file or URL into the index.
+
+        ``genre`` tags all passages; otherwise each book's genre is guessed
+        from its first passages. ``allowed_hosts`` limits where HTTP
+        redirects may lead.
+        """
+        stats = IngestStats()
+        for metadata, lines in iter_books(source, allowed_hosts):
+            stats.books += 1
+            self.add(self._book_passages(metadata, lines, genre), embed, stats=stats)
+        return stats
+
+    def _book_passages(self, metadata: dict[str, str], lines: Iterator[str], genre: str | None) -> Iterator[Passage]:
+        texts = iter_passages(lines)
+        if genre is None:
+            # Guess from the opening passages, which are held back and replayed
+            opening = [text for _, text in zip(range(8), texts)]
+            genre = guess_genre(" ".join(opening))
+            texts = (text for chunk in (opening, texts) for text in chunk)
+        for text in texts:
+            yield Passage(
+                text=text,
+                title=metadata.get("title", ""),
+                author=metadata.get("author", ""),
+                source=metadata.get("source", ""),
+                genre=genre,
+                themes=tag_themes(text),
+            )
@@ -2,15 +2,62 @@
 OpenAI structured tools for educational game development content.
 Specialized tools for Arcade Academy mode.
 """
+import json
 from typing import Any, Dict, List, Literal
 
 from agents import function_tool
+from openai import OpenAIError
 
+from ai_game_dev.constants import OPENAI_MODELS
 from ai_game_dev.templates import TemplateLoader
+from ai_game_dev.text.challenge_runner import get_challenge_runner
+from ai_game_dev.text.teachable_moments import analyze_code
+from ai_game_dev.text.tool import client
 
 # Initialize components
 template_loader = TemplateLoader()
 
+# Runnable starter code and tests for concepts the challenge runner can grade
+CHALLENGE_EXERCISES: Dict[str, Dict[str, Any]] = {
+    "variables": {
+        "starter_code": "# TODO: Create the player's stats\nhealth = 0\ngold = 0",
+        "test_cases": [
+            {"description": "health starts at 100", "expression": "health", "expected": 100},
+            {"description": "gold starts at 50", "expression": "gold", "expected": 50},
+        ],
+    },
+    "loops": {
+        "starter_code": "def total_score(points):\n    # TODO: Add up every value in points with a loop\n    return 0",
+        "test_cases": [
+            {"description": "Adds up a list of points", "call": "total_score", "args": [[10, 20, 30]], "expected": 60},
+            {"description": "An empty list scores 0", "call": "total_score", "args": [[]], "expected": 0},
+        ],
+    },
+    "conditionals": {
+        "starter_code": "def health_status(health):\n    # TODO: Return 'critical' below 20, 'hurt' below 60, else 'healthy'\n    return ''",
+        "test_cases": [
+            {"description": "Low health is critical", "call": "health_status", "args": [10], "expected": "critical"},
+            {"description": "Medium health is hurt", "call": "health_status", "args": [45], "expected": "hurt"},
+            {"description": "Full health is healthy", "call": "health_status", "args": [100], "expected": "healthy"},
+        ],
+    },
+    "functions": {
+        "starter_code": "def damage(attack, defense):\n    # TODO: Return attack minus defense, but never less than 1\n    return 0",
+        "test_cases": [
+            {"description": "Attack beats defense", "call": "damage", "args": [10, 3], "expected": 7},
+            {"description": "Always deals at least 1", "call": "damage", "args": [2, 8], "expected": 1},
+        ],
+    },
+    "classes": {
+        "starter_code": "class Player:\n    # TODO: Store health and add a take_damage(amount) method\n    pass",
+        "test_cases": [
+            {"description": "A new player has 100 health", "expression": "Player().health", "expected": 100},
+            {"description": "take_damage lowers health",
+             "expression": "(lambda p: (p.take_damage(30), p.health)[1])(Player())", "expected": 70},
+        ],
+    },
+}
+
 
 @function_tool(strict_mode=False)
 async def create_lesson_plan(
@@ -125,10 +172,13 @@ async def identify_teachable_moment(
     student_level: Literal["beginner", "intermediate", "advanced"],
     language: str = "python",
     include_exercises: bool = True
-) -> str:
+) -> dict[str, Any]:
     """
     Analyze code to identify teaching opportunities.
     
+    Python code is checked by the local rule registry first; the model is
+    only asked when no rule fires or the language isn't Python.
+    
     Args:
         code_snippet: The code to analyze
         student_level: Student's current level
@@ -136,8 +186,18 @@ async def identify_teachable_moment(
         include_exercises: Whether to generate practice exercises
         
     Returns:
-        Teachable moment analysis with exercises
+        Dict with the analysis ``source`` ("local" or "model") and a list of
+        ``moments``, each with a concept, trigger, explanation and line span;
+        model failures return no moments and an ``error``
     """
+    if language.lower() == "python":
+        moments = [moment.to_dict() for moment in analyze_code(code_snippet, student_level)]
+        if moments:
+            if not include_exercises:
+                for moment in moments:
+                    moment.pop("exercise")
+            return {"source": "local", "moments": moments}
+
     context = {
         "code_snippet": code_snippet,
         "student_level": student_level,
@@ -147,8 +207,33 @@ async def identify_teachable_moment(
         "exercise_hint": "Think about what would make the game more fun",
         "expected_result": "The game should have the new feature working"
     }
-    
-    return template_loader.render_academy_prompt("teachable_moment", **context)
+    prompt = template_loader.render_academy_prompt("teachable_moment", **context)
+
+    try:
+        response = await client.chat.completions.create(
+            model=OPENAI_MODELS["text"]["educational"],
+            messages=[
+                {"role": "system", "content": "You are Professor Pixel, an expert at teaching programming through game development. "
+                                              "Respond with JSON: {\"moments\": [{\"concept\", \"trigger\", \"explanation\", "
+                                              "\"start_line\", \"end_line\", \"code_example\", \"exercise\"}]}."},
+                {"role": "user", "content": f"{prompt}\n\n```{language}\n{code_snippet}\n```"}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+    except OpenAIError as e:
+        return {"source": "model", "moments": [], "error": f"Model request failed: {e}"}
+
+    content = response.choices[0].message.content
+    try:
+        result = json.loads(content or "")
+    except ValueError:
+        return {"source": "model", "moments": [], "error": "Model returned no valid JSON"}
+
+    moments = result.get("moments") if isinstance(result, dict) else None
+    if not isinstance(moments, list):
+        return {"source": "model", "moments": [], "error": "Model response has no list of moments"}
+    return {"source": "model", "moments": moments}
 
 
 @function_tool(strict_mode=False)
@@ -282,6 +367,9 @@ async def create_coding_challenge(
 
 def generate_starter_code(concept: str, difficulty: str) -> str:
     """Generate appropriate starter code based on concept and difficulty."""
+    exercise = CHALLENGE_EXERCISES.get(concept.lower())
+    if exercise:
+        return exercise["starter_code"]
     templates = {
         "easy": "# TODO: Implement a simple {concept}\npass",
         "medium": "# TODO: Enhance this {concept}\nclass GameElement:\n    pass",
@@ -303,14 +391,30 @@ def generate_requirements(concept: str, difficulty: str) -> List[str]:
 
 
 def generate_test_cases(concept: str, difficulty: str) -> List[Dict[str, Any]]:
-    """Generate test cases for the challenge."""
-    return [
-        {
-            "input": "test_input",
-            "expected": "expected_output",
-            "description": f"Basic {concept} functionality"
-        }
-    ]
+    """Generate test cases the challenge runner can execute."""
+    exercise = CHALLENGE_EXERCISES.get(concept.lower())
+    if exercise:
+        return [dict(case) for case in exercise["test_cases"]]
+    return [{"description": f"Your {concept} code runs without errors"}]
+
+
+@function_tool(strict_mode=False)
+async def run_coding_challenge(
+    code: str,
+    test_cases: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Run a student's code against challenge test cases in a sandbox.
+    
+    Args:
+        code: The student's submission
+        test_cases: Test cases from create_coding_challenge
+        
+    Returns:
+        Dictionary with overall pass/fail and a result per test case
+    """
+    report = await get_challenge_runner().grade(code, test_cases)
+    return report.to_dict()
 
 
 def generate_progressive_hints(concept: str, difficulty: str) -> List[str]:
@@ -6,19 +6,53 @@ Integrates with Internet Archive and uses PyTorch embeddings for semantic enhanc
 import asyncio
 import json
 import aiohttp
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 from pathlib import Path
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from ai_game_dev.keywords import find_keywords, matching_labels, register_keywords
+
+from .corpus import CorpusIndex, IngestStats, INGEST_BATCH_SIZE, THEME_KEYWORDS
+from .vector_store import VectorStore, content_hash
+
 try:
-    import torch
-    import torch.nn.functional as F
     from sentence_transformers import SentenceTransformer
     PYTORCH_AVAILABLE = True
 except ImportError:
     PYTORCH_AVAILABLE = False
 
 
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_BATCH_SIZE = 64
+
+# Keywords for the pattern, character, setting and style analyzers
+PATTERN_KEYWORDS = ["castle", "star", "space", "hole", "ground"]
+CHARACTER_KEYWORDS = {
+    "unlikely_hero": ["hobbit"],
+    "wise_mentor": ["wizard", "magic"],
+}
+SETTING_KEYWORDS = {
+    "fortress": ["castle"],
+    "cosmic": ["star", "space"],
+}
+STYLE_KEYWORDS = {
+    "atmospheric_dark": ["dark", "storm"],
+    "warm_inviting": ["comfort", "light"],
+}
+register_keywords(THEME_KEYWORDS, PATTERN_KEYWORDS, CHARACTER_KEYWORDS, SETTING_KEYWORDS, STYLE_KEYWORDS)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, highest first (argpartition, then sort k)."""
+    if k <= 0 or not len(scores):
+        return np.zeros(0, dtype=np.int64)
+    negated = -np.asarray(scores, dtype=np.float64)
+    top = np.argpartition(negated, k - 1)[:k] if k < len(negated) else np.arange(len(negated))
+    return top[np.argsort(negated[top], kind="stable")]
+
+
 @dataclass
 class SeededContent:
     """Container for seeded narrative content."""
@@ -54,14 +88,18 @@ class LiterarySeeder:
     - Cross-genre inspiration gathering
     """
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None, corpus_root: Optional[Path] = None):
         self.embedding_model = None
-        self.cache_dir = Path("seeding_cache")
-        self.cache_dir.mkdir(exist_ok=True)
+        self.cache_dir = cache_dir or Path("seeding_cache")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # The only local directory the ingest tool may read books from
+        self.corpus_root = corpus_root or self.cache_dir / "books"
+        self.vector_store = VectorStore(self.cache_dir / "embeddings" / EMBEDDING_MODEL_NAME)
+        self.corpus = CorpusIndex(self.cache_dir / "corpus", self.vector_store)
         
         if PYTORCH_AVAILABLE:
             try:
-                self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+                self.embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
             except Exception:
                 self.embedding_model = None
                 
@@ -70,16 +108,23 @@ class LiterarySeeder:
         
         seeded_content = []
         
-        # Gather content from multiple sources
-        internet_archive_content = await self._gather_from_internet_archive(request)
-        seeded_content.extend(internet_archive_content)
-        
-        # Generate embeddings and calculate relevance
-        if self.embedding_model and seeded_content:
-            await self._generate_embeddings(seeded_content, request)
+        if len(self.corpus):
+            # Ingested corpus passages come back already scored
+            seeded_content.extend(await self._gather_from_corpus(request))
+        else:
+            # Gather content from multiple sources
+            internet_archive_content = await self._gather_from_internet_archive(request)
+            seeded_content.extend(internet_archive_content)
+            
+            # Generate embeddings and calculate relevance
+            if self.embedding_model and seeded_content:
+                await self._generate_embeddings(seeded_content, request)
             
         # Filter and rank by relevance
         relevant_content = self._filter_by_relevance(seeded_content, request.max_sources)
+        for content in relevant_content:
+            if isinstance(content.embedding_vector, np.ndarray):
+                content.embedding_vector = content.embedding_vector.tolist()
         
         # Compile final seeding data
         return {
@@ -92,6 +137,74 @@ class LiterarySeeder:
             "embedding_summary": self._summarize_embeddings(relevant_content) if PYTORCH_AVAILABLE else None
         }
         
+    async def ingest_corpus(
+        self,
+        source: str | Path,
+        genre: Optional[str] = None,
+        allowed_hosts: Optional[Iterable[str]] = None
+    ) -> IngestStats:
+        """Stream plain-text/EPUB books from a directory, file or URL into the corpus.
+
+        Passages are embedded batch by batch when an embedding model is loaded.
+        The source is trusted; validate untrusted input with
+        ``check_corpus_source`` and pass ``allowed_hosts`` to pin redirects.
+        """
+        embed = self._encode if self.embedding_model else None
+        return await asyncio.to_thread(self.corpus.ingest, source, genre, embed, allowed_hosts)
+        
+    async def _gather_from_corpus(self, request: SeedingRequest) -> List[SeededContent]:
+        """Select and score the best corpus passages for a request.
+
+        Passages are narrowed by genre or theme tags, ranked by embedding
+        similarity (or tag overlap without a model), and only the top
+        ``max_sources`` are read from disk.
+        """
+        
+        rows = self.corpus.rows_matching(request.genres, request.themes)
+        if not len(rows):
+            rows = np.arange(len(self.corpus))
+        keys = [self.corpus.hashes[row] for row in rows]
+        
+        if self.embedding_model:
+            query_text = f"{' '.join(request.themes)} {' '.join(request.genres)} {request.tone}"
+            missing = self.vector_store.missing(keys)
+            # Passages ingested before a model was available are embedded once
+            # here, a batch at a time so their text is never all in memory
+            for start in range(0, len(missing), INGEST_BATCH_SIZE):
+                batch = missing[start:start + INGEST_BATCH_SIZE]
+                texts = [record["text"] for record in self.corpus.read(self.corpus.rows_for(batch))]
+                self.vector_store.add(batch, await asyncio.to_thread(self._encode, texts))
+            query = (await asyncio.to_thread(self._encode, [query_text]))[0]
+            vectors = self.vector_store.get(keys)
+            scores = vectors @ query
+        else:
+            vectors = None
+            wanted = set(request.themes)
+            scores = np.fromiter(
+                (len(wanted.intersection(self.corpus.themes[row])) for row in rows),
+                dtype=np.float64,
+                count=len(rows)
+            )
+        
+        top = top_k(scores, request.max_sources)
+        records = self.corpus.read(rows[top])
+        return [
+            SeededContent(
+                source=record.get("title") or record.get("source", "corpus"),
+                content_type="literary_excerpt",
+                text_content=record["text"],
+                metadata={
+                    "author": record.get("author", ""),
+                    "genre": record.get("genre", "general"),
+                    "themes": record.get("themes", []),
+                    "source": record.get("source", ""),
+                },
+                embedding_vector=vectors[i] if vectors is not None else None,
+                relevance_score=float(scores[i])
+            )
+            for i, record in zip(top, records)
+        ]
+        
     async def _gather_from_internet_archive(self, request: SeedingRequest) -> List[SeededContent]:
         """Gather content from Internet Archive."""
         
@@ -133,62 +246,59 @@ class LiterarySeeder:
         return content_list
         
     async def _generate_embeddings(self, content_list: List[SeededContent], request: SeedingRequest):
-        """Generate PyTorch embeddings for semantic analysis."""
+        """Score content against the request with cached, batched embeddings.
+
+        Only texts missing from the vector store are encoded, in one batched
+        call; scores are a single product of normalized vectors.
+        """
         
         if not self.embedding_model:
             return
             
-        # Create query embedding from request
         query_text = f"{' '.join(request.themes)} {' '.join(request.genres)} {request.tone}"
-        query_embedding = self.embedding_model.encode(query_text)
-        
-        # Generate embeddings for each content piece
-        for content in content_list:
-            try:
-                content_embedding = self.embedding_model.encode(content.text_content)
-                content.embedding_vector = content_embedding.tolist()
-                
-                # Calculate semantic similarity
-                similarity = F.cosine_similarity(
-                    torch.tensor(query_embedding).unsqueeze(0),
-                    torch.tensor(content_embedding).unsqueeze(0)
-                ).item()
-                
-                content.relevance_score = similarity
-                
-            except Exception as e:
+        keys = [content_hash(content.text_content) for content in content_list]
+        
+        try:
+            missing = set(self.vector_store.missing(keys))
+            texts = [c.text_content for c, key in zip(content_list, keys) if key in missing]
+            texts = list(dict.fromkeys(texts))
+            encoded = await asyncio.to_thread(self._encode, [query_text, *texts])
+        except Exception:
+            for content in content_list:
                 content.relevance_score = 0.5  # Default relevance
+            return
+            
+        if texts:
+            self.vector_store.add([content_hash(text) for text in texts], encoded[1:])
+        
+        embeddings = self.vector_store.get(keys)
+        scores = embeddings @ encoded[0]
+        for content, embedding, score in zip(content_list, embeddings, scores.tolist()):
+            content.embedding_vector = embedding
+            content.relevance_score = score
+            
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts to unit-length float32 vectors in batches."""
+        return np.asarray(
+            self.embedding_model.encode(
+                texts,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            ),
+            dtype=np.float32
+        )
                 
     def _filter_by_relevance(self, content_list: List[SeededContent], max_sources: int) -> List[SeededContent]:
-        """Filter and rank content by relevance score."""
+        """Return the ``max_sources`` most relevant items, highest first."""
         
-        # Sort by relevance score (highest first)
-        sorted_content = sorted(content_list, key=lambda x: x.relevance_score, reverse=True)
-        
-        # Return top N most relevant sources
-        return sorted_content[:max_sources]
+        scores = np.fromiter((c.relevance_score for c in content_list), dtype=np.float64, count=len(content_list))
+        return [content_list[i] for i in top_k(scores, max_sources)]
         
     def _extract_themes(self, text: str) -> List[str]:
         """Extract thematic elements from text."""
         
-        # Simple thematic analysis (would be more sophisticated in production)
-        themes = []
-        
-        theme_keywords = {
-            "heroism": ["hero", "brave", "courage", "noble", "champion"],
-            "mystery": ["secret", "hidden", "unknown", "mysterious", "enigma"],
-            "adventure": ["journey", "quest", "travel", "explore", "discover"],
-            "conflict": ["battle", "war", "fight", "struggle", "conflict"],
-            "magic": ["magic", "spell", "wizard", "enchant", "mystical"],
-            "technology": ["machine", "device", "invention", "future", "advanced"]
-        }
-        
-        text_lower = text.lower()
-        for theme, keywords in theme_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                themes.append(theme)
-                
-        return themes
+        return matching_labels(find_keywords(text), THEME_KEYWORDS)
         
     def _analyze_narrative_patterns(self, content_list: List[SeededContent]) -> Dict[str, Any]:
         """Analyze narrative patterns across seeded content."""
@@ -201,14 +311,14 @@ class LiterarySeeder:
         }
         
         # Analyze patterns across all content
-        all_text = " ".join([content.text_content for content in content_list])
+        hits = self._keyword_hits(content_list)
         
         # Simple pattern detection (would be more sophisticated)
-        if "castle" in all_text.lower():
+        if "castle" in hits:
             patterns["setting_patterns"].append("medieval/fantasy settings")
-        if "stars" in all_text.lower() or "space" in all_text.lower():
+        if hits & {"star", "space"}:
             patterns["setting_patterns"].append("cosmic/space settings")
-        if "hole" in all_text.lower() and "ground" in all_text.lower():
+        if {"hole", "ground"} <= hits:
             patterns["setting_patterns"].append("underground/hidden locations")
             
         return patterns
@@ -219,16 +329,16 @@ class LiterarySeeder:
         characters = []
         
         for content in content_list:
-            text = content.text_content.lower()
+            archetypes = matching_labels(find_keywords(content.text_content), CHARACTER_KEYWORDS)
             
             # Simple character archetype detection
-            if "hobbit" in text:
+            if "unlikely_hero" in archetypes:
                 characters.append({
                     "archetype": "unlikely_hero",
                     "description": "Small, comfort-loving being thrust into adventure",
                     "source": content.source
                 })
-            if "wizard" in text or "magic" in text:
+            if "wise_mentor" in archetypes:
                 characters.append({
                     "archetype": "wise_mentor",
                     "description": "Magical guide with ancient knowledge",
@@ -243,17 +353,17 @@ class LiterarySeeder:
         settings = []
         
         for content in content_list:
-            text = content.text_content.lower()
+            setting_types = matching_labels(find_keywords(content.text_content), SETTING_KEYWORDS)
             
             # Setting analysis
-            if "castle" in text:
+            if "fortress" in setting_types:
                 settings.append({
                     "type": "fortress",
                     "description": "Ancient stronghold with hidden secrets",
                     "mood": "mysterious_foreboding",
                     "source": content.source
                 })
-            if "stars" in text or "space" in text:
+            if "cosmic" in setting_types:
                 settings.append({
                     "type": "cosmic",
                     "description": "Vast space with cities of light",
@@ -273,16 +383,17 @@ class LiterarySeeder:
             "descriptive_density": "moderate"
         }
         
-        all_text = " ".join([content.text_content for content in content_list])
-        
         # Simple style analysis
-        if "dark" in all_text.lower() or "storm" in all_text.lower():
-            style_analysis["tone_indicators"].append("atmospheric_dark")
-        if "comfort" in all_text.lower() or "light" in all_text.lower():
-            style_analysis["tone_indicators"].append("warm_inviting")
+        style_analysis["tone_indicators"].extend(
+            matching_labels(self._keyword_hits(content_list), STYLE_KEYWORDS)
+        )
             
         return style_analysis
         
+    def _keyword_hits(self, content_list: List[SeededContent]) -> frozenset:
+        """Keywords found across all content, one automaton pass per text."""
+        return frozenset().union(*(find_keywords(content.text_content) for content in content_list))
+        
     def _summarize_embeddings(self, content_list: List[SeededContent]) -> Dict[str, Any]:
         """Summarize embedding analysis results."""
         
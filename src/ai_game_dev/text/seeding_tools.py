@@ -2,11 +2,13 @@
 OpenAI structured tools for narrative seeding from literary sources.
 """
 import json
+from dataclasses import asdict
 from pathlib import Path
 from typing import Any, Dict, List
 
 from agents import function_tool
 
+from .corpus import CORPUS_ALLOWED_HOSTS, check_corpus_source
 from .literary_seeder import LiterarySeeder, SeedingRequest, SeededContent
 
 
@@ -50,6 +52,33 @@ async def seed_narrative_content(
     return result
 
 
+@function_tool(strict_mode=False)
+async def ingest_literary_corpus(
+    source: str,
+    genre: str | None = None
+) -> Dict[str, Any]:
+    """
+    Ingest public-domain books into the literary seeding corpus.
+    
+    Args:
+        source: Directory or file of .txt/.epub books inside the corpus directory,
+            or an HTTP URL of one book on Project Gutenberg, Internet Archive or
+            Standard Ebooks
+        genre: Optional genre tag for every passage (guessed per book if omitted)
+        
+    Returns:
+        Dictionary with counts of books, passages, added passages and duplicates,
+        or an error when the source is not allowed
+    """
+    try:
+        checked = check_corpus_source(source, _seeder.corpus_root)
+    except ValueError as e:
+        return {"error": str(e), "corpus_root": str(_seeder.corpus_root)}
+    
+    stats = await _seeder.ingest_corpus(checked, genre, allowed_hosts=CORPUS_ALLOWED_HOSTS)
+    return {**asdict(stats), "corpus_size": len(_seeder.corpus)}
+
+
 @function_tool(strict_mode=False)
 async def extract_narrative_patterns(
     text: str,
@@ -0,0 +1,306 @@
+"""
+Local teachable-moment analysis for student Python code.
+
+Rules in a registry inspect one parsed AST (nodes are bucketed by type in
+a single walk) and report structured moments with line spans, so common
+patterns get instant feedback and a model is only needed when no rule
+fires.
+"""
+
+import ast
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterable, Iterator, Literal
+
+StudentLevel = Literal["beginner", "intermediate", "advanced"]
+
+ALL_LEVELS: tuple[str, ...] = ("beginner", "intermediate", "advanced")
+SEVERITY_ORDER = {"error": 0, "warning": 1, "info": 2}
+GOD_CLASS_METHODS = 15
+GOD_CLASS_LINES = 300
+
+
+@dataclass
+class CodeMoment:
+    """A teachable moment found in code, compatible with ``TeachableMoment``."""
+    rule: str
+    concept: str
+    trigger: str
+    explanation: str
+    start_line: int
+    end_line: int
+    severity: str = "info"
+    code_example: str = ""
+    exercise: str = ""
+    interactive: bool = True
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A registered analysis rule."""
+    id: str
+    concept: str
+    check: Callable[["AnalysisContext"], Iterable["Finding"]]
+    levels: tuple[str, ...] = ALL_LEVELS
+    severity: str = "info"
+    explanation: str = ""
+    code_example: str = ""
+    exercise: str = ""
+    max_hits: int | None = None
+
+
+@dataclass
+class Finding:
+    """What a rule check yields: the node to point at and a trigger message."""
+    node: ast.AST
+    trigger: str
+
+
+RULES: dict[str, Rule] = {}
+
+
+def rule(rule_id: str, concept: str, **options) -> Callable:
+    """Register a check function as a rule."""
+    def register(check: Callable[["AnalysisContext"], Iterable[Finding]]):
+        RULES[rule_id] = Rule(id=rule_id, concept=concept, check=check, **options)
+        return check
+    return register
+
+
+class AnalysisContext:
+    """A parsed module with nodes indexed by type and parent links."""
+
+    def __init__(self, tree: ast.Module, source: str):
+        self.tree = tree
+        self.source = source
+        self.parents: dict[ast.AST, ast.AST] = {}
+        self._by_type: dict[type, list[ast.AST]] = {}
+        for node in ast.walk(tree):
+            self._by_type.setdefault(type(node), []).append(node)
+            for child in ast.iter_child_nodes(node):
+                self.parents[child] = node
+
+    def nodes(self, *types: type) -> list[ast.AST]:
+        """All nodes of the given types, in walk order."""
+        if len(types) == 1:
+            return self._by_type.get(types[0], [])
+        return [node for t in types for node in self._by_type.get(t, [])]
+
+    def ancestors(self, node: ast.AST) -> Iterator[ast.AST]:
+        while node in self.parents:
+            node = self.parents[node]
+            yield node
+
+
+def dotted_name(node: ast.AST) -> str:
+    """``a.b.c`` for Name/Attribute chains, else ""."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return ""
+
+
+def _calls(ctx: AnalysisContext, within: ast.AST | None = None) -> Iterator[tuple[ast.Call, str]]:
+    nodes = ast.walk(within) if within is not None else iter(ctx.nodes(ast.Call))
+    for node in nodes:
+        if isinstance(node, ast.Call):
+            yield node, dotted_name(node.func)
+
+
+def _is_game_loop(ctx: AnalysisContext, loop: ast.While) -> bool:
+    """A while loop that flips the display or polls events."""
+    return any(
+        name.endswith(("display.flip", "display.update", "event.get", "event.poll"))
+        for _, name in _calls(ctx, loop)
+    )
+
+
+@rule(
+    "loops", "loops",
+    levels=("beginner",),
+    explanation="Loops repeat a block of code. Games use them for the main loop and to update every enemy or bullet.",
+    code_example="for enemy in enemies:\n    enemy.update()",
+    exercise="Change the loop so it skips enemies whose health is zero.",
+    max_hits=1,
+)
+def _loops(ctx: AnalysisContext) -> Iterator[Finding]:
+    for node in ctx.nodes(ast.For, ast.While):
+        kind = "for" if isinstance(node, ast.For) else "while"
+        yield Finding(node, f"A {kind} loop repeats this block")
+
+
+@rule(
+    "conditionals", "conditionals",
+    levels=("beginner",),
+    explanation="if/elif/else lets the game make decisions, like checking for collisions or key presses.",
+    code_example="if player.health <= 0:\n    game_over()\nelif player.health < 20:\n    show_warning()",
+    exercise="Add an elif branch that handles one more case.",
+    max_hits=1,
+)
+def _conditionals(ctx: AnalysisContext) -> Iterator[Finding]:
+    for node in ctx.nodes(ast.If):
+        if not isinstance(ctx.parents.get(node), ast.If) or node not in ctx.parents[node].orelse:
+            yield Finding(node, "An if statement chooses what happens next")
+
+
+@rule(
+    "mutable-default-argument", "function defaults",
+    severity="warning",
+    explanation="Default values are created once, when the function is defined. A list or dict default is shared "
+                "between every call, so changes leak from one call to the next.",
+    code_example="def add_item(item, inventory=None):\n    if inventory is None:\n        inventory = []\n"
+                 "    inventory.append(item)\n    return inventory",
+    exercise="Rewrite the function to use None as the default and create the container inside.",
+)
+def _mutable_defaults(ctx: AnalysisContext) -> Iterator[Finding]:
+    for func in ctx.nodes(ast.FunctionDef, ast.AsyncFunctionDef):
+        for default in [*func.args.defaults, *(d for d in func.args.kw_defaults if d is not None)]:
+            mutable = isinstance(default, (ast.List, ast.Dict, ast.Set)) or (
+                isinstance(default, ast.Call) and dotted_name(default.func) in ("list", "dict", "set")
+            )
+            if mutable:
+                yield Finding(default, f"'{func.name}' has a mutable default argument")
+
+
+@rule(
+    "god-class", "single responsibility",
+    levels=("intermediate", "advanced"),
+    severity="warning",
+    explanation="A class that does everything is hard to change and test. Split it into smaller classes that each "
+                "own one job, such as input, physics and rendering.",
+    code_example="class Player:\n    def __init__(self):\n        self.movement = Movement()\n"
+                 "        self.renderer = SpriteRenderer()",
+    exercise="Move the drawing methods into their own class and have the original class use it.",
+)
+def _god_classes(ctx: AnalysisContext) -> Iterator[Finding]:
+    for cls in ctx.nodes(ast.ClassDef):
+        methods = sum(isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)) for n in cls.body)
+        lines = (cls.end_lineno or cls.lineno) - cls.lineno + 1
+        if methods > GOD_CLASS_METHODS or lines > GOD_CLASS_LINES:
+            yield Finding(cls, f"Class '{cls.name}' has {methods} methods over {lines} lines")
+
+
+@rule(
+    "image-load-per-frame", "asset loading",
+    severity="warning",
+    explanation="pygame.image.load reads the file from disk every time it runs. Inside the game loop that happens "
+                "every frame; load images once before the loop and reuse them.",
+    code_example="player_image = pygame.image.load('player.png').convert_alpha()\n\nwhile running:\n"
+                 "    screen.blit(player_image, player_pos)",
+    exercise="Move the image loading above the game loop and store the result in a variable.",
+)
+def _image_load_per_frame(ctx: AnalysisContext) -> Iterator[Finding]:
+    frame_functions = {"update", "draw", "render", "on_draw", "tick"}
+    for call, name in _calls(ctx):
+        if not name.endswith("image.load"):
+            continue
+        for ancestor in ctx.ancestors(call):
+            if isinstance(ancestor, (ast.While, ast.For)) or (
+                isinstance(ancestor, (ast.FunctionDef, ast.AsyncFunctionDef)) and ancestor.name in frame_functions
+            ):
+                yield Finding(call, "An image is loaded inside code that runs every frame")
+                break
+            if isinstance(ancestor, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                break
+
+
+@rule(
+    "missing-clock-tick", "frame timing",
+    severity="warning",
+    explanation="Without clock.tick the loop runs as fast as the computer allows, so the game speed changes "
+                "between machines and uses a full CPU core.",
+    code_example="clock = pygame.time.Clock()\n\nwhile running:\n    ...\n    pygame.display.flip()\n"
+                 "    clock.tick(60)",
+    exercise="Create a pygame.time.Clock and call tick(60) once per loop iteration.",
+)
+def _missing_clock_tick(ctx: AnalysisContext) -> Iterator[Finding]:
+    for loop in ctx.nodes(ast.While):
+        if _is_game_loop(ctx, loop) and not any(name.endswith("tick") for _, name in _calls(ctx, loop)):
+            yield Finding(loop, "The game loop never calls clock.tick")
+
+
+@rule(
+    "bare-except", "error handling",
+    levels=("intermediate", "advanced"),
+    severity="warning",
+    explanation="A bare except catches everything, including typos and Ctrl+C, and hides real bugs. "
+                "Catch the specific error you expect.",
+    code_example="try:\n    sound = pygame.mixer.Sound(path)\nexcept FileNotFoundError:\n    sound = None",
+    exercise="Replace the bare except with the specific exception this code can raise.",
+)
+def _bare_except(ctx: AnalysisContext) -> Iterator[Finding]:
+    for handler in ctx.nodes(ast.ExceptHandler):
+        if handler.type is None:
+            yield Finding(handler, "A bare except catches every error")
+
+
+@rule(
+    "range-len", "iteration",
+    levels=("beginner", "intermediate"),
+    explanation="Looping over range(len(items)) and indexing is harder to read than looping over the items "
+                "directly, or using enumerate when the index is needed too.",
+    code_example="for i, enemy in enumerate(enemies):\n    enemy.draw(screen)",
+    exercise="Rewrite the loop to iterate over the list directly.",
+)
+def _range_len(ctx: AnalysisContext) -> Iterator[Finding]:
+    for loop in ctx.nodes(ast.For):
+        it = loop.iter
+        if (isinstance(it, ast.Call) and dotted_name(it.func) == "range" and len(it.args) == 1
+                and isinstance(it.args[0], ast.Call) and dotted_name(it.args[0].func) == "len"):
+            yield Finding(loop, "for ... in range(len(...)) indexes a list by position")
+
+
+def analyze_code(
+    code: str,
+    student_level: StudentLevel = "beginner",
+    rules: Iterable[str] | None = None
+) -> list[CodeMoment]:
+    """Run the registered rules for a student level over Python source.
+
+    Syntax errors are reported as a single moment. Results are ordered by
+    severity, then line.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as error:
+        line = error.lineno or 1
+        return [CodeMoment(
+            rule="syntax-error",
+            concept="syntax",
+            trigger=f"Python can't read line {line}: {error.msg}",
+            explanation="The error message points at where Python got confused; the real mistake is often "
+                        "just before it, like a missing colon, bracket or quote.",
+            start_line=line,
+            end_line=error.end_lineno or line,
+            severity="error",
+            exercise="Fix the line the error points at and run the code again.",
+        )]
+
+    ctx = AnalysisContext(tree, code)
+    selected = [RULES[r] for r in rules] if rules is not None else list(RULES.values())
+    moments = []
+    for registered in selected:
+        if student_level not in registered.levels:
+            continue
+        for count, finding in enumerate(registered.check(ctx)):
+            if registered.max_hits is not None and count >= registered.max_hits:
+                break
+            moments.append(CodeMoment(
+                rule=registered.id,
+                concept=registered.concept,
+                trigger=finding.trigger,
+                explanation=registered.explanation,
+                start_line=finding.node.lineno,
+                end_line=getattr(finding.node, "end_lineno", None) or finding.node.lineno,
+                severity=registered.severity,
+                code_example=registered.code_example,
+                exercise=registered.exercise,
+            ))
+
+    return sorted(moments, key=lambda m: (SEVERITY_ORDER[m.severity], m.start_line))
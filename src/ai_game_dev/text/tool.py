@@ -11,6 +11,7 @@ from openai import AsyncOpenAI
 from ai_game_dev.constants import OPENAI_MODELS
 from ai_game_dev.templates import TemplateLoader
 from ai_game_dev.assets.asset_registry import get_asset_registry
+from ai_game_dev.text.yarn_compiler import compile_yarn, write_engine_runtime
 from ai_game_dev.types import (
     DialogueNode,
     Quest,
@@ -288,6 +289,42 @@ Make the dialogue engaging and true to each character."""
     return response.choices[0].message.content
 
 
+@function_tool(strict_mode=False)
+async def compile_yarn_dialogue(
+    yarn_source: str,
+    output_path: str | None = None,
+    entry_nodes: list[str] | None = None,
+    engine: Literal["pygame", "godot", "bevy"] | None = None
+) -> dict[str, Any]:
+    """
+    Compile and validate Yarnspinner dialogue for game runtimes.
+    
+    Args:
+        yarn_source: Yarnspinner source text (one or more nodes)
+        output_path: Optional path for the compiled program (.yarnc binary or .json)
+        entry_nodes: Nodes the dialogue starts from (defaults to Start or the first node)
+        engine: Also write the engine's dialogue runtime next to the program
+        
+    Returns:
+        Dictionary with node names, errors, warnings and the written paths
+    """
+    program = compile_yarn(yarn_source, entry_nodes)
+    saved = program.save(Path(output_path)) if output_path else None
+    runtime_path = None
+    if engine:
+        runtime_path = write_engine_runtime(engine, saved.parent if saved else Path("text_assets") / "dialogue")
+    
+    return {
+        "nodes": list(program.node_index),
+        "strings": len(program.strings),
+        "instructions": len(program.code),
+        "errors": [str(d) for d in program.errors],
+        "warnings": [str(d) for d in program.diagnostics if d.level == "warning"],
+        "output_path": str(saved) if saved else None,
+        "runtime_path": str(runtime_path) if runtime_path else None
+    }
+
+
 @function_tool
 async def generate_educational_content(
     programming_concept: str,
@@ -0,0 +1,148 @@
+"""
+Persistent embedding store backed by a memory-mapped float32 matrix.
+
+Vectors are appended as rows of ``vectors.f32`` and looked up by content
+hash through ``index.jsonl``, an append-only log with one key per row, so
+embeddings computed once are reused across runs and large corpora are
+never fully loaded into memory. Writers take a file lock so concurrent
+processes keep the log and the matrix paired.
+"""
+
+import hashlib
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+    fcntl = None
+
+
+def content_hash(text: str) -> str:
+    """Stable key for a piece of text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class VectorStore:
+    """Append-only on-disk store of fixed-size vectors keyed by content hash."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.vectors_path = self.root / "vectors.f32"
+        self.index_path = self.root / "index.jsonl"
+        self.lock_path = self.root / ".lock"
+        self.dimensions: int | None = None
+        self._rows: dict[str, int] = {}
+        self._index_end = 0  # Bytes of the index log already read
+        self._matrix: np.memmap | None = None
+        self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """All stored vectors as a read-only memory map."""
+        if self._matrix is None or len(self._matrix) != len(self._rows):
+            if not self._rows:
+                return np.zeros((0, self.dimensions or 0), dtype=np.float32)
+            self._matrix = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(len(self._rows), self.dimensions)
+            )
+        return self._matrix
+
+    def missing(self, keys: list[str]) -> list[str]:
+        """Keys (deduplicated, in order) that have no stored vector."""
+        self._refresh()
+        return [key for key in dict.fromkeys(keys) if key not in self._rows]
+
+    def get(self, keys: list[str]) -> np.ndarray:
+        """Stored vectors for keys as an ``(n, dimensions)`` array."""
+        rows = np.fromiter((self._rows[key] for key in keys), dtype=np.int64, count=len(keys))
+        return self.matrix[rows]
+
+    def add(self, keys: list[str], vectors: np.ndarray) -> None:
+        """Append vectors for new keys; keys already stored are skipped.
+
+        Only the new keys are appended to the index log, so an ingest costs
+        linear rather than quadratic index I/O.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        with self._locked():
+            # Pick up rows another process appended since we last looked
+            self._refresh()
+            header = b""
+            if self.dimensions is None:
+                self.dimensions = int(vectors.shape[1])
+                header = (json.dumps({"dimensions": self.dimensions}) + "\n").encode("utf-8")
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Expected {self.dimensions}-dimensional vectors, got {vectors.shape[1]}")
+
+            first = {}
+            for i, key in enumerate(keys):
+                if key not in self._rows:
+                    first.setdefault(key, i)
+            if not first:
+                return
+
+            with open(self.vectors_path, "ab") as f:
+                # Truncate rows written by an interrupted append that never reached the index
+                f.truncate(len(self._rows) * self.dimensions * 4)
+                f.write(np.ascontiguousarray(vectors[list(first.values())]).tobytes())
+
+            entries = header + b"".join((json.dumps(key) + "\n").encode("utf-8") for key in first)
+            with open(self.index_path, "ab") as f:
+                # Likewise drop a partial entry left by an interrupted index append
+                f.truncate(self._index_end)
+                f.write(entries)
+            self._index_end += len(entries)
+
+            for key in first:
+                self._rows[key] = len(self._rows)
+            self._matrix = None
+
+    def _refresh(self) -> None:
+        """Read index entries appended since the last refresh.
+
+        The first entry holds the dimensions and every later one a key, in
+        row order. A trailing line without a newline is an append still in
+        progress (or interrupted) and is left for later.
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_end)
+                data = f.read()
+        except OSError:
+            return
+
+        complete = data[:data.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            entry = json.loads(line)
+            if isinstance(entry, dict):
+                self.dimensions = entry["dimensions"]
+            else:
+                self._rows.setdefault(entry, len(self._rows))
+        self._index_end += len(complete)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold an exclusive lock on the store across processes (where supported)."""
+        with open(self.lock_path, "a") as lock:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
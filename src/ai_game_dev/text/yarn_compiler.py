@@ -0,0 +1,995 @@
+"""
+Yarn dialogue compiler.
+
+Parses Yarn Spinner source (node headers, lines, ``->`` options,
+``<<commands>>``, ``<<if>>`` blocks and jumps) into a compact program: an
+interned string table, a node table and a flat int32 instruction array
+whose jumps are resolved to node indices ahead of time. Programs are
+validated for dangling jumps and unreachable nodes and serialize to a
+binary ``.yarnc`` file or JSON, so game runtimes load dialogue without
+parsing Yarn text on startup. ``ENGINE_RUNTIMES`` holds the small
+pygame, Godot and Bevy interpreters that play those files.
+
+Instructions are ``(op, a, b, c)`` rows:
+
+    LINE      speaker string (-1 for none), text string
+    COMMAND   command string
+    JUMP      target node index (-1 if dangling), target name string
+    STOP
+    GOTO      pc
+    OPTIONS   option count; the next ``count`` rows are OPTION rows
+    OPTION    text string, body pc, condition string (-1 for none)
+    IF_NOT    condition string, pc to continue at when the condition is false
+"""
+
+import hashlib
+import json
+import re
+import struct
+from dataclasses import asdict, dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+from xdg_base_dirs import xdg_cache_home
+
+
+YARNC_MAGIC = b"YARC"
+YARNC_VERSION = 1
+YARN_CACHE_DIR = xdg_cache_home() / "ai-game-dev" / "yarn"
+
+_SPEAKER = re.compile(r"^([^\s:<>\[\]#][^:<>\[\]#]{0,47}?):\s+(.*)$")
+_COMMAND = re.compile(r"^<<\s*(.*?)\s*>>$")
+_OPTION_CONDITION = re.compile(r"^(.*?)\s*<<\s*if\s+(.*?)\s*>>$")
+_LINK = re.compile(r"^\[\[(?:(.*)\|)?\s*([^\]|]+?)\s*\]\]$")
+_JUMP = re.compile(r"^jump\s+(\S+)$")
+
+
+class Op(IntEnum):
+    """Instruction opcodes."""
+    LINE = 0
+    COMMAND = 1
+    JUMP = 2
+    STOP = 3
+    GOTO = 4
+    OPTIONS = 5
+    OPTION = 6
+    IF_NOT = 7
+
+
+@dataclass
+class YarnDiagnostic:
+    """A compiler error or warning."""
+    level: str
+    message: str
+    node: str | None = None
+    line: int | None = None
+
+    def __str__(self) -> str:
+        where = f"{self.node}:{self.line}" if self.line else (self.node or "")
+        return f"{self.level}: {where}: {self.message}" if where else f"{self.level}: {self.message}"
+
+
+class YarnCompileError(ValueError):
+    """Raised in strict mode when a program has errors."""
+
+    def __init__(self, diagnostics: list[YarnDiagnostic]):
+        self.diagnostics = diagnostics
+        super().__init__("\n".join(str(d) for d in diagnostics))
+
+
+@dataclass
+class YarnNode:
+    """A node's name and tags (string ids) and its instruction range."""
+    name: int
+    tags: tuple[int, ...]
+    start: int
+    end: int
+
+
+@dataclass
+class YarnProgram:
+    """A compiled dialogue program."""
+    strings: list[str]
+    nodes: list[YarnNode]
+    code: np.ndarray  # (n, 4) int32
+    diagnostics: list[YarnDiagnostic] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.node_index = {self.strings[node.name]: i for i, node in enumerate(self.nodes)}
+
+    @property
+    def errors(self) -> list[YarnDiagnostic]:
+        return [d for d in self.diagnostics if d.level == "error"]
+
+    def node(self, name: str) -> YarnNode:
+        return self.nodes[self.node_index[name]]
+
+    def to_json(self) -> dict:
+        """JSON-serializable form with the opcode table for runtimes."""
+        return {
+            "format": "yarnc",
+            "version": YARNC_VERSION,
+            "opcodes": {op.name: int(op) for op in Op},
+            "strings": self.strings,
+            "nodes": [
+                {"name": node.name, "tags": list(node.tags), "start": node.start, "end": node.end}
+                for node in self.nodes
+            ],
+            "code": self.code.tolist(),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "YarnProgram":
+        if data.get("format") != "yarnc" or data.get("version") != YARNC_VERSION:
+            raise ValueError("Not a compiled Yarn program")
+        return cls(
+            strings=data["strings"],
+            nodes=[YarnNode(n["name"], tuple(n["tags"]), n["start"], n["end"]) for n in data["nodes"]],
+            code=np.asarray(data["code"], dtype=np.int32).reshape(-1, 4),
+        )
+
+    def to_bytes(self) -> bytes:
+        """Binary form: little-endian header, length-prefixed UTF-8 strings,
+        int32 node rows ``(name, start, end, tag_offset, tag_count)``, the
+        int32 tag table and the int32 instruction rows."""
+        encoded = [s.encode("utf-8") for s in self.strings]
+        tags = [tag for node in self.nodes for tag in node.tags]
+        rows, offset = [], 0
+        for node in self.nodes:
+            rows.extend((node.name, node.start, node.end, offset, len(node.tags)))
+            offset += len(node.tags)
+
+        parts = [
+            YARNC_MAGIC,
+            struct.pack("<HHIIII", YARNC_VERSION, 0, len(encoded), len(self.nodes), len(tags), len(self.code)),
+        ]
+        parts.extend(struct.pack("<I", len(b)) + b for b in encoded)
+        parts.append(np.asarray(rows, dtype="<i4").tobytes())
+        parts.append(np.asarray(tags, dtype="<i4").tobytes())
+        parts.append(np.ascontiguousarray(self.code, dtype="<i4").tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "YarnProgram":
+        if data[:4] != YARNC_MAGIC:
+            raise ValueError("Not a compiled Yarn program")
+        version, _, string_count, node_count, tag_count, code_count = struct.unpack_from("<HHIIII", data, 4)
+        if version != YARNC_VERSION:
+            raise ValueError(f"Unsupported compiled Yarn version {version}")
+
+        pos = 4 + struct.calcsize("<HHIIII")
+        strings = []
+        for _ in range(string_count):
+            (length,) = struct.unpack_from("<I", data, pos)
+            strings.append(data[pos + 4:pos + 4 + length].decode("utf-8"))
+            pos += 4 + length
+
+        rows = np.frombuffer(data, dtype="<i4", count=node_count * 5, offset=pos).reshape(-1, 5)
+        pos += rows.nbytes
+        tags = np.frombuffer(data, dtype="<i4", count=tag_count, offset=pos).tolist()
+        pos += 4 * tag_count
+        code = np.frombuffer(data, dtype="<i4", count=code_count * 4, offset=pos).reshape(-1, 4)
+
+        nodes = [
+            YarnNode(name, tuple(tags[tag_offset:tag_offset + count]), start, end)
+            for name, start, end, tag_offset, count in rows.tolist()
+        ]
+        return cls(strings=strings, nodes=nodes, code=code.astype(np.int32))
+
+    def save(self, path: Path) -> Path:
+        """Write ``.json`` paths as JSON, anything else as binary."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".json":
+            path.write_text(json.dumps(self.to_json(), separators=(",", ":")))
+        else:
+            path.write_bytes(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "YarnProgram":
+        path = Path(path)
+        if path.suffix == ".json":
+            return cls.from_json(json.loads(path.read_text()))
+        return cls.from_bytes(path.read_bytes())
+
+
+@dataclass
+class _Line:
+    number: int
+    indent: int
+    text: str
+
+
+class YarnCompiler:
+    """Compiles one or more Yarn sources into a single YarnProgram."""
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self.code: list[tuple[int, int, int, int]] = []
+        self.nodes: list[YarnNode] = []
+        self.diagnostics: list[YarnDiagnostic] = []
+        self._jumps: list[tuple[int, str, int, int]] = []  # (pc, target, node index, line)
+        self._entries: list[int] = []
+        self._node = None
+
+    def intern(self, text: str) -> int:
+        """Return the id of a string, adding it to the table once."""
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = self._string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def compile(
+        self,
+        sources: str | Iterable[str],
+        entry_nodes: Iterable[str] | None = None,
+        strict: bool = False
+    ) -> YarnProgram:
+        """Compile sources and validate the node graph.
+
+        Nodes named in ``entry_nodes`` (default: ``Start`` if present, else
+        the first node of each source) are the roots for reachability.
+        """
+        for source in [sources] if isinstance(sources, str) else sources:
+            first = len(self.nodes)
+            self._compile_source(source)
+            if len(self.nodes) > first:
+                self._entries.append(first)
+
+        names = {}
+        for i, node in enumerate(self.nodes):
+            name = self.strings[node.name]
+            if name in names:
+                self.diagnostics.append(YarnDiagnostic("error", f"Duplicate node title '{name}'", name))
+            names.setdefault(name, i)
+
+        for pc, target, node_index, line in self._jumps:
+            index = names.get(target, -1)
+            self.code[pc] = (Op.JUMP, index, self.intern(target), 0)
+            if index < 0:
+                node_name = self.strings[self.nodes[node_index].name]
+                self.diagnostics.append(
+                    YarnDiagnostic("error", f"Jump to unknown node '{target}'", node_name, line)
+                )
+
+        if entry_nodes is not None:
+            roots = [names[name] for name in entry_nodes if name in names]
+        elif "Start" in names:
+            roots = [names["Start"]]
+        else:
+            roots = self._entries
+        self._check_reachability(roots)
+
+        program = YarnProgram(
+            strings=self.strings,
+            nodes=self.nodes,
+            code=np.asarray(self.code, dtype=np.int32).reshape(-1, 4),
+            diagnostics=self.diagnostics,
+        )
+        if strict and program.errors:
+            raise YarnCompileError(program.errors)
+        return program
+
+    def _check_reachability(self, roots: list[int]) -> None:
+        edges = [set() for _ in self.nodes]
+        for pc, _, node_index, _ in self._jumps:
+            target = self.code[pc][1]
+            if target >= 0:
+                edges[node_index].add(target)
+
+        seen = set(roots)
+        stack = list(roots)
+        while stack:
+            for target in edges[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+
+        for i, node in enumerate(self.nodes):
+            if i not in seen:
+                name = self.strings[node.name]
+                self.diagnostics.append(YarnDiagnostic("warning", f"Node '{name}' is unreachable", name))
+
+    def _compile_source(self, source: str) -> None:
+        header: dict[str, str] = {}
+        body: list[_Line] | None = None
+        header_line = 1
+
+        for number, raw in enumerate(source.splitlines(), 1):
+            stripped = raw.strip()
+            if body is None:
+                if stripped == "---":
+                    body = []
+                elif ":" in stripped:
+                    if not header:
+                        header_line = number
+                    key, _, value = stripped.partition(":")
+                    header.setdefault(key.strip(), value.strip())
+                continue
+
+            if stripped == "===":
+                self._compile_node(header, body, header_line)
+                header, body = {}, None
+            elif stripped and not stripped.startswith("//"):
+                expanded = raw.expandtabs(4)
+                body.append(_Line(number, len(expanded) - len(expanded.lstrip()), stripped))
+
+        if body is not None:
+            self.diagnostics.append(
+                YarnDiagnostic("warning", "Node is missing its closing '==='", header.get("title"), header_line)
+            )
+            self._compile_node(header, body, header_line)
+
+    def _compile_node(self, header: dict[str, str], body: list[_Line], line: int) -> None:
+        title = header.get("title", "")
+        if not title:
+            self.diagnostics.append(YarnDiagnostic("error", "Node has no title", None, line))
+            title = f"untitled_{len(self.nodes)}"
+
+        tags = tuple(self.intern(tag) for tag in re.split(r"[,\s]+", header.get("tags", "")) if tag)
+        self._node = len(self.nodes)
+        node = YarnNode(self.intern(title), tags, len(self.code), len(self.code))
+        self.nodes.append(node)
+
+        statements, pos = self._parse_block(body, 0, -1)
+        while pos < len(body):
+            # A stray <<elseif>>/<<else>>/<<endif>> stops a block; report and skip it
+            self.diagnostics.append(YarnDiagnostic("error", f"Unexpected '{body[pos].text}'", title, body[pos].number))
+            more, pos = self._parse_block(body, pos + 1, -1)
+            statements.extend(more)
+
+        self._emit_block(statements)
+        self.code.append((Op.STOP, 0, 0, 0))
+        node.end = len(self.code)
+
+    def _parse_block(self, lines: list[_Line], pos: int, parent_indent: int) -> tuple[list, int]:
+        """Parse statements indented deeper than ``parent_indent``."""
+        statements = []
+        while pos < len(lines):
+            line = lines[pos]
+            if line.indent <= parent_indent:
+                break
+            command = _COMMAND.match(line.text)
+            keyword = command.group(1).split(maxsplit=1)[0] if command and command.group(1) else ""
+
+            if keyword in ("elseif", "else", "endif"):
+                break
+
+            if line.text.startswith("->"):
+                options = []
+                while pos < len(lines) and lines[pos].indent == line.indent and lines[pos].text.startswith("->"):
+                    option = lines[pos]
+                    text = option.text[2:].strip()
+                    condition = None
+                    conditional = _OPTION_CONDITION.match(text)
+                    if conditional:
+                        text, condition = conditional.groups()
+                    body, pos = self._parse_block(lines, pos + 1, option.indent)
+                    options.append((text, condition, body))
+                statements.append(("options", options))
+                continue
+
+            if keyword == "if":
+                branches, else_body = [], []
+                condition = command.group(1)[2:].strip()
+                while True:
+                    body, pos = self._parse_block(lines, pos + 1, parent_indent)
+                    branches.append((condition, body))
+                    end = self._block_end(lines, pos)
+                    if end.startswith("elseif"):
+                        condition = end[6:].strip()
+                        continue
+                    if end == "else":
+                        else_body, pos = self._parse_block(lines, pos + 1, parent_indent)
+                        end = self._block_end(lines, pos)
+                    if end == "endif":
+                        pos += 1
+                    else:
+                        self.diagnostics.append(YarnDiagnostic(
+                            "error", "<<if>> without <<endif>>", self.strings[self.nodes[-1].name], line.number
+                        ))
+                    break
+                statements.append(("if", branches, else_body))
+                continue
+
+            statements.append(self._parse_statement(line, command))
+            pos += 1
+        return statements, pos
+
+    def _block_end(self, lines: list[_Line], pos: int) -> str:
+        """The <<elseif>>/<<else>>/<<endif>> command that ended a block, or ""."""
+        command = _COMMAND.match(lines[pos].text) if pos < len(lines) else None
+        return command.group(1) if command else ""
+
+    def _parse_statement(self, line: _Line, command: re.Match | None) -> tuple:
+        if command:
+            text = command.group(1)
+            jump = _JUMP.match(text)
+            if jump:
+                return ("jump", jump.group(1), line.number)
+            if text == "stop":
+                return ("stop",)
+            return ("command", text)
+
+        jump = _JUMP.match(line.text)  # Yarn 1 style bare jump
+        if jump:
+            return ("jump", jump.group(1), line.number)
+
+        link = _LINK.match(line.text)
+        if link:
+            label, target = link.groups()
+            if label is None:
+                return ("jump", target, line.number)
+            return ("options", [(label.strip(), None, [("jump", target, line.number)])])
+
+        speaker = _SPEAKER.match(line.text)
+        if speaker:
+            return ("line", speaker.group(1).strip(), speaker.group(2))
+        return ("line", None, line.text)
+
+    def _emit_block(self, statements: list) -> None:
+        for statement in statements:
+            kind = statement[0]
+            if kind == "line":
+                speaker = -1 if statement[1] is None else self.intern(statement[1])
+                self.code.append((Op.LINE, speaker, self.intern(statement[2]), 0))
+            elif kind == "command":
+                self.code.append((Op.COMMAND, self.intern(statement[1]), 0, 0))
+            elif kind == "stop":
+                self.code.append((Op.STOP, 0, 0, 0))
+            elif kind == "jump":
+                self._jumps.append((len(self.code), statement[1], self._node, statement[2]))
+                self.code.append((Op.JUMP, -1, 0, 0))
+            elif kind == "options":
+                self._emit_options(statement[1])
+            elif kind == "if":
+                self._emit_if(statement[1], statement[2])
+
+    def _emit_options(self, options: list) -> None:
+        self.code.append((Op.OPTIONS, len(options), 0, 0))
+        option_pcs = []
+        for text, condition, _ in options:
+            option_pcs.append(len(self.code))
+            self.code.append((Op.OPTION, self.intern(text), 0, -1 if condition is None else self.intern(condition)))
+
+        exits = []
+        for pc, (_, _, body) in zip(option_pcs, options):
+            op, text, _, condition = self.code[pc]
+            self.code[pc] = (op, text, len(self.code), condition)
+            self._emit_block(body)
+            exits.append(len(self.code))
+            self.code.append((Op.GOTO, 0, 0, 0))
+
+        for pc in exits:
+            self.code[pc] = (Op.GOTO, len(self.code), 0, 0)
+
+    def _emit_if(self, branches: list, else_body: list) -> None:
+        exits = []
+        for condition, body in branches:
+            test = len(self.code)
+            self.code.append((Op.IF_NOT, self.intern(condition), 0, 0))
+            self._emit_block(body)
+            exits.append(len(self.code))
+            self.code.append((Op.GOTO, 0, 0, 0))
+            self.code[test] = (Op.IF_NOT, self.code[test][1], len(self.code), 0)
+
+        self._emit_block(else_body)
+        for pc in exits:
+            self.code[pc] = (Op.GOTO, len(self.code), 0, 0)
+
+
+def compile_yarn(
+    sources: str | Iterable[str],
+    entry_nodes: Iterable[str] | None = None,
+    strict: bool = False
+) -> YarnProgram:
+    """Compile Yarn source text(s) into a validated program."""
+    return YarnCompiler().compile(sources, entry_nodes, strict)
+
+
+def compile_yarn_cached(
+    sources: str | Iterable[str],
+    cache_dir: Path | None = None,
+    entry_nodes: Iterable[str] | None = None,
+    strict: bool = False
+) -> YarnProgram:
+    """Compile with an on-disk ``.yarnc`` cache keyed by the source text.
+
+    Diagnostics are cached alongside the program, so a cache hit reports
+    the same errors and warnings as a fresh compile (and raises the same
+    way in strict mode).
+    """
+    sources = [sources] if isinstance(sources, str) else list(sources)
+    entry_nodes = None if entry_nodes is None else list(entry_nodes)
+    key = "\0".join(sources) + "\0\0" + json.dumps(entry_nodes)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    cache_path = (cache_dir or YARN_CACHE_DIR) / f"{digest}.yarnc"
+    diagnostics_path = cache_path.with_suffix(".diagnostics.json")
+    try:
+        program = YarnProgram.load(cache_path)
+        program.diagnostics = [YarnDiagnostic(**d) for d in json.loads(diagnostics_path.read_text())]
+    except (OSError, ValueError, TypeError, struct.error):
+        program = compile_yarn(sources, entry_nodes)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Diagnostics first: a program file without them is a cache miss
+        for path, data in (
+            (diagnostics_path, json.dumps([asdict(d) for d in program.diagnostics]).encode("utf-8")),
+            (cache_path, program.to_bytes()),
+        ):
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_bytes(data)
+            tmp_path.replace(path)
+
+    if strict and program.errors:
+        raise YarnCompileError(program.errors)
+    return program
+
+
+class DialogueRunner:
+    """Minimal Python runtime for compiled programs.
+
+    ``variables`` and ``evaluate`` supply condition results; by default
+    conditions are looked up as ``$name`` variables and unknown ones are
+    treated as true.
+    """
+
+    def __init__(self, program: YarnProgram, variables: dict | None = None, evaluate=None):
+        self.program = program
+        self.variables = variables or {}
+        self.evaluate = evaluate or (lambda condition: bool(self.variables.get(condition.lstrip("$"), True)))
+
+    def run(self, node: str, choose=lambda options: 0, max_steps: int = 100_000):
+        """Yield ``("line", speaker, text)`` and ``("command", text)`` events.
+
+        ``choose`` receives the available option texts and returns an index.
+        """
+        strings, code = self.program.strings, self.program.code
+        pc = self.program.node(node).start
+        for _ in range(max_steps):
+            op, a, b, c = (int(v) for v in code[pc])
+            if op == Op.LINE:
+                yield ("line", strings[a] if a >= 0 else None, strings[b])
+                pc += 1
+            elif op == Op.COMMAND:
+                yield ("command", strings[a])
+                pc += 1
+            elif op == Op.JUMP:
+                if a < 0:
+                    raise KeyError(f"Unknown node '{strings[b]}'")
+                pc = self.program.nodes[a].start
+            elif op == Op.STOP:
+                return
+            elif op == Op.GOTO:
+                pc = a
+            elif op == Op.OPTIONS:
+                rows = [code[pc + 1 + i] for i in range(a)]
+                available = [row for row in rows if row[3] < 0 or self.evaluate(strings[row[3]])]
+                if not available:
+                    return
+                selected = available[choose([strings[row[1]] for row in available])]
+                pc = int(selected[2])
+            elif op == Op.IF_NOT:
+                pc = pc + 1 if self.evaluate(strings[a]) else b
+        raise RuntimeError("Dialogue exceeded max_steps; check for jump loops")
+
+
+PYGAME_RUNTIME = '''"""Dialogue runtime: plays compiled Yarn programs (.yarnc or .json) without parsing Yarn.
+
+Usage:
+    dialogue = Dialogue(DialogueProgram("assets/dialogue/dialogue.yarnc"), {"has_map": True})
+    step = dialogue.start("Start")
+    # step is ("line", speaker, text), ("command", text), ("options", [texts]) or None at the end
+    step = dialogue.advance()          # after a line or command
+    step = dialogue.choose(index)      # after options
+"""
+import json
+import struct
+
+LINE, COMMAND, JUMP, STOP, GOTO, OPTIONS, OPTION, IF_NOT = range(8)
+YARNC_MAGIC = b"YARC"
+YARNC_VERSION = 1
+
+
+class DialogueProgram:
+    """A compiled program: string table, node start offsets and instructions."""
+
+    def __init__(self, path):
+        if str(path).endswith(".json"):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.strings = data["strings"]
+            self.starts = [node["start"] for node in data["nodes"]]
+            names = [node["name"] for node in data["nodes"]]
+            self.code = [tuple(row) for row in data["code"]]
+        else:
+            with open(path, "rb") as f:
+                names = self._read(f.read())
+        self.nodes = {self.strings[name]: start for name, start in zip(names, self.starts)}
+
+    def _read(self, data):
+        if data[:4] != YARNC_MAGIC:
+            raise ValueError("Not a compiled Yarn program")
+        version, _, string_count, node_count, tag_count, code_count = struct.unpack_from("<HHIIII", data, 4)
+        if version != YARNC_VERSION:
+            raise ValueError("Unsupported compiled Yarn version %d" % version)
+
+        pos = 24
+        self.strings = []
+        for _ in range(string_count):
+            (length,) = struct.unpack_from("<I", data, pos)
+            self.strings.append(data[pos + 4:pos + 4 + length].decode("utf-8"))
+            pos += 4 + length
+
+        rows = struct.unpack_from("<%di" % (node_count * 5), data, pos)
+        pos += 20 * node_count + 4 * tag_count
+        code = struct.unpack_from("<%di" % (code_count * 4), data, pos)
+        self.starts = list(rows[1::5])
+        self.code = [code[i:i + 4] for i in range(0, len(code), 4)]
+        return rows[0::5]
+
+
+class Dialogue:
+    """Steps through a program one line at a time, for use from a game loop.
+
+    Conditions are looked up as ``$name`` in ``variables``; unknown ones
+    count as true.
+    """
+
+    def __init__(self, program, variables=None):
+        self.program = program
+        self.variables = variables if variables is not None else {}
+        self._pc = None
+        self._choices = []
+
+    def start(self, node):
+        self._pc = self.program.nodes[node]
+        return self.advance()
+
+    def choose(self, index):
+        self._pc = self._choices[index]
+        self._choices = []
+        return self.advance()
+
+    def evaluate(self, condition):
+        return bool(self.variables.get(condition.lstrip("$"), True))
+
+    def advance(self):
+        strings, code = self.program.strings, self.program.code
+        while self._pc is not None:
+            op, a, b, c = code[self._pc]
+            if op == LINE:
+                self._pc += 1
+                return ("line", strings[a] if a >= 0 else None, strings[b])
+            elif op == COMMAND:
+                self._pc += 1
+                return ("command", strings[a])
+            elif op == JUMP:
+                self._pc = self.program.starts[a] if a >= 0 else None
+            elif op == GOTO:
+                self._pc = a
+            elif op == OPTIONS:
+                rows = code[self._pc + 1:self._pc + 1 + a]
+                available = [row for row in rows if row[3] < 0 or self.evaluate(strings[row[3]])]
+                self._pc = None
+                self._choices = [row[2] for row in available]
+                if available:
+                    return ("options", [strings[row[1]] for row in available])
+            elif op == IF_NOT:
+                self._pc = self._pc + 1 if self.evaluate(strings[a]) else b
+            else:
+                self._pc = None
+        return None
+'''
+
+GODOT_RUNTIME = '''class_name YarnDialogue
+extends RefCounted
+## Dialogue runtime: plays compiled Yarn programs (.yarnc) without parsing Yarn.
+##
+## var dialogue := YarnDialogue.load_program("res://dialogue/dialogue.yarnc")
+## var step := dialogue.start("Start")
+## step is ["line", speaker, text], ["command", text], ["options", [texts]] or [] at the end;
+## continue with advance() after a line or command and choose(index) after options.
+## Add *.yarnc to the export preset's non-resource files so it ships with the game.
+
+enum Op { LINE, COMMAND, JUMP, STOP, GOTO, OPTIONS, OPTION, IF_NOT }
+
+var strings := PackedStringArray()
+var node_starts := {}
+var starts := PackedInt32Array()
+var code := PackedInt32Array()
+var variables := {}
+var _pc := -1
+var _choices := PackedInt32Array()
+
+
+static func load_program(path: String) -> YarnDialogue:
+\tvar file := FileAccess.open(path, FileAccess.READ)
+\tif file == null:
+\t\tpush_error("Failed to open dialogue %s" % path)
+\t\treturn null
+\tif file.get_buffer(4).get_string_from_ascii() != "YARC":
+\t\tpush_error("%s is not a compiled Yarn program" % path)
+\t\treturn null
+\tvar version := file.get_16()
+\tfile.get_16()
+\tif version != 1:
+\t\tpush_error("Unsupported compiled Yarn version %d" % version)
+\t\treturn null
+\tvar string_count := file.get_32()
+\tvar node_count := file.get_32()
+\tvar tag_count := file.get_32()
+\tvar code_count := file.get_32()
+
+\tvar dialogue := YarnDialogue.new()
+\tfor i in string_count:
+\t\tvar length := file.get_32()
+\t\tdialogue.strings.append(file.get_buffer(length).get_string_from_utf8())
+\tfor i in node_count:
+\t\tvar name_id := file.get_32()
+\t\tvar start := file.get_32()
+\t\tfile.get_buffer(12)  # end, tag offset, tag count
+\t\tdialogue.node_starts[dialogue.strings[name_id]] = start
+\t\tdialogue.starts.append(start)
+\tfile.get_buffer(tag_count * 4)
+\tfor i in code_count * 4:
+\t\tvar value := file.get_32()
+\t\tdialogue.code.append(value - 4294967296 if value >= 2147483648 else value)
+\treturn dialogue
+
+
+func start(node: String) -> Array:
+\tif not node_starts.has(node):
+\t\tpush_error("Unknown dialogue node '%s'" % node)
+\t\treturn []
+\t_pc = node_starts[node]
+\treturn advance()
+
+
+func choose(index: int) -> Array:
+\t_pc = _choices[index]
+\t_choices = PackedInt32Array()
+\treturn advance()
+
+
+func evaluate(condition: String) -> bool:
+\treturn bool(variables.get(condition.trim_prefix("$"), true))
+
+
+func advance() -> Array:
+\twhile _pc >= 0:
+\t\tvar row := _pc * 4
+\t\tvar op := code[row]
+\t\tvar a := code[row + 1]
+\t\tvar b := code[row + 2]
+\t\tmatch op:
+\t\t\tOp.LINE:
+\t\t\t\t_pc += 1
+\t\t\t\treturn ["line", strings[a] if a >= 0 else "", strings[b]]
+\t\t\tOp.COMMAND:
+\t\t\t\t_pc += 1
+\t\t\t\treturn ["command", strings[a]]
+\t\t\tOp.JUMP:
+\t\t\t\t_pc = starts[a] if a >= 0 else -1
+\t\t\tOp.GOTO:
+\t\t\t\t_pc = a
+\t\t\tOp.OPTIONS:
+\t\t\t\tvar texts := []
+\t\t\t\t_choices = PackedInt32Array()
+\t\t\t\tfor i in a:
+\t\t\t\t\tvar option := (_pc + 1 + i) * 4
+\t\t\t\t\tvar condition := code[option + 3]
+\t\t\t\t\tif condition < 0 or evaluate(strings[condition]):
+\t\t\t\t\t\ttexts.append(strings[code[option + 1]])
+\t\t\t\t\t\t_choices.append(code[option + 2])
+\t\t\t\t_pc = -1
+\t\t\t\tif not texts.is_empty():
+\t\t\t\t\treturn ["options", texts]
+\t\t\tOp.IF_NOT:
+\t\t\t\t_pc = _pc + 1 if evaluate(strings[a]) else b
+\t\t\t_:
+\t\t\t\t_pc = -1
+\treturn []
+'''
+
+BEVY_RUNTIME = '''//! Dialogue runtime: plays compiled Yarn programs (.yarnc) without parsing Yarn.
+//!
+//! Embed the program so it loads on every target, wasm included:
+//!
+//!     let program = YarnProgram::from_bytes(include_bytes!("../assets/dialogue/dialogue.yarnc"))
+//!         .expect("compiled dialogue");
+//!     commands.insert_resource(DialogueRunner::new(program));
+//!
+//! Then call `start`, `advance` and `choose` from your systems.
+use bevy::prelude::*;
+use std::collections::HashMap;
+
+const LINE: i32 = 0;
+const COMMAND: i32 = 1;
+const JUMP: i32 = 2;
+const STOP: i32 = 3;
+const GOTO: i32 = 4;
+const OPTIONS: i32 = 5;
+const IF_NOT: i32 = 7;
+
+#[derive(Clone, Debug, PartialEq)]
+pub enum DialogueStep {
+    Line { speaker: Option<String>, text: String },
+    Command(String),
+    Options(Vec<String>),
+    End,
+}
+
+#[derive(Clone, Debug, Default)]
+pub struct YarnProgram {
+    pub strings: Vec<String>,
+    pub nodes: HashMap<String, usize>,
+    pub starts: Vec<usize>,
+    pub code: Vec<[i32; 4]>,
+}
+
+struct Reader<'a> {
+    data: &'a [u8],
+    pos: usize,
+}
+
+impl<'a> Reader<'a> {
+    fn take(&mut self, count: usize) -> Result<&'a [u8], String> {
+        let end = self
+            .pos
+            .checked_add(count)
+            .filter(|&end| end <= self.data.len())
+            .ok_or("truncated compiled Yarn program")?;
+        let bytes = &self.data[self.pos..end];
+        self.pos = end;
+        Ok(bytes)
+    }
+
+    fn u16(&mut self) -> Result<u16, String> {
+        Ok(u16::from_le_bytes(self.take(2)?.try_into().unwrap()))
+    }
+
+    fn u32(&mut self) -> Result<u32, String> {
+        Ok(u32::from_le_bytes(self.take(4)?.try_into().unwrap()))
+    }
+
+    fn i32(&mut self) -> Result<i32, String> {
+        Ok(i32::from_le_bytes(self.take(4)?.try_into().unwrap()))
+    }
+}
+
+impl YarnProgram {
+    pub fn from_bytes(data: &[u8]) -> Result<Self, String> {
+        let mut reader = Reader { data, pos: 0 };
+        if reader.take(4)? != b"YARC" {
+            return Err("not a compiled Yarn program".into());
+        }
+        let version = reader.u16()?;
+        reader.u16()?;
+        if version != 1 {
+            return Err(format!("unsupported compiled Yarn version {version}"));
+        }
+        let string_count = reader.u32()? as usize;
+        let node_count = reader.u32()? as usize;
+        let tag_count = reader.u32()? as usize;
+        let code_count = reader.u32()? as usize;
+
+        let mut program = Self::default();
+        for _ in 0..string_count {
+            let length = reader.u32()? as usize;
+            let text = std::str::from_utf8(reader.take(length)?).map_err(|e| e.to_string())?;
+            program.strings.push(text.to_string());
+        }
+        for _ in 0..node_count {
+            let name = reader.i32()? as usize;
+            let start = reader.i32()? as usize;
+            reader.take(12)?; // end, tag offset, tag count
+            let name = program.strings.get(name).cloned().ok_or("bad node name")?;
+            program.nodes.insert(name, start);
+            program.starts.push(start);
+        }
+        reader.take(tag_count * 4)?;
+        for _ in 0..code_count {
+            program.code.push([reader.i32()?, reader.i32()?, reader.i32()?, reader.i32()?]);
+        }
+        Ok(program)
+    }
+}
+
+/// Steps through a program one line at a time. Conditions are looked up
+/// as `$name` in `variables`; unknown ones count as true.
+#[derive(Resource, Clone, Debug)]
+pub struct DialogueRunner {
+    pub program: YarnProgram,
+    pub variables: HashMap<String, bool>,
+    pc: Option<usize>,
+    choices: Vec<usize>,
+}
+
+impl DialogueRunner {
+    pub fn new(program: YarnProgram) -> Self {
+        Self { program, variables: HashMap::new(), pc: None, choices: Vec::new() }
+    }
+
+    pub fn start(&mut self, node: &str) -> DialogueStep {
+        self.pc = self.program.nodes.get(node).copied();
+        self.advance()
+    }
+
+    pub fn choose(&mut self, index: usize) -> DialogueStep {
+        self.pc = self.choices.get(index).copied();
+        self.choices.clear();
+        self.advance()
+    }
+
+    fn evaluate(&self, condition: i32) -> bool {
+        let name = self.program.strings[condition as usize].trim_start_matches('$');
+        self.variables.get(name).copied().unwrap_or(true)
+    }
+
+    pub fn advance(&mut self) -> DialogueStep {
+        while let Some(pc) = self.pc {
+            let Some(&[op, a, b, _]) = self.program.code.get(pc) else { break };
+            match op {
+                LINE => {
+                    self.pc = Some(pc + 1);
+                    return DialogueStep::Line {
+                        speaker: (a >= 0).then(|| self.program.strings[a as usize].clone()),
+                        text: self.program.strings[b as usize].clone(),
+                    };
+                }
+                COMMAND => {
+                    self.pc = Some(pc + 1);
+                    return DialogueStep::Command(self.program.strings[a as usize].clone());
+                }
+                JUMP => {
+                    self.pc = usize::try_from(a).ok().and_then(|node| self.program.starts.get(node).copied());
+                }
+                GOTO => self.pc = Some(a as usize),
+                OPTIONS => {
+                    let mut texts = Vec::new();
+                    let mut choices = Vec::new();
+                    for row in &self.program.code[pc + 1..pc + 1 + a as usize] {
+                        if row[3] < 0 || self.evaluate(row[3]) {
+                            texts.push(self.program.strings[row[1] as usize].clone());
+                            choices.push(row[2] as usize);
+                        }
+                    }
+                    self.pc = None;
+                    self.choices = choices;
+                    if !texts.is_empty() {
+                        return DialogueStep::Options(texts);
+                    }
+                }
+                IF_NOT => self.pc = Some(if self.evaluate(a) { pc + 1 } else { b as usize }),
+                STOP => self.pc = None,
+                _ => self.pc = None,
+            }
+        }
+        DialogueStep::End
+    }
+}
+'''
+
+# Engine -> (runtime file name, runtime source)
+ENGINE_RUNTIMES: dict[str, tuple[str, str]] = {
+    "pygame": ("dialogue_runtime.py", PYGAME_RUNTIME),
+    "godot": ("yarn_dialogue.gd", GODOT_RUNTIME),
+    "bevy": ("yarn_dialogue.rs", BEVY_RUNTIME),
+}
+
+
+def write_engine_runtime(engine: str, output_dir: Path) -> Path:
+    """Write the runtime that plays compiled programs in an engine."""
+    if engine not in ENGINE_RUNTIMES:
+        raise ValueError(f"No dialogue runtime for engine: {engine}")
+
+    filename, source = ENGINE_RUNTIMES[engine]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    runtime_path = output_dir / filename
+    runtime_path.write_text(source, encoding="utf-8")
+    return runtime_path
@@ -2,6 +2,9 @@
 Yarn Spinner Integration for NeoTokyo Code Academy
 Dialogue system for educational cyberpunk RPG
 """
+from pathlib import Path
+
+from .yarn_compiler import YarnProgram, compile_yarn_cached
 
 YARN_DIALOGUE_FILES = {
     "professor_pixel_intro": """
@@ -282,4 +285,29 @@ YARN_INTEGRATION_NOTES = {
     "player_choice_tracking": "Choices affect character relationships and story outcomes", 
     "educational_integration": "Dialogue naturally introduces programming concepts",
     "replay_value": "Different choices lead to different learning paths"
-}
\ No newline at end of file
+}
+
+
+# Nodes the game starts conversations from (see DIALOGUE_TRIGGERS)
+DIALOGUE_ENTRY_NODES = [
+    "ProfessorPixelIntro",
+    "grace_debugging_lesson",
+    "zara_web_enthusiasm",
+    "rex_character_development",
+    "turing_ai_philosophy",
+    "final_boss_confrontation",
+    "zara_confidence_growth",
+    "rex_emotional_journey",
+    "variables_explanation",
+    "loops_through_combat",
+    "classes_through_characters",
+]
+
+
+def compile_dialogue_files(cache_dir: Path | None = None, strict: bool = False) -> YarnProgram:
+    """Compile every dialogue file into one program, cached as ``.yarnc``.
+
+    Problems such as jumps to nodes that haven't been written yet are
+    reported as diagnostics; with ``strict`` they raise YarnCompileError.
+    """
+    return compile_yarn_cached(YARN_DIALOGUE_FILES.values(), cache_dir, DIALOGUE_ENTRY_NODES, strict)
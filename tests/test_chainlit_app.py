@@ -283,6 +283,23 @@ class TestAcademyFlow:
             await handle_challenge_submission(code, state)
             assert mock_msg.called
 
+    @pytest.mark.asyncio
+    async def test_submissions_without_tests_earn_no_xp(self):
+        """Nothing to grade means no XP and the challenge stays put."""
+        challenge = {"title": "Untested", "test_cases": []}
+        state = {
+            "lesson": {"id": "intro", "title": "Intro"},
+            "current_challenge": challenge,
+            "progress": {"level": 1, "xp": 0, "lessons": []},
+        }
+
+        with patch('chainlit.Message', return_value=AsyncMock()) as mock_msg:
+            await handle_challenge_submission("x = 1", state)
+            await handle_lesson_interaction("x = 1", state)
+            assert mock_msg.call_count == 2
+        assert state["progress"] == {"level": 1, "xp": 0, "lessons": []}
+        assert state["current_challenge"] is challenge
+
 
 class TestCustomization:
     """Test customization features."""
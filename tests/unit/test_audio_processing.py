@@ -0,0 +1,104 @@
+"""Tests for batch audio post-processing."""
+import numpy as np
+import pytest
+
+from ai_game_dev.audio.audio_processor import (
+    AudioProcessor,
+    ProcessingOptions,
+    WavSource,
+    approximate_lufs,
+    block_stats,
+)
+from ai_game_dev.audio.sfx_synth import encode_wav
+
+
+SAMPLE_RATE = 22050
+
+
+def write_wav(path, samples, sample_rate=SAMPLE_RATE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encode_wav(samples, sample_rate))
+    return path
+
+
+def tone(seconds, frequency=440.0, amplitude=0.25):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+class TestWavSource:
+    """Test memory-mapped WAV access."""
+
+    def test_pcm_wav_is_memory_mapped(self, temp_dir):
+        """16-bit WAV data is mapped rather than read into memory."""
+        path = write_wav(temp_dir / "tone.wav", np.column_stack([tone(0.5), tone(0.5)]))
+
+        source = WavSource(path)
+
+        assert isinstance(source._data, np.memmap)
+        assert (source.frames, source.channels) == (SAMPLE_RATE // 2, 2)
+        assert np.abs(source.read(0, source.frames)).max() == pytest.approx(0.25, abs=1e-3)
+
+
+class TestAudioProcessor:
+    """Test trimming, normalization, fades and loops."""
+
+    def test_trims_silence_and_normalizes_peak(self, temp_dir):
+        """Leading and trailing silence is cut and the peak hits the target."""
+        silence = np.zeros(SAMPLE_RATE // 2, dtype=np.float32)
+        path = write_wav(temp_dir / "clip.wav", np.concatenate([silence, tone(1.0), silence]))
+
+        result = AudioProcessor(ProcessingOptions(target_db=-3.0)).process_file(path, temp_dir / "out.wav")
+
+        assert result.duration_seconds == pytest.approx(1.0, abs=0.02)
+        samples = WavSource(temp_dir / "out.wav").read(0, None)
+        assert np.abs(samples).max() == pytest.approx(10 ** (-3 / 20), abs=0.01)
+        # Short fades leave the edges at silence
+        assert abs(samples[0, 0]) < 1e-3 and abs(samples[-1, 0]) < 1e-3
+
+    def test_loudness_normalization_respects_peak_ceiling(self, temp_dir):
+        """LUFS gain is limited so the peak stays under the ceiling."""
+        path = write_wav(temp_dir / "quiet.wav", tone(2.0, amplitude=0.05))
+        options = ProcessingOptions(normalize="lufs", target_db=0.0, max_peak_db=-1.0)
+
+        result = AudioProcessor(options).process_file(path, temp_dir / "loud.wav")
+
+        assert result.gain_db == pytest.approx(-1.0 - 20 * np.log10(0.05), abs=0.1)
+
+    def test_approximate_lufs_of_full_scale_sine(self):
+        """A full-scale sine measures about -3.7 LUFS without K-weighting."""
+        mean_squares = np.full(1000, 0.5)
+        assert approximate_lufs(mean_squares, SAMPLE_RATE, 1) == pytest.approx(-3.7, abs=0.1)
+
+    def test_loop_point_matches_period(self, temp_dir):
+        """The loop end lands on a whole number of periods of the waveform."""
+        path = write_wav(temp_dir / "music.wav", tone(3.0, frequency=100.0))
+        options = ProcessingOptions(loop=True, trim=False, normalize=None, crossfade_ms=20)
+
+        result = AudioProcessor(options).process_file(path, temp_dir / "loop.wav")
+
+        period = SAMPLE_RATE / 100.0
+        length = result.end_frame - result.start_frame
+        assert result.loop_score > 0.99
+        assert abs(length / period - round(length / period)) < 0.05
+        samples = WavSource(temp_dir / "loop.wav").read(0, None)[:, 0]
+        # Wrapping from the last frame to the first continues the sine
+        assert abs(samples[-1] - samples[0]) < 0.05
+
+    def test_process_directory(self, temp_dir):
+        """Every WAV in a directory is processed into the output directory."""
+        for name in ("a", "b", "c"):
+            write_wav(temp_dir / "in" / f"{name}.wav", tone(0.3))
+
+        results = AudioProcessor().process_directory(temp_dir / "in", temp_dir / "out", max_workers=2)
+
+        assert [r.output_path for r in results] == [str(temp_dir / "out" / f"{n}.wav") for n in "abc"]
+        assert all((temp_dir / "out" / f"{n}.wav").exists() for n in "abc")
+
+
+def test_block_stats_cover_partial_blocks(temp_dir):
+    """The final partial block is included in the statistics."""
+    path = write_wav(temp_dir / "short.wav", np.full(300, 0.5, dtype=np.float32))
+    peaks, mean_squares = block_stats(WavSource(path), block=256)
+    assert len(peaks) == 2
+    assert peaks[1] == pytest.approx(0.5, abs=1e-3)
@@ -0,0 +1,121 @@
+"""Tests for audio sprite packing."""
+import json
+
+import numpy as np
+import pytest
+
+from ai_game_dev.audio.audio_sprite import (
+    PYGAME_SPRITE_PLAYER,
+    build_audio_sprite,
+    pack_web_audio,
+    read_audio,
+)
+from ai_game_dev.audio.sfx_synth import encode_wav
+
+
+def write_clip(path, seconds, sample_rate=22050, channels=1):
+    samples = np.full((int(seconds * sample_rate), channels), 0.5, dtype=np.float32)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encode_wav(samples if channels > 1 else samples[:, 0], sample_rate))
+    return path
+
+
+class TestBuildAudioSprite:
+    """Test packing clips into one file."""
+
+    def test_offsets_include_silence_guards(self, temp_dir):
+        """Clips are resampled, down-mixed and separated by gaps."""
+        clips = {
+            "jump": write_clip(temp_dir / "jump.wav", 0.5, sample_rate=22050),
+            "coin": write_clip(temp_dir / "coin.wav", 0.25, sample_rate=44100, channels=2),
+        }
+
+        sprite = build_audio_sprite(clips, temp_dir / "out" / "sfx.ogg", gap_seconds=0.1)
+
+        assert sprite.sprites["jump"] == pytest.approx({"start": 0.0, "duration": 0.5})
+        assert sprite.sprites["coin"] == pytest.approx({"start": 0.6, "duration": 0.25})
+
+        samples, sample_rate = read_audio(sprite.path)
+        assert sample_rate == 44100
+        assert samples.shape[1] == 1
+        assert len(samples) == pytest.approx((0.5 + 0.1 + 0.25 + 0.1) * 44100, abs=2)
+        assert np.abs(samples[int(0.55 * 44100)]).max() == 0.0  # Silence guard
+
+    def test_map_uses_milliseconds(self, temp_dir):
+        """The JSON map follows the Howler sprite layout."""
+        clips = {"a": write_clip(temp_dir / "a.wav", 0.2), "b": write_clip(temp_dir / "b.wav", 0.3)}
+        sprite = build_audio_sprite(clips, temp_dir / "sfx.ogg", gap_seconds=0.05)
+
+        sprite_map = json.loads(sprite.path.with_suffix(".json").read_text())
+
+        assert sprite_map["src"] == [sprite.path.name]
+        assert sprite_map["sprite"]["b"] == pytest.approx([250.0, 300.0])
+
+
+class TestPackWebAudio:
+    """Test the web build packing stage."""
+
+    def test_packs_short_clips_and_keeps_originals(self, temp_dir):
+        """Short clips are packed; music-length files are not."""
+        audio = temp_dir / "assets" / "audio"
+        write_clip(audio / "click.wav", 0.1)
+        write_clip(audio / "beep.wav", 0.1)
+        write_clip(audio / "theme.wav", 11.0, sample_rate=8000)
+        (temp_dir / "main.py").write_text("import pygame\n")
+
+        sprites = pack_web_audio(temp_dir)
+
+        assert len(sprites) == 1
+        assert set(sprites[0].sprites) == {"beep", "click"}
+        assert (audio / "click.wav").exists()
+        assert (temp_dir / "audio_sprites.py").read_text() == PYGAME_SPRITE_PLAYER
+
+    def test_strips_clips_only_when_asked(self, temp_dir):
+        """Originals are kept by default, even if some code mentions audio_sprites."""
+        audio = temp_dir / "sounds"
+        write_clip(audio / "click.wav", 0.1)
+        write_clip(audio / "beep.wav", 0.1)
+        (temp_dir / "main.py").write_text("from audio_sprites import AudioSprite\n")
+
+        pack_web_audio(temp_dir)
+        assert (audio / "click.wav").exists()
+
+        sprites = pack_web_audio(temp_dir, strip_packed=True)
+        assert not (audio / "click.wav").exists()
+        assert sprites[0].path.exists()
+
+    def test_same_named_clips_are_left_alone(self, temp_dir):
+        """jump.wav and jump.ogg can't share a sprite name, so neither is packed or stripped."""
+        audio = temp_dir / "sounds"
+        write_clip(audio / "click.wav", 0.1)
+        write_clip(audio / "beep.wav", 0.1)
+        write_clip(audio / "jump.wav", 0.1)
+        (audio / "jump.flac").write_bytes((audio / "jump.wav").read_bytes())
+        (temp_dir / "main.py").write_text("from audio_sprites import AudioSprite\n")
+
+        sprites = pack_web_audio(temp_dir, strip_packed=True)
+
+        assert set(sprites[0].sprites) == {"beep", "click"}
+        assert (audio / "jump.wav").exists() and (audio / "jump.flac").exists()
+        assert not (audio / "beep.wav").exists()
+
+    def test_deployer_packs_a_staged_copy(self, temp_dir):
+        """Deploying never writes sprites into, or strips clips from, the source project."""
+        from ai_game_dev.deployment.pygbag_deploy import PygbagConfig, PygbagDeployer
+
+        project = temp_dir / "game"
+        write_clip(project / "sounds" / "click.wav", 0.1)
+        write_clip(project / "sounds" / "beep.wav", 0.1)
+        (project / "main.py").write_text("from audio_sprites import AudioSprite\n")
+        deployer = PygbagDeployer(PygbagConfig(project_path=project, strip_packed_audio=True))
+
+        staged = deployer.stage_project(temp_dir / "staging")
+        deployer.pack_audio_sprites(staged)
+
+        assert sorted(path.name for path in project.rglob("*") if path.is_file()) == ["beep.wav", "click.wav", "main.py"]
+        assert (staged / "audio_sprites.py").exists()
+        assert not (staged / "sounds" / "click.wav").exists()
+
+    def test_pygame_player_compiles(self):
+        """The generated helper is valid Python."""
+        compile(PYGAME_SPRITE_PLAYER, "audio_sprites.py", "exec")
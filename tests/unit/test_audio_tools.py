@@ -260,4 +260,58 @@ class TestAudioTools:
             result = await tools.generate_background_music(music_request)
             
             # Should return empty dict on error
-            assert result == {}
\ No newline at end of file
+            assert result == {}
+
+class TestParallelAudioPack:
+    """Test concurrent audio pack generation."""
+
+    @pytest.mark.asyncio
+    async def test_pack_manifest_records_timing(self, temp_dir):
+        """Dialogue and music run together and the manifest times each pack."""
+        tools = AudioTools(openai_api_key="test_key")
+        tools.tts_generator = MagicMock()
+        tools.tts_generator.generate_speech_batch = AsyncMock(
+            side_effect=lambda lines, output_dir: [output_dir / f"line_{i:03d}.mp3" for i in range(len(lines))]
+        )
+        tools.tts_generator.generate_speech = AsyncMock(return_value=temp_dir / "narration.mp3")
+
+        result = await tools.generate_complete_audio_pack(
+            game_description="Retro pixel arcade battle",
+            audio_needs=["dialogue", "music"],
+            target_duration=60,
+            output_dir=temp_dir,
+        )
+
+        assert set(result.manifest["packs"]) == {"dialogue", "music"}
+        assert set(result.manifest["tracks"]) == {"main_theme", "menu_music"}
+        assert result.background_music["main_theme"]["context"] == "battle"
+        for track in result.manifest["tracks"].values():
+            assert Path(track["path"]).exists()
+            assert track["elapsed_seconds"] > 0
+        assert len(result.dialogue_audio["dialogue"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_music_packs_share_one_pool(self, temp_dir):
+        """Music packs reuse the module pool instead of shutting one down per call."""
+        from ai_game_dev.audio import audio_tools
+
+        tools = AudioTools(openai_api_key="test_key")
+        context = {"mood": "heroic", "context": "menu"}
+        await tools._generate_music_pack("game", context, 60, temp_dir / "first")
+        pool = audio_tools.get_music_pool()
+        await tools._generate_music_pack("game", context, 60, temp_dir / "second")
+
+        assert audio_tools.get_music_pool() is pool
+        assert (temp_dir / "second" / "menu").exists()
+
+    @pytest.mark.asyncio
+    async def test_sfx_search_errors_are_logged(self, caplog):
+        tools = AudioTools(openai_api_key="test_key", freesound_api_key="fs_key")
+        tools.freesound_client = MagicMock()
+        tools.freesound_client.search_game_sounds = AsyncMock(side_effect=RuntimeError("offline"))
+
+        with caplog.at_level("WARNING", logger="ai_game_dev.audio.audio_tools"):
+            effects = await tools._generate_sfx_pack("a puzzle game", {"genre": "casual"})
+
+        assert "offline" in caplog.text
+        assert effects and all(effect["download_url"] is None for effect in effects)
@@ -0,0 +1,125 @@
+"""Tests for the deterministic Bevy project composer."""
+import re
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from ai_game_dev.engines.bevy.adapter import BevyAdapter
+from ai_game_dev.engines.bevy.composer import BevyProjectComposer, crate_name
+from ai_game_dev.engines.validation import strip_code_fences
+
+
+@pytest.fixture
+def composer():
+    return BevyProjectComposer()
+
+
+def defined_types(source):
+    return set(re.findall(r"pub (?:struct|enum) (\w+)", source))
+
+
+class TestBevyProjectComposer:
+    """Composition from the ECS library."""
+
+    def test_plan_maps_features(self, composer):
+        covered, uncovered = composer.plan(["player movement", "enemies", "high_score", "3d_graphics"])
+        assert set(covered) == {"movement", "enemies", "scoring"}
+        assert uncovered == ["3d_graphics"]
+
+    def test_compose_is_deterministic(self, composer):
+        first = composer.compose("Space Game", "a space shooter", ["enemies", "scoring"])
+        second = composer.compose("Space Game", "a space shooter", ["enemies", "scoring"])
+        assert first.files == second.files
+        assert set(first.files) == {
+            "Cargo.toml", "src/main.rs", "src/lib.rs", "src/plugins.rs", "src/components.rs", "src/systems.rs"
+        }
+
+    def test_systems_only_use_defined_components(self, composer):
+        composition = composer.compose("arena", "an arena brawler", ["enemies", "scoring", "animation", "inventory"])
+        components = composition.files["src/components.rs"]
+        systems = composition.files["src/systems.rs"]
+        plugins = composition.files["src/plugins.rs"]
+
+        defined = defined_types(components)
+        assert {"Player", "Enemy", "Health", "Collider", "CollisionEvent", "DeathEvent", "Score"} <= defined
+        assert "check_collision" in systems
+        for system in composition.systems:
+            assert f"pub fn {system}_system(" in systems
+            assert f"{system}_system," in plugins
+        assert "add_event::<CollisionEvent>()" in plugins
+        assert "init_resource::<Score>()" in plugins
+        assert "gameplay" not in composition.files["src/lib.rs"]
+
+    def test_scoring_counts_defeated_enemies(self, composer):
+        """Scoring brings enemies the player can defeat and only scores their deaths."""
+        composition = composer.compose("points", "a points chaser", ["high score"])
+        systems = composition.files["src/systems.rs"]
+
+        assert "Enemy" in composition.files["src/components.rs"]
+        assert {"player_attack", "scoring", "health"} <= set(composition.systems)
+        assert composition.systems.index("scoring") < composition.systems.index("health")
+        assert "mut enemies: Query<(&Transform, &mut Health), With<Enemy>>" in systems
+        assert "Query<&Health, (With<Enemy>, Changed<Health>)>" in systems
+        assert "PLAYER_ATTACK_RANGE" in systems
+
+    def test_minimal_project(self, composer):
+        composition = composer.compose("tiny", "a tiny game", [])
+        assert composition.systems == ["player_input", "movement"]
+        assert "Enemy" not in composition.files["src/systems.rs"]
+
+    def test_cargo_and_main_use_crate_name(self, composer):
+        composition = composer.compose("2D \"Quest\"!", 'a "quoted" quest', [])
+        assert composition.crate_name == "game_2d_quest"
+        assert 'name = "game_2d_quest"' in composition.files["Cargo.toml"]
+        assert "use game_2d_quest::GamePlugin;" in composition.files["src/main.rs"]
+        assert '\\"Quoted\\"' in composition.files["src/main.rs"]
+
+    def test_many_colliders_use_spatial_hash(self, composer):
+        composition = composer.compose("swarm", "a top-down shooter", ["enemies", "projectiles"])
+        assert "collision_grid" in composition.systems
+        assert "collision" not in composition.systems
+        assert "pub struct SpatialHash" in composition.files["src/components.rs"]
+        assert "init_resource::<SpatialHash>()" in composition.files["src/plugins.rs"]
+        assert "ENEMY_COUNT: usize = 200" in composition.files["src/systems.rs"]
+
+        from_description = composer.compose("swarm", "a bullet hell", ["enemies"])
+        assert "collision_grid" in from_description.systems
+
+        few = composer.compose("duel", "a duel", ["enemies"])
+        assert "collision" in few.systems
+        assert "SpatialHash" not in few.files["src/components.rs"]
+
+    def test_glue_prompt_only_for_uncovered(self, composer):
+        covered = composer.compose("a", "a", ["movement"])
+        assert composer.glue_prompt(covered, "a", "simple", "pixel") is None
+
+        composition = composer.compose("a", "a", ["movement", "weather system"])
+        prompt = composer.glue_prompt(composition, "a", "simple", "pixel")
+        assert "weather system" in prompt
+        assert "pub mod gameplay;" in composition.files["src/lib.rs"]
+        assert "GameplayPlugin" in composition.files["src/plugins.rs"]
+
+
+def test_crate_name():
+    assert crate_name("My Game") == "my_game"
+    assert crate_name("!!!") == "game"
+
+
+def test_strip_code_fences():
+    assert strip_code_fences("```rust\nfn main() {}\n```") == "fn main() {}\n"
+    assert strip_code_fences("fn main() {}") == "fn main() {}"
+
+
+@pytest.mark.asyncio
+async def test_adapter_skips_llm_when_library_covers_features(temp_dir):
+    adapter = BevyAdapter()
+    adapter.output_dir = temp_dir
+
+    with patch.object(adapter, "generate_code_with_llm", new=AsyncMock(return_value="```rust\n// glue\n```")) as llm:
+        result = await adapter.generate_game_project("arena", features=["movement", "enemies"])
+        llm.assert_not_called()
+        assert (result.project_path / "src" / "systems.rs").exists()
+
+        result = await adapter.generate_game_project("arena", features=["movement", "weather"])
+        llm.assert_awaited_once()
+        assert result.generated_files["src/gameplay.rs"] == "// glue\n"
@@ -0,0 +1,87 @@
+"""Tests for bitmap font atlas generation."""
+import pytest
+
+from ai_game_dev.fonts.bitmap_font import (
+    ASCII_CHARSET,
+    build_glyph_atlas,
+    collect_charset,
+    write_engine_loader,
+)
+
+
+class TestCollectCharset:
+    """Test charset collection from game strings."""
+
+    def test_collects_unique_glyphs(self):
+        """Only glyphs used by the texts (plus fallbacks) are collected."""
+        charset = collect_charset(["Start Game", "Score: 10"])
+
+        assert set(charset) == set("StarGmeco:10 ?")
+        assert len(charset) == len(set(charset))
+
+
+class TestBuildGlyphAtlas:
+    """Test atlas packing and BMFont output."""
+
+    def test_glyphs_do_not_overlap(self):
+        """Packed glyph rectangles stay inside the atlas and never overlap."""
+        atlas = build_glyph_atlas(ASCII_CHARSET, size=16, effects=["outline"])
+        rects = [(g.x, g.y, g.x + g.width, g.y + g.height) for g in atlas.glyphs.values()]
+
+        for x1, y1, x2, y2 in rects:
+            assert x2 <= atlas.image.width and y2 <= atlas.image.height
+        for i, a in enumerate(rects):
+            for b in rects[i + 1:]:
+                assert a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1]
+
+    def test_atlas_is_power_of_two(self):
+        """Atlas dimensions are powers of two."""
+        atlas = build_glyph_atlas("Hello", size=24)
+
+        for dim in atlas.image.size:
+            assert dim & (dim - 1) == 0
+
+    def test_fnt_descriptor(self, temp_dir):
+        """Saving writes a PNG page and a matching .fnt descriptor."""
+        atlas = build_glyph_atlas("AB", size=16, face="Test Face")
+        files = atlas.save(temp_dir, "test_16")
+        fnt = files["descriptor"].read_text()
+
+        assert files["texture"].exists()
+        assert 'info face="Test Face" size=16' in fnt
+        assert 'page id=0 file="test_16.png"' in fnt
+        assert f"chars count={len(atlas.glyphs)}" in fnt
+        assert "char id=65 " in fnt
+
+
+class TestEngineLoaders:
+    """Test runtime loader emission."""
+
+    @pytest.mark.parametrize("engine,filename", [
+        ("pygame", "bitmap_font.py"),
+        ("godot", "bitmap_font.gd"),
+        ("bevy", "bitmap_font.rs"),
+    ])
+    def test_write_engine_loader(self, temp_dir, engine, filename):
+        """Each engine gets its loader file."""
+        path = write_engine_loader(engine, temp_dir)
+
+        assert path.name == filename
+        assert path.read_text()
+
+    def test_pygame_loader_compiles(self, temp_dir):
+        """The pygame loader is valid Python."""
+        source = write_engine_loader("pygame", temp_dir).read_text()
+        compile(source, "bitmap_font.py", "exec")
+
+    def test_bevy_loader_goes_through_the_asset_server(self, temp_dir):
+        """The Bevy loader is an AssetLoader, so it works on wasm builds too."""
+        source = write_engine_loader("bevy", temp_dir).read_text()
+
+        assert "impl AssetLoader for BitmapFontLoader" in source
+        assert "std::fs" not in source
+
+    def test_unknown_engine(self, temp_dir):
+        """Unknown engines are rejected."""
+        with pytest.raises(ValueError):
+            write_engine_loader("unreal", temp_dir)
@@ -0,0 +1,148 @@
+"""Tests for the sandboxed challenge runner."""
+import asyncio
+import os
+
+import pytest
+
+from ai_game_dev.text.challenge_runner import ChallengeRunner, grade_submission
+from ai_game_dev.text.educational_tools import generate_starter_code, generate_test_cases
+
+
+SCORE_TESTS = [
+    {"description": "Adds points", "call": "total_score", "args": [[1, 2, 3]], "expected": 6},
+    {"description": "Empty list", "call": "total_score", "args": [[]], "expected": 0},
+]
+
+
+@pytest.fixture
+def runner():
+    runner = ChallengeRunner(workers=2, timeout=0.5)
+    yield runner
+    runner.close()
+
+
+class TestGradeSubmission:
+    """In-process grading logic."""
+
+    def test_passing_and_failing_cases(self):
+        report = grade_submission("def total_score(points):\n    return sum(points) or 1\n", SCORE_TESTS)
+        assert not report.passed
+        assert [result.passed for result in report.results] == [True, False]
+        assert report.results[1].expected == "0"
+        assert report.results[1].actual == "1"
+
+    def test_expression_and_output_checks(self):
+        cases = [
+            {"description": "health", "expression": "health", "expected": 100},
+            {"description": "greets", "call": "greet", "expected_output": "hi"},
+        ]
+        report = grade_submission("health = 100\ndef greet():\n    print('hi')\n", cases)
+        assert report.passed
+        assert report.passed_count == 2
+
+    def test_syntax_and_import_errors(self):
+        assert "SyntaxError" in grade_submission("def broken(:", SCORE_TESTS).error
+        assert "isn't available" in grade_submission("import os", []).error
+        assert grade_submission("import math\nx = math.pi", []).passed
+
+    def test_blocked_builtins(self):
+        assert "NameError" in grade_submission("open('x', 'w')", []).error
+
+    @pytest.mark.parametrize("code", [
+        "import random\nrandom._os.listdir('.')",
+        "import random\ngetattr(random, '_os')",
+        "import random\nrandom.choice.__self__",
+        "().__class__.__base__.__subclasses__()",
+        "import typing\ntyping.sys.modules['os']",
+        "import enum\nenum.bltns.open('x')",
+        "import json\njson.codecs.open('x')",
+        "import operator\noperator.attrgetter('__globals__')",
+        "import string\nstring.Formatter().get_field('0.__globals__', [len], {})",
+    ])
+    def test_sandbox_escapes_are_refused(self, code):
+        report = grade_submission(code, [])
+        assert not report.passed
+        assert report.error
+
+    @pytest.mark.parametrize("attribute", [
+        "gi_frame", "cr_frame", "ag_frame", "f_back", "f_globals", "f_locals",
+        "f_builtins", "tb_frame", "tb_next", "gi_code", "co_consts",
+    ])
+    def test_introspection_attributes_are_refused(self, attribute):
+        direct = grade_submission(f"def gen():\n    yield 1\nx = gen().{attribute}", [])
+        assert "isn't available" in direct.error
+        dynamic = grade_submission(f"def gen():\n    yield 1\nx = getattr(gen(), {attribute!r}, None)", [])
+        assert "isn't available" in dynamic.error
+
+    def test_frame_walk_escape_is_refused(self):
+        code = (
+            "holder = []\n"
+            "def gen():\n    yield holder[0].gi_frame.f_back\n"
+            "holder.append(gen())\n"
+            "fr = next(holder[0])\n"
+            "os = fr.f_globals['os']\n"
+        )
+        report = grade_submission(code, [])
+        assert not report.passed
+        assert "isn't available" in report.error
+
+    def test_test_expressions_are_checked(self):
+        cases = [{"description": "escape", "expression": "().__class__.__base__.__subclasses__()"}]
+        report = grade_submission("x = 1", cases)
+        assert not report.passed
+        assert "isn't available" in report.results[0].error
+
+    def test_classes_keep_private_attributes_and_special_methods(self):
+        code = (
+            "from collections.abc import Iterable\n"
+            "import collections.abc\n"
+            "class Base:\n    def __init__(self):\n        self._health = 3\n"
+            "class Player(Base):\n    def __init__(self):\n        super().__init__()\n"
+            "    def __repr__(self):\n        return f'Player({self._health})'\n"
+        )
+        report = grade_submission(code, [{"description": "repr", "expression": "repr(Player())", "expected": "Player(3)"}])
+        assert report.passed, report
+
+    def test_per_test_timeout(self):
+        cases = [{"description": "spins", "call": "spin"}, {"description": "ok", "expression": "1", "expected": 1}]
+        report = grade_submission("def spin():\n    while True:\n        pass\n", cases, timeout=0.2)
+        assert report.results[0].error.startswith("Took longer")
+        assert report.results[1].passed
+
+    def test_timeout_survives_broad_except(self):
+        code = "def spin():\n    while True:\n        try:\n            pass\n        except Exception:\n            pass\n"
+        report = grade_submission(code, [{"description": "spins", "call": "spin"}], timeout=0.2)
+        assert not report.passed
+
+
+class TestChallengeRunner:
+    """Worker pool behaviour."""
+
+    def test_grade_in_worker(self, runner):
+        report = runner.grade_sync("def total_score(points):\n    return sum(points)\n", SCORE_TESTS)
+        assert report.passed
+
+    def test_workers_do_not_inherit_the_environment(self, runner, monkeypatch):
+        monkeypatch.setenv("SECRET_X", "hunter2")
+        report = runner.grade_sync("import random\nprint(random._os.environ.get('SECRET_X'))", [])
+        assert "hunter2" not in report.stdout
+        assert runner._executor.submit(os.getenv, "SECRET_X").result() is None
+
+    def test_memory_cap(self, runner):
+        report = runner.grade_sync("data = bytearray(2 * 1024 ** 3)", [])
+        assert not report.passed
+
+    @pytest.mark.asyncio
+    async def test_concurrent_submissions(self, runner):
+        good = "def total_score(points):\n    return sum(points)\n"
+        bad = "def total_score(points):\n    return 0\n"
+        reports = await asyncio.gather(*(runner.grade(good if i % 2 else bad, SCORE_TESTS) for i in range(10)))
+        assert [report.passed for report in reports] == [bool(i % 2) for i in range(10)]
+
+
+def test_generated_challenges_are_gradable():
+    for concept in ("variables", "loops", "conditionals", "functions", "classes"):
+        report = grade_submission(generate_starter_code(concept, "easy"), generate_test_cases(concept, "easy"))
+        assert report.error is None
+        assert not report.passed
+    assert grade_submission("x = 1", generate_test_cases("recursion", "hard")).passed
@@ -9,7 +9,8 @@ from ai_game_dev.engines import (
     get_supported_engines
 )
 from ai_game_dev.engines.base import BaseEngineAdapter, EngineGenerationResult
-from ai_game_dev.engines.manager import EngineManager
+from ai_game_dev.engines import manager as manager_module
+from ai_game_dev.engines.manager import EngineManager, register_engine
 from ai_game_dev.engines.pygame.adapter import PygameAdapter
 from ai_game_dev.engines.bevy.adapter import BevyAdapter
 from ai_game_dev.engines.godot.adapter import GodotAdapter
@@ -166,6 +167,55 @@ class TestEngineManager:
             mock_adapter.generate_complete_project.assert_called_once()
 
 
+class TestEngineRegistry:
+    """Test lazy adapter registration and discovery."""
+    
+    def test_adapters_built_on_first_use(self):
+        """Test that no adapter exists until it is requested."""
+        manager = EngineManager()
+        assert manager._adapters == {}
+        
+        adapter = manager.get_adapter("Godot")
+        assert isinstance(adapter, GodotAdapter)
+        assert manager.get_adapter("godot") is adapter
+        assert list(manager._adapters) == ["godot"]
+    
+    def test_adapters_share_llm_client(self):
+        """Test that adapters reuse one client."""
+        manager = EngineManager()
+        assert manager.get_adapter("pygame").llm_client is manager.get_adapter("bevy").llm_client
+    
+    def test_register_engine(self, monkeypatch):
+        """Test registering a third-party engine factory."""
+        monkeypatch.setattr(manager_module, "_registered_engines", dict(manager_module._registered_engines))
+        factory = MagicMock(return_value=MagicMock(spec=BaseEngineAdapter))
+        manager = EngineManager()
+        
+        register_engine("Retro", factory)
+        
+        assert "retro" in manager.get_supported_engines()
+        factory.assert_not_called()
+        assert manager.get_adapter("retro") is factory.return_value
+        assert manager.get_adapter("retro") is factory.return_value
+        factory.assert_called_once_with()
+    
+    def test_entry_point_engines(self):
+        """Test that entry point engines are listed without being imported."""
+        entry_point = MagicMock()
+        entry_point.name = "Retro"
+        entry_point.load.return_value = PygameAdapter
+        manager = EngineManager()
+        
+        with patch.object(manager_module, "entry_points", return_value=[entry_point]) as discover:
+            with patch.object(manager_module, "EntryPoint", MagicMock):
+                assert manager.get_supported_engines()[-1] == "retro"
+                entry_point.load.assert_not_called()
+                assert isinstance(manager.get_adapter("retro"), PygameAdapter)
+                assert manager.get_adapter("missing") is None
+        
+        discover.assert_called_once_with(group="ai_game_dev.engines")
+
+
 class TestPygameAdapter:
     """Test PygameAdapter class."""
     
@@ -0,0 +1,122 @@
+"""Tests for font tools and cached text rendering."""
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from ai_game_dev.fonts import tool as font_tool
+from ai_game_dev.fonts.text_effects import load_font
+
+
+@pytest.fixture(autouse=True)
+def clear_render_caches():
+    """Reset module-level font and render caches between tests."""
+    font_tool._resolved_fonts.clear()
+    load_font.cache_clear()
+    font_tool._render_text_image.cache_clear()
+    yield
+    font_tool._resolved_fonts.clear()
+
+
+class TestRenderTextImage:
+    """Test the cached glyph-mask renderer."""
+
+    def test_render_is_cached(self):
+        """Identical requests return the cached image."""
+        first = font_tool._render_text_image("Score:", None, 24, "white", ())
+        second = font_tool._render_text_image("Score:", None, 24, "white", ())
+
+        assert first is second
+        assert first.mode == "RGBA"
+        assert font_tool._render_text_image.cache_info().hits == 1
+
+    def test_outline_dilates_alpha(self):
+        """Outline covers more pixels than the plain glyphs."""
+        plain = font_tool._render_text_image("Quit", None, 24, "white", ())
+        outlined = font_tool._render_text_image("Quit", None, 24, "white", ("outline",))
+
+        def coverage(img):
+            return sum(1 for a in img.getchannel("A").getdata() if a > 0)
+
+        assert plain.size == outlined.size
+        assert coverage(outlined) > coverage(plain)
+
+    def test_effect_order_shares_cache_entry(self):
+        """Effect lists in any order map to the same cache entry."""
+        font_info = {"name": "Default"}
+        font_tool._render_with_font("Go", font_info, "ui", 24, "white", ["shadow", "glow"], None)
+        font_tool._render_with_font("Go", font_info, "ui", 24, "white", ["glow", "shadow"], None)
+
+        assert font_tool._render_text_image.cache_info().misses == 1
+
+
+class TestRenderTextBatch:
+    """Test batch rendering."""
+
+    @pytest.mark.asyncio
+    async def test_batch_resolves_font_once(self, temp_dir):
+        """A batch resolves the font once and saves every label."""
+        with patch.object(
+            font_tool, "_find_font_info", AsyncMock(return_value={"name": "Default"})
+        ) as mock_find:
+            results = await font_tool._render_text_batch(
+                ["Start Game", "Options", "Quit"],
+                effects=["shadow"],
+                output_dir=str(temp_dir)
+            )
+
+        assert mock_find.call_count == 1
+        assert [r["text"] for r in results] == ["Start Game", "Options", "Quit"]
+        assert (temp_dir / "start_game.png").exists()
+        assert all(r["effects"] == ["shadow"] for r in results)
+
+
+    @pytest.mark.asyncio
+    async def test_batch_filenames_are_safe_and_unique(self, temp_dir):
+        """Slashes and punctuation never make subdirectories, and colliding slugs don't overwrite."""
+        with patch.object(font_tool, "_find_font_info", AsyncMock(return_value={"name": "Default"})):
+            results = await font_tool._render_text_batch(
+                ["HP: 100/100", "hp 100 100", "../Quit"],
+                output_dir=str(temp_dir)
+            )
+
+        paths = [Path(r["path"]) for r in results]
+        assert all(path.parent == temp_dir and path.exists() for path in paths)
+        assert len(set(paths)) == 3
+        assert paths[2].name == "quit.png"
+        assert paths[0].name.startswith("hp_100_100_")
+
+class TestFindFontInfo:
+    """Test font lookup and download placement."""
+
+    @pytest.mark.asyncio
+    async def test_font_is_saved_at_requested_path(self, temp_dir):
+        """Downloaded fonts are copied to the caller's save path."""
+        cached = temp_dir / "cache" / "Orbitron_400_0.ttf"
+        cached.parent.mkdir()
+        cached.write_bytes(b"font")
+        save_path = temp_dir / "fonts" / "game_font_bold.ttf"
+
+        with patch.object(font_tool.GoogleFonts, "search_fonts", AsyncMock(return_value=[{"family": "Orbitron"}])), \
+                patch.object(font_tool.GoogleFonts, "download_font_files", AsyncMock(return_value=[cached])):
+            info = await font_tool._find_font_info("sci-fi", "bold", save_path=str(save_path))
+
+        assert info["path"] == str(save_path)
+        assert save_path.read_bytes() == b"font"
+
+
+class TestResolveFont:
+    """Test the per-style font cache."""
+
+    @pytest.mark.asyncio
+    async def test_only_downloaded_fonts_are_cached(self):
+        """A lookup without a font file is retried; one with a file is reused."""
+        results = [{"name": "Default"}, {"name": "Orbitron", "path": "/fonts/orbitron.ttf"}]
+        with patch.object(font_tool, "_find_font_info", AsyncMock(side_effect=results)) as mock_find:
+            first = await font_tool._resolve_font("sci-fi", "bold")
+            second = await font_tool._resolve_font("sci-fi", "bold")
+            third = await font_tool._resolve_font("sci-fi", "bold")
+
+        assert "path" not in first
+        assert second["path"] == third["path"] == "/fonts/orbitron.ttf"
+        assert mock_find.call_count == 2
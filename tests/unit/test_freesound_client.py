@@ -0,0 +1,169 @@
+"""Tests for the Freesound client caches and sound library."""
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from ai_game_dev.audio.freesound_client import FreesoundClient, SoundLibrary
+
+
+RESULTS = [
+    {"id": 101, "name": "Retro Jump", "license": "CC0", "duration": 0.4, "tags": ["jump", "8bit"], "type": "wav"},
+    {"id": 102, "name": "Laser Zap", "license": "CC0", "duration": 0.6, "tags": ["laser"]},
+]
+
+
+def mock_session(payload):
+    """aiohttp-like session whose get() returns one JSON response."""
+    response = MagicMock()
+    response.status = 200
+    response.json = AsyncMock(return_value=payload)
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.closed = False
+    session.get = MagicMock(return_value=context)
+    return session
+
+
+@pytest.fixture
+def client(temp_dir):
+    client = FreesoundClient(api_key="test_key", cache_dir=temp_dir)
+    client.session = mock_session({"results": RESULTS})
+    return client
+
+
+def download_session(location):
+    """Session that redirects the download endpoint to ``location`` and serves bytes there."""
+    redirect = MagicMock(status=302, headers={"Location": location})
+    payload = MagicMock(status=200)
+
+    async def chunks(size):
+        yield b"RIFF"
+
+    payload.content.iter_chunked = chunks
+
+    def get(url, **kwargs):
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=redirect if url.endswith("/download/") else payload)
+        context.__aexit__ = AsyncMock(return_value=None)
+        return context
+
+    session = MagicMock(closed=False)
+    session.get = MagicMock(side_effect=get)
+    return session
+
+
+async def fake_download(sound_id, output_path):
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(b"audio")
+    return output_path
+
+
+class TestSearchCache:
+    """Test persistent search-result caching."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_search_hits_disk_cache(self, client, temp_dir):
+        """A repeated search is served from disk, even by a new client."""
+        first = await client.search_sounds("jump", limit=5)
+
+        fresh = FreesoundClient(api_key="test_key", cache_dir=temp_dir)
+        fresh.session = mock_session({"results": []})
+        second = await fresh.search_sounds("jump", limit=5)
+
+        assert first == second == RESULTS
+        fresh.session.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_key_includes_license(self, client):
+        """Different license filters are cached separately."""
+        await client.search_sounds("jump")
+        await client.search_sounds("jump", license="Attribution")
+        assert client.session.get.call_count == 2
+
+
+class TestSoundLibrary:
+    """Test the local sound library."""
+
+    @pytest.mark.asyncio
+    async def test_find_sound_downloads_into_library(self, client, temp_dir):
+        """Found sounds are downloaded once and reused from the library."""
+        client.download_sound = AsyncMock(side_effect=fake_download)
+
+        entry = await client.find_sound("jump")
+        again = await client.find_sound("jump")
+
+        assert entry["id"] == 101
+        assert entry["path"].endswith("101.wav")
+        assert again["path"] == entry["path"]
+        client.download_sound.assert_called_once()
+        assert SoundLibrary(temp_dir / "library").find("retro jump")["id"] == 101
+
+    @pytest.mark.asyncio
+    async def test_library_only_without_key(self, temp_dir):
+        """Without an API key only the library is searched."""
+        client = FreesoundClient(cache_dir=temp_dir)
+        assert await client.find_sound("explosion") is None
+
+    @pytest.mark.asyncio
+    async def test_fetch_sounds_concurrently(self, client):
+        """Several queries resolve in one call."""
+        client.download_sound = AsyncMock(side_effect=fake_download)
+
+        entries = await client.fetch_sounds(["jump", "laser"])
+
+        assert set(entries) == {"jump", "laser"}
+        assert all(entry is not None for entry in entries.values())
+
+
+class TestDownloads:
+    """Test downloading originals."""
+
+    @pytest.mark.asyncio
+    async def test_suffix_comes_from_download_url(self, temp_dir):
+        client = FreesoundClient(api_key="test_key", cache_dir=temp_dir)
+        client.session = download_session("https://cdn.freesound.org/sounds/101/retro_jump.flac?token=x")
+
+        path = await client.download_sound(101, client.library.path_for(101))
+
+        assert path.name == "101.flac"
+        assert path.read_bytes() == b"RIFF"
+
+    def test_each_loop_gets_its_own_session_and_slots(self, temp_dir):
+        client = FreesoundClient(api_key="test_key", cache_dir=temp_dir, max_concurrent_downloads=1)
+
+        async def use():
+            async with client._slots():
+                return client._get_session(), client._slots()
+
+        first_session, first_slots = asyncio.run(use())
+        second_session, second_slots = asyncio.run(use())
+
+        assert first_slots is not second_slots
+        assert first_session is not second_session
+        assert first_session.closed
+        asyncio.run(client.close())
+
+    def test_sessions_on_running_loops_are_left_to_their_loop(self, temp_dir):
+        client = FreesoundClient(api_key="test_key", cache_dir=temp_dir)
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            async def get_session():
+                return client._get_session()
+
+            other_session = asyncio.run_coroutine_threadsafe(get_session(), other_loop).result(5)
+            asyncio.run(get_session())
+            asyncio.run(client.close())
+            assert not other_session.closed
+
+            asyncio.run_coroutine_threadsafe(client.close(), other_loop).result(5)
+            assert other_session.closed
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join(5)
+            other_loop.close()
@@ -0,0 +1,218 @@
+"""Tests for the deterministic Godot resource emitter."""
+import hashlib
+import io
+import struct
+import zlib
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from PIL import Image
+
+from ai_game_dev.engines.godot.adapter import GodotAdapter
+from ai_game_dev.engines.godot.emitter import GodotProjectEmitter, png_size
+from ai_game_dev.engines.godot.imports import bake_imports, fix_alpha_border, import_base_path
+from ai_game_dev.engines.godot.resources import (
+    TextResource,
+    Vector2,
+    Vector2i,
+    resource_uid,
+    to_godot,
+)
+from ai_game_dev.specs.game_spec_loader import GameSpec
+
+
+def write_png(path, width, height):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    raw = b"".join(b"\x00" + b"\x00\x00\x00\xff" * width for _ in range(height))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+class FakeRegistry:
+    def get_assets_for_game(self, game_type, engine):
+        assert engine == ""
+        return {
+            "sprites": {
+                "player": "/static/hero.png",
+                "tiles": ["/static/tiles.png", "/static/missing.png"],
+            },
+            "backgrounds": [],
+            "audio": {},
+        }
+
+
+@pytest.fixture
+def emitter(temp_dir):
+    write_png(temp_dir / "static" / "hero.png", 32, 32)
+    write_png(temp_dir / "static" / "tiles.png", 48, 16)
+    return GodotProjectEmitter(registry=FakeRegistry(), assets_root=temp_dir)
+
+
+@pytest.fixture
+def spec():
+    return GameSpec(title="Pixel Quest", engine="godot", type="platformer")
+
+
+class TestGodotValues:
+    """Text resource serialization."""
+
+    def test_values(self):
+        assert to_godot(True) == "true"
+        assert to_godot(None) == "null"
+        assert to_godot(1.0) == "1.0"
+        assert to_godot('say "hi"') == '"say \\"hi\\""'
+        assert str(Vector2(32, 16.5)) == "Vector2(32, 16.5)"
+        assert str(Vector2i(1, 2)) == "Vector2i(1, 2)"
+
+    def test_uids_are_stable_and_valid(self):
+        uid = resource_uid("res://scenes/Main.tscn")
+        assert uid == resource_uid("res://scenes/Main.tscn")
+        assert uid != resource_uid("res://scenes/Player.tscn")
+        assert set(uid.removeprefix("uid://")) <= set("abcdefghijklmnopqrstuvwxy012345678")
+
+    def test_scene_layout(self):
+        scene = TextResource("res://a.tscn")
+        script = scene.ext("Script", "res://a.gd")
+        assert scene.ext("Script", "res://a.gd") == script
+        shape = scene.sub("CircleShape2D", {"radius": 4.0})
+        scene.node("A", "Node2D", properties={"script": script})
+        scene.node("Shape", "CollisionShape2D", ".", properties={"shape": shape})
+        text = scene.render()
+
+        assert text.startswith('[gd_scene load_steps=3 format=3 uid="uid://')
+        assert '[ext_resource type="Script" path="res://a.gd" id="1_' in text
+        assert "radius = 4.0" in text
+        assert '[node name="Shape" type="CollisionShape2D" parent="."]' in text
+
+
+class TestGodotProjectEmitter:
+    """Project boilerplate from a spec."""
+
+    def test_emits_expected_files(self, emitter, spec):
+        project = emitter.emit(spec, "pixel art")
+        assert set(project.files) == {
+            "project.godot", "resources/player_frames.tres", "resources/tileset.tres",
+            "scenes/Player.tscn", "scenes/ui/HUD.tscn", "scenes/Main.tscn",
+        }
+        assert set(project.assets) == {"res://assets/hero.png", "res://assets/tiles.png"}
+
+    def test_is_deterministic(self, emitter, spec):
+        assert emitter.emit(spec).files == emitter.emit(spec).files
+
+    def test_project_settings(self, emitter, spec):
+        settings = emitter.emit(spec, "pixel art").files["project.godot"]
+        assert 'config/name="Pixel Quest"' in settings
+        assert 'run/main_scene="res://scenes/Main.tscn"' in settings
+        assert 'GameManager="*res://scripts/GameManager.gd"' in settings
+        assert '"physical_keycode":4194319' in settings  # Left arrow
+        assert "default_texture_filter=0" in settings
+        assert "default_texture_filter=2" in emitter.emit(spec, "modern").files["project.godot"]
+
+    def test_tileset_uses_image_grid(self, emitter, spec):
+        tileset = emitter.emit(spec).files["resources/tileset.tres"]
+        assert "texture_region_size = Vector2i(16, 16)" in tileset
+        assert "2:0/0 = 0" in tileset
+        assert "3:0/0" not in tileset
+
+    def test_scenes_reference_resource_uids(self, emitter, spec):
+        files = emitter.emit(spec).files
+        player_uid = resource_uid("res://scenes/Player.tscn")
+        assert f'uid="{player_uid}"' in files["scenes/Player.tscn"].splitlines()[0]
+        assert f'uid="{player_uid}" path="res://scenes/Player.tscn"' in files["scenes/Main.tscn"]
+        assert 'type="TileMapLayer"' in files["scenes/Main.tscn"]
+        assert 'ExtResource("1_' in files["resources/player_frames.tres"]
+
+
+def read_ctex(data):
+    """Header fields and the decoded PNG levels of a .ctex file."""
+    assert data[:4] == b"GST2"
+    version, width, height, flags, limit = struct.unpack("<IIIIi", data[4:24])
+    data_format, _, _, mipmaps, image_format = struct.unpack("<IHHII", data[36:52])
+    assert (version, data_format, limit) == (1, 1, -1)
+    levels, offset = [], 52
+    for _ in range(mipmaps + 1):
+        (size,) = struct.unpack("<I", data[offset:offset + 4])
+        assert data[offset + 4:offset + 8] == b"PNG "
+        levels.append(Image.open(io.BytesIO(data[offset + 8:offset + 4 + size])))
+        offset += 4 + size
+    assert offset == len(data)
+    return (width, height, flags, image_format), levels
+
+
+class TestGodotImports:
+    """Pre-baked texture imports."""
+
+    def test_pixel_art_texture(self, temp_dir):
+        source = temp_dir / "hero.png"
+        write_png(source, 32, 16)
+        files = bake_imports({"res://assets/hero.png": source}, pixel_art=True)
+
+        base = import_base_path("res://assets/hero.png").removeprefix("res://")
+        assert base == ".godot/imported/hero.png-" + hashlib.md5(b"res://assets/hero.png").hexdigest()
+        assert set(files) == {"assets/hero.png.import", f"{base}.ctex", f"{base}.md5"}
+
+        (width, height, flags, image_format), levels = read_ctex(files[f"{base}.ctex"])
+        assert (width, height, flags, image_format) == (32, 16, 0, 5)
+        assert [level.size for level in levels] == [(32, 16)]
+
+        sidecar = files["assets/hero.png.import"].decode()
+        assert f'uid="{resource_uid("res://assets/hero.png")}"' in sidecar
+        assert f'dest_files=["res://{base}.ctex"]' in sidecar
+        assert "mipmaps/generate=false" in sidecar
+
+        assert files[f"{base}.md5"].decode() == (
+            f'source_md5="{hashlib.md5(source.read_bytes()).hexdigest()}"\n'
+            f'dest_md5="{hashlib.md5(files[f"{base}.ctex"]).hexdigest()}"\n'
+        )
+
+    def test_smooth_art_has_mipmaps(self, temp_dir):
+        source = temp_dir / "bg.png"
+        write_png(source, 8, 4)
+        files = bake_imports({"res://assets/bg.png": source, "res://assets/theme.ogg": source}, pixel_art=False)
+        base = import_base_path("res://assets/bg.png").removeprefix("res://")
+
+        assert len(files) == 3
+        (_, _, flags, _), levels = read_ctex(files[f"{base}.ctex"])
+        assert flags == 1 << 23
+        assert [level.size for level in levels] == [(8, 4), (4, 2), (2, 1), (1, 1)]
+        assert "mipmaps/generate=true" in files["assets/bg.png.import"].decode()
+
+    def test_fix_alpha_border(self):
+        image = Image.new("RGBA", (8, 1), (0, 0, 0, 0))
+        image.putpixel((0, 0), (255, 0, 0, 255))
+        fixed = fix_alpha_border(image)
+
+        assert fixed.getpixel((1, 0)) == (255, 0, 0, 0)
+        assert fixed.getpixel((4, 0)) == (255, 0, 0, 0)
+        assert fixed.getpixel((5, 0)) == (0, 0, 0, 0)
+
+
+def test_png_size(temp_dir):
+    write_png(temp_dir / "a.png", 7, 3)
+    (temp_dir / "b.png").write_bytes(b"nope")
+    assert png_size(temp_dir / "a.png") == (7, 3)
+    assert png_size(temp_dir / "b.png") is None
+
+
+@pytest.mark.asyncio
+async def test_adapter_only_asks_llm_for_scripts(emitter, temp_dir):
+    adapter = GodotAdapter()
+    adapter.emitter = emitter
+    adapter.output_dir = temp_dir / "out"
+    adapter.output_dir.mkdir()
+
+    with patch.object(adapter, "generate_code_with_llm", new=AsyncMock(return_value="extends Node")) as llm:
+        result = await adapter.generate_game_project("pixel platformer", art_style="pixel art")
+
+    assert llm.await_count == 4
+    assert result.generated_files["project.godot"].startswith("; Engine configuration file.")
+    assert (result.project_path / "scenes" / "Main.tscn").exists()
+    assert (result.project_path / "assets" / "hero.png").read_bytes()[:4] == b"\x89PNG"
+    assert (result.project_path / "assets" / "hero.png.import").exists()
+    assert list((result.project_path / ".godot" / "imported").glob("hero.png-*.ctex"))
@@ -0,0 +1,249 @@
+"""Tests for the Google Fonts catalog cache."""
+import json
+import time
+
+import aiohttp
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from ai_game_dev.fonts.google_fonts import GoogleFonts, subset_font
+
+
+CATALOG = [
+    {"family": "Orbitron", "category": "sans-serif", "variants": ["regular", "700"]},
+    {"family": "Press Start 2P", "category": "display", "variants": ["regular"]},
+    {"family": "Bangers", "category": "display", "variants": ["regular"]},
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_catalog():
+    """Isolate the process-wide catalog between tests."""
+    GoogleFonts._shared_catalogs.clear()
+    yield
+    GoogleFonts._shared_catalogs.clear()
+
+
+def write_cache(path, fetched_at, etag="abc"):
+    path.write_text(json.dumps({"etag": etag, "fetched_at": fetched_at, "items": CATALOG}))
+
+
+def mock_session(status, payload=None, etag=None):
+    """Build an aiohttp-like session whose get() yields one response."""
+    response = MagicMock()
+    response.status = status
+    response.headers = {"ETag": etag} if etag else {}
+    response.json = AsyncMock(return_value=payload or {})
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=response)
+    context.__aexit__ = AsyncMock(return_value=None)
+    session = MagicMock()
+    session.get = MagicMock(return_value=context)
+    return session
+
+
+class TestCatalogCache:
+    """Test on-disk catalog caching and revalidation."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_cache_needs_no_session(self, temp_dir):
+        """A fresh on-disk catalog is used without any network session."""
+        cache_path = temp_dir / "catalog.json"
+        write_cache(cache_path, time.time())
+
+        fonts = await GoogleFonts(cache_path=cache_path).get_available_fonts()
+
+        assert [f["family"] for f in fonts] == ["Orbitron", "Press Start 2P", "Bangers"]
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_revalidates_with_etag(self, temp_dir):
+        """A stale catalog is revalidated; 304 keeps the cached items."""
+        cache_path = temp_dir / "catalog.json"
+        write_cache(cache_path, time.time() - 10 * 24 * 3600, etag="v1")
+
+        client = GoogleFonts(cache_path=cache_path)
+        client.session = mock_session(304)
+        fonts = await client.get_available_fonts()
+
+        headers = client.session.get.call_args.kwargs["headers"]
+        assert headers == {"If-None-Match": "v1"}
+        assert len(fonts) == 3
+        assert json.loads(cache_path.read_text())["fetched_at"] > time.time() - 60
+
+    @pytest.mark.asyncio
+    async def test_download_persists_catalog(self, temp_dir):
+        """A fetched catalog is written to disk with its ETag."""
+        cache_path = temp_dir / "catalog.json"
+        client = GoogleFonts(cache_path=cache_path)
+        client.session = mock_session(200, {"items": CATALOG}, etag="v2")
+
+        await client.get_available_fonts()
+
+        data = json.loads(cache_path.read_text())
+        assert data["etag"] == "v2"
+        assert data["items"] == CATALOG
+
+    @pytest.mark.asyncio
+    async def test_catalog_shared_across_instances(self, temp_dir):
+        """Later instances reuse the in-process catalog."""
+        cache_path = temp_dir / "catalog.json"
+        write_cache(cache_path, time.time())
+        await GoogleFonts(cache_path=cache_path).get_available_fonts()
+        cache_path.unlink()
+
+        fonts = await GoogleFonts(cache_path=cache_path).get_available_fonts()
+
+        assert len(fonts) == 3
+
+
+    @pytest.mark.asyncio
+    async def test_shared_catalog_expires(self, temp_dir):
+        """The in-process catalog is refreshed once its TTL has passed."""
+        cache_path = temp_dir / "catalog.json"
+        write_cache(cache_path, time.time())
+        await GoogleFonts(cache_path=cache_path).get_available_fonts()
+        GoogleFonts._shared_catalogs[cache_path] = (time.time() - 10 * 24 * 3600, CATALOG[:1])
+
+        fonts = await GoogleFonts(cache_path=cache_path).get_available_fonts()
+
+        assert len(fonts) == 3
+
+    @pytest.mark.asyncio
+    async def test_shared_catalog_is_per_cache_path(self, temp_dir):
+        """Instances with a different cache path do not see each other's catalog."""
+        write_cache(temp_dir / "a.json", time.time())
+        (temp_dir / "b.json").write_text(json.dumps({"fetched_at": time.time(), "items": CATALOG[:1]}))
+        await GoogleFonts(cache_path=temp_dir / "a.json").get_available_fonts()
+
+        fonts = await GoogleFonts(cache_path=temp_dir / "b.json").get_available_fonts()
+
+        assert [f["family"] for f in fonts] == ["Orbitron"]
+
+
+def failing_session():
+    """Build a session whose requests fail like an offline network."""
+    session = MagicMock()
+    session.get = MagicMock(side_effect=aiohttp.ClientConnectionError("offline"))
+    return session
+
+
+class TestDownloads:
+    """Test font downloads when the network misbehaves."""
+
+    @pytest.mark.asyncio
+    async def test_offline_download_returns_nothing(self, temp_dir):
+        """Network errors are reported as no files instead of raising."""
+        client = GoogleFonts(cache_path=temp_dir / "catalog.json")
+        client.session = failing_session()
+
+        files = await client.download_font_files("Orbitron", temp_dir / "files")
+
+        assert files == []
+
+    @pytest.mark.asyncio
+    async def test_failed_transfer_leaves_no_file(self, temp_dir):
+        """A download cut off mid-way is not left behind as a cached font."""
+        response = MagicMock()
+        response.status = 200
+        response.read = AsyncMock(side_effect=aiohttp.ClientPayloadError("truncated"))
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=None)
+        client = GoogleFonts(cache_path=temp_dir / "catalog.json")
+        client.session = MagicMock()
+        client.session.get = MagicMock(return_value=context)
+        css = "src: url(https://fonts.gstatic.com/o.ttf) format('truetype');"
+
+        downloaded = await client._download_css_fonts(css, "Orbitron", temp_dir, None, None)
+
+        assert downloaded == {}
+        assert list(temp_dir.iterdir()) == []
+
+
+    @pytest.mark.asyncio
+    async def test_unsubsettable_font_is_kept_whole(self, temp_dir):
+        """A font fontTools can't subset is saved in full instead of failing the download."""
+        response = MagicMock()
+        response.status = 200
+        response.read = AsyncMock(return_value=b"not really a font")
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=None)
+        client = GoogleFonts(cache_path=temp_dir / "catalog.json")
+        client.session = MagicMock()
+        client.session.get = MagicMock(return_value=context)
+        css = "src: url(https://fonts.gstatic.com/o.ttf) format('truetype');"
+
+        downloaded = await client._download_css_fonts(css, "Orbitron", temp_dir, None, "HP")
+
+        [path] = downloaded.values()
+        assert path.read_bytes() == b"not really a font"
+        assert list(temp_dir.iterdir()) == [path]
+
+def build_test_font(path):
+    """Write a tiny TrueType font with square glyphs for A, B and space."""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    pen = TTGlyphPen(None)
+    pen.moveTo((100, 0))
+    pen.lineTo((100, 700))
+    pen.lineTo((500, 700))
+    pen.lineTo((500, 0))
+    pen.closePath()
+    square = pen.glyph()
+
+    glyph_order = [".notdef", "space", "A", "B"]
+    builder = FontBuilder(1000, isTTF=True)
+    builder.setupGlyphOrder(glyph_order)
+    builder.setupCharacterMap({32: "space", 65: "A", 66: "B"})
+    builder.setupGlyf({name: square if name in ("A", "B") else TTGlyphPen(None).glyph() for name in glyph_order})
+    builder.setupHorizontalMetrics({name: (600, 0) for name in glyph_order})
+    builder.setupHorizontalHeader(ascent=800, descent=-200)
+    builder.setupNameTable({"familyName": "Test", "styleName": "Regular"})
+    builder.setupOS2()
+    builder.setupPost()
+    builder.save(str(path))
+
+
+class TestSubsetFont:
+    """Test glyph subsetting with fontTools."""
+
+    def test_subset_keeps_only_requested_glyphs(self, temp_dir):
+        """The subset maps exactly the requested characters plus space."""
+        ttLib = pytest.importorskip("fontTools.ttLib")
+        font_path = temp_dir / "test.ttf"
+        build_test_font(font_path)
+
+        subset_path = subset_font(font_path, "AAA")
+
+        assert subset_path == temp_dir / "test_subset.ttf"
+        cmap = ttLib.TTFont(str(subset_path)).getBestCmap()
+        assert set(cmap) == {ord("A"), ord(" ")}
+
+
+class TestSearchIndex:
+    """Test category/style index lookups."""
+
+    @pytest.mark.asyncio
+    async def test_filter_by_category_and_style(self, temp_dir):
+        """Category and variant filters use the local index."""
+        cache_path = temp_dir / "catalog.json"
+        write_cache(cache_path, time.time())
+        client = GoogleFonts(cache_path=cache_path)
+
+        display = await client.get_available_fonts(category="display")
+        bold = await client.get_available_fonts(style="700")
+
+        assert {f["family"] for f in display} == {"Press Start 2P", "Bangers"}
+        assert [f["family"] for f in bold] == ["Orbitron"]
+
+    @pytest.mark.asyncio
+    async def test_fonts_for_game_style(self, temp_dir):
+        """Recommendations resolve through the family index."""
+        cache_path = temp_dir / "catalog.json"
+        write_cache(cache_path, time.time())
+
+        fonts = await GoogleFonts(cache_path=cache_path).get_fonts_for_game_style("retro")
+
+        assert [f["family"] for f in fonts] == ["Press Start 2P", "Orbitron"]
@@ -0,0 +1,53 @@
+"""Tests for the shared keyword automaton."""
+from ai_game_dev.keywords import (
+    KeywordMatcher,
+    count_keywords,
+    find_keywords,
+    matching_labels,
+    register_keywords,
+)
+
+
+class TestKeywordMatcher:
+    """Test Aho-Corasick matching with word boundaries."""
+
+    def test_finds_overlapping_keywords_in_one_pass(self):
+        matcher = KeywordMatcher(["he", "she", "hers", "his"])
+        assert list(matcher.iter_matches("ushers she his")) == [(7, "she"), (11, "his")]
+        assert KeywordMatcher(["she", "he"], suffixes=()).find("she") == {"she"}
+
+    def test_word_boundaries_and_inflections(self):
+        """Keywords must start a word and may only end in an inflection."""
+        matcher = KeywordMatcher(["quest", "ui", "sci-fi", "hero", "win"])
+        assert matcher.find("A request for the build") == frozenset()
+        assert matcher.find("Quests and heroic SCI-FI wins") == {"quest", "sci-fi", "hero", "win"}
+        assert matcher.find("a window") == frozenset()
+
+    def test_counts(self):
+        matcher = KeywordMatcher(["dragon", "sword"])
+        assert matcher.count("Dragons! A dragon, a sword.") == {"dragon": 2, "sword": 1}
+
+
+def test_shared_registry_recompiles_on_new_keywords():
+    register_keywords(["zyxwv"])
+    assert "zyxwv" in find_keywords("the zyxwv appears")
+    register_keywords({"label": ["qwertz"]})
+    assert "qwertz" in find_keywords("qwertz")
+    assert count_keywords("zyxwv zyxwv")["zyxwv"] == 2
+    assert matching_labels(frozenset({"b"}), {"x": ["a"], "y": ["b", "c"]}) == ["y"]
+
+
+def test_analyzers_share_the_automaton():
+    """Seeder and audio analyzers classify through the shared keywords."""
+    from ai_game_dev.audio.audio_tools import AudioTools
+    from ai_game_dev.text.corpus import guess_genre, tag_themes
+
+    tools = AudioTools.__new__(AudioTools)
+    context = tools._analyze_audio_context("A pixel art dragon quest with a main menu", "")
+    assert context["genre"] == "fantasy"
+    assert context["mood"] == "heroic"
+    assert context["context"] == "menu"
+    assert set(tools._analyze_sfx_needs("Open every door in combat", "retro")) >= {"door", "explosion", "powerup"}
+
+    assert tag_themes("A brave knight's secret journey") == ["heroism", "mystery", "adventure"]
+    assert guess_genre("The robot left the planet for another planet") == "sci-fi"
@@ -0,0 +1,339 @@
+"""Tests for literary seeder embedding scoring, corpus ingestion and the vector store."""
+import functools
+import http.server
+import multiprocessing
+import threading
+import urllib.error
+import zipfile
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from ai_game_dev.text.corpus import CorpusIndex, check_corpus_source, iter_passages, read_epub
+from ai_game_dev.text.literary_seeder import LiterarySeeder, SeededContent, SeedingRequest
+from ai_game_dev.text.vector_store import VectorStore, content_hash
+
+
+class FakeEncoder:
+    """Bag-of-letters encoder that records every batch it is given."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=False):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), 26), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for char in text.lower():
+                if char.isalpha() and char.isascii():
+                    vectors[row, ord(char) - ord("a")] += 1
+        if normalize_embeddings:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+
+@pytest.fixture
+def seeder(temp_dir):
+    with patch("ai_game_dev.text.literary_seeder.PYTORCH_AVAILABLE", False):
+        seeder = LiterarySeeder(cache_dir=temp_dir / "seeding")
+    seeder.embedding_model = FakeEncoder()
+    return seeder
+
+
+def make_content(texts):
+    return [SeededContent(source="test", content_type="excerpt", text_content=text) for text in texts]
+
+
+class TestVectorStore:
+    """Test the memory-mapped vector store."""
+
+    def test_vectors_persist_across_instances(self, temp_dir):
+        """Appended rows are readable by a new store over the same directory."""
+        store = VectorStore(temp_dir / "vectors")
+        store.add(["a", "b", "a"], np.array([[1, 0], [0, 1], [5, 5]], dtype=np.float32))
+        store.add(["b", "c"], np.array([[9, 9], [1, 1]], dtype=np.float32))
+
+        reopened = VectorStore(temp_dir / "vectors")
+        assert len(reopened) == 3
+        np.testing.assert_array_equal(reopened.get(["c", "a", "b"]), [[1, 1], [1, 0], [0, 1]])
+        assert reopened.missing(["a", "d", "d"]) == ["d"]
+
+    def test_rejects_mismatched_dimensions(self, temp_dir):
+        store = VectorStore(temp_dir / "vectors")
+        store.add(["a"], np.ones((1, 3)))
+        with pytest.raises(ValueError):
+            store.add(["b"], np.ones((1, 4)))
+
+
+    def test_index_log_only_grows_by_new_keys(self, temp_dir):
+        """Each batch appends its own keys instead of rewriting the index."""
+        store = VectorStore(temp_dir / "vectors")
+        for batch in range(5):
+            keys = [f"{batch}-{i}" for i in range(10)]
+            store.add(keys, np.full((10, 2), batch, dtype=np.float32))
+
+        lines = (temp_dir / "vectors" / "index.jsonl").read_text().splitlines()
+        assert len(lines) == 1 + 50
+        np.testing.assert_array_equal(VectorStore(temp_dir / "vectors").get(["3-7"]), [[3, 3]])
+
+    def test_stale_instances_do_not_clobber_rows(self, temp_dir):
+        """A second writer sees rows appended by the first before adding its own."""
+        first = VectorStore(temp_dir / "vectors")
+        second = VectorStore(temp_dir / "vectors")
+        first.add(["a"], np.array([[1, 1]]))
+        second.add(["b", "a"], np.array([[2, 2], [9, 9]]))
+        first.add(["c"], np.array([[3, 3]]))
+
+        reopened = VectorStore(temp_dir / "vectors")
+        np.testing.assert_array_equal(reopened.get(["a", "b", "c"]), [[1, 1], [2, 2], [3, 3]])
+
+    def test_concurrent_processes_keep_index_and_vectors_paired(self, temp_dir):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=add_tagged_vectors, args=(temp_dir / "vectors", tag)) for tag in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        store = VectorStore(temp_dir / "vectors")
+        keys = [f"{tag}-{i}" for tag in range(4) for i in range(40)]
+        assert len(store) == len(keys)
+        expected = [[tag, i] for tag in range(4) for i in range(40)]
+        np.testing.assert_array_equal(store.get(keys), expected)
+
+
+def add_tagged_vectors(root, tag):
+    """Worker for the concurrency test: vectors encode their own key."""
+    store = VectorStore(root)
+    for i in range(40):
+        store.add([f"{tag}-{i}"], np.array([[tag, i]], dtype=np.float32))
+
+
+class TestEmbeddingScoring:
+    """Test batched scoring and top-k selection."""
+
+    @pytest.mark.asyncio
+    async def test_batches_once_and_reuses_cached_embeddings(self, seeder):
+        """New texts are encoded in one call and never re-encoded."""
+        request = SeedingRequest(themes=["zzz"], genres=[], character_types=[], settings=[], tone="")
+        content = make_content(["zzz zzz", "abc", "zzz zzz"])
+
+        await seeder._generate_embeddings(content, request)
+
+        assert seeder.embedding_model.calls[0][1:] == ["zzz zzz", "abc"]
+        assert content[0].relevance_score == pytest.approx(1.0)
+        assert content[1].relevance_score == pytest.approx(0.0)
+
+        await seeder._generate_embeddings(make_content(["abc", "zzz zzz"]), request)
+        assert len(seeder.embedding_model.calls[-1]) == 1  # Only the query
+        assert content_hash("abc") in seeder.vector_store
+
+    def test_filter_by_relevance_returns_top_k_in_order(self, seeder):
+        content = make_content([str(i) for i in range(1000)])
+        for item, score in zip(content, np.random.default_rng(1).permutation(1000)):
+            item.relevance_score = float(score)
+
+        top = seeder._filter_by_relevance(content, 5)
+
+        assert [item.relevance_score for item in top] == [999, 998, 997, 996, 995]
+        assert seeder._filter_by_relevance(content[:2], 5) == sorted(
+            content[:2], key=lambda item: item.relevance_score, reverse=True
+        )
+
+
+GUTENBERG_BOOK = """The Project Gutenberg eBook of The Dragon Road
+
+Title: The Dragon Road
+Author: A. Writer
+
+*** START OF THE PROJECT GUTENBERG EBOOK THE DRAGON ROAD ***
+
+The wizard raised his staff and the dragon
+answered from the mountain with a roar of fire.
+
+{body}
+
+*** END OF THE PROJECT GUTENBERG EBOOK THE DRAGON ROAD ***
+
+Licence text that must not be ingested.
+"""
+
+
+def write_book(path, paragraphs=12):
+    body = "\n\n".join(
+        f"Paragraph {i}: the brave knight rode on through the kingdom on a long journey, "
+        f"and the sword at his side was a secret gift of the elves. " * 3
+        for i in range(paragraphs)
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(GUTENBERG_BOOK.format(body=body))
+    return path
+
+
+def write_epub(path):
+    with zipfile.ZipFile(path, "w") as epub:
+        epub.writestr("mimetype", "application/epub+zip")
+        epub.writestr("META-INF/container.xml", """<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>
+</container>""")
+        epub.writestr("OEBPS/content.opf", """<?xml version="1.0"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:title>Star Voyage</dc:title><dc:creator>B. Author</dc:creator>
+  </metadata>
+  <manifest>
+    <item id="c2" href="ch2.xhtml" media-type="application/xhtml+xml"/>
+    <item id="c1" href="ch1.xhtml" media-type="application/xhtml+xml"/>
+  </manifest>
+  <spine><itemref idref="c1"/><itemref idref="c2"/></spine>
+</package>""")
+        epub.writestr("OEBPS/ch1.xhtml", "<html><head><title>x</title></head><body>"
+                      "<h1>One</h1><p>The rocket left the planet.</p><p>Space &amp; stars.</p></body></html>")
+        epub.writestr("OEBPS/ch2.xhtml", "<html><body><p>The robot machine waited.</p></body></html>")
+    return path
+
+
+class TestCorpusIngestion:
+    """Test streaming ingestion into the corpus index."""
+
+    def test_passages_respect_size_bounds(self):
+        lines = [("word " * 50).strip(), ""] * 20 + ["x" * 4000]
+        passages = list(iter_passages(lines, min_chars=400, max_chars=1000))
+        assert all(len(p) <= 1000 for p in passages)
+        assert sum(len(p) >= 400 for p in passages) >= len(passages) - 1
+
+    def test_plain_text_is_stripped_tagged_and_deduplicated(self, temp_dir):
+        """Gutenberg boilerplate is dropped and re-ingestion adds nothing."""
+        write_book(temp_dir / "books" / "dragon.txt")
+        index = CorpusIndex(temp_dir / "corpus")
+
+        stats = index.ingest(temp_dir / "books")
+        assert stats.books == 1 and stats.added > 1 and stats.duplicates == 0
+
+        records = index.read(range(len(index)))
+        assert records[0]["title"] == "The Dragon Road"
+        assert records[0]["author"] == "A. Writer"
+        assert records[0]["genre"] == "fantasy"
+        assert "heroism" in records[0]["themes"]
+        assert not any("Licence" in r["text"] or "START OF" in r["text"] for r in records)
+
+        again = CorpusIndex(temp_dir / "corpus").ingest(temp_dir / "books")
+        assert again.added == 0 and again.duplicates == stats.added
+
+    def test_epub_follows_spine_order(self, temp_dir):
+        metadata, lines = read_epub(write_epub(temp_dir / "voyage.epub"))
+        text = " ".join(line for line in lines if line)
+        assert metadata == {"title": "Star Voyage", "author": "B. Author"}
+        assert text == "One The rocket left the planet. Space & stars. The robot machine waited."
+
+    def test_ingests_from_http(self, temp_dir):
+        write_book(temp_dir / "site" / "dragon.txt")
+        handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(temp_dir / "site"))
+        handler.log_message = lambda *args: None
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            index = CorpusIndex(temp_dir / "corpus")
+            stats = index.ingest(f"http://127.0.0.1:{server.server_port}/dragon.txt", genre="fantasy")
+        finally:
+            server.shutdown()
+
+        assert stats.added > 1
+        assert index.read([0])[0]["source"].endswith("/dragon.txt")
+
+    @pytest.mark.asyncio
+    async def test_seeding_draws_on_ingested_corpus(self, seeder, temp_dir):
+        """Passages are embedded while ingesting and ranked from the corpus."""
+        write_book(temp_dir / "books" / "dragon.txt")
+        write_epub(temp_dir / "books" / "voyage.epub")
+
+        stats = await seeder.ingest_corpus(temp_dir / "books")
+        assert len(seeder.vector_store) == stats.added
+
+        request = SeedingRequest(themes=["technology"], genres=["sci-fi"], character_types=[], settings=[],
+                                 max_sources=2)
+        result = await seeder.seed_from_request(request)
+
+        sources = {item["source"] for item in result["seeded_content"]}
+        assert sources == {"Star Voyage"}
+        assert result["seeded_content"][0]["metadata"]["genre"] == "sci-fi"
+
+    @pytest.mark.asyncio
+    async def test_unembedded_passages_are_embedded_in_batches(self, seeder, temp_dir):
+        """Passages ingested without a model are read and encoded batch by batch."""
+        write_book(temp_dir / "books" / "dragon.txt", paragraphs=40)
+        model, seeder.embedding_model = seeder.embedding_model, None
+        stats = await seeder.ingest_corpus(temp_dir / "books")
+        seeder.embedding_model = model
+        assert stats.added > 4
+
+        request = SeedingRequest(themes=[], genres=["fantasy"], character_types=[], settings=[], max_sources=2)
+        with patch("ai_game_dev.text.literary_seeder.INGEST_BATCH_SIZE", 4):
+            await seeder.seed_from_request(request)
+
+        passage_calls = model.calls[:-1]
+        assert max(len(call) for call in passage_calls) == 4
+        assert sum(len(call) for call in passage_calls) == stats.added
+        assert len(seeder.vector_store) == stats.added
+
+
+def serve_redirect(location):
+    """Serve a single 302 redirect to ``location`` on localhost."""
+    class Redirect(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(302)
+            self.send_header("Location", location)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Redirect)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TestCorpusSourceChecks:
+    """Test validation of untrusted ingest sources."""
+
+    def test_paths_must_stay_inside_the_corpus_root(self, temp_dir):
+        write_book(temp_dir / "books" / "dragon.txt")
+        (temp_dir / "secret.txt").write_text("secret")
+
+        assert check_corpus_source("dragon.txt", temp_dir / "books") == (temp_dir / "books" / "dragon.txt").resolve()
+        for source in ("../secret.txt", str(temp_dir / "secret.txt"), "/etc", "missing.txt"):
+            with pytest.raises(ValueError):
+                check_corpus_source(source, temp_dir / "books")
+
+    def test_urls_must_use_an_allowed_host(self, temp_dir):
+        url = "https://www.gutenberg.org/cache/epub/11/pg11.txt"
+        assert check_corpus_source(url, temp_dir) == url
+        assert check_corpus_source("https://ia800.us.archive.org/a/b.epub", temp_dir)
+        for source in ("http://169.254.169.254/latest/meta-data", "https://gutenberg.org.evil.test/a.txt",
+                       "http://localhost:8000/admin"):
+            with pytest.raises(ValueError):
+                check_corpus_source(source, temp_dir)
+
+    def test_redirects_may_not_leave_allowed_hosts(self, temp_dir):
+        server = serve_redirect("http://localhost:9/secret.txt")
+        try:
+            with pytest.raises(urllib.error.HTTPError):
+                CorpusIndex(temp_dir / "corpus").ingest(
+                    f"http://127.0.0.1:{server.server_port}/book.txt", allowed_hosts={"127.0.0.1"}
+                )
+        finally:
+            server.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_tool_refuses_disallowed_sources(self, temp_dir):
+        from agents.tool_context import ToolContext
+        from ai_game_dev.text.seeding_tools import _seeder, ingest_literary_corpus
+
+        payload = '{"source": "http://169.254.169.254/latest/meta-data"}'
+        context = ToolContext(None, tool_name=ingest_literary_corpus.name, tool_call_id="call", tool_arguments=payload)
+        with patch.object(_seeder, "corpus_root", temp_dir / "books"):
+            result = await ingest_literary_corpus.on_invoke_tool(context, payload)
+
+        assert "not an allowed corpus source" in str(result)
@@ -0,0 +1,100 @@
+"""Tests for the offline MIDI renderer."""
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from ai_game_dev.audio.midi_renderer import (
+    NOTE_DTYPE,
+    MidiRenderer,
+    read_midi_notes,
+    voice_for,
+)
+
+
+def write_midi(path, events, division=480, tempo=None):
+    """Write a single-track SMF from (delta, status, data bytes) events."""
+    track = b""
+    if tempo:
+        track += b"\x00\xff\x51\x03" + tempo.to_bytes(3, "big")
+    for delta, status, data in events:
+        track += bytes([delta]) + bytes([status]) + bytes(data)
+    track += b"\x00\xff\x2f\x00"
+    header = b"MThd" + struct.pack(">IHHH", 6, 0, 1, division)
+    path.write_bytes(header + b"MTrk" + struct.pack(">I", len(track)) + track)
+    return path
+
+
+def make_notes(rows):
+    notes = np.zeros(len(rows), dtype=NOTE_DTYPE)
+    for i, row in enumerate(rows):
+        notes[i] = row
+    return notes
+
+
+class TestReadMidi:
+    """Test Standard MIDI File parsing."""
+
+    def test_notes_and_tempo(self, temp_dir):
+        """Note on/off pairs become onsets and durations in seconds."""
+        path = write_midi(temp_dir / "song.mid", [
+            (0, 0xC0, [33]),                 # program change to bass
+            (0, 0x90, [60, 100]),
+            (120, 0x80, [60, 0]),            # 120 ticks = quarter of a beat
+            (0, 0x90, [64, 80]),
+            (120, 0x90, [64, 0]),            # note-on with velocity 0 ends a note
+        ], tempo=1000000)                    # 60 BPM
+
+        notes = read_midi_notes(path)
+
+        assert notes["pitch"].tolist() == [60, 64]
+        assert notes["velocity"].tolist() == [100, 80]
+        assert notes["onset"] == pytest.approx([0.0, 0.25])
+        assert notes["duration"] == pytest.approx([0.25, 0.25])
+        assert notes["program"].tolist() == [33, 33]
+
+    def test_rejects_non_midi(self, temp_dir):
+        """Files without an MThd header are rejected."""
+        path = temp_dir / "bad.mid"
+        path.write_bytes(b"RIFF0000")
+        with pytest.raises(ValueError):
+            read_midi_notes(path)
+
+
+class TestRenderer:
+    """Test chunked wavetable rendering."""
+
+    def test_voice_mapping(self):
+        """GM programs and the drum channel map to voices."""
+        assert voice_for(0, 0) == "piano"
+        assert voice_for(33, 0) == "bass"
+        assert voice_for(48, 0) == "strings"
+        assert voice_for(0, 9) == "drums"
+
+    def test_chunks_match_full_render(self):
+        """Chunking is seamless and covers the release tail."""
+        notes = make_notes([(0.0, 0.5, 60, 100, 0, 0), (0.4, 0.8, 67, 90, 0, 48)])
+        renderer = MidiRenderer(chunk_seconds=0.1)
+
+        chunks = list(renderer.render_chunks(notes))
+        whole = MidiRenderer(chunk_seconds=10.0).render(notes)
+
+        assert max(len(c) for c in chunks) == int(0.1 * renderer.sample_rate)
+        np.testing.assert_allclose(np.concatenate(chunks), whole, atol=1e-6)
+        assert len(whole) >= int((0.4 + 0.8) * renderer.sample_rate)
+        assert np.max(np.abs(whole)) <= 1.0
+        assert np.max(np.abs(whole)) > 0.05
+
+    def test_render_file_writes_wav(self, temp_dir):
+        """MIDI files render to a playable WAV."""
+        midi = write_midi(temp_dir / "song.mid", [
+            (0, 0x90, [60, 100]),
+            (96, 0x80, [60, 0]),
+        ])
+
+        output = MidiRenderer().write(read_midi_notes(midi), temp_dir / "song.wav")
+
+        with wave.open(str(output), "rb") as wav:
+            assert wav.getnchannels() == 1
+            assert wav.getnframes() > 0
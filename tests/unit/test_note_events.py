@@ -0,0 +1,92 @@
+"""Tests for note-event sequences and the MIDI writer."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ai_game_dev.audio.midi_renderer import read_midi_notes
+from ai_game_dev.audio.music_generator import MusicGenerator
+from ai_game_dev.audio.note_events import NoteSequence, scale_pitches
+
+
+class TestNoteSequence:
+    """Test array-backed sequences."""
+
+    def test_scale_pitches(self):
+        """Keys resolve to ascending scale pitches."""
+        assert scale_pitches("C major").tolist() == [60, 62, 64, 65, 67, 69, 71, 72]
+        assert scale_pitches("D minor", count=3).tolist() == [62, 64, 65]
+
+    def test_from_arrays_sorts_by_onset(self):
+        """Events are kept in onset order."""
+        seq = NoteSequence.from_arrays(onset=[1.0, 0.0], duration=0.5, pitch=[64, 60])
+        assert seq.events["pitch"].tolist() == [60, 64]
+        assert seq.duration == pytest.approx(1.5)
+
+    def test_midi_round_trip(self, temp_dir):
+        """Written MIDI parses back to the same notes."""
+        seq = NoteSequence.from_arrays(
+            onset=[0.0, 0.5, 0.5, 1.0],
+            duration=[0.5, 0.5, 1.0, 0.25],
+            pitch=[60, 64, 67, 60],
+            velocity=[100, 90, 80, 70],
+            channel=[0, 0, 1, 0],
+            program=[0, 0, 48, 0],
+            tempo_bpm=90,
+        )
+
+        notes = read_midi_notes(seq.write_midi(temp_dir / "song.mid"))
+
+        np.testing.assert_allclose(notes["onset"], seq.events["onset"], atol=1e-3)
+        np.testing.assert_allclose(notes["duration"], seq.events["duration"], atol=1e-3)
+        for field in ("pitch", "velocity", "channel", "program"):
+            assert sorted(notes[field].tolist()) == sorted(seq.events[field].tolist())
+
+
+class TestMusicGenerator:
+    """Test seeded generators."""
+
+    def test_seeded_generation_is_reproducible(self):
+        """The same seed produces identical sequences."""
+        generator = MusicGenerator()
+        a = generator.generate_action_music(1, "high", seed=7)
+        b = generator.generate_action_music(1, "high", seed=7)
+        c = generator.generate_action_music(1, "high", seed=8)
+        assert np.array_equal(a.events, b.events)
+        assert not np.array_equal(a.events, c.events)
+
+    def test_compose_fills_duration(self):
+        """Composed background music spans the requested duration."""
+        seq = MusicGenerator().compose_background_music("happy", "chiptune", 120, 30)
+        assert seq.duration == pytest.approx(30.0)
+
+    def test_soundtrack_is_reproducible(self, temp_dir):
+        """A soundtrack seed reproduces every theme byte for byte."""
+        generator = MusicGenerator()
+        themes = ["menu", "combat", "victory"]
+        first = generator.generate_game_soundtrack(themes, temp_dir / "a", seed=1)
+        second = generator.generate_game_soundtrack(themes, temp_dir / "b", seed=1)
+
+        assert set(first) == set(themes)
+        assert all(first[t].read_bytes() == second[t].read_bytes() for t in themes)
+
+
+class TestParallelSoundtrack:
+    """Test process-pool soundtrack generation."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_matches_sequential(self, temp_dir):
+        """Parallel output matches the sequential soundtrack and reports timing."""
+        generator = MusicGenerator()
+        themes = ["menu", "combat", "unknown"]
+
+        manifest = await generator.generate_game_soundtrack_parallel(
+            themes, temp_dir / "parallel", seed=3, render_audio=False
+        )
+        sequential = generator.generate_game_soundtrack(themes, temp_dir / "sequential", seed=3)
+
+        assert set(manifest) == {"menu", "combat"}
+        for theme, entry in manifest.items():
+            assert Path(entry["midi_path"]).read_bytes() == sequential[theme].read_bytes()
+            assert entry["elapsed_seconds"] >= entry["compose_seconds"] >= 0
+            assert entry["audio_path"] is None
@@ -0,0 +1,76 @@
+"""Tests for the incremental project writer."""
+import os
+
+import pytest
+
+from ai_game_dev.engines.project_writer import MANIFEST_NAME, atomic_write, write_project
+
+
+@pytest.mark.asyncio
+async def test_first_write_creates_everything(temp_dir):
+    project = temp_dir / "game"
+    manifest = await write_project(project, {"main.py": "print('hi')", "assets/a.bin": b"\x00\x01"})
+
+    assert manifest.changed == ["assets/a.bin", "main.py"]
+    assert manifest.unchanged == [] and manifest.removed == []
+    assert (project / "main.py").read_text() == "print('hi')"
+    assert (project / "assets" / "a.bin").read_bytes() == b"\x00\x01"
+    assert (project / MANIFEST_NAME).exists()
+
+
+@pytest.mark.asyncio
+async def test_rewrite_skips_unchanged_and_removes_stale(temp_dir):
+    project = temp_dir / "game"
+    await write_project(project, {"main.py": "a = 1", "old.py": "x", "same.py": "s"})
+    (project / "notes.txt").write_text("mine")
+    os.utime(project / "same.py", ns=(1, 1))
+    await write_project(project, {"main.py": "a = 1", "old.py": "x", "same.py": "s"})
+
+    manifest = await write_project(project, {"main.py": "a = 2", "same.py": "s", "new.py": "n"})
+
+    assert manifest.changed == ["main.py", "new.py"]
+    assert manifest.unchanged == ["same.py"]
+    assert manifest.removed == ["old.py"]
+    assert (project / "same.py").stat().st_mtime_ns == 1
+    assert not (project / "old.py").exists()
+    assert (project / "notes.txt").read_text() == "mine"
+    assert manifest.to_dict()["project_path"] == str(project)
+
+
+@pytest.mark.asyncio
+async def test_edited_file_is_restored(temp_dir):
+    project = temp_dir / "game"
+    await write_project(project, {"main.py": "a = 1"})
+    (project / "main.py").write_text("a = 9")
+
+    manifest = await write_project(project, {"main.py": "a = 1"})
+
+    assert manifest.changed == ["main.py"]
+    assert (project / "main.py").read_text() == "a = 1"
+
+
+@pytest.mark.asyncio
+async def test_corrupt_manifest_is_ignored(temp_dir):
+    project = temp_dir / "game"
+    await write_project(project, {"main.py": "a = 1"})
+    (project / MANIFEST_NAME).write_text('{"files": {"../outside": {"sha256": "x"}}')
+
+    manifest = await write_project(project, {"main.py": "a = 1"})
+
+    assert manifest.unchanged == ["main.py"] and manifest.removed == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", ["../escape.py", "/etc/passwd", MANIFEST_NAME])
+async def test_rejects_paths_outside_project(temp_dir, name):
+    with pytest.raises(ValueError, match="Invalid project file path"):
+        await write_project(temp_dir / "game", {name: "x"})
+
+
+def test_atomic_write_leaves_no_temp_files(temp_dir):
+    target = temp_dir / "deep" / "file.txt"
+    atomic_write(target, b"one")
+    atomic_write(target, b"two")
+
+    assert target.read_bytes() == b"two"
+    assert [p.name for p in target.parent.iterdir()] == ["file.txt"]
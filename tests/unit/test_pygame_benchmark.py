@@ -0,0 +1,166 @@
+"""Tests for the headless pygame smoke-run and benchmark."""
+import json
+import textwrap
+
+import pytest
+
+from ai_game_dev.engines.pygame.benchmark import build_report, smoke_run, summarize
+from ai_game_dev.project_manager import ProjectManager
+
+
+GAME = '''
+import json
+import pygame
+
+
+class Player:
+    def __init__(self):
+        self.x = 100
+
+    def update(self, keys):
+        if keys[pygame.K_RIGHT]:
+            self.x += 2
+
+
+class Game:
+    def __init__(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((320, 240))
+        self.clock = pygame.time.Clock()
+        self.player = Player()
+        self.clicks = 0
+
+    def update(self):
+        self.player.update(pygame.key.get_pressed())
+
+    def draw(self):
+        self.screen.fill((0, 0, 0))
+        pygame.draw.rect(self.screen, (255, 255, 255), (self.player.x, 100, 10, 10))
+        pygame.display.flip()
+
+    def run(self):
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    self.clicks += 1
+            self.update()
+            self.draw()
+            self.clock.tick(60)
+            with open("state.json", "w") as f:
+                json.dump({"x": self.player.x, "clicks": self.clicks}, f)
+
+
+if __name__ == "__main__":
+    Game().run()
+'''
+
+
+def _result(frames=100, frame_ms=1.0, **overrides):
+    result = {
+        "error": None,
+        "completed": True,
+        "frames": frames,
+        "frame_ms": [frame_ms] * frames,
+        "update_ms": [frame_ms / 4] * frames,
+        "draw_ms": [frame_ms / 2] * frames,
+        "allocated_blocks": [1000 + 2 * i for i in range(frames)],
+        "gc_collections": 3,
+        "peak_rss_kb": 102400,
+    }
+    result.update(overrides)
+    return result
+
+
+def test_summarize():
+    summary = summarize([float(ms) for ms in range(1, 101)])
+
+    assert summary["mean"] == 50.5
+    assert summary["p50"] == 51.0
+    assert summary["p99"] == 99.0
+    assert summary["max"] == 100.0
+    assert summarize([])["max"] == 0.0
+
+
+def test_build_report_passes_within_budget():
+    report = build_report(_result(), frames=100, fps_budget=60)
+
+    assert report.passed
+    assert report.fps == 1000.0
+    assert report.update_ms["mean"] == 0.25
+    assert report.allocated_blocks_per_frame == 2.0
+    assert report.peak_rss_mb == 100.0
+    assert report.frames_over_budget == 0
+
+
+def test_build_report_failures():
+    slow = build_report(_result(frame_ms=25.0), frames=100, fps_budget=60)
+    assert not slow.passed
+    assert slow.frames_over_budget == 90
+    assert "below the 60 FPS budget" in slow.failures[0]
+
+    early = build_report(_result(frames=40, completed=False), frames=100, fps_budget=60)
+    assert early.failures == ["Game exited after 40 of 100 frames"]
+
+    crashed = build_report(_result(frames=3, completed=False, error="Traceback ..."), frames=100, fps_budget=60)
+    assert crashed.failures == ["Game raised an exception"]
+    assert crashed.to_dict()["error"] == "Traceback ..."
+
+
+@pytest.mark.asyncio
+async def test_smoke_run_without_entry_point(temp_dir):
+    report = await smoke_run(temp_dir, frames=10)
+
+    assert not report.passed
+    assert report.frames == 0
+
+
+@pytest.mark.asyncio
+async def test_smoke_run_drives_game_with_scripted_input(temp_dir):
+    pytest.importorskip("pygame")
+    (temp_dir / "main.py").write_text(GAME)
+    script = [
+        {"frame": 2, "type": "KEYDOWN", "key": "K_RIGHT"},
+        {"frame": 12, "type": "KEYUP", "key": "K_RIGHT"},
+        {"frame": 15, "type": "MOUSEBUTTONDOWN", "pos": [10, 10], "button": 1},
+    ]
+
+    report = await smoke_run(temp_dir, frames=30, fps_budget=1, input_script=script)
+
+    assert report.passed, report.failures
+    assert report.frames == 30
+    assert report.draw_ms["max"] > 0
+    state = json.loads((temp_dir / "state.json").read_text())
+    assert state == {"x": 120, "clicks": 1}
+
+
+@pytest.mark.asyncio
+async def test_smoke_run_reports_game_errors(temp_dir):
+    pytest.importorskip("pygame")
+    (temp_dir / "main.py").write_text(textwrap.dedent('''
+        import pygame
+        pygame.init()
+        screen = pygame.display.set_mode((64, 64))
+        for frame in range(5):
+            pygame.display.flip()
+        raise RuntimeError("boom")
+    '''))
+
+    report = await smoke_run(temp_dir, frames=30, fps_budget=1)
+
+    assert not report.passed
+    assert report.frames == 5
+    assert "RuntimeError: boom" in report.error
+
+
+def test_benchmarks_are_recorded_on_the_project(temp_dir):
+    manager = ProjectManager(db_path=temp_dir / "projects.db")
+    project = manager.create_project("Smoke", "A test game", "pygame")
+    assert project.benchmarks == []
+
+    manager.record_benchmark(project.id, build_report(_result(), 100, 60).to_dict())
+    updated = manager.record_benchmark(project.id, build_report(_result(frame_ms=2.0), 100, 60).to_dict())
+
+    assert [run["fps"] for run in updated.benchmarks] == [1000.0, 500.0]
+    assert manager.record_benchmark("missing", {}) is None
@@ -0,0 +1,130 @@
+"""Tests for the local teachable-moment analyzer."""
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from agents.tool_context import ToolContext
+
+from ai_game_dev.text.teachable_moments import RULES, analyze_code
+
+
+GAME_LOOP = '''import pygame
+
+def spawn(enemies=[]):
+    return enemies
+
+running = True
+while running:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            running = False
+    player = pygame.image.load("player.png")
+    pygame.display.flip()
+'''
+
+
+async def invoke(**arguments):
+    from ai_game_dev.text.educational_tools import identify_teachable_moment
+
+    payload = json.dumps(arguments)
+    context = ToolContext(None, tool_name=identify_teachable_moment.name, tool_call_id="call", tool_arguments=payload)
+    return await identify_teachable_moment.on_invoke_tool(context, payload)
+
+
+def rules_fired(moments):
+    return {moment.rule for moment in moments}
+
+
+class TestAnalyzeCode:
+    """Rule registry behaviour."""
+
+    def test_finds_game_loop_problems_with_spans(self):
+        moments = analyze_code(GAME_LOOP, "intermediate")
+        by_rule = {moment.rule: moment for moment in moments}
+
+        assert {"mutable-default-argument", "image-load-per-frame", "missing-clock-tick"} <= set(by_rule)
+        assert by_rule["mutable-default-argument"].start_line == 3
+        assert by_rule["image-load-per-frame"].start_line == 11
+        assert (by_rule["missing-clock-tick"].start_line, by_rule["missing-clock-tick"].end_line) == (7, 12)
+        assert moments[0].severity == "warning"
+
+    def test_clock_tick_and_preloaded_images_are_fine(self):
+        code = (
+            "image = pygame.image.load('p.png')\n"
+            "while True:\n"
+            "    pygame.display.flip()\n"
+            "    clock.tick(60)\n"
+        )
+        assert not rules_fired(analyze_code(code, "advanced")) & {"missing-clock-tick", "image-load-per-frame"}
+
+    def test_beginner_concepts_reported_once(self):
+        code = "for a in b:\n    pass\nfor c in d:\n    if c:\n        pass\n    elif a:\n        pass\n"
+        moments = analyze_code(code, "beginner")
+        assert [m.rule for m in moments].count("loops") == 1
+        assert [m.rule for m in moments].count("conditionals") == 1
+        assert not rules_fired(analyze_code(code, "advanced"))
+
+    def test_god_class(self):
+        methods = "".join(f"    def m{i}(self):\n        pass\n" for i in range(20))
+        moments = analyze_code(f"class Game:\n{methods}", "advanced")
+        assert rules_fired(moments) == {"god-class"}
+
+    def test_syntax_error_is_a_moment(self):
+        moments = analyze_code("def broken(:\n    pass\n")
+        assert len(moments) == 1
+        assert moments[0].rule == "syntax-error"
+        assert moments[0].start_line == 1
+
+    def test_rule_selection(self):
+        moments = analyze_code(GAME_LOOP, "intermediate", rules=["missing-clock-tick"])
+        assert rules_fired(moments) == {"missing-clock-tick"}
+        assert "missing-clock-tick" in RULES
+
+
+class TestIdentifyTeachableMoment:
+    """The tool only calls the model when no rule fires."""
+
+    @pytest.mark.asyncio
+    async def test_local_rules_skip_model(self):
+        from ai_game_dev.text import educational_tools
+
+        with patch.object(educational_tools.client.chat.completions, "create", new=AsyncMock()) as create:
+            result = await invoke(code_snippet=GAME_LOOP, student_level="beginner")
+        create.assert_not_called()
+        assert result["source"] == "local"
+        assert result["moments"][0]["start_line"]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_model(self):
+        from ai_game_dev.text import educational_tools
+
+        response = MagicMock()
+        response.choices[0].message.content = json.dumps({"moments": [{"concept": "variables"}]})
+        with patch.object(educational_tools.client.chat.completions, "create", new=AsyncMock(return_value=response)) as create:
+            result = await invoke(code_snippet="x = 1\n", student_level="advanced")
+        create.assert_awaited_once()
+        assert result == {"source": "model", "moments": [{"concept": "variables"}]}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content", [None, "not json", '{"moments": "none"}', "[]"])
+    async def test_unusable_model_output_returns_error(self, content):
+        from ai_game_dev.text import educational_tools
+
+        response = MagicMock()
+        response.choices[0].message.content = content
+        with patch.object(educational_tools.client.chat.completions, "create", new=AsyncMock(return_value=response)):
+            result = await invoke(code_snippet="x = 1\n", student_level="advanced")
+        assert result["source"] == "model"
+        assert result["moments"] == []
+        assert result["error"]
+
+    @pytest.mark.asyncio
+    async def test_api_errors_return_error(self):
+        import openai
+        from ai_game_dev.text import educational_tools
+
+        error = openai.APIConnectionError(request=MagicMock())
+        with patch.object(educational_tools.client.chat.completions, "create", new=AsyncMock(side_effect=error)):
+            result = await invoke(code_snippet="x = 1\n", student_level="advanced")
+        assert result["moments"] == []
+        assert "Model request failed" in result["error"]
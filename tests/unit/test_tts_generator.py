@@ -0,0 +1,79 @@
+"""Tests for the TTS generator clip cache."""
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from ai_game_dev.audio.tts_generator import TTSGenerator, clip_key
+
+
+@pytest.fixture
+def generator(temp_dir):
+    """TTSGenerator with a mocked client and a temporary clip cache."""
+    tts = TTSGenerator(api_key="test_key", cache_dir=temp_dir / "cache")
+
+    async def create(model, voice, input):
+        await asyncio.sleep(0.01)
+        return MagicMock(content=f"{voice}:{input}".encode())
+
+    tts.client = MagicMock()
+    tts.client.audio.speech.create = AsyncMock(side_effect=create)
+    return tts
+
+
+class TestClipKey:
+    """Test content-addressed clip keys."""
+
+    def test_key_is_stable_and_distinct(self):
+        """Keys depend on text, voice and model only."""
+        assert clip_key("Hi", "alloy", "tts-1") == clip_key("Hi", "alloy", "tts-1")
+        assert clip_key("Hi", "alloy", "tts-1") != clip_key("Hi", "echo", "tts-1")
+        assert clip_key("Hi", "alloy", "tts-1") != clip_key("Hi", "alloy", "tts-1-hd")
+
+
+class TestNarration:
+    """Test concurrent, deduplicated narration rendering."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_lines_synthesized_once(self, generator, temp_dir):
+        """Identical (text, voice) lines share a single API call."""
+        script = "Pixel: Hello!\nPixel: Hello!\nHero: Hello!\nPixel: Bye"
+
+        paths = await generator.generate_narration(
+            script,
+            character_voices={"Pixel": "fable", "Hero": "onyx"},
+            output_dir=temp_dir / "out",
+        )
+
+        assert generator.client.audio.speech.create.call_count == 3
+        assert [p.name for p in paths] == [f"line_{i:03d}.mp3" for i in range(4)]
+        assert [p.read_bytes() for p in paths] == [
+            b"fable:Hello!", b"fable:Hello!", b"onyx:Hello!", b"fable:Bye"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cache_persists_across_instances(self, generator, temp_dir):
+        """A new generator reuses clips rendered by an earlier one."""
+        await generator.generate_speech("Welcome", output_path=temp_dir / "a.mp3")
+
+        fresh = TTSGenerator(api_key="test_key", cache_dir=generator.cache_dir)
+        fresh.client = MagicMock()
+        fresh.client.audio.speech.create = AsyncMock()
+        path = await fresh.generate_speech("Welcome", output_path=temp_dir / "b.mp3")
+
+        fresh.client.audio.speech.create.assert_not_called()
+        assert path.read_bytes() == b"alloy:Welcome"
+
+    def test_generator_works_across_event_loops(self, generator, temp_dir):
+        """Each asyncio.run gets its own request slots, even when they were contended."""
+        client = generator.client
+        generator = TTSGenerator(api_key="test_key", cache_dir=temp_dir / "cache", max_concurrency=1)
+        generator.client = client
+
+        async def narrate(script):
+            return await generator.generate_narration(script, output_dir=temp_dir / "out")
+
+        asyncio.run(narrate("Pixel: One\nPixel: Two"))
+        paths = asyncio.run(narrate("Pixel: Three\nPixel: Four"))
+
+        assert [p.read_bytes() for p in paths] == [b"alloy:Three", b"alloy:Four"]
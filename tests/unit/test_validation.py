@@ -0,0 +1,138 @@
+"""Tests for generated code validation."""
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ai_game_dev.engines.pygame.adapter import PygameAdapter
+from ai_game_dev.engines.validation import (
+    check_gdscript,
+    check_python,
+    check_rust,
+    strip_code_fences,
+    validate_project,
+)
+
+
+GDSCRIPT = '''extends CharacterBody2D
+
+@export var speed := 200.0
+var data = {
+	"a": 1, # comment with ( bracket
+	"b": [1, 2],
+}
+var health: int = 100:
+	set(value):
+		health = clamp(value, 0, 100)
+
+func _physics_process(delta: float) -> void:
+	var text = """multi
+line ) string"""
+	if Input.is_action_pressed("jump"):
+		velocity.y = -speed
+	else:
+		velocity.y += 10.0 * delta
+	move_and_slide()
+'''
+
+RUST = '''use bevy::prelude::*;
+/* nested /* comment { */ */
+fn first<'a>(s: &'a str) -> char {
+    let brace = '{';
+    let raw = r#"raw " { "#;
+    'outer: loop { break 'outer; }
+    brace
+}
+fn main() { println!("{} }", 1); }
+'''
+
+
+class TestCheckers:
+    """Per-language checks."""
+
+    def test_python(self):
+        assert check_python("main.py", "import pygame\n\nprint('hi')\n").ok
+        report = check_python("main.py", "def broken(:\n    pass\n")
+        assert report.messages() == ["line 1: SyntaxError: invalid syntax"]
+
+    def test_placeholder_and_fences(self):
+        assert check_python("a.py", "// Error generating code: boom").messages() == [
+            "Code generation failed; the file only contains the error placeholder"
+        ]
+        assert check_rust("a.rs", "  ").messages() == ["File is empty"]
+        assert strip_code_fences("```gdscript\nextends Node\n```") == "extends Node\n"
+
+    def test_gdscript_valid(self):
+        assert check_gdscript("Player.gd", GDSCRIPT).messages() == []
+
+    def test_gdscript_errors(self):
+        code = "extends Node\nonready var x = 1\nfunc _ready()\n\tpass\nfunc _process(delta):\n\tif x:\n\tpass\n"
+        assert check_gdscript("Main.gd", code).messages() == [
+            "line 2: 'onready var' is Godot 3 syntax; use '@onready var'",
+            "line 3: Invalid function declaration (expected 'func name(args):')",
+            "line 4: Unexpected indentation",
+            "line 7: Expected an indented block after line 6",
+        ]
+
+    def test_gdscript_brackets_and_indent_characters(self):
+        assert "line 2: '(' is never closed" in check_gdscript("a.gd", "func a():\n\tprint(1\n").messages()
+        mixed = check_gdscript("a.gd", "func a():\n\tpass\nfunc b():\n    pass\n")
+        assert mixed.messages() == ["line 4: Indentation uses a different character than earlier lines"]
+
+    def test_rust(self):
+        assert check_rust("src/main.rs", RUST).messages() == []
+        assert check_rust("src/lib.rs", "fn a() { let x = (1, 2]; }").messages() == [
+            "line 1: Unmatched ']', expected closing for '(' from line 1"
+        ]
+        assert check_rust("src/lib.rs", "fn a() {\n").messages() == ["line 1: '{' is never closed"]
+        assert check_rust("src/main.rs", "// fn main() {}\n").messages() == ["main.rs has no 'fn main'"]
+
+
+@pytest.mark.asyncio
+async def test_validate_project_checks_imports():
+    reports = await validate_project({
+        "main.py": "from game import Game, missing\nfrom .utils import WIDTH\nimport pygame\n",
+        "game.py": "class Game:\n    pass\n",
+        "utils.py": "WIDTH = 800\n",
+        "README.md": "# not code",
+    })
+
+    assert set(reports) == {"main.py", "game.py", "utils.py"}
+    assert reports["main.py"].messages() == ["line 1: 'missing' is not defined in 'game'"]
+    assert reports["game.py"].ok and reports["utils.py"].ok
+
+
+@pytest.mark.asyncio
+async def test_only_broken_files_are_reprompted():
+    adapter = PygameAdapter()
+    responses = {
+        "good": "```python\nfrom helper import VALUE\nprint(VALUE)\n```",
+        "helper": "VALUE = (",
+    }
+    calls = []
+
+    async def generate(prompt, max_tokens=4000):
+        calls.append(prompt)
+        if "had these problems" in prompt:
+            assert "SyntaxError" in prompt and "VALUE = (" in prompt
+            return "VALUE = 1\n"
+        return responses[prompt]
+
+    adapter.generate_code_with_llm = AsyncMock(side_effect=generate)
+    files, issues = await adapter.generate_files_with_llm({"main.py": "good", "helper.py": "helper"})
+
+    assert files == {"main.py": "from helper import VALUE\nprint(VALUE)\n", "helper.py": "VALUE = 1\n"}
+    assert issues == {}
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_unfixable_files_are_reported():
+    adapter = PygameAdapter()
+    adapter.generate_code_with_llm = AsyncMock(return_value="// Error generating code: offline")
+
+    files, issues = await adapter.generate_files_with_llm({"main.py": "make a game"}, {"README.md": "x"})
+
+    assert adapter.generate_code_with_llm.await_count == 3
+    assert all(call.args[0] == "make a game" for call in adapter.generate_code_with_llm.await_args_list)
+    assert issues == {"main.py": ["Code generation failed; the file only contains the error placeholder"]}
+    assert files == {}
@@ -0,0 +1,171 @@
+"""Tests for the Yarn dialogue compiler."""
+import pytest
+
+from ai_game_dev.text.yarn_compiler import (
+    DialogueRunner,
+    Op,
+    YarnCompileError,
+    YarnProgram,
+    compile_yarn,
+    compile_yarn_cached,
+    write_engine_runtime,
+)
+from ai_game_dev.engines.validation import check_file
+from ai_game_dev.text.yarn_dialogue import compile_dialogue_files
+
+
+SOURCE = """
+title: Start
+tags: intro, chapter1
+---
+Guide: Welcome, traveller.
+<<set $met_guide to true>>
+-> Who are you?
+    Guide: Someone who knows the way.
+    <<jump Road>>
+-> Where am I? <<if $lost>>
+    Guide: Far from home.
+-> Goodbye.
+    <<stop>>
+Guide: Shall we go on?
+<<if $has_map>>
+    Guide: You have a map!
+<<elseif $has_compass>>
+    Guide: A compass will do.
+<<else>>
+    Guide: Stay close.
+<<endif>>
+jump Road
+===
+title: Road
+---
+The road stretches ahead.
+===
+title: Forgotten
+---
+Nobody comes here.
+<<jump Nowhere>>
+===
+"""
+
+
+class TestYarnCompiler:
+    """Test parsing, validation and serialization."""
+
+    def test_nodes_strings_and_jump_table(self):
+        program = compile_yarn(SOURCE)
+
+        assert list(program.node_index) == ["Start", "Road", "Forgotten"]
+        assert [program.strings[t] for t in program.node("Start").tags] == ["intro", "chapter1"]
+        # Speaker names are interned once
+        assert program.strings.count("Guide") == 1
+        jumps = program.code[program.code[:, 0] == Op.JUMP]
+        assert jumps[:, 1].tolist() == [1, 1, -1]
+
+    def test_reports_dangling_jumps_and_unreachable_nodes(self):
+        program = compile_yarn(SOURCE)
+        messages = [(d.level, d.node, d.message) for d in program.diagnostics]
+
+        assert ("error", "Forgotten", "Jump to unknown node 'Nowhere'") in messages
+        assert ("warning", "Forgotten", "Node 'Forgotten' is unreachable") in messages
+        assert not any(d.node == "Road" for d in program.diagnostics)
+        with pytest.raises(YarnCompileError):
+            compile_yarn(SOURCE, strict=True)
+
+    def test_reports_unclosed_if(self):
+        program = compile_yarn("title: A\n---\n<<if $x>>\nHi\n===\n")
+        assert [d.message for d in program.errors] == ["<<if>> without <<endif>>"]
+
+    @pytest.mark.parametrize("suffix", [".yarnc", ".json"])
+    def test_round_trip(self, temp_dir, suffix):
+        program = compile_yarn(SOURCE)
+        loaded = YarnProgram.load(program.save(temp_dir / f"dialogue{suffix}"))
+
+        assert loaded.strings == program.strings
+        assert loaded.nodes == program.nodes
+        assert (loaded.code == program.code).all()
+
+    def test_cache_is_reused(self, temp_dir):
+        first = compile_yarn_cached(SOURCE, temp_dir)
+        assert len(list(temp_dir.glob("*.yarnc"))) == 1
+        second = compile_yarn_cached(SOURCE, temp_dir)
+        assert second.strings == first.strings
+        assert second.diagnostics == first.diagnostics and second.errors
+
+    def test_cache_hit_still_raises_in_strict_mode(self, temp_dir):
+        compile_yarn_cached(SOURCE, temp_dir)
+        with pytest.raises(YarnCompileError):
+            compile_yarn_cached(SOURCE, temp_dir, strict=True)
+
+
+class TestDialogueRunner:
+    """Test running compiled programs."""
+
+    def test_options_conditions_and_jumps(self):
+        program = compile_yarn(SOURCE)
+        seen = []
+
+        def choose(options):
+            seen.append(options)
+            return 0
+
+        events = list(DialogueRunner(program, {"lost": False, "has_map": False}).run("Start", choose))
+
+        assert seen == [["Who are you?", "Goodbye."]]
+        assert events == [
+            ("line", "Guide", "Welcome, traveller."),
+            ("command", "set $met_guide to true"),
+            ("line", "Guide", "Someone who knows the way."),
+            ("line", None, "The road stretches ahead."),
+        ]
+
+    def test_if_else_chain(self):
+        program = compile_yarn(SOURCE)
+        runner = DialogueRunner(program, {"lost": True, "has_map": False, "has_compass": False})
+        events = list(runner.run("Start", lambda options: 1))  # "Where am I?"
+        assert ("line", "Guide", "Far from home.") in events
+        assert ("line", "Guide", "Stay close.") in events
+        assert events[-1] == ("line", None, "The road stretches ahead.")
+
+
+def test_bundled_dialogue_compiles(temp_dir):
+    """The bundled dialogue parses; its jumps to unwritten nodes are reported."""
+    program = compile_dialogue_files(temp_dir)
+    assert "ProfessorPixelIntro" in program.node_index
+    assert "zara_web_enthusiasm" in program.node_index
+    assert any("window_creation" in d.message for d in program.errors)
+
+
+class TestEngineRuntimes:
+    """Test the runtimes written into game projects."""
+
+    @pytest.mark.parametrize("engine,filename", [
+        ("pygame", "dialogue_runtime.py"),
+        ("godot", "yarn_dialogue.gd"),
+        ("bevy", "yarn_dialogue.rs"),
+    ])
+    def test_write_engine_runtime(self, temp_dir, engine, filename):
+        path = write_engine_runtime(engine, temp_dir)
+        assert path.name == filename
+        assert check_file(filename, path.read_text()).issues == []
+
+    def test_unknown_engine(self, temp_dir):
+        with pytest.raises(ValueError):
+            write_engine_runtime("unreal", temp_dir)
+
+    @pytest.mark.parametrize("suffix", [".yarnc", ".json"])
+    def test_pygame_runtime_matches_dialogue_runner(self, temp_dir, suffix):
+        program = compile_yarn(SOURCE)
+        path = program.save(temp_dir / f"dialogue{suffix}")
+        runtime = {}
+        exec(write_engine_runtime("pygame", temp_dir).read_text(), runtime)
+        variables = {"lost": True, "has_map": False, "has_compass": False}
+
+        dialogue = runtime["Dialogue"](runtime["DialogueProgram"](str(path)), variables)
+        steps = [dialogue.start("Start")]
+        while steps[-1] is not None:
+            steps.append(dialogue.choose(1) if steps[-1][0] == "options" else dialogue.advance())
+
+        assert steps[2] == ("options", ["Who are you?", "Where am I?", "Goodbye."])
+        expected = list(DialogueRunner(program, variables).run("Start", lambda options: 1))
+        assert [step for step in steps[:-1] if step[0] != "options"] == expected